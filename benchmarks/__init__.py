@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Benchmarks of the client library.
+
+The modules of this package hold two kinds of benchmarks. Scripts with a
+``main`` function compare alternative implementations once, and are run
+directly, e.g. ``python benchmarks/raw_pages.py``. Classes with ``time_``
+methods form a suite in the style of `airspeed velocity
+<https://asv.readthedocs.io>`_ (``asv``), configured by ``asv.conf.json``
+at the root of the repository, which records results per commit so that
+regressions are caught:
+
+.. code-block:: console
+
+    $ pip install asv virtualenv
+    $ asv run master^!                      # benchmark a commit
+    $ asv continuous --factor 1.1 master HEAD  # fail on 10% regressions
+    $ asv publish && asv preview            # browse results over time
+
+``asv dev`` runs the suite once against the working tree, for quick
+checks while writing benchmarks.
+"""
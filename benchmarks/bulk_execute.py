@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Benchmark bulk execution of patch jobs against a local fake server.
+
+Compares a serial loop of ``execute_patch_job`` calls with
+``execute_patch_jobs`` on the sync and async clients, reporting
+throughput and per-request latency percentiles. The fake server runs
+in-process on a local port and answers after a fixed delay.
+
+Run with ``python benchmarks/bulk_execute.py``.
+"""
+
+import asyncio
+import time
+
+from google.cloud.osconfig_v1.services.os_config_service import bulk
+from google.cloud.osconfig_v1.services.os_config_service.fake_server import (
+    FakeOsConfigServer,
+    FakeOsConfigService,
+)
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+class _Timed:
+    # Records the latency of every execute_patch_job call on a client.
+
+    def __init__(self, client):
+        self._client = client
+        self.latencies = []
+
+    def execute_patch_job(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._client.execute_patch_job(*args, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+class _TimedAsync(_Timed):
+    async def execute_patch_job(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await self._client.execute_patch_job(*args, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+def _report(label, elapsed, latencies):
+    latencies = sorted(latencies)
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1e3
+
+    print(
+        "{0:<28} {1:8.1f} req/s   p50 {2:7.2f} ms   p99 {3:7.2f} ms".format(
+            label, len(latencies) / elapsed, percentile(0.50), percentile(0.99)
+        )
+    )
+
+
+def main(count: int = 400, concurrency: int = 32, latency: float = 0.005):
+    server = FakeOsConfigServer(
+        FakeOsConfigService(instances_per_project=10, latency=latency), max_workers=64
+    ).start()
+    requests = bulk.requests_for_parents(
+        patch_jobs.ExecutePatchJobRequest(
+            display_name="bench", instance_filter={"all": True}
+        ),
+        ["projects/p{0}".format(i) for i in range(count)],
+    )
+
+    try:
+        client = server.client()
+
+        timed = _Timed(client)
+        start = time.perf_counter()
+        for request in requests:
+            timed.execute_patch_job(request)
+        _report("serial loop", time.perf_counter() - start, timed.latencies)
+
+        timed = _Timed(client)
+        start = time.perf_counter()
+        bulk.execute_patch_jobs(timed, requests, max_workers=concurrency)
+        _report("execute_patch_jobs", time.perf_counter() - start, timed.latencies)
+
+        async def run_async():
+            client = server.async_client()
+            timed = _TimedAsync(client)
+            start = time.perf_counter()
+            await bulk.execute_patch_jobs_async(
+                timed, requests, max_concurrency=concurrency
+            )
+            _report(
+                "execute_patch_jobs (async)",
+                time.perf_counter() - start,
+                timed.latencies,
+            )
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(run_async())
+        finally:
+            loop.close()
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
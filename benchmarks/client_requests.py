@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Benchmarks of building requests and calling methods on the client.
+
+The gRPC stubs are replaced with in-memory functions so that only the
+client-side overhead of coercing arguments, building metadata and
+wrapping responses is measured.
+"""
+
+from google.auth import credentials  # type: ignore
+
+from google.cloud.osconfig_v1.services.os_config_service import OsConfigServiceClient
+from google.cloud.osconfig_v1.types import patch_jobs
+
+_PATCH_JOB_NAME = "projects/p/patchJobs/j"
+
+_EXECUTE_FIELDS = {
+    "parent": "projects/p",
+    "display_name": "nightly",
+    "description": "Nightly security updates.",
+    "instance_filter": {
+        "group_labels": [{"labels": {"env": "prod", "tier": "web"}}],
+        "zones": ["us-central1-a", "us-central1-b"],
+    },
+    "patch_config": {
+        "reboot_config": patch_jobs.PatchConfig.RebootConfig.DEFAULT,
+        "apt": {"type": patch_jobs.AptSettings.Type.DIST, "excludes": ["nginx"]},
+        "yum": {"security": True, "minimal": True},
+    },
+    "duration": {"seconds": 3600},
+}
+
+
+def _stub(response):
+    def stub(request, timeout=None, metadata=None, **kwargs):
+        return response
+
+    return stub
+
+
+class RequestConstruction:
+    """Build request messages from keyword arguments and dictionaries."""
+
+    def time_get_patch_job_request(self):
+        patch_jobs.GetPatchJobRequest(name=_PATCH_JOB_NAME)
+
+    def time_execute_patch_job_request_from_kwargs(self):
+        patch_jobs.ExecutePatchJobRequest(**_EXECUTE_FIELDS)
+
+    def time_execute_patch_job_request_from_dict(self):
+        patch_jobs.ExecutePatchJobRequest(_EXECUTE_FIELDS)
+
+
+class ClientCalls:
+    """Call client methods with their different forms of arguments."""
+
+    def setup(self):
+        self.client = OsConfigServiceClient(
+            credentials=credentials.AnonymousCredentials()
+        )
+        stubs = self.client._transport._stubs
+        stubs["get_patch_job"] = _stub(patch_jobs.PatchJob(name=_PATCH_JOB_NAME))
+        stubs["execute_patch_job"] = _stub(patch_jobs.PatchJob(name=_PATCH_JOB_NAME))
+        stubs["list_patch_jobs"] = _stub(
+            patch_jobs.ListPatchJobsResponse(
+                patch_jobs=[patch_jobs.PatchJob(name=_PATCH_JOB_NAME)]
+            )
+        )
+        self.get_request = patch_jobs.GetPatchJobRequest(name=_PATCH_JOB_NAME)
+        self.execute_request = patch_jobs.ExecutePatchJobRequest(**_EXECUTE_FIELDS)
+
+    def time_get_patch_job_flattened(self):
+        self.client.get_patch_job(name=_PATCH_JOB_NAME)
+
+    def time_get_patch_job_request(self):
+        self.client.get_patch_job(self.get_request)
+
+    def time_get_patch_job_dict(self):
+        self.client.get_patch_job({"name": _PATCH_JOB_NAME})
+
+    def time_execute_patch_job_request(self):
+        self.client.execute_patch_job(self.execute_request)
+
+    def time_execute_patch_job_dict(self):
+        self.client.execute_patch_job(_EXECUTE_FIELDS)
+
+    def time_list_patch_jobs(self):
+        for _ in self.client.list_patch_jobs(parent="projects/p"):
+            pass
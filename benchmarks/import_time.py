@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Benchmark the time taken to import the package and its clients.
+
+Each import runs in a fresh interpreter. Run with
+``python benchmarks/import_time.py`` to print the median of several runs
+and the modules of the library each import loads; the ``timeraw_``
+methods are the same measurements in the benchmark suite.
+"""
+
+import statistics
+import subprocess
+import sys
+
+_IMPORTS = (
+    ("package", "import google.cloud.osconfig"),
+    ("types", "from google.cloud.osconfig import PatchJob"),
+    ("sync client", "from google.cloud.osconfig import OsConfigServiceClient"),
+    ("async client", "from google.cloud.osconfig import OsConfigServiceAsyncClient"),
+)
+
+# Reports the time an import took and the library modules it loaded.
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+{0}
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(" ".join(sorted(
+    name.rsplit(".", 1)[-1]
+    for name in sys.modules
+    if name.startswith("google.cloud.osconfig_v1.services.")
+)))
+"""
+
+
+class ImportTime:
+    """Import the package, its types and its clients in a fresh interpreter."""
+
+    def timeraw_import_package(self):
+        return _IMPORTS[0][1]
+
+    def timeraw_import_types(self):
+        return _IMPORTS[1][1]
+
+    def timeraw_import_sync_client(self):
+        return _IMPORTS[2][1]
+
+    def timeraw_import_async_client(self):
+        return _IMPORTS[3][1]
+
+
+def _probe(statement):
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(statement)],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    ).stdout.splitlines()
+    return float(output[0]), output[1].split() if len(output) > 1 else []
+
+
+def main(repeat: int = 7):
+    for label, statement in _IMPORTS:
+        runs = [_probe(statement) for _ in range(repeat)]
+        modules = runs[-1][1]
+        print(
+            "{0:<14} {1:8.1f} ms   {2} service modules: {3}".format(
+                label,
+                statistics.median(elapsed for elapsed, _ in runs) * 1e3,
+                len(modules),
+                ", ".join(modules) or "-",
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Benchmark holding instance details as messages and as compact records.
+
+Materializes every instance of the same serialized pages as
+``PatchJobInstanceDetails`` proto-plus messages, as records built from
+those messages, and as records projected from raw pages, reporting the
+construction time and the memory retained per instance.
+
+Run with ``python benchmarks/instance_records.py``.
+"""
+
+import gc
+import time
+import tracemalloc
+
+from google.cloud.osconfig_v1.services.os_config_service import raw
+from google.cloud.osconfig_v1.services.os_config_service.records import (
+    InstanceDetailsRecord,
+    make_records,
+)
+from google.cloud.osconfig_v1.types import patch_jobs
+
+_REASONS = ("", "Instance timed out.", "Agent not detected.", "Reboot failed.")
+
+
+def _pages(count, page_size):
+    pages = []
+    for p in range(count):
+        response = patch_jobs.ListPatchJobInstanceDetailsResponse(
+            patch_job_instance_details=[
+                patch_jobs.PatchJobInstanceDetails(
+                    name="projects/p/zones/us-central1-a/instances/vm-{0}".format(i),
+                    instance_system_id=str(10 ** 15 + i),
+                    state=i % 14,
+                    failure_reason=_REASONS[i % len(_REASONS)],
+                    attempt_count=i % 3,
+                )
+                for i in range(p * page_size, (p + 1) * page_size)
+            ]
+        )
+        pages.append(patch_jobs.ListPatchJobInstanceDetailsResponse.serialize(response))
+    return pages
+
+
+def _messages(pages):
+    held = []
+    for data in pages:
+        page = patch_jobs.ListPatchJobInstanceDetailsResponse.deserialize(data)
+        held.extend(page.patch_job_instance_details)
+    return held
+
+
+def _records_from_messages(pages):
+    held = []
+    for data in pages:
+        page = patch_jobs.ListPatchJobInstanceDetailsResponse.deserialize(data)
+        held.extend(
+            InstanceDetailsRecord.from_proto(details)
+            for details in page.patch_job_instance_details
+        )
+    return held
+
+
+def _records_from_raw_pages(pages):
+    held = []
+    for data in pages:
+        page = raw.RawListPatchJobInstanceDetailsResponse.deserialize(data)
+        held.extend(make_records(page.project(InstanceDetailsRecord.FIELDS)))
+    return held
+
+
+def main(count: int = 20, page_size: int = 1000):
+    pages = _pages(count, page_size)
+    instances = count * page_size
+    for label, build in (
+        ("proto-plus messages", _messages),
+        ("records from messages", _records_from_messages),
+        ("records from raw pages", _records_from_raw_pages),
+    ):
+        gc.collect()
+        start = time.perf_counter()
+        build(pages)
+        elapsed = time.perf_counter() - start
+
+        # Measure the memory retained separately, as tracing slows
+        # construction down.
+        gc.collect()
+        tracemalloc.start()
+        held = build(pages)
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        assert len(held) == instances
+        del held
+
+        print(
+            "{0:<24} {1:8.2f} us/instance   {2:8.0f} bytes/instance".format(
+                label, elapsed * 1e6 / instances, retained / instances
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
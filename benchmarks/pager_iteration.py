@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Benchmarks of iterating pagers over large instance details pages.
+
+The gRPC stub is replaced with an in-memory function that deserializes
+prepared pages, as the real stub does, so that the measurements cover
+deserialization and the pager but not the network.
+"""
+
+from google.auth import credentials  # type: ignore
+
+from google.cloud.osconfig_v1.services.os_config_service import OsConfigServiceClient
+from google.cloud.osconfig_v1.services.os_config_service import raw
+from google.cloud.osconfig_v1.types import patch_jobs
+
+_INSTANCES = 10000
+
+
+def _pages(page_size):
+    pages = {}
+    for offset in range(0, _INSTANCES, page_size):
+        end = offset + page_size
+        response = patch_jobs.ListPatchJobInstanceDetailsResponse(
+            patch_job_instance_details=[
+                patch_jobs.PatchJobInstanceDetails(
+                    name="projects/p/zones/us-central1-a/instances/vm-{0}".format(i),
+                    instance_system_id=str(10 ** 15 + i),
+                    state=i % 14,
+                    failure_reason="" if i % 5 else "Instance timed out.",
+                    attempt_count=i % 3,
+                )
+                for i in range(offset, end)
+            ],
+            next_page_token=str(end) if end < _INSTANCES else "",
+        )
+        pages[
+            str(offset) if offset else ""
+        ] = patch_jobs.ListPatchJobInstanceDetailsResponse.serialize(response)
+    return pages
+
+
+def _stub(pages, deserialize):
+    def stub(request, timeout=None, metadata=None, **kwargs):
+        return deserialize(pages[request.page_token])
+
+    return stub
+
+
+class PagerIteration:
+    """Iterate over 10000 instance details, in pages of different sizes."""
+
+    params = [100, 1000]
+    param_names = ["page_size"]
+
+    def setup(self, page_size):
+        self.client = OsConfigServiceClient(
+            credentials=credentials.AnonymousCredentials()
+        )
+        pages = _pages(page_size)
+        stubs = self.client._transport._stubs
+        stubs["list_patch_job_instance_details"] = _stub(
+            pages, patch_jobs.ListPatchJobInstanceDetailsResponse.deserialize
+        )
+        stubs["list_patch_job_instance_details_raw"] = _stub(
+            pages, raw.RawListPatchJobInstanceDetailsResponse.deserialize
+        )
+        self.request = patch_jobs.ListPatchJobInstanceDetailsRequest(
+            parent="projects/p/patchJobs/j", page_size=page_size
+        )
+
+    def time_items(self, page_size):
+        for _ in self.client.list_patch_job_instance_details(self.request):
+            pass
+
+    def time_item_states(self, page_size):
+        for details in self.client.list_patch_job_instance_details(self.request):
+            details.state
+
+    def time_pages(self, page_size):
+        pager = self.client.list_patch_job_instance_details(self.request)
+        for _ in pager.pages:
+            pass
+
+    def time_raw_item_states(self, page_size):
+        pager = self.client.list_patch_job_instance_details(self.request, raw=True)
+        for details in pager:
+            details.state
+
+    def time_prefetched_items(self, page_size):
+        pager = self.client.list_patch_job_instance_details(self.request, prefetch=2)
+        for _ in pager:
+            pass
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Benchmark scanning instance details in the default and raw page modes.
+
+Deserializes the same ``ListPatchJobInstanceDetailsResponse`` pages the
+way the transport does in each mode and counts instances by state,
+reporting CPU time and peak memory allocated per scan.
+
+Run with ``python benchmarks/raw_pages.py``.
+"""
+
+import collections
+import time
+import tracemalloc
+
+from google.cloud.osconfig_v1.services.os_config_service import raw
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+def _pages(count, page_size):
+    pages = []
+    for p in range(count):
+        response = patch_jobs.ListPatchJobInstanceDetailsResponse(
+            patch_job_instance_details=[
+                patch_jobs.PatchJobInstanceDetails(
+                    name="projects/p/zones/us-central1-a/instances/vm-{0}".format(i),
+                    instance_system_id=str(10 ** 15 + i),
+                    state=i % 14,
+                    failure_reason="" if i % 5 else "Instance timed out.",
+                    attempt_count=i % 3,
+                )
+                for i in range(p * page_size, (p + 1) * page_size)
+            ],
+            next_page_token=str(p),
+        )
+        pages.append(patch_jobs.ListPatchJobInstanceDetailsResponse.serialize(response))
+    return pages
+
+
+def _proto_plus(pages):
+    counts = collections.Counter()
+    for data in pages:
+        page = patch_jobs.ListPatchJobInstanceDetailsResponse.deserialize(data)
+        counts.update(details.state for details in page.patch_job_instance_details)
+    return counts
+
+
+def _raw_lazy(pages):
+    counts = collections.Counter()
+    for data in pages:
+        page = raw.RawListPatchJobInstanceDetailsResponse.deserialize(data)
+        counts.update(details.state for details in page.patch_job_instance_details)
+    return counts
+
+
+def _raw_projected(pages):
+    counts = collections.Counter()
+    for data in pages:
+        page = raw.RawListPatchJobInstanceDetailsResponse.deserialize(data)
+        counts.update(state for state, in page.project(["state"]))
+    return counts
+
+
+def main(count: int = 20, page_size: int = 1000):
+    pages = _pages(count, page_size)
+    expected = None
+    for label, scan in (
+        ("proto-plus pages", _proto_plus),
+        ("raw pages, lazy items", _raw_lazy),
+        ("raw pages, projected", _raw_projected),
+    ):
+        tracemalloc.start()
+        start = time.perf_counter()
+        counts = scan(pages)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        counts = {int(state): n for state, n in counts.items()}
+        assert expected is None or counts == expected
+        expected = counts
+        print(
+            "{0:<24} {1:8.1f} ms   {2:8.1f} us/instance   peak {3:8.1f} KiB".format(
+                label, elapsed * 1e3, elapsed * 1e6 / (count * page_size), peak / 1024
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Benchmarks of serializing patch jobs and patch deployments.
+
+Measures the proto-plus messages against the protocol buffers they wrap,
+to show the cost of the wrapper layer.
+"""
+
+from google.cloud.osconfig_v1.types import patch_deployments
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+def _patch_config():
+    return patch_jobs.PatchConfig(
+        reboot_config=patch_jobs.PatchConfig.RebootConfig.DEFAULT,
+        apt={"type": patch_jobs.AptSettings.Type.DIST, "excludes": ["nginx"]},
+        yum={"security": True, "minimal": True, "excludes": ["kernel"]},
+        zypper={"categories": ["security"], "severities": ["critical"]},
+        windows_update={
+            "classifications": [
+                patch_jobs.WindowsUpdateSettings.Classification.CRITICAL,
+                patch_jobs.WindowsUpdateSettings.Classification.SECURITY,
+            ]
+        },
+        pre_step={"linux_exec_step_config": {"local_path": "/opt/pre.sh"}},
+        post_step={
+            "linux_exec_step_config": {
+                "gcs_object": {"bucket": "b", "object": "post.sh"},
+                "allowed_success_codes": [0, 3],
+            }
+        },
+    )
+
+
+def _patch_job():
+    return patch_jobs.PatchJob(
+        name="projects/p/patchJobs/j",
+        display_name="nightly",
+        description="Nightly security updates.",
+        create_time={"seconds": 1600000000},
+        update_time={"seconds": 1600003600},
+        state=patch_jobs.PatchJob.State.COMPLETED_WITH_ERRORS,
+        instance_filter={
+            "group_labels": [{"labels": {"env": "prod", "tier": "web"}}],
+            "zones": ["us-central1-a", "us-central1-b"],
+        },
+        patch_config=_patch_config(),
+        duration={"seconds": 3600},
+        instance_details_summary={
+            "succeeded_instance_count": 950,
+            "failed_instance_count": 40,
+            "timed_out_instance_count": 10,
+        },
+        percent_complete=100.0,
+        patch_deployment="projects/p/patchDeployments/weekly",
+    )
+
+
+def _patch_deployment():
+    return patch_deployments.PatchDeployment(
+        name="projects/p/patchDeployments/weekly",
+        description="Weekly updates.",
+        instance_filter={"all": True},
+        patch_config=_patch_config(),
+        duration={"seconds": 7200},
+        recurring_schedule={
+            "time_zone": {"id": "America/New_York"},
+            "time_of_day": {"hours": 3},
+            "frequency": patch_deployments.RecurringSchedule.Frequency.WEEKLY,
+            "weekly": {"day_of_week": 7},
+        },
+        create_time={"seconds": 1600000000},
+        update_time={"seconds": 1600000000},
+    )
+
+
+class _Serialization:
+    # Round trips of one message type; subclasses set the type and sample.
+
+    message_type = None
+    make_message = None
+
+    def setup(self):
+        self.message = type(self).make_message()
+        self.pb = self.message_type.pb(self.message)
+        self.data = self.message_type.serialize(self.message)
+
+    def time_serialize(self):
+        self.message_type.serialize(self.message)
+
+    def time_deserialize(self):
+        self.message_type.deserialize(self.data)
+
+    def time_serialize_pb(self):
+        self.pb.SerializeToString()
+
+    def time_deserialize_pb(self):
+        self.message_type.pb().FromString(self.data)
+
+    def time_to_dict(self):
+        self.message_type.to_dict(self.message)
+
+    def track_serialized_bytes(self):
+        return len(self.data)
+
+    track_serialized_bytes.unit = "bytes"
+
+
+class PatchJobSerialization(_Serialization):
+    """Serialize and deserialize a fully populated patch job."""
+
+    message_type = patch_jobs.PatchJob
+    make_message = staticmethod(_patch_job)
+
+
+class PatchDeploymentSerialization(_Serialization):
+    """Serialize and deserialize a fully populated patch deployment."""
+
+    message_type = patch_deployments.PatchDeployment
+    make_message = staticmethod(_patch_deployment)
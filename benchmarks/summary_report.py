@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Benchmark a fleet report over the summaries of many patch jobs.
+
+Compares per-job attribute access on the proto-plus messages with
+building a :class:`SummaryTable` and computing the same report with
+NumPy. Requires the ``numpy`` package.
+
+Run with ``python benchmarks/summary_report.py``.
+"""
+
+import random
+import time
+
+from google.cloud.osconfig_v1.services.os_config_service import summaries
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+def _jobs(count):
+    rng = random.Random(0)
+    return [
+        patch_jobs.PatchJob(
+            name="projects/p/patchJobs/{0}".format(i),
+            state=patch_jobs.PatchJob.State.SUCCEEDED,
+            instance_details_summary={
+                field: rng.randrange(100) for field in summaries.SUMMARY_FIELDS
+            },
+        )
+        for i in range(count)
+    ]
+
+
+def _report_attributes(jobs):
+    totals = dict.fromkeys(summaries.SUMMARY_FIELDS, 0)
+    ratios = []
+    for job in jobs:
+        summary = job.instance_details_summary
+        total = 0
+        for field in summaries.SUMMARY_FIELDS:
+            value = getattr(summary, field)
+            totals[field] += value
+            total += value
+        succeeded = sum(getattr(summary, f) for f in summaries.SUCCEEDED_FIELDS)
+        if total:
+            ratios.append(succeeded / total)
+    ratios.sort()
+    return totals, ratios[len(ratios) // 2]
+
+
+def _report_table(jobs):
+    table = summaries.SummaryTable.from_patch_jobs(jobs)
+    return table.totals(), table.percentiles(table.success_ratios(), q=(50,))
+
+
+def main(count: int = 100000):
+    jobs = _jobs(count)
+
+    for label, report in (
+        ("attribute access", _report_attributes),
+        ("SummaryTable", _report_table),
+    ):
+        start = time.perf_counter()
+        report(jobs)
+        print(
+            "{0:<20} {1:8.3f} s for {2} jobs".format(
+                label, time.perf_counter() - start, count
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Benchmarks of the sync and async transports against a local server.
+
+Requests go over gRPC to an in-process
+:class:`~.fake_server.FakeOsConfigServer` that answers without delay, so
+the measurements cover the client, the transport and gRPC itself.
+"""
+
+import asyncio
+from concurrent import futures
+
+from google.cloud.osconfig_v1.services.os_config_service.fake_server import (
+    FakeOsConfigServer,
+    FakeOsConfigService,
+)
+from google.cloud.osconfig_v1.types import patch_jobs
+
+# The calls made by each get_patch_job benchmark.
+_CALLS = 200
+
+
+class TransportThroughput:
+    """Make 200 calls, and list 2000 instance details, at a concurrency."""
+
+    params = [1, 16]
+    param_names = ["concurrency"]
+    timeout = 120
+
+    def setup(self, concurrency):
+        self.server = FakeOsConfigServer(
+            FakeOsConfigService(instances_per_project=2000), max_workers=32
+        ).start()
+        self.client = self.server.client()
+        self.job = self.client.execute_patch_job(
+            patch_jobs.ExecutePatchJobRequest(
+                parent="projects/p", instance_filter={"all": True}
+            )
+        )
+        self.list_request = patch_jobs.ListPatchJobInstanceDetailsRequest(
+            parent=self.job.name, page_size=500
+        )
+        self.executor = futures.ThreadPoolExecutor(max_workers=concurrency)
+
+        # The async client's channel, like the semaphores of the async
+        # benchmarks, belongs to the loop it is created on.
+        self.loop = asyncio.new_event_loop()
+
+        async def make_async_client():
+            return self.server.async_client()
+
+        self.async_client = self.loop.run_until_complete(make_async_client())
+
+    def teardown(self, concurrency):
+        self.executor.shutdown()
+        self.loop.run_until_complete(self.async_client._client._transport.close())
+        self.loop.close()
+        self.server.stop()
+
+    def time_get_patch_job(self, concurrency):
+        name = self.job.name
+        list(
+            self.executor.map(
+                lambda _: self.client.get_patch_job(name=name), range(_CALLS)
+            )
+        )
+
+    def time_get_patch_job_async(self, concurrency):
+        name = self.job.name
+
+        async def get(semaphore):
+            async with semaphore:
+                await self.async_client.get_patch_job(name=name)
+
+        async def run():
+            semaphore = asyncio.Semaphore(concurrency)
+            await asyncio.gather(*(get(semaphore) for _ in range(_CALLS)))
+
+        self.loop.run_until_complete(run())
+
+    def time_list_instance_details(self, concurrency):
+        for _ in self.client.list_patch_job_instance_details(
+            self.list_request, prefetch=concurrency - 1
+        ):
+            pass
+
+    def time_list_instance_details_async(self, concurrency):
+        async def run():
+            pager = await self.async_client.list_patch_job_instance_details(
+                self.list_request, prefetch=concurrency - 1
+            )
+            async for _ in pager:
+                pass
+
+        self.loop.run_until_complete(run())
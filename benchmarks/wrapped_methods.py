@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Micro-benchmark for the per-call cost of wrapping RPC methods.
+
+Compares wrapping the transport method on every call (the previous
+behavior of the clients) against reusing the wrapper cached on the
+transport. The gRPC stub is replaced with an in-memory function so that
+only client-side overhead is measured.
+
+Run with ``python benchmarks/wrapped_methods.py``.
+"""
+
+import timeit
+
+from google.api_core import gapic_v1  # type: ignore
+from google.auth import credentials  # type: ignore
+
+from google.cloud.osconfig_v1.services.os_config_service import OsConfigServiceClient
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+def _make_client():
+    client = OsConfigServiceClient(credentials=credentials.AnonymousCredentials())
+    response = patch_jobs.PatchJob(name="projects/p/patchJobs/j")
+
+    def fake_stub(request, timeout=None, metadata=None, **kwargs):
+        return response
+
+    client._transport._stubs["get_patch_job"] = fake_stub
+    return client
+
+
+def run(number: int = 20000):
+    """Run the benchmark and return per-call timings in microseconds."""
+    client = _make_client()
+    transport = client._transport
+    request = patch_jobs.GetPatchJobRequest(name="projects/p/patchJobs/j")
+
+    def rewrap():
+        rpc = gapic_v1.method.wrap_method(
+            transport.get_patch_job,
+            default_timeout=None,
+            client_info=transport._client_info,
+        )
+        rpc(request)
+
+    def cached():
+        rpc = transport._wrapped_method("get_patch_job")
+        rpc(request)
+
+    def client_call():
+        client.get_patch_job(request)
+
+    results = {}
+    for label, func in (
+        ("wrap per call", rewrap),
+        ("cached wrapper", cached),
+        ("client.get_patch_job", client_call),
+    ):
+        elapsed = min(timeit.repeat(func, number=number, repeat=3))
+        results[label] = elapsed / number * 1e6
+    return results
+
+
+def main():
+    for label, usec in run().items():
+        print("{0:<24} {1:8.2f} us/call".format(label, usec))
+
+
+if __name__ == "__main__":
+    main()
@@ -15,51 +15,68 @@
 # limitations under the License.
 #
 
-from google.cloud.osconfig_v1.services.os_config_service.async_client import (
-    OsConfigServiceAsyncClient,
-)
-from google.cloud.osconfig_v1.services.os_config_service.client import (
-    OsConfigServiceClient,
-)
-from google.cloud.osconfig_v1.types.patch_deployments import (
-    CreatePatchDeploymentRequest,
-)
-from google.cloud.osconfig_v1.types.patch_deployments import (
-    DeletePatchDeploymentRequest,
-)
-from google.cloud.osconfig_v1.types.patch_deployments import GetPatchDeploymentRequest
-from google.cloud.osconfig_v1.types.patch_deployments import ListPatchDeploymentsRequest
-from google.cloud.osconfig_v1.types.patch_deployments import (
-    ListPatchDeploymentsResponse,
-)
-from google.cloud.osconfig_v1.types.patch_deployments import MonthlySchedule
-from google.cloud.osconfig_v1.types.patch_deployments import OneTimeSchedule
-from google.cloud.osconfig_v1.types.patch_deployments import PatchDeployment
-from google.cloud.osconfig_v1.types.patch_deployments import RecurringSchedule
-from google.cloud.osconfig_v1.types.patch_deployments import WeekDayOfMonth
-from google.cloud.osconfig_v1.types.patch_deployments import WeeklySchedule
-from google.cloud.osconfig_v1.types.patch_jobs import AptSettings
-from google.cloud.osconfig_v1.types.patch_jobs import CancelPatchJobRequest
-from google.cloud.osconfig_v1.types.patch_jobs import ExecStep
-from google.cloud.osconfig_v1.types.patch_jobs import ExecStepConfig
-from google.cloud.osconfig_v1.types.patch_jobs import ExecutePatchJobRequest
-from google.cloud.osconfig_v1.types.patch_jobs import GcsObject
-from google.cloud.osconfig_v1.types.patch_jobs import GetPatchJobRequest
-from google.cloud.osconfig_v1.types.patch_jobs import GooSettings
-from google.cloud.osconfig_v1.types.patch_jobs import Instance
-from google.cloud.osconfig_v1.types.patch_jobs import ListPatchJobInstanceDetailsRequest
-from google.cloud.osconfig_v1.types.patch_jobs import (
-    ListPatchJobInstanceDetailsResponse,
-)
-from google.cloud.osconfig_v1.types.patch_jobs import ListPatchJobsRequest
-from google.cloud.osconfig_v1.types.patch_jobs import ListPatchJobsResponse
-from google.cloud.osconfig_v1.types.patch_jobs import PatchConfig
-from google.cloud.osconfig_v1.types.patch_jobs import PatchInstanceFilter
-from google.cloud.osconfig_v1.types.patch_jobs import PatchJob
-from google.cloud.osconfig_v1.types.patch_jobs import PatchJobInstanceDetails
-from google.cloud.osconfig_v1.types.patch_jobs import WindowsUpdateSettings
-from google.cloud.osconfig_v1.types.patch_jobs import YumSettings
-from google.cloud.osconfig_v1.types.patch_jobs import ZypperSettings
+import importlib
+import sys
+
+# The module defining each name exported by this package. They are imported
+# on first access (PEP 562), so that importing the package does not load
+# both clients, their transports and every type module up front.
+_EXPORTS = {
+    "AptSettings": "google.cloud.osconfig_v1.types.patch_jobs",
+    "CancelPatchJobRequest": "google.cloud.osconfig_v1.types.patch_jobs",
+    "CreatePatchDeploymentRequest": "google.cloud.osconfig_v1.types.patch_deployments",
+    "DeletePatchDeploymentRequest": "google.cloud.osconfig_v1.types.patch_deployments",
+    "ExecStep": "google.cloud.osconfig_v1.types.patch_jobs",
+    "ExecStepConfig": "google.cloud.osconfig_v1.types.patch_jobs",
+    "ExecutePatchJobRequest": "google.cloud.osconfig_v1.types.patch_jobs",
+    "GcsObject": "google.cloud.osconfig_v1.types.patch_jobs",
+    "GetPatchDeploymentRequest": "google.cloud.osconfig_v1.types.patch_deployments",
+    "GetPatchJobRequest": "google.cloud.osconfig_v1.types.patch_jobs",
+    "GooSettings": "google.cloud.osconfig_v1.types.patch_jobs",
+    "Instance": "google.cloud.osconfig_v1.types.patch_jobs",
+    "ListPatchDeploymentsRequest": "google.cloud.osconfig_v1.types.patch_deployments",
+    "ListPatchDeploymentsResponse": "google.cloud.osconfig_v1.types.patch_deployments",
+    "ListPatchJobInstanceDetailsRequest": "google.cloud.osconfig_v1.types.patch_jobs",
+    "ListPatchJobInstanceDetailsResponse": "google.cloud.osconfig_v1.types.patch_jobs",
+    "ListPatchJobsRequest": "google.cloud.osconfig_v1.types.patch_jobs",
+    "ListPatchJobsResponse": "google.cloud.osconfig_v1.types.patch_jobs",
+    "MonthlySchedule": "google.cloud.osconfig_v1.types.patch_deployments",
+    "OneTimeSchedule": "google.cloud.osconfig_v1.types.patch_deployments",
+    "OsConfigServiceAsyncClient": "google.cloud.osconfig_v1.services.os_config_service.async_client",
+    "OsConfigServiceClient": "google.cloud.osconfig_v1.services.os_config_service.client",
+    "PatchConfig": "google.cloud.osconfig_v1.types.patch_jobs",
+    "PatchDeployment": "google.cloud.osconfig_v1.types.patch_deployments",
+    "PatchInstanceFilter": "google.cloud.osconfig_v1.types.patch_jobs",
+    "PatchJob": "google.cloud.osconfig_v1.types.patch_jobs",
+    "PatchJobInstanceDetails": "google.cloud.osconfig_v1.types.patch_jobs",
+    "RecurringSchedule": "google.cloud.osconfig_v1.types.patch_deployments",
+    "WeekDayOfMonth": "google.cloud.osconfig_v1.types.patch_deployments",
+    "WeeklySchedule": "google.cloud.osconfig_v1.types.patch_deployments",
+    "WindowsUpdateSettings": "google.cloud.osconfig_v1.types.patch_jobs",
+    "YumSettings": "google.cloud.osconfig_v1.types.patch_jobs",
+    "ZypperSettings": "google.cloud.osconfig_v1.types.patch_jobs",
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(
+            "module {0!r} has no attribute {1!r}".format(__name__, name)
+        )
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if sys.version_info < (3, 7):  # pragma: NO COVER
+    # Module __getattr__ is not supported; import every name now.
+    for _name in _EXPORTS:
+        __getattr__(_name)
 
 __all__ = (
     "AptSettings",
@@ -15,39 +15,74 @@
 # limitations under the License.
 #
 
-from .services.os_config_service import OsConfigServiceClient
-from .types.patch_deployments import CreatePatchDeploymentRequest
-from .types.patch_deployments import DeletePatchDeploymentRequest
-from .types.patch_deployments import GetPatchDeploymentRequest
-from .types.patch_deployments import ListPatchDeploymentsRequest
-from .types.patch_deployments import ListPatchDeploymentsResponse
-from .types.patch_deployments import MonthlySchedule
-from .types.patch_deployments import OneTimeSchedule
-from .types.patch_deployments import PatchDeployment
-from .types.patch_deployments import RecurringSchedule
-from .types.patch_deployments import WeekDayOfMonth
-from .types.patch_deployments import WeeklySchedule
-from .types.patch_jobs import AptSettings
-from .types.patch_jobs import CancelPatchJobRequest
-from .types.patch_jobs import ExecStep
-from .types.patch_jobs import ExecStepConfig
-from .types.patch_jobs import ExecutePatchJobRequest
-from .types.patch_jobs import GcsObject
-from .types.patch_jobs import GetPatchJobRequest
-from .types.patch_jobs import GooSettings
-from .types.patch_jobs import Instance
-from .types.patch_jobs import ListPatchJobInstanceDetailsRequest
-from .types.patch_jobs import ListPatchJobInstanceDetailsResponse
-from .types.patch_jobs import ListPatchJobsRequest
-from .types.patch_jobs import ListPatchJobsResponse
-from .types.patch_jobs import PatchConfig
-from .types.patch_jobs import PatchInstanceFilter
-from .types.patch_jobs import PatchJob
-from .types.patch_jobs import PatchJobInstanceDetails
-from .types.patch_jobs import WindowsUpdateSettings
-from .types.patch_jobs import YumSettings
-from .types.patch_jobs import ZypperSettings
+import importlib
+import sys
 
+# The module defining each name exported by this package, relative to it.
+# They are imported on first access (PEP 562), so that importing the
+# package does not load the clients, their transports and every type
+# module up front.
+_EXPORTS = {
+    "AptSettings": ".types.patch_jobs",
+    "CancelPatchJobRequest": ".types.patch_jobs",
+    "CreatePatchDeploymentRequest": ".types.patch_deployments",
+    "DeletePatchDeploymentRequest": ".types.patch_deployments",
+    "ExecStep": ".types.patch_jobs",
+    "ExecStepConfig": ".types.patch_jobs",
+    "ExecutePatchJobRequest": ".types.patch_jobs",
+    "GcsObject": ".types.patch_jobs",
+    "GetPatchDeploymentRequest": ".types.patch_deployments",
+    "GetPatchJobRequest": ".types.patch_jobs",
+    "GooSettings": ".types.patch_jobs",
+    "Instance": ".types.patch_jobs",
+    "ListPatchDeploymentsRequest": ".types.patch_deployments",
+    "ListPatchDeploymentsResponse": ".types.patch_deployments",
+    "ListPatchJobInstanceDetailsRequest": ".types.patch_jobs",
+    "ListPatchJobInstanceDetailsResponse": ".types.patch_jobs",
+    "ListPatchJobsRequest": ".types.patch_jobs",
+    "ListPatchJobsResponse": ".types.patch_jobs",
+    "MonthlySchedule": ".types.patch_deployments",
+    "OneTimeSchedule": ".types.patch_deployments",
+    "OsConfigServiceClient": ".services.os_config_service.client",
+    "PatchConfig": ".types.patch_jobs",
+    "PatchDeployment": ".types.patch_deployments",
+    "PatchInstanceFilter": ".types.patch_jobs",
+    "PatchJob": ".types.patch_jobs",
+    "PatchJobInstanceDetails": ".types.patch_jobs",
+    "RecurringSchedule": ".types.patch_deployments",
+    "WeekDayOfMonth": ".types.patch_deployments",
+    "WeeklySchedule": ".types.patch_deployments",
+    "WindowsUpdateSettings": ".types.patch_jobs",
+    "YumSettings": ".types.patch_jobs",
+    "ZypperSettings": ".types.patch_jobs",
+}
+
+
+# Subpackages, which were loaded by the imports of the exported names.
+_SUBPACKAGES = ("services", "types")
+
+
+def __getattr__(name):
+    if name in _SUBPACKAGES:
+        return importlib.import_module("." + name, __name__)
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(
+            "module {0!r} has no attribute {1!r}".format(__name__, name)
+        )
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if sys.version_info < (3, 7):  # pragma: NO COVER
+    # Module __getattr__ is not supported; import every name now.
+    for _name in _EXPORTS:
+        __getattr__(_name)
 
 __all__ = (
     "AptSettings",
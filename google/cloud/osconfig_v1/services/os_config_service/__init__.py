@@ -15,7 +15,36 @@
 # limitations under the License.
 #
 
-from .client import OsConfigServiceClient
-from .async_client import OsConfigServiceAsyncClient
+import importlib
+import sys
+
+# The module defining each client, relative to this package. They are
+# imported on first access (PEP 562), so that the synchronous client can be
+# used without loading the asyncio client and its transport.
+_EXPORTS = {
+    "OsConfigServiceAsyncClient": ".async_client",
+    "OsConfigServiceClient": ".client",
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(
+            "module {0!r} has no attribute {1!r}".format(__name__, name)
+        )
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if sys.version_info < (3, 7):  # pragma: NO COVER
+    # Module __getattr__ is not supported; import every name now.
+    for _name in _EXPORTS:
+        __getattr__(_name)
 
 __all__ = ("OsConfigServiceClient", "OsConfigServiceAsyncClient")
@@ -18,8 +18,16 @@
 from collections import OrderedDict
 import functools
 import re
-from typing import Dict, Sequence, Tuple, Type, Union
-import pkg_resources
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    List,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
 import google.api_core.client_options as ClientOptions  # type: ignore
 from google.api_core import exceptions  # type: ignore
@@ -28,13 +36,25 @@ from google.api_core import retry as retries  # type: ignore
 from google.auth import credentials  # type: ignore
 from google.oauth2 import service_account  # type: ignore
 
+from google.cloud.osconfig_v1.services.os_config_service import bulk
+from google.cloud.osconfig_v1.services.os_config_service.cache import ResourceCache
+from google.cloud.osconfig_v1.services.os_config_service.hedging import HedgingPolicy
+from google.cloud.osconfig_v1.services.os_config_service.instrumentation import (
+    MetricsRegistry,
+)
+from google.cloud.osconfig_v1.services.os_config_service import fanin
 from google.cloud.osconfig_v1.services.os_config_service import pagers
+from google.cloud.osconfig_v1.services.os_config_service.paging import AdaptivePageSize
+from google.cloud.osconfig_v1.services.os_config_service.ratelimit import RateLimiter
+from google.cloud.osconfig_v1.services.os_config_service import watchers
 from google.cloud.osconfig_v1.types import patch_deployments
 from google.cloud.osconfig_v1.types import patch_jobs
 from google.protobuf import duration_pb2 as duration  # type: ignore
 from google.protobuf import timestamp_pb2 as timestamp  # type: ignore
 
 from .transports.base import OsConfigServiceTransport
+from .transports.channel_pool import ChannelPool
+from .transports.circuit_breaker import CircuitBreakers
 from .transports.grpc_asyncio import OsConfigServiceGrpcAsyncIOTransport
 from .client import OsConfigServiceClient
 
@@ -66,6 +86,12 @@ class OsConfigServiceAsyncClient:
         credentials: credentials.Credentials = None,
         transport: Union[str, OsConfigServiceTransport] = "grpc_asyncio",
         client_options: ClientOptions = None,
+        cache: ResourceCache = None,
+        metrics: MetricsRegistry = None,
+        hedging: HedgingPolicy = None,
+        circuit_breakers: CircuitBreakers = None,
+        rate_limiter: RateLimiter = None,
+        channel_pool: ChannelPool = None,
     ) -> None:
         """Instantiate the os config service client.
 
@@ -91,6 +117,33 @@ class OsConfigServiceAsyncClient:
                 (2) The ``client_cert_source`` property is used to provide client
                 SSL credentials for mutual TLS transport. If not provided, the
                 default SSL credentials will be used if present.
+                (3) The ``method_policies`` property, a mapping of method names
+                to :class:`~.policies.MethodPolicy`, overrides the default
+                retry and timeout of those methods, and the ``retry_budget``
+                property sets the :class:`~.policies.RetryBudget` that
+                default retries draw from. These apply to a provided
+                ``transport`` instance too.
+            cache (Optional[~.ResourceCache]): A cache that
+                ``get_patch_deployment`` and ``get_patch_job`` read through.
+                Responses are not cached by default.
+            metrics (Optional[~.MetricsRegistry]): A registry to record
+                the latency, payload sizes, retries, pages and errors of
+                every RPC to. Nothing is recorded by default.
+            hedging (Optional[~.HedgingPolicy]): A policy for hedging
+                slow ``get_patch_job`` and ``get_patch_deployment``
+                requests. Requests are not hedged by default.
+            circuit_breakers (Optional[~.CircuitBreakers]): Breakers that
+                refuse calls to a method with
+                :class:`~.CircuitOpenError` while it keeps failing. Calls
+                are not refused by default.
+            rate_limiter (Optional[~.RateLimiter]): A limiter that spaces
+                out the calls to each method for each project under its
+                quota. Calls are not limited by default.
+            channel_pool (Optional[~.ChannelPool]): A pool, such as
+                :data:`~.DEFAULT_CHANNEL_POOL`, to draw the transport's
+                channel from, so that clients with the same endpoint and
+                credentials share a connection. It won't take effect if a
+                ``transport`` instance is provided.
 
         Raises:
             google.auth.exceptions.MutualTlsChannelError: If mutual TLS transport
@@ -98,7 +151,15 @@ class OsConfigServiceAsyncClient:
         """
 
         self._client = OsConfigServiceClient(
-            credentials=credentials, transport=transport, client_options=client_options
+            credentials=credentials,
+            transport=transport,
+            client_options=client_options,
+            cache=cache,
+            metrics=metrics,
+            hedging=hedging,
+            circuit_breakers=circuit_breakers,
+            rate_limiter=rate_limiter,
+            channel_pool=channel_pool,
         )
 
     async def execute_patch_job(
@@ -106,7 +167,7 @@ class OsConfigServiceAsyncClient:
         request: patch_jobs.ExecutePatchJobRequest = None,
         *,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
-        timeout: float = None,
+        timeout: float = gapic_v1.method.DEFAULT,
         metadata: Sequence[Tuple[str, str]] = (),
     ) -> patch_jobs.PatchJob:
         r"""Patch VM instances by creating and running a patch
@@ -142,12 +203,8 @@ class OsConfigServiceAsyncClient:
         request = patch_jobs.ExecutePatchJobRequest(request)
 
         # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method_async.wrap_method(
-            self._client._transport.execute_patch_job,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # and friendly error handling. The wrapper is cached on the transport.
+        rpc = self._client._transport._wrapped_method("execute_patch_job")
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -167,7 +224,7 @@ class OsConfigServiceAsyncClient:
         *,
         name: str = None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
-        timeout: float = None,
+        timeout: float = gapic_v1.method.DEFAULT,
         metadata: Sequence[Tuple[str, str]] = (),
     ) -> patch_jobs.PatchJob:
         r"""Get the patch job. This can be used to track the
@@ -222,13 +279,15 @@ class OsConfigServiceAsyncClient:
         if name is not None:
             request.name = name
 
+        # Serve the resource from the client-side cache, if there is one.
+        if self._client._cache is not None:
+            cached = self._client._cache.get(request.name)
+            if cached is not None:
+                return cached
+
         # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method_async.wrap_method(
-            self._client._transport.get_patch_job,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # and friendly error handling. The wrapper is cached on the transport.
+        rpc = self._client._transport._wrapped_method("get_patch_job")
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -236,8 +295,24 @@ class OsConfigServiceAsyncClient:
             gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
         )
 
-        # Send the request.
-        response = await rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+        # Send the request, hedged if it is slow and the client hedges.
+        if self._client._hedging is not None:
+            response = await self._client._hedging.call_async(
+                "get_patch_job",
+                rpc,
+                request,
+                metrics=self._client._transport._metrics,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+        else:
+            response = await rpc(
+                request, retry=retry, timeout=timeout, metadata=metadata
+            )
+
+        if self._client._cache is not None:
+            self._client._cache.put(response)
 
         # Done; return the response.
         return response
@@ -247,7 +322,7 @@ class OsConfigServiceAsyncClient:
         request: patch_jobs.CancelPatchJobRequest = None,
         *,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
-        timeout: float = None,
+        timeout: float = gapic_v1.method.DEFAULT,
         metadata: Sequence[Tuple[str, str]] = (),
     ) -> patch_jobs.PatchJob:
         r"""Cancel a patch job. The patch job must be active.
@@ -282,12 +357,8 @@ class OsConfigServiceAsyncClient:
         request = patch_jobs.CancelPatchJobRequest(request)
 
         # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method_async.wrap_method(
-            self._client._transport.cancel_patch_job,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # and friendly error handling. The wrapper is cached on the transport.
+        rpc = self._client._transport._wrapped_method("cancel_patch_job")
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -307,8 +378,10 @@ class OsConfigServiceAsyncClient:
         *,
         parent: str = None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
-        timeout: float = None,
+        timeout: float = gapic_v1.method.DEFAULT,
         metadata: Sequence[Tuple[str, str]] = (),
+        prefetch: int = 0,
+        adaptive_page_size: AdaptivePageSize = None,
     ) -> pagers.ListPatchJobsAsyncPager:
         r"""Get a list of patch jobs.
 
@@ -327,6 +400,13 @@ class OsConfigServiceAsyncClient:
             timeout (float): The timeout for this request.
             metadata (Sequence[Tuple[str, str]]): Strings which should be
                 sent along with the request as metadata.
+            prefetch (int): The number of additional pages the returned
+                pager requests ahead of iteration in a background task.
+                Prefetching is disabled by default.
+            adaptive_page_size (~.AdaptivePageSize): If set, the page
+                size of every request, including this one, is adapted to
+                a latency budget, replacing any ``page_size`` on
+                ``request``.
 
         Returns:
             ~.pagers.ListPatchJobsAsyncPager:
@@ -355,12 +435,8 @@ class OsConfigServiceAsyncClient:
             request.parent = parent
 
         # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method_async.wrap_method(
-            self._client._transport.list_patch_jobs,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # and friendly error handling. The wrapper is cached on the transport.
+        rpc = self._client._transport._wrapped_method("list_patch_jobs")
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -368,13 +444,26 @@ class OsConfigServiceAsyncClient:
             gapic_v1.routing_header.to_grpc_metadata((("parent", request.parent),)),
         )
 
-        # Send the request.
-        response = await rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+        # Send the request, at the adapted page size if there is one.
+        if adaptive_page_size is None:
+            response = await rpc(
+                request, retry=retry, timeout=timeout, metadata=metadata
+            )
+        else:
+            response = await adaptive_page_size.fetch_async(
+                functools.partial(rpc, retry=retry, timeout=timeout, metadata=metadata),
+                request,
+                "patch_jobs",
+            )
 
         # This method is paged; wrap the response in a pager, which provides
         # an `__aiter__` convenience method.
         response = pagers.ListPatchJobsAsyncPager(
-            method=rpc, request=request, response=response
+            method=rpc,
+            request=request,
+            response=response,
+            prefetch=prefetch,
+            adaptive_page_size=adaptive_page_size,
         )
 
         # Done; return the response.
@@ -386,8 +475,11 @@ class OsConfigServiceAsyncClient:
         *,
         parent: str = None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
-        timeout: float = None,
+        timeout: float = gapic_v1.method.DEFAULT,
         metadata: Sequence[Tuple[str, str]] = (),
+        prefetch: int = 0,
+        adaptive_page_size: AdaptivePageSize = None,
+        raw: bool = False,
     ) -> pagers.ListPatchJobInstanceDetailsAsyncPager:
         r"""Get a list of instance details for a given patch job.
 
@@ -407,6 +499,18 @@ class OsConfigServiceAsyncClient:
             timeout (float): The timeout for this request.
             metadata (Sequence[Tuple[str, str]]): Strings which should be
                 sent along with the request as metadata.
+            prefetch (int): The number of additional pages the returned
+                pager requests ahead of iteration in a background task.
+                Prefetching is disabled by default.
+            adaptive_page_size (~.AdaptivePageSize): If set, the page
+                size of every request, including this one, is adapted to
+                a latency budget, replacing any ``page_size`` on
+                ``request``.
+            raw (bool): Keep each page in its wire format as a
+                :class:`~.raw.RawListPatchJobInstanceDetailsResponse`, so
+                instance details are only deserialized when accessed and
+                selected fields can be read with the pager's ``project``
+                method without deserializing them.
 
         Returns:
             ~.pagers.ListPatchJobInstanceDetailsAsyncPager:
@@ -435,11 +539,11 @@ class OsConfigServiceAsyncClient:
             request.parent = parent
 
         # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method_async.wrap_method(
-            self._client._transport.list_patch_job_instance_details,
-            default_timeout=None,
-            client_info=_client_info,
+        # and friendly error handling. The wrapper is cached on the transport.
+        rpc = self._client._transport._wrapped_method(
+            "list_patch_job_instance_details_raw"
+            if raw
+            else "list_patch_job_instance_details"
         )
 
         # Certain fields should be provided within the metadata header;
@@ -448,13 +552,26 @@ class OsConfigServiceAsyncClient:
             gapic_v1.routing_header.to_grpc_metadata((("parent", request.parent),)),
         )
 
-        # Send the request.
-        response = await rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+        # Send the request, at the adapted page size if there is one.
+        if adaptive_page_size is None:
+            response = await rpc(
+                request, retry=retry, timeout=timeout, metadata=metadata
+            )
+        else:
+            response = await adaptive_page_size.fetch_async(
+                functools.partial(rpc, retry=retry, timeout=timeout, metadata=metadata),
+                request,
+                "patch_job_instance_details",
+            )
 
         # This method is paged; wrap the response in a pager, which provides
         # an `__aiter__` convenience method.
         response = pagers.ListPatchJobInstanceDetailsAsyncPager(
-            method=rpc, request=request, response=response
+            method=rpc,
+            request=request,
+            response=response,
+            prefetch=prefetch,
+            adaptive_page_size=adaptive_page_size,
         )
 
         # Done; return the response.
@@ -468,7 +585,7 @@ class OsConfigServiceAsyncClient:
         patch_deployment: patch_deployments.PatchDeployment = None,
         patch_deployment_id: str = None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
-        timeout: float = None,
+        timeout: float = gapic_v1.method.DEFAULT,
         metadata: Sequence[Tuple[str, str]] = (),
     ) -> patch_deployments.PatchDeployment:
         r"""Create an OS Config patch deployment.
@@ -542,12 +659,8 @@ class OsConfigServiceAsyncClient:
             request.patch_deployment_id = patch_deployment_id
 
         # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method_async.wrap_method(
-            self._client._transport.create_patch_deployment,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # and friendly error handling. The wrapper is cached on the transport.
+        rpc = self._client._transport._wrapped_method("create_patch_deployment")
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -555,8 +668,18 @@ class OsConfigServiceAsyncClient:
             gapic_v1.routing_header.to_grpc_metadata((("parent", request.parent),)),
         )
 
-        # Send the request.
-        response = await rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+        # Send the request; the new deployment replaces any cached one.
+        try:
+            response = await rpc(
+                request, retry=retry, timeout=timeout, metadata=metadata
+            )
+        finally:
+            if self._client._cache is not None:
+                self._client._cache.invalidate(
+                    "{0}/patchDeployments/{1}".format(
+                        request.parent, request.patch_deployment_id
+                    )
+                )
 
         # Done; return the response.
         return response
@@ -567,7 +690,7 @@ class OsConfigServiceAsyncClient:
         *,
         name: str = None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
-        timeout: float = None,
+        timeout: float = gapic_v1.method.DEFAULT,
         metadata: Sequence[Tuple[str, str]] = (),
     ) -> patch_deployments.PatchDeployment:
         r"""Get an OS Config patch deployment.
@@ -616,13 +739,15 @@ class OsConfigServiceAsyncClient:
         if name is not None:
             request.name = name
 
+        # Serve the resource from the client-side cache, if there is one.
+        if self._client._cache is not None:
+            cached = self._client._cache.get(request.name)
+            if cached is not None:
+                return cached
+
         # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method_async.wrap_method(
-            self._client._transport.get_patch_deployment,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # and friendly error handling. The wrapper is cached on the transport.
+        rpc = self._client._transport._wrapped_method("get_patch_deployment")
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -630,8 +755,24 @@ class OsConfigServiceAsyncClient:
             gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
         )
 
-        # Send the request.
-        response = await rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+        # Send the request, hedged if it is slow and the client hedges.
+        if self._client._hedging is not None:
+            response = await self._client._hedging.call_async(
+                "get_patch_deployment",
+                rpc,
+                request,
+                metrics=self._client._transport._metrics,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+        else:
+            response = await rpc(
+                request, retry=retry, timeout=timeout, metadata=metadata
+            )
+
+        if self._client._cache is not None:
+            self._client._cache.put(response)
 
         # Done; return the response.
         return response
@@ -642,8 +783,10 @@ class OsConfigServiceAsyncClient:
         *,
         parent: str = None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
-        timeout: float = None,
+        timeout: float = gapic_v1.method.DEFAULT,
         metadata: Sequence[Tuple[str, str]] = (),
+        prefetch: int = 0,
+        adaptive_page_size: AdaptivePageSize = None,
     ) -> pagers.ListPatchDeploymentsAsyncPager:
         r"""Get a page of OS Config patch deployments.
 
@@ -663,6 +806,13 @@ class OsConfigServiceAsyncClient:
             timeout (float): The timeout for this request.
             metadata (Sequence[Tuple[str, str]]): Strings which should be
                 sent along with the request as metadata.
+            prefetch (int): The number of additional pages the returned
+                pager requests ahead of iteration in a background task.
+                Prefetching is disabled by default.
+            adaptive_page_size (~.AdaptivePageSize): If set, the page
+                size of every request, including this one, is adapted to
+                a latency budget, replacing any ``page_size`` on
+                ``request``.
 
         Returns:
             ~.pagers.ListPatchDeploymentsAsyncPager:
@@ -691,12 +841,8 @@ class OsConfigServiceAsyncClient:
             request.parent = parent
 
         # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method_async.wrap_method(
-            self._client._transport.list_patch_deployments,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # and friendly error handling. The wrapper is cached on the transport.
+        rpc = self._client._transport._wrapped_method("list_patch_deployments")
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -704,13 +850,26 @@ class OsConfigServiceAsyncClient:
             gapic_v1.routing_header.to_grpc_metadata((("parent", request.parent),)),
         )
 
-        # Send the request.
-        response = await rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+        # Send the request, at the adapted page size if there is one.
+        if adaptive_page_size is None:
+            response = await rpc(
+                request, retry=retry, timeout=timeout, metadata=metadata
+            )
+        else:
+            response = await adaptive_page_size.fetch_async(
+                functools.partial(rpc, retry=retry, timeout=timeout, metadata=metadata),
+                request,
+                "patch_deployments",
+            )
 
         # This method is paged; wrap the response in a pager, which provides
         # an `__aiter__` convenience method.
         response = pagers.ListPatchDeploymentsAsyncPager(
-            method=rpc, request=request, response=response
+            method=rpc,
+            request=request,
+            response=response,
+            prefetch=prefetch,
+            adaptive_page_size=adaptive_page_size,
         )
 
         # Done; return the response.
@@ -722,7 +881,7 @@ class OsConfigServiceAsyncClient:
         *,
         name: str = None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
-        timeout: float = None,
+        timeout: float = gapic_v1.method.DEFAULT,
         metadata: Sequence[Tuple[str, str]] = (),
     ) -> None:
         r"""Delete an OS Config patch deployment.
@@ -762,12 +921,8 @@ class OsConfigServiceAsyncClient:
             request.name = name
 
         # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method_async.wrap_method(
-            self._client._transport.delete_patch_deployment,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # and friendly error handling. The wrapper is cached on the transport.
+        rpc = self._client._transport._wrapped_method("delete_patch_deployment")
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -775,16 +930,174 @@ class OsConfigServiceAsyncClient:
             gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
         )
 
-        # Send the request.
-        await rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+        # Send the request, and drop the deployment from the cache.
+        try:
+            await rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+        finally:
+            if self._client._cache is not None:
+                self._client._cache.invalidate(request.name)
 
+    def wait_for_patch_job(
+        self,
+        name: str,
+        *,
+        polling: watchers.AdaptivePolling = None,
+        deadline: float = None,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = gapic_v1.method.DEFAULT,
+        metadata: Sequence[Tuple[str, str]] = (),
+    ) -> AsyncIterable[patch_jobs.PatchJob]:
+        r"""Poll a patch job until it reaches a terminal state.
 
-try:
-    _client_info = gapic_v1.client_info.ClientInfo(
-        gapic_version=pkg_resources.get_distribution("google-cloud-os-config").version
-    )
-except pkg_resources.DistributionNotFound:
-    _client_info = gapic_v1.client_info.ClientInfo()
+        The delay between polls adapts to the job's progress: it grows
+        while ``percent_complete`` and the instance details summary are
+        unchanged, and shrinks as the job progresses or nears completion.
+
+        Iterate with ``async for``; every poll awaits
+        :meth:`get_patch_job`.
+
+        Args:
+            name (:class:`str`):
+                Required. Name of the patch in the form
+                ``projects/*/patchJobs/*``
+            polling (:class:`~.watchers.AdaptivePolling`):
+                The policy deciding the delay between polls.
+            deadline (float): The overall time in seconds to wait for the
+                job. If not set, waits indefinitely.
+
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried on each poll.
+            timeout (float): The timeout for each request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with each request as metadata.
+
+        Returns:
+            AsyncIterable[~.patch_jobs.PatchJob]:
+                A snapshot of the job after every poll. The
+                last snapshot is in a terminal state.
+
+        Raises:
+            concurrent.futures.TimeoutError: If the deadline passes before
+                the job reaches a terminal state.
+        """
+        return watchers.wait_for_patch_job_async(
+            self,
+            name,
+            polling=polling,
+            deadline=deadline,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+    async def execute_patch_jobs(
+        self,
+        requests: Sequence[patch_jobs.ExecutePatchJobRequest] = None,
+        *,
+        template: patch_jobs.ExecutePatchJobRequest = None,
+        parents: Sequence[str] = None,
+        max_concurrency: int = 10,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = gapic_v1.method.DEFAULT,
+        metadata: Sequence[Tuple[str, str]] = (),
+    ) -> List[bulk.BulkResult]:
+        r"""Patch VM instances across many parents by running
+        patch jobs concurrently.
+
+        A failed request does not stop the others; its error is
+        returned in its result instead of being raised.
+
+        Args:
+            requests (Sequence[:class:`~.patch_jobs.ExecutePatchJobRequest`]):
+                The request objects, one per patch job.
+            template (:class:`~.patch_jobs.ExecutePatchJobRequest`):
+                A request copied once for each of ``parents``. If
+                ``requests`` is provided, this should not be set.
+            parents (Sequence[str]):
+                The projects to patch in the form ``projects/*``, used
+                with ``template``.
+            max_concurrency (int): The maximum number of requests
+                in flight at once.
+
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for each request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with each request as metadata.
+
+        Returns:
+            List[~.bulk.BulkResult]:
+                One result per request, in request order, holding
+                either the patch job or the error raised.
+
+        """
+        # Sanity check: If we got request objects, we should *not* have
+        # gotten a template to build them from.
+        if requests is not None and (template is not None or parents is not None):
+            raise ValueError(
+                "If the `requests` argument is set, then neither "
+                "`template` nor `parents` should be set."
+            )
+
+        if requests is None:
+            requests = bulk.requests_for_parents(template, parents or ())
+
+        return await bulk.execute_patch_jobs_async(
+            self,
+            requests,
+            max_concurrency=max_concurrency,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+    def merge_patch_job_instance_details(
+        self,
+        parents: Sequence[str],
+        *,
+        max_concurrency: int = 10,
+        max_buffered_pages: int = 10,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = gapic_v1.method.DEFAULT,
+        metadata: Sequence[Tuple[str, str]] = (),
+    ) -> AsyncIterator[fanin.PatchJobInstance]:
+        r"""Get the instance details of many patch jobs at once.
+
+        The jobs are listed concurrently and their instance
+        details merged into one iterator, keeping the order of
+        each job's instances. See
+        :func:`~.fanin.merge_instance_details`.
+
+        Args:
+            parents (Sequence[str]):
+                The patch jobs in the form
+                ``projects/*/patchJobs/*``.
+            max_concurrency (int): The maximum number of page
+                requests in flight at once.
+            max_buffered_pages (int): The maximum number of fetched
+                pages waiting to be consumed.
+
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for each request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with each request as metadata.
+
+        Returns:
+            AsyncIterator[~.fanin.PatchJobInstance]:
+                The details of every instance, with the name of its
+                patch job.
+
+        """
+        return fanin.merge_instance_details(
+            self,
+            parents,
+            max_concurrency=max_concurrency,
+            max_buffered_pages=max_buffered_pages,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
 
 
 __all__ = ("OsConfigServiceAsyncClient",)
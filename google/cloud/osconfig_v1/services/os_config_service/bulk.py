@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+from concurrent import futures
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from google.api_core import gapic_v1  # type: ignore
+from google.api_core import retry as retries  # type: ignore
+
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+class BulkResult(NamedTuple):
+    """The outcome of one request in a bulk operation.
+
+    Attributes:
+        request (~.patch_jobs.ExecutePatchJobRequest): The request sent.
+        patch_job (Optional[~.patch_jobs.PatchJob]): The response, if the
+            request succeeded.
+        error (Optional[Exception]): The error raised, if the request
+            failed.
+    """
+
+    request: patch_jobs.ExecutePatchJobRequest
+    patch_job: Optional[patch_jobs.PatchJob]
+    error: Optional[Exception]
+
+    @property
+    def ok(self) -> bool:
+        """Whether the request succeeded."""
+        return self.error is None
+
+
+def requests_for_parents(
+    template: patch_jobs.ExecutePatchJobRequest, parents: Sequence[str]
+) -> List[patch_jobs.ExecutePatchJobRequest]:
+    """Build one request per parent from a template request.
+
+    Args:
+        template (:class:`~.patch_jobs.ExecutePatchJobRequest`): The
+            request to copy. Its ``parent`` field is ignored.
+        parents (Sequence[str]): The projects to patch, in the form
+            ``projects/*``.
+
+    Returns:
+        List[~.patch_jobs.ExecutePatchJobRequest]: The requests, in the
+            order of ``parents``.
+    """
+    template = patch_jobs.ExecutePatchJobRequest(template)
+    requests = []
+    for parent in parents:
+        request = patch_jobs.ExecutePatchJobRequest(template)
+        request.parent = parent
+        requests.append(request)
+    return requests
+
+
+def execute_patch_jobs(
+    client,
+    requests: Sequence[patch_jobs.ExecutePatchJobRequest],
+    *,
+    max_workers: int = 10,
+    retry: retries.Retry = gapic_v1.method.DEFAULT,
+    timeout: float = gapic_v1.method.DEFAULT,
+    metadata: Sequence[Tuple[str, str]] = (),
+) -> List[BulkResult]:
+    """Execute many patch jobs over a bounded thread pool.
+
+    A failed request does not stop the others; its error is returned in
+    its :class:`BulkResult`.
+
+    Args:
+        client (~.OsConfigServiceClient): The client used to send the
+            requests.
+        requests (Sequence[~.patch_jobs.ExecutePatchJobRequest]): The
+            requests to send.
+        max_workers (int): The maximum number of requests in flight.
+        retry (google.api_core.retry.Retry): Designation of what errors, if
+            any, should be retried.
+        timeout (float): The timeout for each request.
+        metadata (Sequence[Tuple[str, str]]): Strings which should be
+            sent along with each request as metadata.
+
+    Returns:
+        List[~.BulkResult]: One result per request, in the order of
+            ``requests``.
+    """
+    requests = [patch_jobs.ExecutePatchJobRequest(r) for r in requests]
+
+    def execute(request):
+        try:
+            patch_job = client.execute_patch_job(
+                request, retry=retry, timeout=timeout, metadata=metadata
+            )
+        except Exception as exc:
+            return BulkResult(request, None, exc)
+        return BulkResult(request, patch_job, None)
+
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(execute, requests))
+
+
+async def execute_patch_jobs_async(
+    client,
+    requests: Sequence[patch_jobs.ExecutePatchJobRequest],
+    *,
+    max_concurrency: int = 10,
+    retry: retries.Retry = gapic_v1.method.DEFAULT,
+    timeout: float = gapic_v1.method.DEFAULT,
+    metadata: Sequence[Tuple[str, str]] = (),
+) -> List[BulkResult]:
+    """Execute many patch jobs concurrently.
+
+    This is the asynchronous counterpart of :func:`execute_patch_jobs`;
+    ``client`` is an :class:`~.OsConfigServiceAsyncClient` and at most
+    ``max_concurrency`` requests are in flight at once.
+
+    Returns:
+        List[~.BulkResult]: One result per request, in the order of
+            ``requests``.
+    """
+    requests = [patch_jobs.ExecutePatchJobRequest(r) for r in requests]
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def execute(request):
+        async with semaphore:
+            try:
+                patch_job = await client.execute_patch_job(
+                    request, retry=retry, timeout=timeout, metadata=metadata
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                return BulkResult(request, None, exc)
+        return BulkResult(request, patch_job, None)
+
+    return list(await asyncio.gather(*(execute(r) for r in requests)))
+
+
+__all__ = (
+    "BulkResult",
+    "execute_patch_jobs",
+    "execute_patch_jobs_async",
+    "requests_for_parents",
+)
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from collections import OrderedDict
+import threading
+import time
+from typing import Callable, Optional, Tuple, Union
+
+from google.cloud.osconfig_v1.services.os_config_service import watchers
+from google.cloud.osconfig_v1.types import patch_deployments
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+_Resource = Union[patch_deployments.PatchDeployment, patch_jobs.PatchJob]
+
+# A cached resource and the time it expires at, or None if it never does.
+_Entry = Tuple[_Resource, Optional[float]]
+
+
+class ResourceCache:
+    """A client-side read-through cache of patch jobs and deployments.
+
+    Pass an instance as the ``cache`` argument of a client to serve
+    ``get_patch_deployment`` and ``get_patch_job`` from memory. Entries
+    are keyed by resource name and the least recently used entry is
+    evicted once ``maxsize`` entries are held.
+
+    Patch deployments expire ``ttl`` seconds after they were fetched, and
+    are invalidated by ``create_patch_deployment`` and
+    ``delete_patch_deployment`` on the client. Patch jobs are only cached
+    once they reach a terminal state, after which they never change, so
+    they do not expire. Running patch jobs are always fetched from the
+    service; once the cache has seen a job running, lookups of it are
+    counted as :attr:`uncacheable` rather than as misses.
+
+    The cache is thread-safe, and may be shared between clients.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 60.0,
+        *,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Instantiate the cache.
+
+        Args:
+            maxsize (int): The maximum number of entries held.
+            ttl (float): How long in seconds a patch deployment is served
+                from the cache.
+            clock (Callable[[], float]): Returns the current time in
+                seconds; used for testing.
+        """
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # type: OrderedDict[str, _Entry]
+        # The names of the patch jobs last seen running, least recent first.
+        self._running = OrderedDict()  # type: OrderedDict[str, None]
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._uncacheable = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hits(self) -> int:
+        """The number of lookups served from the cache."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """The number of lookups not served from the cache.
+
+        Lookups counted as :attr:`uncacheable` are not included.
+        """
+        return self._misses
+
+    @property
+    def uncacheable(self) -> int:
+        """The number of lookups of patch jobs last seen running."""
+        return self._uncacheable
+
+    @property
+    def hit_ratio(self) -> float:
+        """The fraction of lookups served from the cache, other than
+        :attr:`uncacheable` ones."""
+        lookups = self._hits + self._misses
+        return self._hits / lookups if lookups else 0.0
+
+    def get(self, name: str) -> Optional[_Resource]:
+        """Look up a resource by name.
+
+        Args:
+            name (str): The resource name.
+
+        Returns:
+            Optional[Union[~.patch_deployments.PatchDeployment, ~.patch_jobs.PatchJob]]:
+                A copy of the cached resource, or None if it is not cached
+                or has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[1] is not None:
+                if entry[1] <= self._clock():
+                    del self._entries[name]
+                    entry = None
+            if entry is None:
+                if name in self._running:
+                    self._uncacheable += 1
+                else:
+                    self._misses += 1
+                return None
+            self._entries.move_to_end(name)
+            self._hits += 1
+            resource = entry[0]
+
+        # Hand out copies so callers cannot modify the cached resource.
+        return type(resource)(resource)
+
+    def put(self, resource: _Resource) -> None:
+        """Cache a resource returned by the service, if it is cacheable.
+
+        Args:
+            resource (Union[~.patch_deployments.PatchDeployment, ~.patch_jobs.PatchJob]):
+                The resource to cache under its name.
+        """
+        if isinstance(resource, patch_jobs.PatchJob):
+            if not watchers.is_terminal(resource):
+                with self._lock:
+                    self._running[resource.name] = None
+                    self._running.move_to_end(resource.name)
+                    while len(self._running) > self._maxsize:
+                        self._running.popitem(last=False)
+                return
+            expires = None
+        else:
+            expires = self._clock() + self._ttl
+
+        resource = type(resource)(resource)
+        with self._lock:
+            self._running.pop(resource.name, None)
+            self._entries[resource.name] = (resource, expires)
+            self._entries.move_to_end(resource.name)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, name: str) -> bool:
+        """Drop a resource from the cache.
+
+        Args:
+            name (str): The resource name.
+
+        Returns:
+            bool: Whether the resource was cached.
+        """
+        with self._lock:
+            self._running.pop(name, None)
+            return self._entries.pop(name, None) is not None
+
+    def clear(self) -> None:
+        """Drop every entry and reset the lookup counters."""
+        with self._lock:
+            self._entries.clear()
+            self._running.clear()
+            self._hits = 0
+            self._misses = 0
+            self._uncacheable = 0
+
+
+__all__ = ("ResourceCache",)
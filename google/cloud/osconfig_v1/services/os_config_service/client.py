@@ -16,10 +16,20 @@
 #
 
 from collections import OrderedDict
+import functools
 import os
 import re
-from typing import Callable, Dict, Sequence, Tuple, Type, Union
-import pkg_resources
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    TYPE_CHECKING,
+)
 
 import google.api_core.client_options as ClientOptions  # type: ignore
 from google.api_core import exceptions  # type: ignore
@@ -38,7 +48,28 @@ from google.protobuf import timestamp_pb2 as timestamp  # type: ignore
 
 from .transports.base import OsConfigServiceTransport
 from .transports.grpc import OsConfigServiceGrpcTransport
-from .transports.grpc_asyncio import OsConfigServiceGrpcAsyncIOTransport
+
+# The optional features of the client are imported when they are used, so
+# that importing it does not load all of them.
+if TYPE_CHECKING:  # pragma: NO COVER
+    from google.cloud.osconfig_v1.services.os_config_service import bulk
+    from google.cloud.osconfig_v1.services.os_config_service import watchers
+    from google.cloud.osconfig_v1.services.os_config_service.cache import ResourceCache
+    from google.cloud.osconfig_v1.services.os_config_service.hedging import (
+        HedgingPolicy,
+    )
+    from google.cloud.osconfig_v1.services.os_config_service.instrumentation import (
+        MetricsRegistry,
+    )
+    from google.cloud.osconfig_v1.services.os_config_service.paging import (
+        AdaptivePageSize,
+    )
+    from google.cloud.osconfig_v1.services.os_config_service.ratelimit import (
+        RateLimiter,
+    )
+
+    from .transports.channel_pool import ChannelPool
+    from .transports.circuit_breaker import CircuitBreakers
 
 
 class OsConfigServiceClientMeta(type):
@@ -53,7 +84,6 @@ class OsConfigServiceClientMeta(type):
         OrderedDict()
     )  # type: Dict[str, Type[OsConfigServiceTransport]]
     _transport_registry["grpc"] = OsConfigServiceGrpcTransport
-    _transport_registry["grpc_asyncio"] = OsConfigServiceGrpcAsyncIOTransport
 
     def get_transport_class(cls, label: str = None) -> Type[OsConfigServiceTransport]:
         """Return an appropriate transport class.
@@ -67,6 +97,21 @@ class OsConfigServiceClientMeta(type):
         """
         # If a specific transport is requested, return that one.
         if label:
+            # The asyncio transport imports grpc.aio, and the multi-channel
+            # one is rarely used, so they are only imported, and registered,
+            # once they are asked for.
+            if label == "grpc_asyncio" and label not in cls._transport_registry:
+                from .transports.grpc_asyncio import OsConfigServiceGrpcAsyncIOTransport
+
+                cls._transport_registry[label] = OsConfigServiceGrpcAsyncIOTransport
+            if label == "grpc_multichannel" and label not in cls._transport_registry:
+                from .transports.grpc_multichannel import (
+                    OsConfigServiceGrpcMultiChannelTransport,
+                )
+
+                cls._transport_registry[
+                    label
+                ] = OsConfigServiceGrpcMultiChannelTransport
             return cls._transport_registry[label]
 
         # No transport is requested; return the default (that is, the first one
@@ -157,6 +202,12 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
         credentials: credentials.Credentials = None,
         transport: Union[str, OsConfigServiceTransport] = None,
         client_options: ClientOptions = None,
+        cache: "ResourceCache" = None,
+        metrics: "MetricsRegistry" = None,
+        hedging: "HedgingPolicy" = None,
+        circuit_breakers: "CircuitBreakers" = None,
+        rate_limiter: "RateLimiter" = None,
+        channel_pool: "ChannelPool" = None,
     ) -> None:
         """Instantiate the os config service client.
 
@@ -182,13 +233,50 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
                 (2) The ``client_cert_source`` property is used to provide client
                 SSL credentials for mutual TLS transport. If not provided, the
                 default SSL credentials will be used if present.
+                (3) The ``method_policies`` property, a mapping of method names
+                to :class:`~.policies.MethodPolicy`, overrides the default
+                retry and timeout of those methods, and the ``retry_budget``
+                property sets the :class:`~.policies.RetryBudget` that
+                default retries draw from. These apply to a provided
+                ``transport`` instance too.
+            cache (Optional[~.ResourceCache]): A cache that
+                ``get_patch_deployment`` and ``get_patch_job`` read through.
+                Responses are not cached by default.
+            metrics (Optional[~.MetricsRegistry]): A registry to record
+                the latency, payload sizes, retries, pages and errors of
+                every RPC to. Nothing is recorded by default.
+            hedging (Optional[~.HedgingPolicy]): A policy for hedging
+                slow ``get_patch_job`` and ``get_patch_deployment``
+                requests. Requests are not hedged by default.
+            circuit_breakers (Optional[~.CircuitBreakers]): Breakers that
+                refuse calls to a method with
+                :class:`~.CircuitOpenError` while it keeps failing. Calls
+                are not refused by default.
+            rate_limiter (Optional[~.RateLimiter]): A limiter that spaces
+                out the calls to each method for each project under its
+                quota. Calls are not limited by default.
+            channel_pool (Optional[~.ChannelPool]): A pool, such as
+                :data:`~.DEFAULT_CHANNEL_POOL`, to draw the transport's
+                channel from, so that clients with the same endpoint and
+                credentials share a connection. It won't take effect if a
+                ``transport`` instance is provided.
 
         Raises:
             google.auth.exceptions.MutualTLSChannelError: If mutual TLS transport
                 creation failed for any reason.
         """
         if isinstance(client_options, dict):
+            # The options for method policies are not known to
+            # ClientOptions.from_dict, so they are set separately.
+            client_options = dict(client_options)
+            policy_options = {
+                key: client_options.pop(key)
+                for key in ("method_policies", "retry_budget")
+                if key in client_options
+            }
             client_options = ClientOptions.from_dict(client_options)
+            for key, value in policy_options.items():
+                setattr(client_options, key, value)
         if client_options is None:
             client_options = ClientOptions.ClientOptions()
 
@@ -226,19 +314,42 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
             self._transport = transport
         else:
             Transport = type(self).get_transport_class(transport)
+            transport_kwargs = {}
+            if channel_pool is not None:
+                transport_kwargs["channel_pool"] = channel_pool
             self._transport = Transport(
                 credentials=credentials,
                 host=client_options.api_endpoint,
                 api_mtls_endpoint=client_options.api_endpoint,
                 client_cert_source=client_options.client_cert_source,
+                **transport_kwargs,
             )
 
+        # Apply the default retry and timeout policies, if any were given.
+        method_policies = getattr(client_options, "method_policies", None)
+        retry_budget = getattr(client_options, "retry_budget", None)
+        if method_policies is not None or retry_budget is not None:
+            self._transport.configure_policies(method_policies, retry_budget)
+
+        self._cache = cache
+        self._hedging = hedging
+        if hedging is not None:
+            self._transport.set_hedged_methods(
+                ("get_patch_job", "get_patch_deployment")
+            )
+        if circuit_breakers is not None:
+            self._transport.set_circuit_breakers(circuit_breakers)
+        if rate_limiter is not None:
+            self._transport.set_rate_limiter(rate_limiter)
+        if metrics is not None:
+            self._transport.instrument(metrics)
+
     def execute_patch_job(
         self,
         request: patch_jobs.ExecutePatchJobRequest = None,
         *,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
-        timeout: float = None,
+        timeout: float = gapic_v1.method.DEFAULT,
         metadata: Sequence[Tuple[str, str]] = (),
     ) -> patch_jobs.PatchJob:
         r"""Patch VM instances by creating and running a patch
@@ -274,12 +385,8 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
         request = patch_jobs.ExecutePatchJobRequest(request)
 
         # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.execute_patch_job,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # and friendly error handling. The wrapper is cached on the transport.
+        rpc = self._transport._wrapped_method("execute_patch_job")
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -299,7 +406,7 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
         *,
         name: str = None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
-        timeout: float = None,
+        timeout: float = gapic_v1.method.DEFAULT,
         metadata: Sequence[Tuple[str, str]] = (),
     ) -> patch_jobs.PatchJob:
         r"""Get the patch job. This can be used to track the
@@ -354,13 +461,15 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
         if name is not None:
             request.name = name
 
+        # Serve the resource from the client-side cache, if there is one.
+        if self._cache is not None:
+            cached = self._cache.get(request.name)
+            if cached is not None:
+                return cached
+
         # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.get_patch_job,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # and friendly error handling. The wrapper is cached on the transport.
+        rpc = self._transport._wrapped_method("get_patch_job")
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -368,8 +477,22 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
             gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
         )
 
-        # Send the request.
-        response = rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+        # Send the request, hedged if it is slow and the client hedges.
+        if self._hedging is not None:
+            response = self._hedging.call(
+                "get_patch_job",
+                rpc,
+                request,
+                metrics=self._transport._metrics,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+        else:
+            response = rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+
+        if self._cache is not None:
+            self._cache.put(response)
 
         # Done; return the response.
         return response
@@ -379,7 +502,7 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
         request: patch_jobs.CancelPatchJobRequest = None,
         *,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
-        timeout: float = None,
+        timeout: float = gapic_v1.method.DEFAULT,
         metadata: Sequence[Tuple[str, str]] = (),
     ) -> patch_jobs.PatchJob:
         r"""Cancel a patch job. The patch job must be active.
@@ -414,12 +537,8 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
         request = patch_jobs.CancelPatchJobRequest(request)
 
         # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.cancel_patch_job,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # and friendly error handling. The wrapper is cached on the transport.
+        rpc = self._transport._wrapped_method("cancel_patch_job")
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -439,8 +558,10 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
         *,
         parent: str = None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
-        timeout: float = None,
+        timeout: float = gapic_v1.method.DEFAULT,
         metadata: Sequence[Tuple[str, str]] = (),
+        prefetch: int = 0,
+        adaptive_page_size: "AdaptivePageSize" = None,
     ) -> pagers.ListPatchJobsPager:
         r"""Get a list of patch jobs.
 
@@ -459,6 +580,13 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
             timeout (float): The timeout for this request.
             metadata (Sequence[Tuple[str, str]]): Strings which should be
                 sent along with the request as metadata.
+            prefetch (int): The number of additional pages the returned
+                pager requests ahead of iteration in a background thread.
+                Prefetching is disabled by default.
+            adaptive_page_size (~.AdaptivePageSize): If set, the page
+                size of every request, including this one, is adapted to
+                a latency budget, replacing any ``page_size`` on
+                ``request``.
 
         Returns:
             ~.pagers.ListPatchJobsPager:
@@ -487,12 +615,8 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
             request.parent = parent
 
         # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.list_patch_jobs,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # and friendly error handling. The wrapper is cached on the transport.
+        rpc = self._transport._wrapped_method("list_patch_jobs")
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -500,13 +624,24 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
             gapic_v1.routing_header.to_grpc_metadata((("parent", request.parent),)),
         )
 
-        # Send the request.
-        response = rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+        # Send the request, at the adapted page size if there is one.
+        if adaptive_page_size is None:
+            response = rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+        else:
+            response = adaptive_page_size.fetch(
+                functools.partial(rpc, retry=retry, timeout=timeout, metadata=metadata),
+                request,
+                "patch_jobs",
+            )
 
         # This method is paged; wrap the response in a pager, which provides
         # an `__iter__` convenience method.
         response = pagers.ListPatchJobsPager(
-            method=rpc, request=request, response=response
+            method=rpc,
+            request=request,
+            response=response,
+            prefetch=prefetch,
+            adaptive_page_size=adaptive_page_size,
         )
 
         # Done; return the response.
@@ -518,8 +653,11 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
         *,
         parent: str = None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
-        timeout: float = None,
+        timeout: float = gapic_v1.method.DEFAULT,
         metadata: Sequence[Tuple[str, str]] = (),
+        prefetch: int = 0,
+        adaptive_page_size: "AdaptivePageSize" = None,
+        raw: bool = False,
     ) -> pagers.ListPatchJobInstanceDetailsPager:
         r"""Get a list of instance details for a given patch job.
 
@@ -539,6 +677,18 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
             timeout (float): The timeout for this request.
             metadata (Sequence[Tuple[str, str]]): Strings which should be
                 sent along with the request as metadata.
+            prefetch (int): The number of additional pages the returned
+                pager requests ahead of iteration in a background thread.
+                Prefetching is disabled by default.
+            adaptive_page_size (~.AdaptivePageSize): If set, the page
+                size of every request, including this one, is adapted to
+                a latency budget, replacing any ``page_size`` on
+                ``request``.
+            raw (bool): Keep each page in its wire format as a
+                :class:`~.raw.RawListPatchJobInstanceDetailsResponse`, so
+                instance details are only deserialized when accessed and
+                selected fields can be read with the pager's ``project``
+                method without deserializing them.
 
         Returns:
             ~.pagers.ListPatchJobInstanceDetailsPager:
@@ -567,11 +717,11 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
             request.parent = parent
 
         # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.list_patch_job_instance_details,
-            default_timeout=None,
-            client_info=_client_info,
+        # and friendly error handling. The wrapper is cached on the transport.
+        rpc = self._transport._wrapped_method(
+            "list_patch_job_instance_details_raw"
+            if raw
+            else "list_patch_job_instance_details"
         )
 
         # Certain fields should be provided within the metadata header;
@@ -580,13 +730,24 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
             gapic_v1.routing_header.to_grpc_metadata((("parent", request.parent),)),
         )
 
-        # Send the request.
-        response = rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+        # Send the request, at the adapted page size if there is one.
+        if adaptive_page_size is None:
+            response = rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+        else:
+            response = adaptive_page_size.fetch(
+                functools.partial(rpc, retry=retry, timeout=timeout, metadata=metadata),
+                request,
+                "patch_job_instance_details",
+            )
 
         # This method is paged; wrap the response in a pager, which provides
         # an `__iter__` convenience method.
         response = pagers.ListPatchJobInstanceDetailsPager(
-            method=rpc, request=request, response=response
+            method=rpc,
+            request=request,
+            response=response,
+            prefetch=prefetch,
+            adaptive_page_size=adaptive_page_size,
         )
 
         # Done; return the response.
@@ -600,7 +761,7 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
         patch_deployment: patch_deployments.PatchDeployment = None,
         patch_deployment_id: str = None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
-        timeout: float = None,
+        timeout: float = gapic_v1.method.DEFAULT,
         metadata: Sequence[Tuple[str, str]] = (),
     ) -> patch_deployments.PatchDeployment:
         r"""Create an OS Config patch deployment.
@@ -674,12 +835,8 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
             request.patch_deployment_id = patch_deployment_id
 
         # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.create_patch_deployment,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # and friendly error handling. The wrapper is cached on the transport.
+        rpc = self._transport._wrapped_method("create_patch_deployment")
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -687,8 +844,16 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
             gapic_v1.routing_header.to_grpc_metadata((("parent", request.parent),)),
         )
 
-        # Send the request.
-        response = rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+        # Send the request; the new deployment replaces any cached one.
+        try:
+            response = rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+        finally:
+            if self._cache is not None:
+                self._cache.invalidate(
+                    "{0}/patchDeployments/{1}".format(
+                        request.parent, request.patch_deployment_id
+                    )
+                )
 
         # Done; return the response.
         return response
@@ -699,7 +864,7 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
         *,
         name: str = None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
-        timeout: float = None,
+        timeout: float = gapic_v1.method.DEFAULT,
         metadata: Sequence[Tuple[str, str]] = (),
     ) -> patch_deployments.PatchDeployment:
         r"""Get an OS Config patch deployment.
@@ -748,13 +913,15 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
         if name is not None:
             request.name = name
 
+        # Serve the resource from the client-side cache, if there is one.
+        if self._cache is not None:
+            cached = self._cache.get(request.name)
+            if cached is not None:
+                return cached
+
         # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.get_patch_deployment,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # and friendly error handling. The wrapper is cached on the transport.
+        rpc = self._transport._wrapped_method("get_patch_deployment")
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -762,8 +929,22 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
             gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
         )
 
-        # Send the request.
-        response = rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+        # Send the request, hedged if it is slow and the client hedges.
+        if self._hedging is not None:
+            response = self._hedging.call(
+                "get_patch_deployment",
+                rpc,
+                request,
+                metrics=self._transport._metrics,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+        else:
+            response = rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+
+        if self._cache is not None:
+            self._cache.put(response)
 
         # Done; return the response.
         return response
@@ -774,8 +955,10 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
         *,
         parent: str = None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
-        timeout: float = None,
+        timeout: float = gapic_v1.method.DEFAULT,
         metadata: Sequence[Tuple[str, str]] = (),
+        prefetch: int = 0,
+        adaptive_page_size: "AdaptivePageSize" = None,
     ) -> pagers.ListPatchDeploymentsPager:
         r"""Get a page of OS Config patch deployments.
 
@@ -795,6 +978,13 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
             timeout (float): The timeout for this request.
             metadata (Sequence[Tuple[str, str]]): Strings which should be
                 sent along with the request as metadata.
+            prefetch (int): The number of additional pages the returned
+                pager requests ahead of iteration in a background thread.
+                Prefetching is disabled by default.
+            adaptive_page_size (~.AdaptivePageSize): If set, the page
+                size of every request, including this one, is adapted to
+                a latency budget, replacing any ``page_size`` on
+                ``request``.
 
         Returns:
             ~.pagers.ListPatchDeploymentsPager:
@@ -823,12 +1013,8 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
             request.parent = parent
 
         # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.list_patch_deployments,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # and friendly error handling. The wrapper is cached on the transport.
+        rpc = self._transport._wrapped_method("list_patch_deployments")
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -836,13 +1022,24 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
             gapic_v1.routing_header.to_grpc_metadata((("parent", request.parent),)),
         )
 
-        # Send the request.
-        response = rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+        # Send the request, at the adapted page size if there is one.
+        if adaptive_page_size is None:
+            response = rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+        else:
+            response = adaptive_page_size.fetch(
+                functools.partial(rpc, retry=retry, timeout=timeout, metadata=metadata),
+                request,
+                "patch_deployments",
+            )
 
         # This method is paged; wrap the response in a pager, which provides
         # an `__iter__` convenience method.
         response = pagers.ListPatchDeploymentsPager(
-            method=rpc, request=request, response=response
+            method=rpc,
+            request=request,
+            response=response,
+            prefetch=prefetch,
+            adaptive_page_size=adaptive_page_size,
         )
 
         # Done; return the response.
@@ -854,7 +1051,7 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
         *,
         name: str = None,
         retry: retries.Retry = gapic_v1.method.DEFAULT,
-        timeout: float = None,
+        timeout: float = gapic_v1.method.DEFAULT,
         metadata: Sequence[Tuple[str, str]] = (),
     ) -> None:
         r"""Delete an OS Config patch deployment.
@@ -894,12 +1091,8 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
             request.name = name
 
         # Wrap the RPC method; this adds retry and timeout information,
-        # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.delete_patch_deployment,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        # and friendly error handling. The wrapper is cached on the transport.
+        rpc = self._transport._wrapped_method("delete_patch_deployment")
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -907,16 +1100,127 @@ class OsConfigServiceClient(metaclass=OsConfigServiceClientMeta):
             gapic_v1.routing_header.to_grpc_metadata((("name", request.name),)),
         )
 
-        # Send the request.
-        rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+        # Send the request, and drop the deployment from the cache.
+        try:
+            rpc(request, retry=retry, timeout=timeout, metadata=metadata)
+        finally:
+            if self._cache is not None:
+                self._cache.invalidate(request.name)
 
+    def wait_for_patch_job(
+        self,
+        name: str,
+        *,
+        polling: "watchers.AdaptivePolling" = None,
+        deadline: float = None,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = gapic_v1.method.DEFAULT,
+        metadata: Sequence[Tuple[str, str]] = (),
+    ) -> Iterable[patch_jobs.PatchJob]:
+        r"""Poll a patch job until it reaches a terminal state.
 
-try:
-    _client_info = gapic_v1.client_info.ClientInfo(
-        gapic_version=pkg_resources.get_distribution("google-cloud-os-config").version
-    )
-except pkg_resources.DistributionNotFound:
-    _client_info = gapic_v1.client_info.ClientInfo()
+        The delay between polls adapts to the job's progress: it grows
+        while ``percent_complete`` and the instance details summary are
+        unchanged, and shrinks as the job progresses or nears completion.
+
+        Args:
+            name (:class:`str`):
+                Required. Name of the patch in the form
+                ``projects/*/patchJobs/*``
+            polling (:class:`~.watchers.AdaptivePolling`):
+                The policy deciding the delay between polls.
+            deadline (float): The overall time in seconds to wait for the
+                job. If not set, waits indefinitely.
+
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried on each poll.
+            timeout (float): The timeout for each request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with each request as metadata.
+
+        Returns:
+            Iterable[~.patch_jobs.PatchJob]:
+                A snapshot of the job after every poll. The
+                last snapshot is in a terminal state.
+
+        Raises:
+            concurrent.futures.TimeoutError: If the deadline passes before
+                the job reaches a terminal state.
+        """
+        from google.cloud.osconfig_v1.services.os_config_service import watchers
+
+        return watchers.wait_for_patch_job(
+            self,
+            name,
+            polling=polling,
+            deadline=deadline,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+    def execute_patch_jobs(
+        self,
+        requests: Sequence[patch_jobs.ExecutePatchJobRequest] = None,
+        *,
+        template: patch_jobs.ExecutePatchJobRequest = None,
+        parents: Sequence[str] = None,
+        max_workers: int = 10,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = gapic_v1.method.DEFAULT,
+        metadata: Sequence[Tuple[str, str]] = (),
+    ) -> List["bulk.BulkResult"]:
+        r"""Patch VM instances across many parents by running
+        patch jobs over a bounded thread pool.
+
+        A failed request does not stop the others; its error is
+        returned in its result instead of being raised.
+
+        Args:
+            requests (Sequence[:class:`~.patch_jobs.ExecutePatchJobRequest`]):
+                The request objects, one per patch job.
+            template (:class:`~.patch_jobs.ExecutePatchJobRequest`):
+                A request copied once for each of ``parents``. If
+                ``requests`` is provided, this should not be set.
+            parents (Sequence[str]):
+                The projects to patch in the form ``projects/*``, used
+                with ``template``.
+            max_workers (int): The maximum number of threads sending
+                requests, and so of requests in flight at once.
+
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for each request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with each request as metadata.
+
+        Returns:
+            List[~.bulk.BulkResult]:
+                One result per request, in request order, holding
+                either the patch job or the error raised.
+
+        """
+        from google.cloud.osconfig_v1.services.os_config_service import bulk
+
+        # Sanity check: If we got request objects, we should *not* have
+        # gotten a template to build them from.
+        if requests is not None and (template is not None or parents is not None):
+            raise ValueError(
+                "If the `requests` argument is set, then neither "
+                "`template` nor `parents` should be set."
+            )
+
+        if requests is None:
+            requests = bulk.requests_for_parents(template, parents or ())
+
+        return bulk.execute_patch_jobs(
+            self,
+            requests,
+            max_workers=max_workers,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
 
 
 __all__ = ("OsConfigServiceClient",)
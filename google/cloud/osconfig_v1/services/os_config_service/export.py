@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import csv
+import json
+from typing import IO, Dict, Iterator, List, Tuple
+
+from google.cloud.osconfig_v1.services.os_config_service import pagers
+from google.cloud.osconfig_v1.services.os_config_service import raw
+
+try:
+    import pyarrow  # type: ignore
+    import pyarrow.parquet  # type: ignore
+except ImportError:  # pragma: NO COVER
+    pyarrow = None
+
+
+# The exported fields of each ``PatchJobInstanceDetails``, in order.
+COLUMNS = ("name", "instance_system_id", "state", "failure_reason", "attempt_count")
+
+# A row of exported fields; ``state`` is the integer PatchState value.
+Row = Tuple[str, str, int, str, int]
+
+if pyarrow is not None:
+    # The Arrow schema of exported rows.
+    ARROW_SCHEMA = pyarrow.schema(
+        [
+            ("name", pyarrow.string()),
+            ("instance_system_id", pyarrow.string()),
+            ("state", pyarrow.int32()),
+            ("failure_reason", pyarrow.string()),
+            ("attempt_count", pyarrow.int64()),
+        ]
+    )
+else:  # pragma: NO COVER
+    ARROW_SCHEMA = None
+
+
+def iter_rows(pager: pagers.ListPatchJobInstanceDetailsPager) -> Iterator[Row]:
+    """Iterate over the instance details of a listing as plain tuples.
+
+    Rows are read straight from the underlying protobuf messages of each
+    page without wrapping every instance detail in a proto-plus object,
+    or from the wire format for listings requested with ``raw=True``. Only
+    one page is held in memory at a time.
+
+    Args:
+        pager (~.pagers.ListPatchJobInstanceDetailsPager): The pager
+            returned by ``list_patch_job_instance_details``.
+
+    Yields:
+        Tuple[str, str, int, str, int]: The fields named in
+            :data:`COLUMNS` for each instance.
+    """
+    for page in pager.pages:
+        yield from _page_rows(page)
+
+
+def _page_rows(page) -> List[Row]:
+    return list(raw.project(page, COLUMNS))
+
+
+def iter_column_chunks(
+    pager: pagers.ListPatchJobInstanceDetailsPager, chunk_size: int = 65536
+) -> Iterator[Dict[str, List]]:
+    """Iterate over the instance details of a listing in columnar chunks.
+
+    Each chunk maps every name in :data:`COLUMNS` to a list of at most
+    ``chunk_size`` values, a layout that can be handed directly to
+    ``pyarrow.RecordBatch.from_pydict`` or ``pandas.DataFrame``.
+
+    Args:
+        pager (~.pagers.ListPatchJobInstanceDetailsPager): The pager
+            returned by ``list_patch_job_instance_details``.
+        chunk_size (int): The maximum number of rows in a chunk.
+
+    Yields:
+        Dict[str, List]: The columns of the next chunk of rows.
+    """
+    rows = []  # type: List[Row]
+    for row in iter_rows(pager):
+        rows.append(row)
+        if len(rows) >= chunk_size:
+            yield _columns(rows)
+            rows = []
+    if rows:
+        yield _columns(rows)
+
+
+def _columns(rows: List[Row]) -> Dict[str, List]:
+    return {name: list(values) for name, values in zip(COLUMNS, zip(*rows))}
+
+
+def export_csv(
+    pager: pagers.ListPatchJobInstanceDetailsPager, file: IO[str], header: bool = True
+) -> int:
+    """Write the instance details of a listing to a CSV file.
+
+    Args:
+        pager (~.pagers.ListPatchJobInstanceDetailsPager): The pager
+            returned by ``list_patch_job_instance_details``.
+        file (IO[str]): A text file opened with ``newline=""``.
+        header (bool): Whether to write :data:`COLUMNS` as the first row.
+
+    Returns:
+        int: The number of rows written, excluding the header.
+    """
+    writer = csv.writer(file)
+    if header:
+        writer.writerow(COLUMNS)
+    return _write_pages(pager, writer.writerows)
+
+
+def export_jsonl(pager: pagers.ListPatchJobInstanceDetailsPager, file: IO[str]) -> int:
+    """Write the instance details of a listing as JSON Lines.
+
+    Every line is an object keyed by the names in :data:`COLUMNS`.
+
+    Args:
+        pager (~.pagers.ListPatchJobInstanceDetailsPager): The pager
+            returned by ``list_patch_job_instance_details``.
+        file (IO[str]): A text file.
+
+    Returns:
+        int: The number of lines written.
+    """
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+
+    def write(rows):
+        file.writelines(encode(dict(zip(COLUMNS, row))) + "\n" for row in rows)
+
+    return _write_pages(pager, write)
+
+
+def export_parquet(
+    pager: pagers.ListPatchJobInstanceDetailsPager,
+    where,
+    chunk_size: int = 65536,
+    **kwargs
+) -> int:
+    """Write the instance details of a listing to a Parquet file.
+
+    Every chunk of ``chunk_size`` rows is written as one row group, so
+    memory use is bounded by the chunk size rather than the listing size.
+    This requires the ``pyarrow`` package, which is installed with the
+    ``parquet`` extra.
+
+    Args:
+        pager (~.pagers.ListPatchJobInstanceDetailsPager): The pager
+            returned by ``list_patch_job_instance_details``.
+        where (Union[str, IO[bytes]]): The path or binary file to write to.
+        chunk_size (int): The number of rows in each row group.
+        kwargs (dict): Passed to ``pyarrow.parquet.ParquetWriter``.
+
+    Returns:
+        int: The number of rows written.
+    """
+    if pyarrow is None:
+        raise ImportError(
+            "Exporting to Parquet requires pyarrow; install it with "
+            "`pip install google-cloud-os-config[parquet]`."
+        )
+
+    count = 0
+    with pyarrow.parquet.ParquetWriter(where, ARROW_SCHEMA, **kwargs) as writer:
+        for chunk in iter_column_chunks(pager, chunk_size):
+            writer.write_table(pyarrow.Table.from_pydict(chunk, schema=ARROW_SCHEMA))
+            count += len(chunk["name"])
+    return count
+
+
+def _write_pages(pager, write) -> int:
+    # Write the rows of a listing one page at a time.
+    count = 0
+    for page in pager.pages:
+        rows = _page_rows(page)
+        write(rows)
+        count += len(rows)
+    return count
+
+
+__all__ = (
+    "ARROW_SCHEMA",
+    "COLUMNS",
+    "export_csv",
+    "export_jsonl",
+    "export_parquet",
+    "iter_column_chunks",
+    "iter_rows",
+)
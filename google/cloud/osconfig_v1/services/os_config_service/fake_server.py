@@ -0,0 +1,781 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import collections
+from concurrent import futures
+import random
+import re
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+import grpc  # type: ignore
+
+from google.cloud.osconfig_v1.services.os_config_service.client import (
+    OsConfigServiceClient,
+)
+from google.cloud.osconfig_v1.services.os_config_service import transports
+from google.cloud.osconfig_v1.types import patch_deployments
+from google.cloud.osconfig_v1.types import patch_jobs
+from google.protobuf import empty_pb2 as empty  # type: ignore
+from google.protobuf import timestamp_pb2 as timestamp  # type: ignore
+
+if TYPE_CHECKING:  # pragma: NO COVER
+    from google.cloud.osconfig_v1.services.os_config_service.async_client import (
+        OsConfigServiceAsyncClient,
+    )
+
+_SERVICE = "google.cloud.osconfig.v1.OsConfigService"
+
+_PatchJobState = patch_jobs.PatchJob.State
+_PatchState = patch_jobs.Instance.PatchState
+
+# The summary counter of each state the simulated instances go through.
+_SUMMARY_FIELDS = {
+    _PatchState.NOTIFIED: "notified_instance_count",
+    _PatchState.SUCCEEDED: "succeeded_instance_count",
+    _PatchState.FAILED: "failed_instance_count",
+}
+
+_FILTER_TERM = re.compile(r'\s*(\w+)\s*=\s*"((?:[^"\\]|\\.)*)"\s*$')
+
+
+class FakeInstance(NamedTuple):
+    """A VM instance of the simulated fleet.
+
+    Attributes:
+        name (str): The name of the instance, in the form
+            ``projects/*/zones/*/instances/*``.
+        zone (str): The zone of the instance.
+        system_id (str): The unique identifier of the instance.
+        labels (Mapping[str, str]): The labels of the instance.
+    """
+
+    name: str
+    zone: str
+    system_id: str
+    labels: Mapping[str, str]
+
+
+class _RpcError(Exception):
+    # Raised by the RPC implementations to end a call with an error status.
+
+    def __init__(self, code: grpc.StatusCode, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class _Fault:
+    # An error injected into calls, see FakeOsConfigService.inject_error.
+
+    __slots__ = ("code", "methods", "remaining", "rate", "message")
+
+    def __init__(self, code, methods, count, rate, message):
+        self.code = code
+        self.methods = methods
+        self.remaining = count
+        self.rate = rate
+        self.message = message
+
+
+class _PatchJobRun:
+    # A patch job and the simulated outcome on each of its instances.
+
+    def __init__(self, pb, outcomes, started, duration):
+        self.pb = pb
+        self.outcomes = outcomes  # type: List[Tuple[FakeInstance, int, str]]
+        self.started = started
+        self.duration = duration
+        self.canceled_at = None  # type: Optional[float]
+
+    def progress(self, now: float) -> float:
+        if self.canceled_at is not None:
+            now = self.canceled_at
+        if self.duration <= 0:
+            return 1.0
+        return min(1.0, (now - self.started) / self.duration)
+
+
+def _parse_filter(expression: str, fields: Sequence[str]) -> Dict[str, str]:
+    # Parse a conjunction of ``field="value"`` terms.
+    terms = {}
+    if not expression.strip():
+        return terms
+    for term in expression.split(" AND "):
+        match = _FILTER_TERM.match(term)
+        if match is None or match.group(1) not in fields:
+            raise _RpcError(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                "Unsupported filter: {0!r}".format(expression),
+            )
+        terms[match.group(1)] = re.sub(r"\\(.)", r"\1", match.group(2))
+    return terms
+
+
+def _check_name(name: str, pattern: str) -> None:
+    if re.match(pattern + "$", name) is None:
+        raise _RpcError(
+            grpc.StatusCode.INVALID_ARGUMENT,
+            "Invalid resource name: {0!r}".format(name),
+        )
+
+
+class FakeOsConfigService:
+    """An in-memory implementation of the OS Config service.
+
+    It answers all the RPCs of the service over gRPC, with
+    :class:`FakeOsConfigServer`, for testing and load testing clients
+    without a network:
+
+    .. code-block:: python
+
+        service = FakeOsConfigService(instances_per_project=5000, latency=0.02)
+        with FakeOsConfigServer(service) as server:
+            client = server.client()
+            job = client.execute_patch_job(
+                patch_jobs.ExecutePatchJobRequest(
+                    parent="projects/p", instance_filter={"all": True}
+                )
+            )
+            details = list(client.list_patch_job_instance_details(parent=job.name))
+
+    Every project has a simulated fleet of instances, spread over
+    ``zones``. Patch jobs target the instances matching their filter
+    and progress through them over ``patch_duration`` seconds, failing
+    on a ``failure_rate`` fraction of them, and their ``update_time`` is
+    when their state or progress last changed. Patch jobs are listed
+    newest first, and patch deployments in the order they were created.
+    Listings are paginated and accept filters of the form
+    ``field="value" AND ...`` on the ``state``, ``display_name`` and
+    ``patch_deployment`` of patch jobs and the ``state`` of instance
+    details.
+
+    Calls are answered after ``latency`` seconds, plus up to ``jitter``
+    seconds at random, and may be made to fail with
+    :meth:`inject_error`. The service is thread-safe.
+    """
+
+    def __init__(
+        self,
+        *,
+        instances_per_project: int = 100,
+        zones: Sequence[str] = ("us-central1-a", "us-central1-b", "europe-west1-b"),
+        patch_duration: float = 0.0,
+        failure_rate: float = 0.05,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        method_latency: Mapping[str, float] = None,
+        default_page_size: int = 100,
+        max_page_size: int = 1000,
+        seed: int = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Instantiate the service.
+
+        Args:
+            instances_per_project (int): The size of each project's fleet.
+            zones (Sequence[str]): The zones the fleet is spread over.
+            patch_duration (float): The seconds a patch job takes to go
+                through all its instances.
+            failure_rate (float): The fraction of instances that fail to
+                be patched.
+            latency (float): The seconds every call takes.
+            jitter (float): The most seconds added to the latency of a
+                call, at random.
+            method_latency (Mapping[str, float]): The latency of some
+                methods, by name, e.g. ``"list_patch_job_instance_details"``,
+                replacing ``latency``.
+            default_page_size (int): The page size of listings that do not
+                set one.
+            max_page_size (int): The largest page size, to which larger
+                ones are reduced.
+            seed (int): Seeds the random outcomes, latencies and errors, to
+                make them repeatable.
+            clock (Callable[[], float]): Returns the current time in
+                seconds, to time the progress of patch jobs.
+        """
+        self.instances_per_project = instances_per_project
+        self.zones = tuple(zones)
+        self.patch_duration = patch_duration
+        self.failure_rate = failure_rate
+        self.latency = latency
+        self.jitter = jitter
+        self.method_latency = dict(method_latency or {})
+        self.default_page_size = default_page_size
+        self.max_page_size = max_page_size
+        self.calls = collections.Counter()  # type: collections.Counter
+        self._clock = clock
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._fleets = {}  # type: Dict[str, List[FakeInstance]]
+        self._patch_jobs = collections.OrderedDict()  # type: Dict[str, _PatchJobRun]
+        self._patch_deployments = collections.OrderedDict()  # type: Dict[str, Any]
+        self._faults = []  # type: List[_Fault]
+        self._next_id = 1
+
+    def fleet(self, project: str) -> List[FakeInstance]:
+        """Return the simulated instances of a project.
+
+        Args:
+            project (str): The project, in the form ``projects/*``.
+
+        Returns:
+            List[~.FakeInstance]: The instances.
+        """
+        with self._lock:
+            return list(self._fleet(project))
+
+    def _fleet(self, project: str) -> List[FakeInstance]:
+        fleet = self._fleets.get(project)
+        if fleet is None:
+            fleet = self._fleets[project] = [
+                FakeInstance(
+                    name="{0}/zones/{1}/instances/instance-{2}".format(
+                        project, self.zones[i % len(self.zones)], i
+                    ),
+                    zone=self.zones[i % len(self.zones)],
+                    system_id=str(4000000000000000000 + len(self._fleets) * 100000 + i),
+                    labels={"env": ("prod", "staging", "dev")[i % 3]},
+                )
+                for i in range(self.instances_per_project)
+            ]
+        return fleet
+
+    def inject_error(
+        self,
+        code: grpc.StatusCode,
+        *,
+        methods: Sequence[str] = None,
+        count: int = None,
+        rate: float = 1.0,
+        message: str = None
+    ) -> None:
+        """Make calls fail with an error status.
+
+        Args:
+            code (grpc.StatusCode): The status of the failed calls, e.g.
+                ``grpc.StatusCode.UNAVAILABLE``.
+            methods (Sequence[str]): The names of the methods to fail,
+                e.g. ``"get_patch_job"``; all methods by default.
+            count (int): The number of calls to fail; every call by
+                default.
+            rate (float): The fraction of calls to fail, at random.
+            message (str): The error message.
+        """
+        fault = _Fault(
+            code,
+            None if methods is None else frozenset(methods),
+            count,
+            rate,
+            message or "Injected error.",
+        )
+        with self._lock:
+            self._faults.append(fault)
+
+    def clear_errors(self) -> None:
+        """Stop failing calls with the errors injected so far."""
+        with self._lock:
+            del self._faults[:]
+
+    def _begin(self, method: str) -> float:
+        # Count a call, raise the injected error it fails with, if any, and
+        # return how long it should take.
+        with self._lock:
+            self.calls[method] += 1
+            for fault in self._faults:
+                if fault.methods is not None and method not in fault.methods:
+                    continue
+                if fault.remaining == 0:
+                    continue
+                if fault.rate < 1.0 and self._random.random() >= fault.rate:
+                    continue
+                if fault.remaining is not None:
+                    fault.remaining -= 1
+                raise _RpcError(fault.code, fault.message)
+            latency = self.method_latency.get(method, self.latency)
+            if self.jitter:
+                latency += self._random.uniform(0.0, self.jitter)
+        return latency
+
+    def _page(self, items: list, page_size: int, page_token: str):
+        if page_size < 0:
+            raise _RpcError(grpc.StatusCode.INVALID_ARGUMENT, "Negative page size.")
+        page_size = min(page_size or self.default_page_size, self.max_page_size)
+        try:
+            offset = int(page_token or 0)
+        except ValueError:
+            offset = -1
+        if not 0 <= offset <= len(items):
+            raise _RpcError(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                "Invalid page token: {0!r}".format(page_token),
+            )
+        end = offset + page_size
+        return items[offset:end], str(end) if end < len(items) else ""
+
+    def _patch_job_run(self, name: str) -> _PatchJobRun:
+        _check_name(name, r"projects/[^/]+/patchJobs/[^/]+")
+        run = self._patch_jobs.get(name)
+        if run is None:
+            raise _RpcError(
+                grpc.StatusCode.NOT_FOUND, "Patch job {0} not found.".format(name)
+            )
+        return run
+
+    def _instance_states(self, run: _PatchJobRun, now: float) -> List[int]:
+        # The state of each instance of a job: the first ones reach their
+        # outcome as the job progresses, the others wait to be patched.
+        done = int(run.progress(now) * len(run.outcomes))
+        return [
+            outcome if i < done else _PatchState.NOTIFIED
+            for i, (_, outcome, _) in enumerate(run.outcomes)
+        ]
+
+    def _patch_job(self, run: _PatchJobRun, now: float) -> patch_jobs.PatchJob.pb:
+        states = self._instance_states(run, now)
+        pb = patch_jobs.PatchJob.pb()()
+        pb.CopyFrom(run.pb)
+        summary = collections.Counter(states)
+        for state, field in _SUMMARY_FIELDS.items():
+            setattr(pb.instance_details_summary, field, summary[state])
+        done = len(states) - summary[_PatchState.NOTIFIED]
+        pb.percent_complete = 100.0 * done / len(states) if states else 100.0
+        if run.canceled_at is not None:
+            pb.state = _PatchJobState.CANCELED
+        elif done < len(states):
+            pb.state = _PatchJobState.PATCHING
+        elif summary[_PatchState.FAILED]:
+            pb.state = _PatchJobState.COMPLETED_WITH_ERRORS
+        else:
+            pb.state = _PatchJobState.SUCCEEDED
+        if run.canceled_at is None and done and run.duration > 0:
+            # The job last changed when its latest instance was patched.
+            changed = run.duration * done / len(states)
+            pb.update_time.FromNanoseconds(
+                run.pb.create_time.ToNanoseconds() + int(changed * 1e9)
+            )
+        return pb
+
+    @staticmethod
+    def _targets(
+        fleet: Sequence[FakeInstance],
+        instance_filter: patch_jobs.PatchInstanceFilter.pb,
+    ) -> List[FakeInstance]:
+        if instance_filter.all:
+            return list(fleet)
+        targets = []
+        for instance in fleet:
+            if instance_filter.zones and instance.zone not in instance_filter.zones:
+                continue
+            # Instances may be named in full, by zone and name, or by URL;
+            # comparing the trailing zone and name matches all of them.
+            if instance_filter.instances and not any(
+                instance.name.endswith("/" + "/".join(name.split("/")[-3:]))
+                for name in instance_filter.instances
+            ):
+                continue
+            if instance_filter.instance_name_prefixes and not any(
+                instance.name.split("/")[-1].startswith(prefix)
+                for prefix in instance_filter.instance_name_prefixes
+            ):
+                continue
+            if instance_filter.group_labels and not any(
+                all(instance.labels.get(k) == v for k, v in group.labels.items())
+                for group in instance_filter.group_labels
+            ):
+                continue
+            targets.append(instance)
+        return targets
+
+    def execute_patch_job(self, request):
+        """Start a patch job on the instances matching its filter."""
+        _check_name(request.parent, r"projects/[^/]+")
+        instance_filter = request.instance_filter
+        if not (
+            instance_filter.all
+            or instance_filter.group_labels
+            or instance_filter.zones
+            or instance_filter.instances
+            or instance_filter.instance_name_prefixes
+        ):
+            raise _RpcError(
+                grpc.StatusCode.INVALID_ARGUMENT, "An instance filter is required."
+            )
+        now = self._clock()
+        with self._lock:
+            pb = patch_jobs.PatchJob.pb()(
+                name="{0}/patchJobs/{1}".format(request.parent, self._next_id),
+                display_name=request.display_name,
+                description=request.description,
+                instance_filter=instance_filter,
+                patch_config=request.patch_config,
+                duration=request.duration,
+                dry_run=request.dry_run,
+            )
+            self._next_id += 1
+            pb.create_time.GetCurrentTime()
+            pb.update_time.CopyFrom(pb.create_time)
+            outcomes = []
+            for instance in self._targets(self._fleet(request.parent), instance_filter):
+                if not request.dry_run and self._random.random() < self.failure_rate:
+                    outcomes.append(
+                        (instance, _PatchState.FAILED, "Patch installation failed.")
+                    )
+                else:
+                    outcomes.append((instance, _PatchState.SUCCEEDED, ""))
+            run = _PatchJobRun(pb, outcomes, now, self.patch_duration)
+            self._patch_jobs[pb.name] = run
+            return self._patch_job(run, now)
+
+    def get_patch_job(self, request):
+        """Return a patch job, in its current state."""
+        now = self._clock()
+        with self._lock:
+            return self._patch_job(self._patch_job_run(request.name), now)
+
+    def cancel_patch_job(self, request):
+        """Stop a patch job, leaving the unpatched instances as they are."""
+        now = self._clock()
+        with self._lock:
+            run = self._patch_job_run(request.name)
+            if run.canceled_at is None and run.progress(now) < 1.0:
+                run.canceled_at = now
+                run.pb.update_time.GetCurrentTime()
+            return self._patch_job(run, now)
+
+    def list_patch_jobs(self, request):
+        """Return a page of the patch jobs of a project."""
+        _check_name(request.parent, r"projects/[^/]+")
+        terms = _parse_filter(
+            request.filter, ("state", "display_name", "patch_deployment")
+        )
+        now = self._clock()
+        prefix = request.parent + "/patchJobs/"
+        with self._lock:
+            jobs = [
+                self._patch_job(run, now)
+                for name, run in reversed(self._patch_jobs.items())
+                if name.startswith(prefix)
+            ]
+        if "state" in terms:
+            jobs = [
+                pb for pb in jobs if _PatchJobState(pb.state).name == terms["state"]
+            ]
+        for field in ("display_name", "patch_deployment"):
+            if field in terms:
+                jobs = [pb for pb in jobs if getattr(pb, field) == terms[field]]
+        page, next_page_token = self._page(jobs, request.page_size, request.page_token)
+        return patch_jobs.ListPatchJobsResponse.pb()(
+            patch_jobs=page, next_page_token=next_page_token
+        )
+
+    def list_patch_job_instance_details(self, request):
+        """Return a page of the instance details of a patch job."""
+        terms = _parse_filter(request.filter, ("state",))
+        now = self._clock()
+        with self._lock:
+            run = self._patch_job_run(request.parent)
+            outcomes = list(
+                zip(run.outcomes, self._instance_states(run, now))
+            )  # type: list
+        if "state" in terms:
+            outcomes = [
+                item for item in outcomes if _PatchState(item[1]).name == terms["state"]
+            ]
+        page, next_page_token = self._page(
+            outcomes, request.page_size, request.page_token
+        )
+        details_pb = patch_jobs.PatchJobInstanceDetails.pb()
+        return patch_jobs.ListPatchJobInstanceDetailsResponse.pb()(
+            patch_job_instance_details=[
+                details_pb(
+                    name=instance.name,
+                    instance_system_id=instance.system_id,
+                    state=state,
+                    failure_reason=reason if state == outcome else "",
+                    attempt_count=1 if state == outcome else 0,
+                )
+                for (instance, outcome, reason), state in page
+            ],
+            next_page_token=next_page_token,
+        )
+
+    def create_patch_deployment(self, request):
+        """Store a new patch deployment."""
+        _check_name(request.parent, r"projects/[^/]+")
+        if (
+            re.match(r"[a-z](?:[-a-z0-9]{0,61}[a-z0-9])?$", request.patch_deployment_id)
+            is None
+        ):
+            raise _RpcError(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                "Invalid patch deployment id: {0!r}".format(
+                    request.patch_deployment_id
+                ),
+            )
+        name = "{0}/patchDeployments/{1}".format(
+            request.parent, request.patch_deployment_id
+        )
+        pb = patch_deployments.PatchDeployment.pb()()
+        pb.CopyFrom(request.patch_deployment)
+        pb.name = name
+        pb.create_time.GetCurrentTime()
+        pb.update_time.CopyFrom(pb.create_time)
+        with self._lock:
+            if name in self._patch_deployments:
+                raise _RpcError(
+                    grpc.StatusCode.ALREADY_EXISTS,
+                    "Patch deployment {0} already exists.".format(name),
+                )
+            self._patch_deployments[name] = pb
+        return pb
+
+    def _patch_deployment(self, name: str):
+        _check_name(name, r"projects/[^/]+/patchDeployments/[^/]+")
+        pb = self._patch_deployments.get(name)
+        if pb is None:
+            raise _RpcError(
+                grpc.StatusCode.NOT_FOUND,
+                "Patch deployment {0} not found.".format(name),
+            )
+        return pb
+
+    def get_patch_deployment(self, request):
+        """Return a patch deployment."""
+        with self._lock:
+            return self._patch_deployment(request.name)
+
+    def list_patch_deployments(self, request):
+        """Return a page of the patch deployments of a project."""
+        _check_name(request.parent, r"projects/[^/]+")
+        prefix = request.parent + "/patchDeployments/"
+        with self._lock:
+            deployments = [
+                pb
+                for name, pb in self._patch_deployments.items()
+                if name.startswith(prefix)
+            ]
+        page, next_page_token = self._page(
+            deployments, request.page_size, request.page_token
+        )
+        return patch_deployments.ListPatchDeploymentsResponse.pb()(
+            patch_deployments=page, next_page_token=next_page_token
+        )
+
+    def delete_patch_deployment(self, request):
+        """Delete a patch deployment."""
+        with self._lock:
+            self._patch_deployment(request.name)
+            del self._patch_deployments[request.name]
+        return empty.Empty()
+
+    def _handle(self, name: str, implementation: Callable) -> Callable:
+        # Adapt an implementation to a gRPC method handler behavior.
+
+        def behavior(request, context):
+            try:
+                latency = self._begin(name)
+                if latency > 0:
+                    time.sleep(latency)
+                return implementation(request)
+            except _RpcError as exc:
+                context.abort(exc.code, str(exc))
+
+        return behavior
+
+    def handler(self) -> grpc.GenericRpcHandler:
+        """Return the gRPC handler of the service's methods.
+
+        Returns:
+            grpc.GenericRpcHandler: The handler, to add to a gRPC server.
+        """
+        methods = {}
+        for rpc, name, request_type, response_type in _METHODS:
+            methods[rpc] = grpc.unary_unary_rpc_method_handler(
+                self._handle(name, getattr(self, name)),
+                request_deserializer=request_type.FromString,
+                response_serializer=response_type.SerializeToString,
+            )
+        return grpc.method_handlers_generic_handler(_SERVICE, methods)
+
+
+# The RPCs of the service, with the name of their implementation and their
+# protocol buffer request and response types.
+_METHODS = (
+    (
+        "ExecutePatchJob",
+        "execute_patch_job",
+        patch_jobs.ExecutePatchJobRequest.pb(),
+        patch_jobs.PatchJob.pb(),
+    ),
+    (
+        "GetPatchJob",
+        "get_patch_job",
+        patch_jobs.GetPatchJobRequest.pb(),
+        patch_jobs.PatchJob.pb(),
+    ),
+    (
+        "CancelPatchJob",
+        "cancel_patch_job",
+        patch_jobs.CancelPatchJobRequest.pb(),
+        patch_jobs.PatchJob.pb(),
+    ),
+    (
+        "ListPatchJobs",
+        "list_patch_jobs",
+        patch_jobs.ListPatchJobsRequest.pb(),
+        patch_jobs.ListPatchJobsResponse.pb(),
+    ),
+    (
+        "ListPatchJobInstanceDetails",
+        "list_patch_job_instance_details",
+        patch_jobs.ListPatchJobInstanceDetailsRequest.pb(),
+        patch_jobs.ListPatchJobInstanceDetailsResponse.pb(),
+    ),
+    (
+        "CreatePatchDeployment",
+        "create_patch_deployment",
+        patch_deployments.CreatePatchDeploymentRequest.pb(),
+        patch_deployments.PatchDeployment.pb(),
+    ),
+    (
+        "GetPatchDeployment",
+        "get_patch_deployment",
+        patch_deployments.GetPatchDeploymentRequest.pb(),
+        patch_deployments.PatchDeployment.pb(),
+    ),
+    (
+        "ListPatchDeployments",
+        "list_patch_deployments",
+        patch_deployments.ListPatchDeploymentsRequest.pb(),
+        patch_deployments.ListPatchDeploymentsResponse.pb(),
+    ),
+    (
+        "DeletePatchDeployment",
+        "delete_patch_deployment",
+        patch_deployments.DeletePatchDeploymentRequest.pb(),
+        empty.Empty,
+    ),
+)
+
+
+class FakeOsConfigServer:
+    """Serves a :class:`FakeOsConfigService` on a local port.
+
+    The server runs in background threads of the current process. It is
+    a context manager, started on entry and stopped on exit.
+    """
+
+    def __init__(
+        self,
+        service: FakeOsConfigService = None,
+        *,
+        address: str = "localhost:0",
+        max_workers: int = 32
+    ):
+        """Instantiate the server.
+
+        Args:
+            service (~.FakeOsConfigService): The service to serve; a new
+                one with the default settings by default.
+            address (str): The address to listen on; port 0 picks a free
+                port.
+            max_workers (int): The most calls answered at once.
+        """
+        self.service = service if service is not None else FakeOsConfigService()
+        self._server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+        self._server.add_generic_rpc_handlers((self.service.handler(),))
+        port = self._server.add_insecure_port(address)
+        self.address = "{0}:{1}".format(address.rsplit(":", 1)[0], port)
+
+    def start(self) -> "FakeOsConfigServer":
+        """Start answering calls.
+
+        Returns:
+            ~.FakeOsConfigServer: The server.
+        """
+        self._server.start()
+        return self
+
+    def stop(self, grace: float = None) -> None:
+        """Stop the server, and wait until it has stopped.
+
+        Args:
+            grace (float): The seconds calls in progress have to finish;
+                they are aborted at once by default.
+        """
+        self._server.stop(grace).wait()
+
+    def __enter__(self) -> "FakeOsConfigServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def client(self, **kwargs) -> OsConfigServiceClient:
+        """Return a client of the server.
+
+        Args:
+            kwargs: Further arguments of the client, e.g. ``metrics``.
+
+        Returns:
+            ~.OsConfigServiceClient: The client.
+        """
+        return OsConfigServiceClient(
+            transport=transports.OsConfigServiceGrpcTransport(
+                channel=grpc.insecure_channel(self.address)
+            ),
+            **kwargs
+        )
+
+    def async_client(self, **kwargs) -> "OsConfigServiceAsyncClient":
+        """Return an asynchronous client of the server.
+
+        It must be called from the event loop the client is used on.
+
+        Args:
+            kwargs: Further arguments of the client, e.g. ``metrics``.
+
+        Returns:
+            ~.OsConfigServiceAsyncClient: The client.
+        """
+        from grpc.experimental import aio  # type: ignore
+
+        from google.cloud.osconfig_v1.services.os_config_service.async_client import (
+            OsConfigServiceAsyncClient,
+        )
+
+        return OsConfigServiceAsyncClient(
+            transport=transports.OsConfigServiceGrpcAsyncIOTransport(
+                channel=aio.insecure_channel(self.address)
+            ),
+            **kwargs
+        )
+
+
+__all__ = ("FakeInstance", "FakeOsConfigServer", "FakeOsConfigService")
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+from typing import AsyncIterator, NamedTuple, Sequence, Tuple
+
+from google.api_core import gapic_v1  # type: ignore
+from google.api_core import retry as retries  # type: ignore
+
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+class PatchJobInstance(NamedTuple):
+    """An instance's details, and the patch job they belong to.
+
+    Attributes:
+        patch_job (str): The name of the patch job.
+        details (~.patch_jobs.PatchJobInstanceDetails): The details.
+    """
+
+    patch_job: str
+    details: patch_jobs.PatchJobInstanceDetails
+
+
+# Marks the end of one patch job's pages in the merged queue.
+_DONE = object()
+
+
+async def merge_instance_details(
+    client,
+    parents: Sequence[str],
+    *,
+    max_concurrency: int = 10,
+    max_buffered_pages: int = 10,
+    retry: retries.Retry = gapic_v1.method.DEFAULT,
+    timeout: float = gapic_v1.method.DEFAULT,
+    metadata: Sequence[Tuple[str, str]] = (),
+) -> AsyncIterator[PatchJobInstance]:
+    """Iterate over the instance details of many patch jobs concurrently.
+
+    The instance details of every job are listed concurrently, with at
+    most ``max_concurrency`` page requests in flight across all jobs, and
+    merged into one iterator. The details of each job are yielded in the
+    order the service lists them, but the jobs are interleaved as their
+    pages arrive. Fetched pages wait in a buffer of ``max_buffered_pages``
+    pages; once it is full, no more pages are requested until the
+    consumer catches up.
+
+    If listing any job fails, the other listings are cancelled and the
+    error is raised.
+
+    Args:
+        client (~.OsConfigServiceAsyncClient): The client used to list the
+            instance details.
+        parents (Sequence[str]): The patch jobs, in the form
+            ``projects/*/patchJobs/*``.
+        max_concurrency (int): The maximum number of page requests in
+            flight at once.
+        max_buffered_pages (int): The maximum number of fetched pages
+            waiting to be consumed.
+        retry (google.api_core.retry.Retry): Designation of what errors, if
+            any, should be retried.
+        timeout (float): The timeout for each request.
+        metadata (Sequence[Tuple[str, str]]): Strings which should be
+            sent along with each request as metadata.
+
+    Yields:
+        ~.PatchJobInstance: The details of each instance, with the name of
+            its patch job.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    buffered = asyncio.Queue(maxsize=max_buffered_pages)
+
+    async def list_pages(name):
+        try:
+            async with semaphore:
+                pager = await client.list_patch_job_instance_details(
+                    parent=name, retry=retry, timeout=timeout, metadata=metadata
+                )
+            pages = pager.pages.__aiter__()
+            while True:
+                # Only the page requests count against the concurrency
+                # limit; waiting for room in the buffer does not.
+                async with semaphore:
+                    try:
+                        page = await pages.__anext__()
+                    except StopAsyncIteration:
+                        break
+                await buffered.put((name, page))
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            await buffered.put((name, exc))
+        else:
+            await buffered.put((name, _DONE))
+
+    workers = [asyncio.ensure_future(list_pages(name)) for name in parents]
+    try:
+        remaining = len(workers)
+        while remaining:
+            name, page = await buffered.get()
+            if page is _DONE:
+                remaining -= 1
+            elif isinstance(page, Exception):
+                raise page
+            else:
+                for details in page.patch_job_instance_details:
+                    yield PatchJobInstance(name, details)
+    finally:
+        for worker in workers:
+            worker.cancel()
+
+
+__all__ = ("PatchJobInstance", "merge_instance_details")
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import datetime
+from typing import FrozenSet, Iterable, Iterator, Optional
+
+from google.cloud.osconfig_v1.types import patch_jobs
+from google.protobuf import timestamp_pb2 as timestamp  # type: ignore
+
+
+def timestamp_key(value) -> int:
+    """Return a timestamp as integer nanoseconds since the epoch, for sorting.
+
+    Args:
+        value (Union[datetime.datetime, google.protobuf.timestamp_pb2.Timestamp]):
+            The timestamp. Naive datetimes are taken to be in UTC.
+
+    Returns:
+        int: The nanoseconds since the epoch.
+    """
+    if isinstance(value, datetime.datetime):
+        pb = timestamp.Timestamp()
+        pb.FromDatetime(value)
+        value = pb
+    return value.seconds * 1000000000 + value.nanos
+
+
+def _quote(value: str) -> str:
+    return '"{0}"'.format(value.replace("\\", "\\\\").replace('"', '\\"'))
+
+
+class PatchJobFilter:
+    """Criteria selecting patch jobs from a ``list_patch_jobs`` listing.
+
+    The criteria the service can evaluate are pushed down into
+    ``ListPatchJobsRequest.filter`` by :meth:`server_filter`; the others
+    are evaluated locally by :meth:`matches`. A job matches when it meets
+    every criterion given.
+
+    .. code-block:: python
+
+        criteria = PatchJobFilter(
+            patch_deployment="projects/p/patchDeployments/weekly",
+            states=[PatchJob.State.COMPLETED_WITH_ERRORS, PatchJob.State.TIMED_OUT],
+        )
+        pager = client.list_patch_jobs(criteria.request("projects/p"))
+        unsuccessful = list(criteria.filter(pager))
+    """
+
+    def __init__(
+        self,
+        *,
+        states: Iterable[patch_jobs.PatchJob.State] = None,
+        patch_deployment: str = None,
+        display_name: str = None,
+        created_after: datetime.datetime = None,
+        created_before: datetime.datetime = None
+    ):
+        """Instantiate the filter.
+
+        Args:
+            states (Iterable[~.patch_jobs.PatchJob.State]): The states a
+                job may be in.
+            patch_deployment (str): The name of the patch deployment that
+                created the job, in the form
+                ``projects/*/patchDeployments/*``.
+            display_name (str): The job's display name.
+            created_after (datetime.datetime): The earliest creation time,
+                inclusive.
+            created_before (datetime.datetime): The latest creation time,
+                exclusive.
+        """
+        self.states = (
+            None if states is None else frozenset(int(state) for state in states)
+        )  # type: Optional[FrozenSet[int]]
+        self.patch_deployment = patch_deployment
+        self.display_name = display_name
+        self.created_after = created_after
+        self.created_before = created_before
+
+        self._created_after = (
+            None if created_after is None else timestamp_key(created_after)
+        )
+        self._created_before = (
+            None if created_before is None else timestamp_key(created_before)
+        )
+
+    def __repr__(self) -> str:
+        criteria = [
+            "{0}={1!r}".format(name, value)
+            for name, value in sorted(vars(self).items())
+            if not name.startswith("_") and value is not None
+        ]
+        return "{0}({1})".format(type(self).__name__, ", ".join(criteria))
+
+    def server_filter(self) -> str:
+        """Return the filter expression for the criteria the service supports.
+
+        Returns:
+            str: The expression for ``ListPatchJobsRequest.filter``, or an
+                empty string if no criterion can be pushed down.
+        """
+        terms = []
+        if self.patch_deployment is not None:
+            terms.append("patch_deployment=" + _quote(self.patch_deployment))
+        return " AND ".join(terms)
+
+    @property
+    def needs_local_filtering(self) -> bool:
+        """Whether some criteria are not evaluated by the service.
+
+        Currently the service only filters on ``patch_deployment``.
+        """
+        return any(
+            value is not None
+            for value in (
+                self.states,
+                self.display_name,
+                self.created_after,
+                self.created_before,
+            )
+        )
+
+    def request(
+        self, parent: str, page_size: int = 0
+    ) -> patch_jobs.ListPatchJobsRequest:
+        """Build a request listing the jobs of a project with this filter.
+
+        Args:
+            parent (str): The project, in the form ``projects/*``.
+            page_size (int): The maximum number of jobs in each page.
+
+        Returns:
+            ~.patch_jobs.ListPatchJobsRequest: The request.
+        """
+        return patch_jobs.ListPatchJobsRequest(
+            parent=parent, page_size=page_size, filter=self.server_filter()
+        )
+
+    def matches(self, patch_job: patch_jobs.PatchJob) -> bool:
+        """Return whether a patch job meets every criterion.
+
+        Args:
+            patch_job (~.patch_jobs.PatchJob): The job.
+
+        Returns:
+            bool: Whether the job matches.
+        """
+        pb = patch_jobs.PatchJob.pb(patch_job)
+        if self.states is not None and pb.state not in self.states:
+            return False
+        if (
+            self.patch_deployment is not None
+            and pb.patch_deployment != self.patch_deployment
+        ):
+            return False
+        if self.display_name is not None and pb.display_name != self.display_name:
+            return False
+        if self._created_after is not None or self._created_before is not None:
+            created = timestamp_key(pb.create_time)
+            if self._created_after is not None and created < self._created_after:
+                return False
+            if self._created_before is not None and created >= self._created_before:
+                return False
+        return True
+
+    def filter(
+        self, jobs: Iterable[patch_jobs.PatchJob]
+    ) -> Iterator[patch_jobs.PatchJob]:
+        """Yield the patch jobs that meet every criterion.
+
+        Args:
+            jobs (Iterable[~.patch_jobs.PatchJob]): The jobs, for example a
+                :class:`~.pagers.ListPatchJobsPager`.
+
+        Yields:
+            ~.patch_jobs.PatchJob: The matching jobs, in order.
+        """
+        for patch_job in jobs:
+            if self.matches(patch_job):
+                yield patch_job
+
+
+__all__ = ("PatchJobFilter", "timestamp_key")
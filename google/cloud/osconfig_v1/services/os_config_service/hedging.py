@@ -0,0 +1,405 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import collections
+from concurrent import futures
+import contextvars
+import functools
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, Optional
+
+from google.cloud.osconfig_v1.services.os_config_service import instrumentation
+from google.cloud.osconfig_v1.services.os_config_service.policies import RetryBudget
+
+
+# The request of a hedged call being sent in the current context.
+_hedged_request = contextvars.ContextVar("osconfig_hedged_request", default=None)
+
+
+class _HedgedRequest:
+    # One of the two requests of a synchronous hedged call. Its attempts
+    # are sent as gRPC futures, so that the other request can cancel them.
+
+    def __init__(self, call: "_HedgedCall"):
+        self._call = call
+        self._lock = threading.Lock()
+        self._future = None  # type: Optional[futures.Future]
+        self._cancelled = False
+
+    def send(self, stub: Callable, request: Any, kwargs: Dict[str, Any]) -> Any:
+        with self._lock:
+            if self._cancelled:
+                raise futures.CancelledError()
+            future = self._future = stub.future(request, **kwargs)
+        future.add_done_callback(lambda _: self._call.notify())
+        if self is self._call.primary:
+            self._call.wait(future)
+        return future.result()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            future = self._future
+        if future is not None:
+            future.cancel()
+
+
+class _HedgedCall:
+    # The state shared by the requests of a synchronous hedged call. The
+    # primary request is sent on the caller's thread and starts the hedge
+    # once its delay has passed; the hedge is sent on a pool thread.
+
+    def __init__(
+        self,
+        policy: "HedgingPolicy",
+        name: str,
+        rpc: Callable,
+        request: Any,
+        kwargs: Dict[str, Any],
+        metrics: Optional[instrumentation.MetricsRegistry],
+    ):
+        self._policy = policy
+        self._name = name
+        self._rpc = rpc
+        self._request = request
+        self._kwargs = kwargs
+        self._metrics = metrics
+        self._hedge_at = time.monotonic() + policy.delay(name)
+        self._condition = threading.Condition()
+        self.primary = _HedgedRequest(self)
+        self.hedge = None  # type: Optional[futures.Future]
+        self._hedge_request = None  # type: Optional[_HedgedRequest]
+        self._hedge_denied = False
+
+    def notify(self) -> None:
+        with self._condition:
+            self._condition.notify_all()
+
+    def wait(self, future) -> None:
+        # Wait for an attempt of the primary request, starting the hedge
+        # when it is due, and cancel the attempt if the hedge succeeds.
+        with self._condition:
+            while not future.done():
+                if self.hedge is None and not self._hedge_denied:
+                    remaining = self._hedge_at - time.monotonic()
+                    if remaining > 0:
+                        self._condition.wait(remaining)
+                    elif self._policy._should_hedge(self._name, self._metrics):
+                        self._start_hedge()
+                    else:
+                        self._hedge_denied = True
+                elif (
+                    self.hedge is not None
+                    and self.hedge.done()
+                    and self.hedge.exception() is None
+                ):
+                    self.primary.cancel()
+                    return
+                else:
+                    self._condition.wait()
+
+    def _start_hedge(self) -> None:
+        self._hedge_request = _HedgedRequest(self)
+        self.hedge = self._policy._get_executor().submit(self._send_hedge)
+        self.hedge.add_done_callback(lambda _: self.notify())
+
+    def _send_hedge(self) -> Any:
+        token = _hedged_request.set(self._hedge_request)
+        try:
+            return self._rpc(self._request, **self._kwargs)
+        finally:
+            _hedged_request.reset(token)
+
+    def cancel_hedge(self) -> None:
+        if self.hedge is not None:
+            self.hedge.cancel()
+            self._hedge_request.cancel()
+
+
+def cancellable(stub: Callable) -> Callable:
+    """Wrap a transport stub so that hedged calls can cancel its requests.
+
+    Outside of a synchronous hedged call, the stub is called as usual.
+    Stubs that cannot send requests as gRPC futures are left as they are,
+    and calls through them are not hedged.
+
+    Args:
+        stub (Callable): The RPC stub.
+
+    Returns:
+        Callable: The wrapped stub.
+    """
+    if not hasattr(stub, "future"):
+        return stub
+
+    @functools.wraps(stub)
+    def send(request, **kwargs):
+        hedged = _hedged_request.get()
+        if hedged is None:
+            return stub(request, **kwargs)
+        return hedged.send(stub, request, kwargs)
+
+    return send
+
+
+class HedgingPolicy:
+    """Hedges slow read requests with a second, identical request.
+
+    Pass an instance as the ``hedging`` argument of a client to hedge
+    ``get_patch_job`` and ``get_patch_deployment``. If a request has not
+    completed once the ``percentile`` of the method's recent latencies
+    has passed, the same request is sent again and whichever succeeds
+    first is returned. An error is only raised once both have failed.
+
+    The losing request is cancelled. A synchronous call sends its first
+    request on the caller's thread and the hedge on a pool thread; both
+    are sent as gRPC futures, which is how the transport stubs of hedged
+    methods are wrapped, so that either can be cancelled. Calls through
+    other callables are never hedged.
+
+    Hedges are limited to ``max_hedge_ratio`` of the calls made, so that
+    hedging cannot add more than that fraction to the load of a slow
+    service. The policy is thread-safe, and may be shared between clients.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        *,
+        initial_delay: float = 0.1,
+        min_delay: float = 0.005,
+        window: int = 256,
+        min_samples: int = 20,
+        max_hedge_ratio: float = 0.05,
+        max_workers: int = 16,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Instantiate the policy.
+
+        Args:
+            percentile (float): The percentile of recent latencies after
+                which a request is hedged, between 0 and 100.
+            initial_delay (float): The delay in seconds before hedging
+                until ``min_samples`` latencies have been observed.
+            min_delay (float): The shortest delay in seconds before
+                hedging.
+            window (int): The number of recent latencies kept per method.
+            min_samples (int): The number of latencies needed before the
+                percentile is used.
+            max_hedge_ratio (float): The most hedges allowed per call.
+            max_workers (int): The number of threads sending synchronous
+                hedging requests.
+            clock (Callable[[], float]): Returns the current time in
+                seconds; used for testing.
+        """
+        self._percentile = percentile
+        self._initial_delay = initial_delay
+        self._min_delay = min_delay
+        self._window = window
+        self._min_samples = min_samples
+        self._max_workers = max_workers
+        self._clock = clock
+        self._budget = RetryBudget(
+            max_hedge_ratio, 0.0, capacity=max(1.0, max_hedge_ratio * 100)
+        )
+        self._latencies = {}  # type: Dict[str, Deque[float]]
+        self._executor = None  # type: futures.ThreadPoolExecutor
+        self._calls = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+        self._lock = threading.Lock()
+
+    @property
+    def calls(self) -> int:
+        """The number of calls made through the policy."""
+        return self._calls
+
+    @property
+    def hedges(self) -> int:
+        """The number of hedging requests sent."""
+        return self._hedges
+
+    @property
+    def hedge_wins(self) -> int:
+        """The number of calls answered by the hedging request."""
+        return self._hedge_wins
+
+    @property
+    def hedge_rate(self) -> float:
+        """The fraction of calls that were hedged."""
+        return self._hedges / self._calls if self._calls else 0.0
+
+    def delay(self, name: str) -> float:
+        """Return how long to wait before hedging a call.
+
+        Args:
+            name (str): The name of the method.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies.get(name, ()))
+        if len(latencies) < self._min_samples:
+            return max(self._min_delay, self._initial_delay)
+        index = min(len(latencies) - 1, int(self._percentile / 100 * len(latencies)))
+        return max(self._min_delay, latencies[index])
+
+    def observe(self, name: str, latency: float) -> None:
+        """Record the latency of a request.
+
+        Args:
+            name (str): The name of the method.
+            latency (float): The latency in seconds.
+        """
+        with self._lock:
+            latencies = self._latencies.get(name)
+            if latencies is None:
+                latencies = self._latencies[name] = collections.deque(
+                    maxlen=self._window
+                )
+            latencies.append(latency)
+
+    def close(self) -> None:
+        """Stop the threads sending synchronous hedging requests."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _start(self) -> float:
+        self._budget.deposit()
+        with self._lock:
+            self._calls += 1
+        return self._clock()
+
+    def _should_hedge(
+        self, name: str, metrics: instrumentation.MetricsRegistry
+    ) -> bool:
+        if not self._budget.withdraw():
+            return False
+        with self._lock:
+            self._hedges += 1
+        if metrics is not None:
+            metrics.increment(instrumentation.HEDGES, name)
+        return True
+
+    def _hedge_won(self, name: str, metrics: instrumentation.MetricsRegistry) -> None:
+        with self._lock:
+            self._hedge_wins += 1
+        if metrics is not None:
+            metrics.increment(instrumentation.HEDGE_WINS, name)
+
+    def _get_executor(self) -> futures.ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = futures.ThreadPoolExecutor(
+                    self._max_workers, thread_name_prefix="osconfig-hedge"
+                )
+            return self._executor
+
+    def call(
+        self,
+        name: str,
+        rpc: Callable,
+        request: Any,
+        metrics: instrumentation.MetricsRegistry = None,
+        **kwargs
+    ) -> Any:
+        """Call a synchronous method, hedging the request if it is slow.
+
+        Args:
+            name (str): The name of the method.
+            rpc (Callable): The wrapped RPC method. It is only hedged if
+                its stub was wrapped with :func:`cancellable`.
+            request (Any): The request.
+            metrics (~.MetricsRegistry): A registry to count hedges in.
+            kwargs (dict): Passed to ``rpc``.
+
+        Returns:
+            The response of the first request to succeed.
+        """
+        start = self._start()
+        call = _HedgedCall(self, name, rpc, request, kwargs, metrics)
+        token = _hedged_request.set(call.primary)
+        try:
+            response = rpc(request, **kwargs)
+        except Exception as exc:
+            # The primary request failed, or was cancelled because the
+            # hedge succeeded; only raise once both have failed.
+            if call.hedge is None:
+                raise
+            try:
+                response = call.hedge.result()
+            except Exception:
+                raise exc
+            self._hedge_won(name, metrics)
+            return response
+        finally:
+            _hedged_request.reset(token)
+
+        call.cancel_hedge()
+        self.observe(name, self._clock() - start)
+        return response
+
+    async def call_async(
+        self,
+        name: str,
+        rpc: Callable,
+        request: Any,
+        metrics: instrumentation.MetricsRegistry = None,
+        **kwargs
+    ) -> Any:
+        """Call an asynchronous method, hedging the request if it is slow.
+
+        See :meth:`call`.
+        """
+        start = self._start()
+        primary = asyncio.ensure_future(rpc(request, **kwargs))
+        # A primary request cancelled by the hedge never completed, so its
+        # truncated latency is not observed.
+        primary.add_done_callback(
+            lambda task: task.cancelled() or self.observe(name, self._clock() - start)
+        )
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self.delay(name))
+            if done or not self._should_hedge(name, metrics):
+                return await primary
+
+            hedge = asyncio.ensure_future(rpc(request, **kwargs))
+            pending.add(hedge)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._hedge_won(name, metrics)
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+__all__ = ("HedgingPolicy", "cancellable")
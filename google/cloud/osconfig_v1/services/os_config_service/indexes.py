@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import bisect
+import datetime
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from google.cloud.osconfig_v1.services.os_config_service import pagers
+from google.cloud.osconfig_v1.services.os_config_service.filters import (
+    PatchJobFilter,
+    timestamp_key,
+)
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+class PatchJobIndex:
+    """An in-memory index of patch jobs for repeated local queries.
+
+    Jobs are indexed by state, by patch deployment and by creation time
+    as they are added, either directly with :meth:`update` or while a
+    ``list_patch_jobs`` listing is iterated through :meth:`track`. Adding
+    a job that is already indexed replaces it.
+
+    .. code-block:: python
+
+        index = PatchJobIndex()
+        index.update(client.list_patch_jobs(parent="projects/p"))
+        timed_out = index.by_state(PatchJob.State.TIMED_OUT)
+
+    The index is thread-safe.
+    """
+
+    def __init__(self):
+        self._jobs = {}  # type: Dict[str, patch_jobs.PatchJob]
+        self._by_state = {}  # type: Dict[int, Set[str]]
+        self._by_deployment = {}  # type: Dict[str, Set[str]]
+        # (create time in nanoseconds, name), kept sorted.
+        self._by_create_time = []  # type: List[Tuple[int, str]]
+        self._create_time = {}  # type: Dict[str, int]
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._jobs
+
+    def get(self, name: str) -> Optional[patch_jobs.PatchJob]:
+        """Return the indexed job with the given name, if any."""
+        return self._jobs.get(name)
+
+    def add(self, patch_job: patch_jobs.PatchJob) -> None:
+        """Index a patch job, replacing any job with the same name.
+
+        Args:
+            patch_job (~.patch_jobs.PatchJob): The job.
+        """
+        pb = patch_jobs.PatchJob.pb(patch_job)
+        with self._lock:
+            self.remove(pb.name)
+            self._jobs[pb.name] = patch_job
+            self._by_state.setdefault(pb.state, set()).add(pb.name)
+            self._by_deployment.setdefault(pb.patch_deployment, set()).add(pb.name)
+            created = self._create_time[pb.name] = timestamp_key(pb.create_time)
+            bisect.insort(self._by_create_time, (created, pb.name))
+
+    def remove(self, name: str) -> bool:
+        """Drop a patch job from the index.
+
+        Args:
+            name (str): The name of the job.
+
+        Returns:
+            bool: Whether the job was indexed.
+        """
+        with self._lock:
+            patch_job = self._jobs.pop(name, None)
+            if patch_job is None:
+                return False
+            pb = patch_jobs.PatchJob.pb(patch_job)
+            _discard(self._by_state, pb.state, name)
+            _discard(self._by_deployment, pb.patch_deployment, name)
+            key = (self._create_time.pop(name), name)
+            position = bisect.bisect_left(self._by_create_time, key)
+            del self._by_create_time[position]
+            return True
+
+    def update(self, jobs: Iterable[patch_jobs.PatchJob]) -> int:
+        """Index many patch jobs.
+
+        Args:
+            jobs (Iterable[~.patch_jobs.PatchJob]): The jobs, for example a
+                :class:`~.pagers.ListPatchJobsPager`.
+
+        Returns:
+            int: The number of jobs indexed.
+        """
+        count = 0
+        for count, patch_job in enumerate(jobs, 1):
+            self.add(patch_job)
+        return count
+
+    def track(self, pager: pagers.ListPatchJobsPager) -> Iterator[patch_jobs.PatchJob]:
+        """Iterate over a listing, indexing each page as it arrives.
+
+        Every job of a page is indexed before the first of them is
+        yielded, so queries see whole pages even while the listing is
+        still being iterated.
+
+        Args:
+            pager (~.pagers.ListPatchJobsPager): The pager returned by
+                ``list_patch_jobs``.
+
+        Yields:
+            ~.patch_jobs.PatchJob: The jobs of the listing, in order.
+        """
+        for page in pager.pages:
+            self.update(page.patch_jobs)
+            yield from page.patch_jobs
+
+    def by_state(self, state: patch_jobs.PatchJob.State) -> List[patch_jobs.PatchJob]:
+        """Return the indexed jobs in a state, oldest first."""
+        return self.query(PatchJobFilter(states=[state]))
+
+    def by_patch_deployment(self, patch_deployment: str) -> List[patch_jobs.PatchJob]:
+        """Return the indexed jobs created by a patch deployment, oldest first."""
+        return self.query(PatchJobFilter(patch_deployment=patch_deployment))
+
+    def created_between(
+        self, start: datetime.datetime = None, end: datetime.datetime = None
+    ) -> List[patch_jobs.PatchJob]:
+        """Return the indexed jobs created in ``[start, end)``, oldest first."""
+        return self.query(PatchJobFilter(created_after=start, created_before=end))
+
+    def query(self, criteria: PatchJobFilter) -> List[patch_jobs.PatchJob]:
+        """Return the indexed jobs that meet the criteria.
+
+        The state, patch deployment and creation time indexes narrow down
+        the candidates; any remaining criteria are evaluated on each
+        candidate.
+
+        Args:
+            criteria (~.PatchJobFilter): The criteria.
+
+        Returns:
+            List[~.patch_jobs.PatchJob]: The matching jobs, ordered by
+                creation time, oldest first.
+        """
+        with self._lock:
+            names = None  # type: Optional[Set[str]]
+            if criteria.states is not None:
+                names = set()
+                for state in criteria.states:
+                    names.update(self._by_state.get(state, ()))
+            if criteria.patch_deployment is not None:
+                names = _intersect(
+                    names, self._by_deployment.get(criteria.patch_deployment, set())
+                )
+
+            low = high = None
+            if criteria.created_after is not None:
+                low = timestamp_key(criteria.created_after)
+            if criteria.created_before is not None:
+                high = timestamp_key(criteria.created_before)
+
+            if names is None:
+                # Only the creation time index applies; slice it.
+                start, stop = 0, len(self._by_create_time)
+                if low is not None:
+                    start = bisect.bisect_left(self._by_create_time, (low,))
+                if high is not None:
+                    stop = bisect.bisect_left(self._by_create_time, (high,))
+                entries = self._by_create_time[start:stop]
+            else:
+                entries = sorted(
+                    (self._create_time[name], name)
+                    for name in names
+                    if (low is None or self._create_time[name] >= low)
+                    and (high is None or self._create_time[name] < high)
+                )
+            candidates = [self._jobs[name] for _, name in entries]
+
+        if criteria.display_name is None:
+            return candidates
+        return list(criteria.filter(candidates))
+
+
+def _discard(index: Dict, key, name: str) -> None:
+    names = index.get(key)
+    if names is not None:
+        names.discard(name)
+        if not names:
+            del index[key]
+
+
+def _intersect(names: Optional[Set[str]], other: Set[str]) -> Set[str]:
+    return set(other) if names is None else names & other
+
+
+__all__ = ("PatchJobIndex",)
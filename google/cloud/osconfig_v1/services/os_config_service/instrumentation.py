@@ -0,0 +1,529 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import bisect
+import contextvars
+import functools
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import proto  # type: ignore
+
+from google.cloud.osconfig_v1.services.os_config_service import raw
+
+
+# The names of the metrics recorded for each method.
+LATENCY = "rpc_latency_seconds"
+REQUEST_BYTES = "rpc_request_bytes"
+RESPONSE_BYTES = "rpc_response_bytes"
+RETRIES = "rpc_retries"
+PAGES = "pager_pages"
+ERRORS = "rpc_errors"
+HEDGES = "rpc_hedges"
+HEDGE_WINS = "rpc_hedge_wins"
+CIRCUIT_STATE = "circuit_state"
+CIRCUIT_OPENED = "circuit_opened"
+CIRCUIT_REJECTED = "circuit_rejected_calls"
+RATE_LIMIT_WAIT = "rate_limit_wait_seconds"
+
+
+def _exponential_bounds(start: float, factor: float, count: int) -> Tuple[float, ...]:
+    return tuple(start * factor ** i for i in range(count))
+
+
+# The upper bounds of the histogram buckets of each metric; other
+# metrics use powers of two.
+DEFAULT_BOUNDS = {
+    LATENCY: _exponential_bounds(0.001, 2.0, 17),
+    REQUEST_BYTES: _exponential_bounds(64, 4.0, 11),
+    RESPONSE_BYTES: _exponential_bounds(64, 4.0, 11),
+    RETRIES: (0, 1, 2, 3, 5, 8, 13),
+    PAGES: _exponential_bounds(1, 2.0, 15),
+}  # type: Dict[str, Tuple[float, ...]]
+
+_POWERS_OF_TWO = _exponential_bounds(1, 2.0, 31)
+
+
+class Histogram:
+    """A histogram of observed values over fixed buckets."""
+
+    __slots__ = ("bounds", "bucket_counts", "count", "sum", "min", "max")
+
+    def __init__(self, bounds: Sequence[float]):
+        """Instantiate the histogram.
+
+        Args:
+            bounds (Sequence[float]): The inclusive upper bound of each
+                bucket, in increasing order; values above the last bound
+                fall in an overflow bucket.
+        """
+        self.bounds = tuple(bounds)
+        self.bucket_counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None  # type: Optional[float]
+        self.max = None  # type: Optional[float]
+
+    def observe(self, value: float) -> None:
+        """Record a value."""
+        self.bucket_counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> Optional[float]:
+        """The mean of the values, or None if there are none."""
+        return self.sum / self.count if self.count else None
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Estimate a percentile of the values.
+
+        The estimate interpolates linearly within the bucket holding the
+        percentile, and is clamped to the observed minimum and maximum.
+
+        Args:
+            q (float): The percentile, between 0 and 100.
+
+        Returns:
+            Optional[float]: The estimate, or None if there are no values.
+        """
+        if not self.count:
+            return None
+        rank = q / 100.0 * self.count
+        seen = 0
+        for index, count in enumerate(self.bucket_counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[index - 1] if index else self.min
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / count
+                return min(max(estimate, self.min), self.max)
+            seen += count
+        return self.max
+
+    def copy(self) -> "Histogram":
+        """Return a copy of the histogram."""
+        other = Histogram(self.bounds)
+        other.bucket_counts = list(self.bucket_counts)
+        other.count = self.count
+        other.sum = self.sum
+        other.min = self.min
+        other.max = self.max
+        return other
+
+    def __repr__(self) -> str:
+        return "Histogram<count={0}, mean={1!r}, max={2!r}>".format(
+            self.count, self.mean, self.max
+        )
+
+
+class MetricsRegistry:
+    """An in-process registry of per-method client metrics.
+
+    Pass an instance as the ``metrics`` argument of a client to record,
+    for every RPC method, histograms of latency, request and response
+    bytes and retried attempts, a histogram of the pages each pager
+    iterated over, and counters of errors. Other client features add
+    their own counters and gauges, such as the state of circuit breakers.
+    Clients without a registry record nothing and pay nothing for it.
+
+    Every value recorded is also forwarded to the registry's exporters,
+    such as :class:`PrometheusExporter` and :class:`OpenTelemetryExporter`.
+    The registry is thread-safe, and may be shared between clients.
+    """
+
+    def __init__(self, exporters: Sequence[Any] = ()):
+        """Instantiate the registry.
+
+        Args:
+            exporters (Sequence[Any]): Objects with ``record(metric,
+                method, value)``, ``increment(metric, method, amount)``
+                and ``set_gauge(metric, method, value)`` methods, which
+                are called for every value recorded.
+        """
+        self._exporters = list(exporters)
+        self._histograms = {}  # type: Dict[Tuple[str, str], Histogram]
+        self._counters = {}  # type: Dict[Tuple[str, str], int]
+        self._gauges = {}  # type: Dict[Tuple[str, str], float]
+        self._lock = threading.Lock()
+
+    def add_exporter(self, exporter: Any) -> None:
+        """Forward the values recorded from now on to ``exporter``."""
+        self._exporters.append(exporter)
+
+    def record(self, metric: str, method: str, value: float) -> None:
+        """Add a value to the histogram of a method's metric.
+
+        Args:
+            metric (str): The name of the metric, e.g. :data:`LATENCY`.
+            method (str): The name of the method, e.g. ``"get_patch_job"``.
+            value (float): The value.
+        """
+        key = (metric, method)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(
+                    DEFAULT_BOUNDS.get(metric, _POWERS_OF_TWO)
+                )
+            histogram.observe(value)
+        for exporter in self._exporters:
+            exporter.record(metric, method, value)
+
+    def increment(self, metric: str, method: str, amount: int = 1) -> None:
+        """Add to the counter of a method's metric.
+
+        Args:
+            metric (str): The name of the metric, e.g. :data:`ERRORS`.
+            method (str): The name of the method.
+            amount (int): The amount to add.
+        """
+        key = (metric, method)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+        for exporter in self._exporters:
+            exporter.increment(metric, method, amount)
+
+    def set_gauge(self, metric: str, method: str, value: float) -> None:
+        """Set the gauge of a method's metric.
+
+        Args:
+            metric (str): The name of the metric, e.g. :data:`CIRCUIT_STATE`.
+            method (str): The name of the method.
+            value (float): The value.
+        """
+        with self._lock:
+            self._gauges[(metric, method)] = value
+        for exporter in self._exporters:
+            exporter.set_gauge(metric, method, value)
+
+    def histogram(self, metric: str, method: str) -> Optional[Histogram]:
+        """Return a copy of the histogram of a method's metric.
+
+        Returns:
+            Optional[~.Histogram]: The histogram, or None if no value was
+                recorded.
+        """
+        with self._lock:
+            histogram = self._histograms.get((metric, method))
+            return histogram.copy() if histogram is not None else None
+
+    def counter(self, metric: str, method: str) -> int:
+        """Return the counter of a method's metric."""
+        with self._lock:
+            return self._counters.get((metric, method), 0)
+
+    def gauge(self, metric: str, method: str) -> Optional[float]:
+        """Return the gauge of a method's metric, or None if it is unset."""
+        with self._lock:
+            return self._gauges.get((metric, method))
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return copies of all the metrics recorded.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: For each metric name, a mapping of
+                method names to their :class:`Histogram`, or counter or
+                gauge value.
+        """
+        snapshot = {}  # type: Dict[str, Dict[str, Any]]
+        with self._lock:
+            for (metric, method), histogram in self._histograms.items():
+                snapshot.setdefault(metric, {})[method] = histogram.copy()
+            for (metric, method), value in self._counters.items():
+                snapshot.setdefault(metric, {})[method] = value
+            for (metric, method), value in self._gauges.items():
+                snapshot.setdefault(metric, {})[method] = value
+        return snapshot
+
+    def reset(self) -> None:
+        """Discard all the metrics recorded."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+
+class PrometheusExporter:
+    """Exports client metrics to Prometheus.
+
+    Each metric becomes a Prometheus histogram, counter or gauge labelled
+    by method. This requires the ``prometheus-client`` package, which is
+    installed with the ``prometheus`` extra.
+    """
+
+    def __init__(self, registry: Any = None, namespace: str = "osconfig"):
+        """Instantiate the exporter.
+
+        Args:
+            registry (prometheus_client.CollectorRegistry): The registry to
+                register the metrics with; defaults to the global one.
+            namespace (str): The prefix of the metric names.
+        """
+        try:
+            import prometheus_client  # type: ignore
+        except ImportError as exc:
+            raise ImportError(
+                "Exporting to Prometheus requires prometheus-client; install "
+                "it with `pip install google-cloud-os-config[prometheus]`."
+            ) from exc
+        self._prometheus_client = prometheus_client
+        self._registry = registry or prometheus_client.REGISTRY
+        self._namespace = namespace
+        self._metrics = {}  # type: Dict[str, Any]
+        self._lock = threading.Lock()
+
+    def _metric(self, kind: Any, name: str, **kwargs) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = kind(
+                    name,
+                    "OsConfigService client {0}.".format(name.replace("_", " ")),
+                    ("method",),
+                    namespace=self._namespace,
+                    registry=self._registry,
+                    **kwargs
+                )
+            return metric
+
+    def record(self, metric: str, method: str, value: float) -> None:
+        buckets = DEFAULT_BOUNDS.get(metric, _POWERS_OF_TWO) + (float("inf"),)
+        histogram = self._metric(
+            self._prometheus_client.Histogram, metric, buckets=buckets
+        )
+        histogram.labels(method).observe(value)
+
+    def increment(self, metric: str, method: str, amount: int = 1) -> None:
+        counter = self._metric(self._prometheus_client.Counter, metric)
+        counter.labels(method).inc(amount)
+
+    def set_gauge(self, metric: str, method: str, value: float) -> None:
+        gauge = self._metric(self._prometheus_client.Gauge, metric)
+        gauge.labels(method).set(value)
+
+
+class OpenTelemetryExporter:
+    """Exports client metrics to OpenTelemetry.
+
+    Each metric becomes an OpenTelemetry histogram or counter with a
+    ``method`` attribute; gauges become up-down counters. This requires
+    the ``opentelemetry-api`` package, which is installed with the
+    ``opentelemetry`` extra.
+    """
+
+    def __init__(self, meter: Any = None):
+        """Instantiate the exporter.
+
+        Args:
+            meter (opentelemetry.metrics.Meter): The meter to create the
+                instruments with; defaults to one from the global meter
+                provider.
+        """
+        try:
+            from opentelemetry import metrics as otel_metrics  # type: ignore
+        except ImportError as exc:
+            raise ImportError(
+                "Exporting to OpenTelemetry requires opentelemetry-api; install "
+                "it with `pip install google-cloud-os-config[opentelemetry]`."
+            ) from exc
+        self._meter = meter or otel_metrics.get_meter(__name__)
+        self._instruments = {}  # type: Dict[str, Any]
+        self._gauges = {}  # type: Dict[Tuple[str, str], float]
+        self._lock = threading.Lock()
+
+    def _instrument(self, create: Callable[..., Any], name: str) -> Any:
+        with self._lock:
+            instrument = self._instruments.get(name)
+            if instrument is None:
+                instrument = self._instruments[name] = create("osconfig." + name)
+            return instrument
+
+    def record(self, metric: str, method: str, value: float) -> None:
+        histogram = self._instrument(self._meter.create_histogram, metric)
+        histogram.record(value, {"method": method})
+
+    def increment(self, metric: str, method: str, amount: int = 1) -> None:
+        counter = self._instrument(self._meter.create_counter, metric)
+        counter.add(amount, {"method": method})
+
+    def set_gauge(self, metric: str, method: str, value: float) -> None:
+        counter = self._instrument(self._meter.create_up_down_counter, metric)
+        with self._lock:
+            delta = value - self._gauges.get((metric, method), 0.0)
+            self._gauges[(metric, method)] = value
+        counter.add(delta, {"method": method})
+
+
+def message_bytes(message: Any) -> int:
+    """Return the serialized size of a request or response message."""
+    if isinstance(message, proto.Message):
+        return type(message).pb(message).ByteSize()
+    if isinstance(message, raw.RawListPatchJobInstanceDetailsResponse):
+        return len(message.serialize())
+    byte_size = getattr(message, "ByteSize", None)
+    return byte_size() if byte_size is not None else 0
+
+
+# The attempts made by the instrumented call in progress, counted by the
+# innermost callable of a wrapped method, beneath any retries.
+_attempts = contextvars.ContextVar("osconfig_rpc_attempts", default=None)
+
+
+def _count_attempt() -> None:
+    attempts = _attempts.get()
+    if attempts is not None:
+        attempts[0] += 1
+
+
+@functools.lru_cache(maxsize=None)
+def _counting_stub_type(base: type) -> type:
+    # The asynchronous wrappers of google.api_core check the type of the
+    # stubs they wrap, so AsyncIO stubs are counted by a stand-in of the
+    # same type. It is defined on first use, to import grpc.aio only if
+    # AsyncIO stubs are used.
+
+    class _CountingUnaryUnaryMultiCallable(base):
+        def __init__(self, stub):
+            self._stub = stub
+
+        def __call__(self, *args, **kwargs):
+            _count_attempt()
+            return self._stub(*args, **kwargs)
+
+    return _CountingUnaryUnaryMultiCallable
+
+
+def count_attempts(stub: Callable) -> Callable:
+    """Wrap a transport stub to count the attempts of instrumented calls.
+
+    Args:
+        stub (Callable): The RPC stub.
+
+    Returns:
+        Callable: The stub, counting each call.
+    """
+    # AsyncIO stubs only exist once grpc.aio has been imported.
+    aio = sys.modules.get("grpc.aio")
+    if aio is not None and isinstance(stub, aio.UnaryUnaryMultiCallable):
+        return _counting_stub_type(aio.UnaryUnaryMultiCallable)(stub)
+
+    @functools.wraps(stub)
+    def attempt(*args, **kwargs):
+        _count_attempt()
+        return stub(*args, **kwargs)
+
+    return attempt
+
+
+class _InstrumentedMethod:
+    # Records metrics around a wrapped method. Pagers report the number of
+    # pages they iterated over through `observe_pages`.
+
+    def __init__(self, rpc: Callable, name: str, metrics: MetricsRegistry):
+        self._rpc = rpc
+        self._name = name
+        self._metrics = metrics
+
+    def observe_pages(self, count: int) -> None:
+        self._metrics.record(PAGES, self._name, count)
+
+    def _start(self, request) -> Tuple[contextvars.Token, List[int], float]:
+        self._metrics.record(REQUEST_BYTES, self._name, message_bytes(request))
+        attempts = [0]
+        return _attempts.set(attempts), attempts, time.perf_counter()
+
+    def _finish(self, token, attempts: List[int], start: float, response) -> None:
+        self._metrics.record(LATENCY, self._name, time.perf_counter() - start)
+        _attempts.reset(token)
+        self._metrics.record(RETRIES, self._name, max(attempts[0] - 1, 0))
+        if response is None:
+            self._metrics.increment(ERRORS, self._name)
+        else:
+            self._metrics.record(RESPONSE_BYTES, self._name, message_bytes(response))
+
+    def __call__(self, request, *args, **kwargs):
+        token, attempts, start = self._start(request)
+        response = None
+        try:
+            response = self._rpc(request, *args, **kwargs)
+            return response
+        finally:
+            self._finish(token, attempts, start, response)
+
+
+class _InstrumentedAsyncMethod(_InstrumentedMethod):
+    async def __call__(self, request, *args, **kwargs):
+        token, attempts, start = self._start(request)
+        response = None
+        try:
+            response = await self._rpc(request, *args, **kwargs)
+            return response
+        finally:
+            self._finish(token, attempts, start, response)
+
+
+def instrument(rpc: Callable, name: str, metrics: MetricsRegistry) -> Callable:
+    """Record metrics for every call of a wrapped method.
+
+    Args:
+        rpc (Callable): The wrapped method.
+        name (str): The name of the method.
+        metrics (~.MetricsRegistry): The registry to record to.
+
+    Returns:
+        Callable: The instrumented method.
+    """
+    return _InstrumentedMethod(rpc, name, metrics)
+
+
+def instrument_async(rpc: Callable, name: str, metrics: MetricsRegistry) -> Callable:
+    """Record metrics for every call of an asynchronous wrapped method.
+
+    See :func:`instrument`.
+    """
+    return _InstrumentedAsyncMethod(rpc, name, metrics)
+
+
+__all__ = (
+    "CIRCUIT_OPENED",
+    "CIRCUIT_REJECTED",
+    "CIRCUIT_STATE",
+    "DEFAULT_BOUNDS",
+    "ERRORS",
+    "HEDGES",
+    "HEDGE_WINS",
+    "Histogram",
+    "LATENCY",
+    "MetricsRegistry",
+    "OpenTelemetryExporter",
+    "PAGES",
+    "PrometheusExporter",
+    "RATE_LIMIT_WAIT",
+    "REQUEST_BYTES",
+    "RESPONSE_BYTES",
+    "RETRIES",
+    "count_attempts",
+    "instrument",
+    "instrument_async",
+    "message_bytes",
+)
@@ -15,13 +15,207 @@
 # limitations under the License.
 #
 
-from typing import Any, AsyncIterable, Awaitable, Callable, Iterable
+import asyncio
+import queue
+import threading
+from typing import (
+    Any,
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Sequence,
+    Tuple,
+    TYPE_CHECKING,
+)
 
 from google.cloud.osconfig_v1.types import patch_deployments
 from google.cloud.osconfig_v1.types import patch_jobs
 
+# Projections and records of instance details are imported when they are
+# used, so that importing the pagers does not load them.
+if TYPE_CHECKING:  # pragma: NO COVER
+    from google.cloud.osconfig_v1.services.os_config_service.paging import (
+        AdaptivePageSize,
+    )
+    from google.cloud.osconfig_v1.services.os_config_service.records import (
+        InstanceDetailsRecord,
+    )
 
-class ListPatchJobsPager:
+
+# Marks the end of the pages produced by a prefetching worker.
+_END_OF_PAGES = object()
+
+
+class _BasePager:
+    """Page iteration shared by the synchronous pagers.
+
+    Subclasses set ``_method``, ``_request``, ``_response``, ``_prefetch``
+    and ``_adaptive_page_size`` in their constructors, and name the
+    repeated field of the response in ``_items_field``.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._response, name)
+
+    def _fetch(self, page_token: str) -> Any:
+        self._request.page_token = page_token
+        if self._adaptive_page_size is None:
+            return self._method(self._request)
+        return self._adaptive_page_size.fetch(
+            self._method, self._request, self._items_field
+        )
+
+    @property
+    def pages(self) -> Iterable[Any]:
+        pages = self._prefetched_pages() if self._prefetch > 0 else self._pages()
+
+        # Instrumented methods record how many pages each listing took.
+        observe_pages = getattr(self._method, "observe_pages", None)
+        if observe_pages is None:
+            yield from pages
+            return
+
+        count = 0
+        for page in pages:
+            count += 1
+            yield page
+        observe_pages(count)
+
+    def _pages(self) -> Iterable[Any]:
+        yield self._response
+        while self._response.next_page_token:
+            self._response = self._fetch(self._response.next_page_token)
+            yield self._response
+
+    def _prefetched_pages(self) -> Iterable[Any]:
+        # Pages are fetched on a background thread into a bounded queue, so
+        # that the next request is in flight while the caller processes the
+        # current page.
+        buffered = queue.Queue(maxsize=self._prefetch)
+        stopped = threading.Event()
+
+        def put(item):
+            while not stopped.is_set():
+                try:
+                    buffered.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def fetch(response):
+            try:
+                while response.next_page_token and not stopped.is_set():
+                    response = self._fetch(response.next_page_token)
+                    put(response)
+            except Exception as exc:
+                put(exc)
+            else:
+                put(_END_OF_PAGES)
+
+        if not self._response.next_page_token:
+            yield self._response
+            return
+
+        worker = threading.Thread(
+            target=fetch, args=(self._response,), name="pager-prefetch", daemon=True
+        )
+        worker.start()
+        try:
+            yield self._response
+            while True:
+                item = buffered.get()
+                if item is _END_OF_PAGES:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                self._response = item
+                yield item
+        finally:
+            stopped.set()
+
+    def __repr__(self) -> str:
+        return "{0}<{1!r}>".format(self.__class__.__name__, self._response)
+
+
+class _BaseAsyncPager:
+    """Page iteration shared by the asynchronous pagers.
+
+    Subclasses set ``_method``, ``_request``, ``_response``, ``_prefetch``
+    and ``_adaptive_page_size`` in their constructors, and name the
+    repeated field of the response in ``_items_field``.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._response, name)
+
+    async def _fetch(self, page_token: str) -> Any:
+        self._request.page_token = page_token
+        if self._adaptive_page_size is None:
+            return await self._method(self._request)
+        return await self._adaptive_page_size.fetch_async(
+            self._method, self._request, self._items_field
+        )
+
+    @property
+    async def pages(self) -> AsyncIterable[Any]:
+        pages = self._prefetched_pages() if self._prefetch > 0 else self._pages()
+
+        # Instrumented methods record how many pages each listing took.
+        observe_pages = getattr(self._method, "observe_pages", None)
+        count = 0
+        async for page in pages:
+            count += 1
+            yield page
+        if observe_pages is not None:
+            observe_pages(count)
+
+    async def _pages(self) -> AsyncIterable[Any]:
+        yield self._response
+        while self._response.next_page_token:
+            self._response = await self._fetch(self._response.next_page_token)
+            yield self._response
+
+    async def _prefetched_pages(self) -> AsyncIterable[Any]:
+        # Pages are fetched by a background task into a bounded queue, so
+        # that the next request is in flight while the caller processes the
+        # current page.
+        buffered = asyncio.Queue(maxsize=self._prefetch)
+
+        async def fetch(response):
+            try:
+                while response.next_page_token:
+                    response = await self._fetch(response.next_page_token)
+                    await buffered.put(response)
+            except Exception as exc:
+                await buffered.put(exc)
+            else:
+                await buffered.put(_END_OF_PAGES)
+
+        if not self._response.next_page_token:
+            yield self._response
+            return
+
+        worker = asyncio.ensure_future(fetch(self._response))
+        try:
+            yield self._response
+            while True:
+                item = await buffered.get()
+                if item is _END_OF_PAGES:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                self._response = item
+                yield item
+        finally:
+            worker.cancel()
+
+    def __repr__(self) -> str:
+        return "{0}<{1!r}>".format(self.__class__.__name__, self._response)
+
+
+class ListPatchJobsPager(_BasePager):
     """A pager for iterating through ``list_patch_jobs`` requests.
 
     This class thinly wraps an initial
@@ -39,6 +233,8 @@ class ListPatchJobsPager:
     the most recent response is retained, and thus used for attribute lookup.
     """
 
+    _items_field = "patch_jobs"
+
     def __init__(
         self,
         method: Callable[
@@ -46,6 +242,8 @@ class ListPatchJobsPager:
         ],
         request: patch_jobs.ListPatchJobsRequest,
         response: patch_jobs.ListPatchJobsResponse,
+        prefetch: int = 0,
+        adaptive_page_size: "AdaptivePageSize" = None,
     ):
         """Instantiate the pager.
 
@@ -56,31 +254,24 @@ class ListPatchJobsPager:
                 The initial request object.
             response (:class:`~.patch_jobs.ListPatchJobsResponse`):
                 The initial response object.
+            prefetch (int): The number of pages to request ahead of
+                iteration in a background thread. Defaults to ``0``,
+                which requests each page only once it is needed.
+            adaptive_page_size (~.AdaptivePageSize): If set, adapts the
+                page size of each request to its latency.
         """
         self._method = method
         self._request = patch_jobs.ListPatchJobsRequest(request)
         self._response = response
-
-    def __getattr__(self, name: str) -> Any:
-        return getattr(self._response, name)
-
-    @property
-    def pages(self) -> Iterable[patch_jobs.ListPatchJobsResponse]:
-        yield self._response
-        while self._response.next_page_token:
-            self._request.page_token = self._response.next_page_token
-            self._response = self._method(self._request)
-            yield self._response
+        self._prefetch = prefetch
+        self._adaptive_page_size = adaptive_page_size
 
     def __iter__(self) -> Iterable[patch_jobs.PatchJob]:
         for page in self.pages:
             yield from page.patch_jobs
 
-    def __repr__(self) -> str:
-        return "{0}<{1!r}>".format(self.__class__.__name__, self._response)
 
-
-class ListPatchJobsAsyncPager:
+class ListPatchJobsAsyncPager(_BaseAsyncPager):
     """A pager for iterating through ``list_patch_jobs`` requests.
 
     This class thinly wraps an initial
@@ -98,6 +289,8 @@ class ListPatchJobsAsyncPager:
     the most recent response is retained, and thus used for attribute lookup.
     """
 
+    _items_field = "patch_jobs"
+
     def __init__(
         self,
         method: Callable[
@@ -106,6 +299,8 @@ class ListPatchJobsAsyncPager:
         ],
         request: patch_jobs.ListPatchJobsRequest,
         response: patch_jobs.ListPatchJobsResponse,
+        prefetch: int = 0,
+        adaptive_page_size: "AdaptivePageSize" = None,
     ):
         """Instantiate the pager.
 
@@ -116,21 +311,17 @@ class ListPatchJobsAsyncPager:
                 The initial request object.
             response (:class:`~.patch_jobs.ListPatchJobsResponse`):
                 The initial response object.
+            prefetch (int): The number of pages to request ahead of
+                iteration in a background task. Defaults to ``0``,
+                which requests each page only once it is needed.
+            adaptive_page_size (~.AdaptivePageSize): If set, adapts the
+                page size of each request to its latency.
         """
         self._method = method
         self._request = patch_jobs.ListPatchJobsRequest(request)
         self._response = response
-
-    def __getattr__(self, name: str) -> Any:
-        return getattr(self._response, name)
-
-    @property
-    async def pages(self) -> AsyncIterable[patch_jobs.ListPatchJobsResponse]:
-        yield self._response
-        while self._response.next_page_token:
-            self._request.page_token = self._response.next_page_token
-            self._response = await self._method(self._request)
-            yield self._response
+        self._prefetch = prefetch
+        self._adaptive_page_size = adaptive_page_size
 
     def __aiter__(self) -> AsyncIterable[patch_jobs.PatchJob]:
         async def async_generator():
@@ -140,11 +331,8 @@ class ListPatchJobsAsyncPager:
 
         return async_generator()
 
-    def __repr__(self) -> str:
-        return "{0}<{1!r}>".format(self.__class__.__name__, self._response)
-
 
-class ListPatchJobInstanceDetailsPager:
+class ListPatchJobInstanceDetailsPager(_BasePager):
     """A pager for iterating through ``list_patch_job_instance_details`` requests.
 
     This class thinly wraps an initial
@@ -162,6 +350,8 @@ class ListPatchJobInstanceDetailsPager:
     the most recent response is retained, and thus used for attribute lookup.
     """
 
+    _items_field = "patch_job_instance_details"
+
     def __init__(
         self,
         method: Callable[
@@ -170,6 +360,8 @@ class ListPatchJobInstanceDetailsPager:
         ],
         request: patch_jobs.ListPatchJobInstanceDetailsRequest,
         response: patch_jobs.ListPatchJobInstanceDetailsResponse,
+        prefetch: int = 0,
+        adaptive_page_size: "AdaptivePageSize" = None,
     ):
         """Instantiate the pager.
 
@@ -180,31 +372,60 @@ class ListPatchJobInstanceDetailsPager:
                 The initial request object.
             response (:class:`~.patch_jobs.ListPatchJobInstanceDetailsResponse`):
                 The initial response object.
+            prefetch (int): The number of pages to request ahead of
+                iteration in a background thread. Defaults to ``0``,
+                which requests each page only once it is needed.
+            adaptive_page_size (~.AdaptivePageSize): If set, adapts the
+                page size of each request to its latency.
         """
         self._method = method
         self._request = patch_jobs.ListPatchJobInstanceDetailsRequest(request)
         self._response = response
-
-    def __getattr__(self, name: str) -> Any:
-        return getattr(self._response, name)
-
-    @property
-    def pages(self) -> Iterable[patch_jobs.ListPatchJobInstanceDetailsResponse]:
-        yield self._response
-        while self._response.next_page_token:
-            self._request.page_token = self._response.next_page_token
-            self._response = self._method(self._request)
-            yield self._response
+        self._prefetch = prefetch
+        self._adaptive_page_size = adaptive_page_size
 
     def __iter__(self) -> Iterable[patch_jobs.PatchJobInstanceDetails]:
         for page in self.pages:
             yield from page.patch_job_instance_details
 
-    def __repr__(self) -> str:
-        return "{0}<{1!r}>".format(self.__class__.__name__, self._response)
+    def project(self, fields: Sequence[str]) -> Iterator[Tuple[Any, ...]]:
+        """Iterate over selected fields of every instance.
+
+        This is much cheaper than iterating over the pager when only a few
+        fields are needed, especially for pages requested with
+        ``raw=True``, whose instances are then never deserialized.
+
+        Args:
+            fields (Sequence[str]): Names of ``PatchJobInstanceDetails``
+                fields.
+
+        Yields:
+            Tuple: The values of ``fields`` for each instance, with enums
+                as ints.
+        """
+        from google.cloud.osconfig_v1.services.os_config_service import raw
+
+        for page in self.pages:
+            yield from raw.project(page, fields)
+
+    def records(self) -> Iterator["InstanceDetailsRecord"]:
+        """Iterate over the instances as compact, immutable records.
+
+        Records take far less memory than ``PatchJobInstanceDetails``
+        messages, and convert back to them with ``to_proto``.
+
+        Yields:
+            ~.InstanceDetailsRecord: A record for each instance.
+        """
+        from google.cloud.osconfig_v1.services.os_config_service.records import (
+            InstanceDetailsRecord,
+            make_records,
+        )
 
+        return make_records(self.project(InstanceDetailsRecord.FIELDS))
 
-class ListPatchJobInstanceDetailsAsyncPager:
+
+class ListPatchJobInstanceDetailsAsyncPager(_BaseAsyncPager):
     """A pager for iterating through ``list_patch_job_instance_details`` requests.
 
     This class thinly wraps an initial
@@ -222,6 +443,8 @@ class ListPatchJobInstanceDetailsAsyncPager:
     the most recent response is retained, and thus used for attribute lookup.
     """
 
+    _items_field = "patch_job_instance_details"
+
     def __init__(
         self,
         method: Callable[
@@ -230,6 +453,8 @@ class ListPatchJobInstanceDetailsAsyncPager:
         ],
         request: patch_jobs.ListPatchJobInstanceDetailsRequest,
         response: patch_jobs.ListPatchJobInstanceDetailsResponse,
+        prefetch: int = 0,
+        adaptive_page_size: "AdaptivePageSize" = None,
     ):
         """Instantiate the pager.
 
@@ -240,23 +465,17 @@ class ListPatchJobInstanceDetailsAsyncPager:
                 The initial request object.
             response (:class:`~.patch_jobs.ListPatchJobInstanceDetailsResponse`):
                 The initial response object.
+            prefetch (int): The number of pages to request ahead of
+                iteration in a background task. Defaults to ``0``,
+                which requests each page only once it is needed.
+            adaptive_page_size (~.AdaptivePageSize): If set, adapts the
+                page size of each request to its latency.
         """
         self._method = method
         self._request = patch_jobs.ListPatchJobInstanceDetailsRequest(request)
         self._response = response
-
-    def __getattr__(self, name: str) -> Any:
-        return getattr(self._response, name)
-
-    @property
-    async def pages(
-        self
-    ) -> AsyncIterable[patch_jobs.ListPatchJobInstanceDetailsResponse]:
-        yield self._response
-        while self._response.next_page_token:
-            self._request.page_token = self._response.next_page_token
-            self._response = await self._method(self._request)
-            yield self._response
+        self._prefetch = prefetch
+        self._adaptive_page_size = adaptive_page_size
 
     def __aiter__(self) -> AsyncIterable[patch_jobs.PatchJobInstanceDetails]:
         async def async_generator():
@@ -266,11 +485,42 @@ class ListPatchJobInstanceDetailsAsyncPager:
 
         return async_generator()
 
-    def __repr__(self) -> str:
-        return "{0}<{1!r}>".format(self.__class__.__name__, self._response)
+    def project(self, fields: Sequence[str]) -> AsyncIterable[Tuple[Any, ...]]:
+        """Iterate over selected fields of every instance.
+
+        See :meth:`ListPatchJobInstanceDetailsPager.project`.
+        """
+
+        from google.cloud.osconfig_v1.services.os_config_service import raw
+
+        async def async_generator():
+            async for page in self.pages:
+                for values in raw.project(page, fields):
+                    yield values
+
+        return async_generator()
+
+    def records(self) -> AsyncIterable["InstanceDetailsRecord"]:
+        """Iterate over the instances as compact, immutable records.
+
+        See :meth:`ListPatchJobInstanceDetailsPager.records`.
+        """
+        from google.cloud.osconfig_v1.services.os_config_service import raw
+        from google.cloud.osconfig_v1.services.os_config_service.records import (
+            InstanceDetailsRecord,
+            make_records,
+        )
+
+        async def async_generator():
+            async for page in self.pages:
+                rows = raw.project(page, InstanceDetailsRecord.FIELDS)
+                for record in make_records(rows):
+                    yield record
+
+        return async_generator()
 
 
-class ListPatchDeploymentsPager:
+class ListPatchDeploymentsPager(_BasePager):
     """A pager for iterating through ``list_patch_deployments`` requests.
 
     This class thinly wraps an initial
@@ -288,6 +538,8 @@ class ListPatchDeploymentsPager:
     the most recent response is retained, and thus used for attribute lookup.
     """
 
+    _items_field = "patch_deployments"
+
     def __init__(
         self,
         method: Callable[
@@ -296,6 +548,8 @@ class ListPatchDeploymentsPager:
         ],
         request: patch_deployments.ListPatchDeploymentsRequest,
         response: patch_deployments.ListPatchDeploymentsResponse,
+        prefetch: int = 0,
+        adaptive_page_size: "AdaptivePageSize" = None,
     ):
         """Instantiate the pager.
 
@@ -306,31 +560,24 @@ class ListPatchDeploymentsPager:
                 The initial request object.
             response (:class:`~.patch_deployments.ListPatchDeploymentsResponse`):
                 The initial response object.
+            prefetch (int): The number of pages to request ahead of
+                iteration in a background thread. Defaults to ``0``,
+                which requests each page only once it is needed.
+            adaptive_page_size (~.AdaptivePageSize): If set, adapts the
+                page size of each request to its latency.
         """
         self._method = method
         self._request = patch_deployments.ListPatchDeploymentsRequest(request)
         self._response = response
-
-    def __getattr__(self, name: str) -> Any:
-        return getattr(self._response, name)
-
-    @property
-    def pages(self) -> Iterable[patch_deployments.ListPatchDeploymentsResponse]:
-        yield self._response
-        while self._response.next_page_token:
-            self._request.page_token = self._response.next_page_token
-            self._response = self._method(self._request)
-            yield self._response
+        self._prefetch = prefetch
+        self._adaptive_page_size = adaptive_page_size
 
     def __iter__(self) -> Iterable[patch_deployments.PatchDeployment]:
         for page in self.pages:
             yield from page.patch_deployments
 
-    def __repr__(self) -> str:
-        return "{0}<{1!r}>".format(self.__class__.__name__, self._response)
-
 
-class ListPatchDeploymentsAsyncPager:
+class ListPatchDeploymentsAsyncPager(_BaseAsyncPager):
     """A pager for iterating through ``list_patch_deployments`` requests.
 
     This class thinly wraps an initial
@@ -348,6 +595,8 @@ class ListPatchDeploymentsAsyncPager:
     the most recent response is retained, and thus used for attribute lookup.
     """
 
+    _items_field = "patch_deployments"
+
     def __init__(
         self,
         method: Callable[
@@ -356,6 +605,8 @@ class ListPatchDeploymentsAsyncPager:
         ],
         request: patch_deployments.ListPatchDeploymentsRequest,
         response: patch_deployments.ListPatchDeploymentsResponse,
+        prefetch: int = 0,
+        adaptive_page_size: "AdaptivePageSize" = None,
     ):
         """Instantiate the pager.
 
@@ -366,23 +617,17 @@ class ListPatchDeploymentsAsyncPager:
                 The initial request object.
             response (:class:`~.patch_deployments.ListPatchDeploymentsResponse`):
                 The initial response object.
+            prefetch (int): The number of pages to request ahead of
+                iteration in a background task. Defaults to ``0``,
+                which requests each page only once it is needed.
+            adaptive_page_size (~.AdaptivePageSize): If set, adapts the
+                page size of each request to its latency.
         """
         self._method = method
         self._request = patch_deployments.ListPatchDeploymentsRequest(request)
         self._response = response
-
-    def __getattr__(self, name: str) -> Any:
-        return getattr(self._response, name)
-
-    @property
-    async def pages(
-        self
-    ) -> AsyncIterable[patch_deployments.ListPatchDeploymentsResponse]:
-        yield self._response
-        while self._response.next_page_token:
-            self._request.page_token = self._response.next_page_token
-            self._response = await self._method(self._request)
-            yield self._response
+        self._prefetch = prefetch
+        self._adaptive_page_size = adaptive_page_size
 
     def __aiter__(self) -> AsyncIterable[patch_deployments.PatchDeployment]:
         async def async_generator():
@@ -391,6 +636,3 @@ class ListPatchDeploymentsAsyncPager:
                     yield response
 
         return async_generator()
-
-    def __repr__(self) -> str:
-        return "{0}<{1!r}>".format(self.__class__.__name__, self._response)
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+import time
+from typing import Any, Awaitable, Callable
+
+from google.api_core import exceptions  # type: ignore
+
+from google.cloud.osconfig_v1.services.os_config_service import raw
+
+
+def _page_bytes(response) -> int:
+    if isinstance(response, raw.RawListPatchJobInstanceDetailsResponse):
+        return len(response.serialize())
+    return type(response).pb(response).ByteSize()
+
+
+class AdaptivePageSize:
+    """Adapts the page size of list requests to a latency budget.
+
+    Pass an instance as the ``adaptive_page_size`` argument of a client's
+    list method. The pager then sets ``page_size`` on every request,
+    scaling it after each page by how far the round trip was from
+    ``latency_budget`` seconds, so that full scans take as few round
+    trips as the budget allows. A page may grow to at most ``growth``
+    times the size of the last one, but shrinks as far as needed at once.
+
+    If ``max_page_bytes`` is set, pages are also kept below that size on
+    the wire. A page request that fails with ``DeadlineExceeded`` is
+    retried at half the page size, until ``min_page_size`` is reached.
+
+    An instance may be shared between pagers over similar data, so that
+    each starts at the size the others settled on. It is thread-safe.
+    """
+
+    def __init__(
+        self,
+        latency_budget: float = 1.0,
+        *,
+        initial_page_size: int = 100,
+        min_page_size: int = 10,
+        max_page_size: int = 10000,
+        max_page_bytes: int = None,
+        growth: float = 2.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Instantiate the policy.
+
+        Args:
+            latency_budget (float): The target duration in seconds of each
+                page request.
+            initial_page_size (int): The page size of the first request.
+            min_page_size (int): The smallest page size requested.
+            max_page_size (int): The largest page size requested.
+            max_page_bytes (int): If set, the target size in bytes of each
+                page.
+            growth (float): The most the page size may grow from one page
+                to the next, as a factor.
+            clock (Callable[[], float]): Returns the current time in
+                seconds; used for testing.
+        """
+        if not 0 < min_page_size <= max_page_size:
+            raise ValueError("Page size bounds must satisfy 0 < min <= max.")
+        self._latency_budget = latency_budget
+        self._min_page_size = min_page_size
+        self._max_page_size = max_page_size
+        self._max_page_bytes = max_page_bytes
+        self._growth = growth
+        self._clock = clock
+        self._page_size = self._clamp(initial_page_size)
+        self._lock = threading.Lock()
+
+    @property
+    def page_size(self) -> int:
+        """The page size of the next request."""
+        return self._page_size
+
+    def _clamp(self, page_size: float) -> int:
+        return max(self._min_page_size, min(self._max_page_size, int(page_size)))
+
+    def observe(
+        self, page_size: int, items: int, latency: float, page_bytes: int = None
+    ) -> int:
+        """Adjust the page size to a page that was fetched.
+
+        Args:
+            page_size (int): The page size that was requested.
+            items (int): The number of items on the page.
+            latency (float): The duration in seconds of the request.
+            page_bytes (int): The size in bytes of the page, if known.
+
+        Returns:
+            int: The page size of the next request.
+        """
+        with self._lock:
+            if items < page_size and latency <= self._latency_budget:
+                # A short page, most likely the last one, says nothing
+                # about how much larger a page could be.
+                return self._page_size
+
+            scale = self._latency_budget / max(latency, 1e-6)
+            if self._max_page_bytes is not None and page_bytes:
+                scale = min(scale, self._max_page_bytes / page_bytes)
+            scale = min(scale, self._growth)
+            self._page_size = self._clamp(max(items, 1) * scale)
+            return self._page_size
+
+    def _shrink(self, request) -> bool:
+        with self._lock:
+            if request.page_size <= self._min_page_size:
+                return False
+            self._page_size = self._clamp(request.page_size // 2)
+            return True
+
+    def _observe_page(self, request, response, field: str, latency: float) -> None:
+        page_bytes = None
+        if self._max_page_bytes is not None:
+            page_bytes = _page_bytes(response)
+        self.observe(
+            request.page_size, len(getattr(response, field)), latency, page_bytes
+        )
+
+    def fetch(self, method: Callable[[Any], Any], request, field: str) -> Any:
+        """Request a page at the current page size.
+
+        Args:
+            method (Callable): The list method.
+            request: The list request; its ``page_size`` is overwritten.
+            field (str): The name of the response field holding the items.
+
+        Returns:
+            The response.
+        """
+        while True:
+            request.page_size = self._page_size
+            start = self._clock()
+            try:
+                response = method(request)
+            except exceptions.DeadlineExceeded:
+                if not self._shrink(request):
+                    raise
+                continue
+            self._observe_page(request, response, field, self._clock() - start)
+            return response
+
+    async def fetch_async(
+        self, method: Callable[[Any], Awaitable[Any]], request, field: str
+    ) -> Any:
+        """Request a page at the current page size.
+
+        See :meth:`fetch`.
+        """
+        while True:
+            request.page_size = self._page_size
+            start = self._clock()
+            try:
+                response = await method(request)
+            except exceptions.DeadlineExceeded:
+                if not self._shrink(request):
+                    raise
+                continue
+            self._observe_page(request, response, field, self._clock() - start)
+            return response
+
+
+__all__ = ("AdaptivePageSize",)
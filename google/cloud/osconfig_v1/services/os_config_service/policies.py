@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+import time
+from typing import Callable, Dict, Mapping, NamedTuple, Optional, Tuple, Type
+
+from google.api_core import exceptions  # type: ignore
+from google.api_core import retry as retries  # type: ignore
+
+
+class RetryBudget:
+    """Limits the retries of a client to a fraction of its calls.
+
+    Every call deposits ``ratio`` of a token and every retry withdraws a
+    whole one, so that retries add at most ``ratio`` to the load of a
+    failing service instead of multiplying it. The budget also refills
+    at ``min_retries_per_second``, so that a client making few calls can
+    still retry. Deposits and refills accumulate up to ``capacity``
+    tokens, which bounds the burst of retries when an outage starts.
+
+    The budget is thread-safe, and may be shared between clients.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.1,
+        min_retries_per_second: float = 1.0,
+        *,
+        capacity: float = 10.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Instantiate the budget.
+
+        Args:
+            ratio (float): The retries allowed per call.
+            min_retries_per_second (float): The retries allowed each
+                second regardless of the calls made.
+            capacity (float): The most retries that can be saved up.
+            clock (Callable[[], float]): Returns the current time in
+                seconds; used for testing.
+        """
+        self._ratio = ratio
+        self._min_retries_per_second = min_retries_per_second
+        self._capacity = capacity
+        self._clock = clock
+        self._balance = capacity
+        self._refilled_at = clock()
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def balance(self) -> float:
+        """The number of retries currently allowed."""
+        with self._lock:
+            self._refill()
+            return self._balance
+
+    @property
+    def rejected(self) -> int:
+        """The number of retries refused so far."""
+        return self._rejected
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._balance = min(
+            self._capacity,
+            self._balance + (now - self._refilled_at) * self._min_retries_per_second,
+        )
+        self._refilled_at = now
+
+    def deposit(self) -> None:
+        """Record a call."""
+        with self._lock:
+            self._balance = min(self._capacity, self._balance + self._ratio)
+
+    def withdraw(self) -> bool:
+        """Ask to retry a call.
+
+        Returns:
+            bool: Whether the retry is within the budget.
+        """
+        with self._lock:
+            self._refill()
+            if self._balance < 1.0:
+                self._rejected += 1
+                return False
+            self._balance -= 1.0
+            return True
+
+    def track(self, rpc: Callable) -> Callable:
+        """Wrap a method so that each call makes a deposit.
+
+        Args:
+            rpc (Callable): The wrapped RPC method.
+
+        Returns:
+            Callable: The method, depositing on every call.
+        """
+
+        def call(*args, **kwargs):
+            self.deposit()
+            return rpc(*args, **kwargs)
+
+        return call
+
+
+class MethodPolicy(NamedTuple):
+    """The default retry and timeout of an RPC method.
+
+    Retries back off exponentially, using the sleep intervals of
+    :func:`google.api_core.retry.exponential_sleep_generator`: a nominal
+    delay starts at ``initial_delay`` and is multiplied by
+    ``delay_multiplier`` after every attempt. Each sleep is drawn at
+    random to spread out retries; depending on the ``google-api-core``
+    version, uniformly between zero and the nominal delay capped at
+    ``maximum_delay`` (full jitter), or between zero and twice the
+    nominal delay, then capped at ``maximum_delay``.
+
+    Attributes:
+        timeout (Optional[float]): The deadline in seconds of each call,
+            including any retries; None for no deadline.
+        retry_on (Tuple[Type[Exception], ...]): The errors that are
+            retried. Methods that are not safe to repeat retry none.
+        initial_delay (float): The first nominal delay, in seconds.
+        maximum_delay (float): The longest sleep, in seconds.
+        delay_multiplier (float): How much the nominal delay grows per
+            attempt.
+        retry_deadline (float): How long in seconds to keep retrying.
+    """
+
+    timeout: Optional[float] = 60.0
+    retry_on: Tuple[Type[Exception], ...] = ()
+    initial_delay: float = 0.1
+    maximum_delay: float = 10.0
+    delay_multiplier: float = 2.0
+    retry_deadline: float = 60.0
+
+    def make_retry(
+        self, retry_class: Type = retries.Retry, budget: RetryBudget = None
+    ) -> Optional[retries.Retry]:
+        """Build the retry of the policy.
+
+        Args:
+            retry_class (Type): The class of retry to build;
+                ``google.api_core.retry_async.AsyncRetry`` for
+                asynchronous methods.
+            budget (~.RetryBudget): If set, every retry is withdrawn from
+                this budget, and errors are raised once it is spent.
+
+        Returns:
+            Optional[google.api_core.retry.Retry]: The retry, or None if
+                the method is not retried.
+        """
+        if not self.retry_on:
+            return None
+
+        retryable = retries.if_exception_type(*self.retry_on)
+        if budget is None:
+            predicate = retryable
+        else:
+
+            def predicate(exc):
+                return retryable(exc) and budget.withdraw()
+
+        return retry_class(
+            predicate=predicate,
+            initial=self.initial_delay,
+            maximum=self.maximum_delay,
+            multiplier=self.delay_multiplier,
+            deadline=self.retry_deadline,
+        )
+
+
+# Reads are safe to repeat, and are retried while the service is
+# unavailable. DeadlineExceeded is not retried: repeating a request that
+# was too slow rarely helps, and adaptive paging shrinks pages instead.
+_READ = MethodPolicy(retry_on=(exceptions.ServiceUnavailable,))
+
+# Methods that change state are never retried, so that a patch job is not
+# executed twice when a response is lost.
+_WRITE = MethodPolicy()
+
+# The default policy of each RPC method, by name.
+DEFAULT_METHOD_POLICIES = {
+    "execute_patch_job": _WRITE,
+    "get_patch_job": _READ,
+    "cancel_patch_job": _WRITE,
+    "list_patch_jobs": _READ,
+    "list_patch_job_instance_details": _READ,
+    "list_patch_job_instance_details_raw": _READ,
+    "create_patch_deployment": _WRITE,
+    "get_patch_deployment": _READ,
+    "list_patch_deployments": _READ,
+    "delete_patch_deployment": _WRITE,
+}  # type: Dict[str, MethodPolicy]
+
+
+def merge_policies(
+    overrides: Optional[Mapping[str, MethodPolicy]]
+) -> Dict[str, MethodPolicy]:
+    """Merge policies for some methods into the defaults.
+
+    Args:
+        overrides (Mapping[str, ~.MethodPolicy]): Policies by method name.
+            The policy of ``list_patch_job_instance_details`` also applies
+            to its raw variant unless that is given too.
+
+    Returns:
+        Dict[str, ~.MethodPolicy]: The policy of every method.
+
+    Raises:
+        ValueError: If a method name is unknown.
+    """
+    policies = dict(DEFAULT_METHOD_POLICIES)
+    overrides = dict(overrides or {})
+    unknown = set(overrides) - set(policies)
+    if unknown:
+        raise ValueError(
+            "Unknown method names in method policies: {0}".format(
+                ", ".join(sorted(unknown))
+            )
+        )
+    if "list_patch_job_instance_details" in overrides:
+        overrides.setdefault(
+            "list_patch_job_instance_details_raw",
+            overrides["list_patch_job_instance_details"],
+        )
+    policies.update(overrides)
+    return policies
+
+
+__all__ = ("DEFAULT_METHOD_POLICIES", "MethodPolicy", "RetryBudget", "merge_policies")
@@ -0,0 +1,451 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import functools
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Optional, Sequence, Tuple
+import urllib.parse
+
+from google.api_core import exceptions  # type: ignore
+
+from google.cloud.osconfig_v1.services.os_config_service import instrumentation
+
+
+# The state of a bucket: the tokens held, which are negative while calls
+# wait for reserved tokens, and the time they were counted at.
+_BucketState = Tuple[float, float]
+
+
+class RateLimit(NamedTuple):
+    """The budget of calls to a method.
+
+    Attributes:
+        rate (float): The calls allowed per second, on average.
+        burst (float): The calls allowed at once after a quiet period.
+    """
+
+    rate: float
+    burst: float = 1.0
+
+
+class RateLimitExceeded(exceptions.GoogleAPIError):
+    """Raised instead of waiting longer than allowed for a call's turn.
+
+    Attributes:
+        key (str): The project the call was for.
+        method (str): The name of the method.
+        delay (float): The seconds the call would have had to wait.
+    """
+
+    def __init__(self, key: str, method: str, delay: float):
+        super().__init__(
+            "Calling {0} for {1!r} would exceed its rate limit for "
+            "another {2:.2f} seconds.".format(method, key, delay)
+        )
+        self.key = key
+        self.method = method
+        self.delay = delay
+
+
+def _reserve(
+    state: Optional[_BucketState],
+    limit: RateLimit,
+    now: float,
+    max_wait: Optional[float],
+) -> Tuple[Optional[_BucketState], float]:
+    # Take a token from a bucket, reserving it ahead of time if the bucket
+    # is empty. Returns the new state, or None if the reservation was
+    # refused, and how long the caller has to wait.
+    tokens, counted_at = state if state is not None else (limit.burst, now)
+    tokens = min(limit.burst, tokens + max(0.0, now - counted_at) * limit.rate)
+    delay = max(0.0, (1.0 - tokens) / limit.rate)
+    if max_wait is not None and delay > max_wait:
+        return None, delay
+    return (tokens - 1.0, now), delay
+
+
+class MemoryTokenStore:
+    """Keeps token buckets in memory, shared by the clients of a process."""
+
+    def __init__(self):
+        self._buckets = {}  # type: Dict[Tuple[str, str], _BucketState]
+        self._lock = threading.Lock()
+
+    def reserve(
+        self,
+        key: Tuple[str, str],
+        limit: RateLimit,
+        now: float,
+        max_wait: Optional[float],
+    ) -> Tuple[bool, float]:
+        """Reserve a token from a bucket.
+
+        Args:
+            key (Tuple[str, str]): The project and method of the bucket.
+            limit (~.RateLimit): The budget of the bucket.
+            now (float): The current time in seconds.
+            max_wait (Optional[float]): The longest wait to reserve a token
+                for.
+
+        Returns:
+            Tuple[bool, float]: Whether the token was reserved, and the
+                seconds until it is available.
+        """
+        with self._lock:
+            state, delay = _reserve(self._buckets.get(key), limit, now, max_wait)
+            if state is not None:
+                self._buckets[key] = state
+        return state is not None, delay
+
+
+class FileTokenStore:
+    """Keeps token buckets in a SQLite file, shared between processes.
+
+    Every process whose limiter uses a store on the same path draws from
+    the same buckets, so that tools sharing a project share its quota.
+    Each reservation is a short write transaction; placing the file on a
+    memory-backed file system such as ``/dev/shm`` keeps them fast.
+
+    Times are read from the wall clock, the only clock all processes
+    share.
+    """
+
+    def __init__(self, path: str, *, timeout: float = 5.0):
+        """Open the store, creating the file if needed.
+
+        Args:
+            path (str): The path of the SQLite file.
+            timeout (float): How long in seconds to wait for another
+                process to finish a reservation.
+        """
+        self._path = path
+        self._timeout = timeout
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "project TEXT NOT NULL, method TEXT NOT NULL, "
+                "tokens REAL NOT NULL, counted_at REAL NOT NULL, "
+                "PRIMARY KEY (project, method))"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections may not be shared between threads, so each
+        # thread opens its own.
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = sqlite3.connect(
+                self._path, timeout=self._timeout, isolation_level=None
+            )
+        return connection
+
+    def reserve(
+        self,
+        key: Tuple[str, str],
+        limit: RateLimit,
+        now: float,
+        max_wait: Optional[float],
+    ) -> Tuple[bool, float]:
+        """Reserve a token from a bucket.
+
+        See :meth:`MemoryTokenStore.reserve`.
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT tokens, counted_at FROM buckets "
+                "WHERE project = ? AND method = ?",
+                key,
+            ).fetchone()
+            state, delay = _reserve(row, limit, now, max_wait)
+            if state is not None:
+                connection.execute(
+                    "INSERT OR REPLACE INTO buckets VALUES (?, ?, ?, ?)", key + state
+                )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return state is not None, delay
+
+    def close(self) -> None:
+        """Close the calling thread's connection to the file."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+def routing_key(request: Any, metadata: Sequence[Tuple[str, str]] = ()) -> str:
+    """Return the project a call is for.
+
+    The project is read from the routing header the client adds to the
+    call's metadata, falling back to the ``parent`` or ``name`` of the
+    request for page requests, which are sent without metadata.
+
+    Args:
+        request (Any): The request.
+        metadata (Sequence[Tuple[str, str]]): The metadata of the call.
+
+    Returns:
+        str: The project, in the form ``projects/*``, or ``""`` if the
+            call has none.
+    """
+    resource = ""
+    for key, value in metadata or ():
+        if key == "x-goog-request-params":
+            params = urllib.parse.parse_qsl(value)
+            if params:
+                resource = params[0][1]
+            break
+    else:
+        resource = getattr(request, "parent", "") or getattr(request, "name", "")
+    return "/".join(resource.split("/")[:2])
+
+
+class RateLimiter:
+    """Limits the rate of calls to each method, per project.
+
+    Pass an instance as the ``rate_limiter`` argument of a client to
+    space out calls according to ``limits``, which map method names to
+    their :class:`RateLimit`. Each project, read from the routing header
+    of a call, has its own token bucket per method. A call waits for its
+    turn instead of being sent and failing with a quota error; waits are
+    reserved in order, so calls are spread evenly under the limit.
+
+    Calls that would wait longer than ``max_wait`` seconds raise
+    :class:`RateLimitExceeded` instead. Methods without a limit are
+    never delayed.
+
+    Buckets are kept in memory unless a ``store`` such as
+    :class:`FileTokenStore` shares them between processes. The limiter
+    is thread-safe, and may be shared between clients.
+    """
+
+    def __init__(
+        self,
+        limits: Mapping[str, RateLimit],
+        *,
+        default: RateLimit = None,
+        max_wait: float = None,
+        store: Any = None,
+        clock: Callable[[], float] = None
+    ):
+        """Instantiate the limiter.
+
+        Args:
+            limits (Mapping[str, ~.RateLimit]): The budget of each method,
+                by name, e.g. ``"list_patch_job_instance_details"``.
+            default (~.RateLimit): The budget of the other methods; they
+                are not limited by default.
+            max_wait (float): The longest a call may wait, in seconds;
+                calls wait as long as needed by default.
+            store (Union[~.MemoryTokenStore, ~.FileTokenStore]): Where the
+                buckets are kept.
+            clock (Callable[[], float]): Returns the current time in
+                seconds; defaults to the monotonic clock, or to the wall
+                clock for a :class:`FileTokenStore`.
+        """
+        self._limits = dict(limits)
+        if "list_patch_job_instance_details" in self._limits:
+            self._limits.setdefault(
+                "list_patch_job_instance_details_raw",
+                self._limits["list_patch_job_instance_details"],
+            )
+        self._default = default
+        self._max_wait = max_wait
+        self._store = store if store is not None else MemoryTokenStore()
+        if clock is None:
+            clock = time.time if isinstance(store, FileTokenStore) else time.monotonic
+        self._clock = clock
+
+    def limit(self, method: str) -> Optional[RateLimit]:
+        """Return the budget of a method, or None if it is not limited."""
+        return self._limits.get(method, self._default)
+
+    def reserve(self, method: str, key: str) -> float:
+        """Reserve a call to a method for a project.
+
+        Args:
+            method (str): The name of the method.
+            key (str): The project.
+
+        Returns:
+            float: The seconds to wait before making the call.
+
+        Raises:
+            ~.RateLimitExceeded: If the wait would exceed ``max_wait``.
+        """
+        limit = self.limit(method)
+        if limit is None:
+            return 0.0
+        reserved, delay = self._store.reserve(
+            (key, method), limit, self._clock(), self._max_wait
+        )
+        if not reserved:
+            raise RateLimitExceeded(key, method, delay)
+        return delay
+
+    def acquire(self, method: str, key: str) -> float:
+        """Wait for the turn of a call to a method for a project.
+
+        See :meth:`reserve`.
+
+        Returns:
+            float: The seconds waited.
+        """
+        delay = self.reserve(method, key)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, method: str, key: str) -> float:
+        """Wait for the turn of a call without blocking the event loop.
+
+        See :meth:`reserve`.
+
+        Returns:
+            float: The seconds waited.
+        """
+        delay = self.reserve(method, key)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class _LimitedMethod:
+    # Waits for the rate limiter before every call of a stub. Stubs are
+    # called once per attempt, beneath any retries, so each attempt takes
+    # a token.
+
+    def __init__(
+        self,
+        stub: Callable,
+        name: str,
+        limiter: RateLimiter,
+        metrics: Optional[instrumentation.MetricsRegistry],
+    ):
+        self._stub = stub
+        self._name = name
+        self._limiter = limiter
+        self._metrics = metrics
+
+    def _waited(self, delay: float) -> None:
+        if self._metrics is not None:
+            self._metrics.record(instrumentation.RATE_LIMIT_WAIT, self._name, delay)
+
+    def __call__(self, request, *args, **kwargs):
+        key = routing_key(request, kwargs.get("metadata"))
+        self._waited(self._limiter.acquire(self._name, key))
+        return self._stub(request, *args, **kwargs)
+
+
+class _LimitedAsyncCall:
+    # Stands in for the call of an AsyncIO stub, which is only started once
+    # the rate limiter lets it through.
+
+    def __init__(self, method: _LimitedMethod, request, args, kwargs):
+        self._method = method
+        self._request = request
+        self._args = args
+        self._kwargs = kwargs
+
+    def __await__(self):
+        return self._call().__await__()
+
+    async def _call(self):
+        method = self._method
+        key = routing_key(self._request, self._kwargs.get("metadata"))
+        method._waited(await method._limiter.acquire_async(method._name, key))
+        return await method._stub(self._request, *self._args, **self._kwargs)
+
+
+class _LimitedAsyncMethod(_LimitedMethod):
+    def __call__(self, request, *args, **kwargs):
+        return _LimitedAsyncCall(self, request, args, kwargs)
+
+
+@functools.lru_cache(maxsize=None)
+def _limited_stub_type(base: type) -> type:
+    # The asynchronous wrappers of google.api_core check the type of the
+    # stubs they wrap, so AsyncIO stubs are limited by a stand-in of the
+    # same type.
+
+    class _LimitedUnaryUnaryMultiCallable(_LimitedAsyncMethod, base):
+        pass
+
+    return _LimitedUnaryUnaryMultiCallable
+
+
+def limit(
+    stub: Callable,
+    name: str,
+    limiter: RateLimiter,
+    metrics: instrumentation.MetricsRegistry = None,
+) -> Callable:
+    """Wait for the rate limiter before every call of a transport stub.
+
+    The stub is wrapped beneath any retries, so that every attempt waits
+    for its turn.
+
+    Args:
+        stub (Callable): The RPC stub.
+        name (str): The name of the method.
+        limiter (~.RateLimiter): The rate limiter.
+        metrics (~.MetricsRegistry): A registry to record the waits to.
+
+    Returns:
+        Callable: The limited stub.
+    """
+    return _LimitedMethod(stub, name, limiter, metrics)
+
+
+def limit_async(
+    stub: Callable,
+    name: str,
+    limiter: RateLimiter,
+    metrics: instrumentation.MetricsRegistry = None,
+) -> Callable:
+    """Wait for the rate limiter before every call of an AsyncIO stub.
+
+    The limited stub returns an awaitable call at once, and waits for its
+    turn when the call is awaited. See :func:`limit`.
+    """
+    # AsyncIO stubs only exist once grpc.aio has been imported.
+    aio = sys.modules.get("grpc.aio")
+    if aio is not None and isinstance(stub, aio.UnaryUnaryMultiCallable):
+        return _limited_stub_type(aio.UnaryUnaryMultiCallable)(
+            stub, name, limiter, metrics
+        )
+    return _LimitedAsyncMethod(stub, name, limiter, metrics)
+
+
+__all__ = (
+    "FileTokenStore",
+    "MemoryTokenStore",
+    "RateLimit",
+    "RateLimitExceeded",
+    "RateLimiter",
+    "limit",
+    "limit_async",
+    "routing_key",
+)
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from typing import Any, Iterator, List, Sequence, Tuple
+
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+_WIRE_VARINT = 0
+_WIRE_FIXED64 = 1
+_WIRE_LENGTH_DELIMITED = 2
+_WIRE_FIXED32 = 5
+
+_DETAILS_FIELDS = patch_jobs.PatchJobInstanceDetails.pb().DESCRIPTOR.fields_by_name
+_RESPONSE_FIELDS = (
+    patch_jobs.ListPatchJobInstanceDetailsResponse.pb().DESCRIPTOR.fields_by_name
+)
+_DETAILS_NUMBER = _RESPONSE_FIELDS["patch_job_instance_details"].number
+_NEXT_PAGE_TOKEN_NUMBER = _RESPONSE_FIELDS["next_page_token"].number
+
+# The fields of ``PatchJobInstanceDetails`` that can be projected.
+PROJECTABLE_FIELDS = tuple(_DETAILS_FIELDS)
+
+
+def _read_varint(data: bytes, position: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, position
+        shift += 7
+
+
+def _skip(data: bytes, position: int, wire_type: int) -> int:
+    if wire_type == _WIRE_VARINT:
+        return _read_varint(data, position)[1]
+    if wire_type == _WIRE_FIXED64:
+        return position + 8
+    if wire_type == _WIRE_LENGTH_DELIMITED:
+        length, position = _read_varint(data, position)
+        return position + length
+    if wire_type == _WIRE_FIXED32:
+        return position + 4
+    raise ValueError("Unsupported wire type {0}.".format(wire_type))
+
+
+class _LazyInstanceDetails(Sequence[patch_jobs.PatchJobInstanceDetails]):
+    # The instance details of a raw page; each one is deserialized only
+    # when it is accessed.
+
+    __slots__ = ("_data", "_spans")
+
+    def __init__(self, data: bytes, spans: List[Tuple[int, int]]):
+        self._data = data
+        self._spans = spans
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        start, end = self._spans[index]
+        return patch_jobs.PatchJobInstanceDetails.deserialize(self._data[start:end])
+
+
+class RawListPatchJobInstanceDetailsResponse:
+    """A ``ListPatchJobInstanceDetailsResponse`` kept in its wire format.
+
+    Creating a raw response only locates the instance details in the
+    serialized bytes. Each ``PatchJobInstanceDetails`` is deserialized when
+    it is accessed through :attr:`patch_job_instance_details`, and
+    :meth:`project` reads selected fields of every instance straight from
+    the bytes without building any message, which makes scans over large
+    patch jobs much cheaper.
+
+    Clients return pages of this type from
+    ``list_patch_job_instance_details(..., raw=True)``.
+    """
+
+    __slots__ = ("_data", "_spans", "_next_page_token")
+
+    def __init__(self, data: bytes):
+        """Instantiate the response.
+
+        Args:
+            data (bytes): A serialized ``ListPatchJobInstanceDetailsResponse``.
+        """
+        self._data = data
+        self._spans = []  # type: List[Tuple[int, int]]
+        self._next_page_token = ""
+
+        position, end = 0, len(data)
+        while position < end:
+            key, position = _read_varint(data, position)
+            number, wire_type = key >> 3, key & 7
+            if wire_type != _WIRE_LENGTH_DELIMITED:
+                position = _skip(data, position, wire_type)
+                continue
+            length, position = _read_varint(data, position)
+            if number == _DETAILS_NUMBER:
+                self._spans.append((position, position + length))
+            elif number == _NEXT_PAGE_TOKEN_NUMBER:
+                self._next_page_token = data[position : position + length].decode(
+                    "utf-8"
+                )
+            position += length
+
+    @classmethod
+    def deserialize(cls, data: bytes) -> "RawListPatchJobInstanceDetailsResponse":
+        """Wrap a serialized response; used as the gRPC deserializer."""
+        return cls(data)
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def __repr__(self) -> str:
+        return "<{0} instances={1} next_page_token={2!r}>".format(
+            type(self).__name__, len(self._spans), self._next_page_token
+        )
+
+    @property
+    def raw_page(self) -> "RawListPatchJobInstanceDetailsResponse":
+        return self
+
+    @property
+    def next_page_token(self) -> str:
+        """The token of the next page, or an empty string on the last page."""
+        return self._next_page_token
+
+    @property
+    def patch_job_instance_details(
+        self
+    ) -> Sequence[patch_jobs.PatchJobInstanceDetails]:
+        """The instance details, deserialized one by one as they are accessed."""
+        return _LazyInstanceDetails(self._data, self._spans)
+
+    def serialize(self) -> bytes:
+        """Return the serialized response."""
+        return self._data
+
+    def to_response(self) -> patch_jobs.ListPatchJobInstanceDetailsResponse:
+        """Deserialize the whole response."""
+        return patch_jobs.ListPatchJobInstanceDetailsResponse.deserialize(self._data)
+
+    def project(self, fields: Sequence[str]) -> Iterator[Tuple[Any, ...]]:
+        """Read selected fields of every instance without deserializing it.
+
+        Args:
+            fields (Sequence[str]): Names of ``PatchJobInstanceDetails``
+                fields, from :data:`PROJECTABLE_FIELDS`.
+
+        Yields:
+            Tuple: The values of ``fields`` for each instance, in order.
+                Enums are returned as ints and unset fields as their
+                default values.
+        """
+        slots = {}
+        defaults = []
+        for slot, field in enumerate(fields):
+            descriptor = _DETAILS_FIELDS[field]
+            slots[descriptor.number] = slot
+            defaults.append(
+                ""
+                if descriptor.type == descriptor.TYPE_STRING
+                else descriptor.default_value
+            )
+
+        data = self._data
+        for start, end in self._spans:
+            values = list(defaults)
+            position = start
+            while position < end:
+                key, position = _read_varint(data, position)
+                number, wire_type = key >> 3, key & 7
+                slot = slots.get(number)
+                if wire_type == _WIRE_VARINT:
+                    value, position = _read_varint(data, position)
+                    if slot is not None:
+                        # Negative numbers are encoded in two's complement.
+                        values[slot] = value - (1 << 64) if value >> 63 else value
+                elif wire_type == _WIRE_LENGTH_DELIMITED:
+                    length, position = _read_varint(data, position)
+                    if slot is not None:
+                        values[slot] = data[position : position + length].decode(
+                            "utf-8"
+                        )
+                    position += length
+                else:
+                    position = _skip(data, position, wire_type)
+            yield tuple(values)
+
+
+def project(page, fields: Sequence[str]) -> Iterator[Tuple[Any, ...]]:
+    """Read selected fields of the instance details of a page.
+
+    Args:
+        page (Union[~.patch_jobs.ListPatchJobInstanceDetailsResponse, ~.RawListPatchJobInstanceDetailsResponse]):
+            A page of a ``list_patch_job_instance_details`` listing, in
+            either mode.
+        fields (Sequence[str]): Names of ``PatchJobInstanceDetails``
+            fields, from :data:`PROJECTABLE_FIELDS`.
+
+    Returns:
+        Iterator[Tuple]: The values of ``fields`` for each instance, with
+            enums as ints.
+    """
+    if isinstance(page, RawListPatchJobInstanceDetailsResponse):
+        return page.project(fields)
+    for field in fields:
+        if field not in _DETAILS_FIELDS:
+            raise KeyError(field)
+    details = patch_jobs.ListPatchJobInstanceDetailsResponse.pb(page)
+    return (
+        tuple(getattr(item, field) for field in fields)
+        for item in details.patch_job_instance_details
+    )
+
+
+__all__ = ("PROJECTABLE_FIELDS", "RawListPatchJobInstanceDetailsResponse", "project")
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import sys
+from typing import Any, Iterable, Iterator, Tuple
+
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+_FIELDS = ("name", "instance_system_id", "state", "failure_reason", "attempt_count")
+
+
+class InstanceDetailsRecord:
+    """A compact, immutable view of a ``PatchJobInstanceDetails``.
+
+    A record keeps the five fields of an instance's details in slots,
+    with the patch state as a plain int and the failure reason interned,
+    as there are only a handful of distinct reasons in a patch job. It
+    takes a fraction of the memory of a proto-plus message, which makes
+    holding millions of instances in memory practical. Use
+    :meth:`to_proto` to get the message back.
+
+    Pagers of ``list_patch_job_instance_details`` yield records from
+    their ``records`` method.
+    """
+
+    __slots__ = _FIELDS
+
+    FIELDS = _FIELDS
+
+    def __init__(
+        self,
+        name: str = "",
+        instance_system_id: str = "",
+        state: int = 0,
+        failure_reason: str = "",
+        attempt_count: int = 0,
+    ):
+        _set = object.__setattr__
+        _set(self, "name", name)
+        _set(self, "instance_system_id", instance_system_id)
+        _set(self, "state", int(state))
+        _set(self, "failure_reason", sys.intern(failure_reason))
+        _set(self, "attempt_count", attempt_count)
+
+    @classmethod
+    def from_proto(
+        cls, details: patch_jobs.PatchJobInstanceDetails
+    ) -> "InstanceDetailsRecord":
+        """Build a record from a ``PatchJobInstanceDetails``."""
+        pb = patch_jobs.PatchJobInstanceDetails.pb(details)
+        return cls(
+            pb.name,
+            pb.instance_system_id,
+            pb.state,
+            pb.failure_reason,
+            pb.attempt_count,
+        )
+
+    def to_proto(self) -> patch_jobs.PatchJobInstanceDetails:
+        """Convert the record back to a ``PatchJobInstanceDetails``."""
+        return patch_jobs.PatchJobInstanceDetails(
+            name=self.name,
+            instance_system_id=self.instance_system_id,
+            state=self.state,
+            failure_reason=self.failure_reason,
+            attempt_count=self.attempt_count,
+        )
+
+    @property
+    def patch_state(self) -> patch_jobs.Instance.PatchState:
+        """The state as a ``PatchState`` enum."""
+        return patch_jobs.Instance.PatchState(self.state)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("{0} is immutable".format(type(self).__name__))
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("{0} is immutable".format(type(self).__name__))
+
+    def __reduce__(self):
+        return type(self), self._values()
+
+    def _values(self) -> Tuple[str, str, int, str, int]:
+        return (
+            self.name,
+            self.instance_system_id,
+            self.state,
+            self.failure_reason,
+            self.attempt_count,
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, InstanceDetailsRecord):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self) -> int:
+        return hash(self._values())
+
+    def __repr__(self) -> str:
+        return "{0}({1})".format(
+            type(self).__name__,
+            ", ".join(
+                "{0}={1!r}".format(f, v) for f, v in zip(_FIELDS, self._values())
+            ),
+        )
+
+
+def make_records(rows: Iterable[Tuple]) -> Iterator[InstanceDetailsRecord]:
+    """Build records from tuples of the fields in ``InstanceDetailsRecord.FIELDS``.
+
+    Args:
+        rows (Iterable[Tuple]): The field values of each record, for
+            example from a pager's ``project`` method.
+
+    Yields:
+        ~.InstanceDetailsRecord: The records.
+    """
+    for row in rows:
+        yield InstanceDetailsRecord(*row)
+
+
+__all__ = ("InstanceDetailsRecord", "make_records")
@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import sqlite3
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from google.api_core import gapic_v1  # type: ignore
+from google.api_core import retry as retries  # type: ignore
+
+from google.cloud.osconfig_v1.services.os_config_service.filters import (
+    PatchJobFilter,
+    timestamp_key,
+)
+from google.cloud.osconfig_v1.types import patch_deployments
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS patch_jobs (
+    name TEXT PRIMARY KEY,
+    parent TEXT NOT NULL,
+    state INTEGER NOT NULL,
+    patch_deployment TEXT NOT NULL,
+    create_time INTEGER NOT NULL,
+    update_time INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS patch_jobs_state ON patch_jobs (state);
+CREATE INDEX IF NOT EXISTS patch_jobs_patch_deployment
+    ON patch_jobs (patch_deployment);
+CREATE INDEX IF NOT EXISTS patch_jobs_create_time ON patch_jobs (create_time);
+CREATE TABLE IF NOT EXISTS patch_deployments (
+    name TEXT PRIMARY KEY,
+    parent TEXT NOT NULL,
+    update_time INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS patch_deployments_parent ON patch_deployments (parent);
+"""
+
+
+def _parent(name: str) -> str:
+    # "projects/p/patchJobs/j" -> "projects/p"
+    return "/".join(name.split("/")[:2])
+
+
+class SnapshotStore:
+    """A durable local mirror of patch jobs and patch deployments.
+
+    Resources are kept in an SQLite database as serialized protocol
+    buffers, alongside the fields they are looked up by: patch jobs are
+    indexed by name, state, patch deployment and creation time, and patch
+    deployments by name and project. Only the rows a lookup returns are
+    deserialized, and the database file is memory-mapped, so tools can
+    start from a large store without any RPC or a full load.
+
+    The store is refreshed from the service with
+    :meth:`refresh_patch_jobs` and :meth:`refresh_patch_deployments`. It
+    is thread-safe; several processes may share a database file. Each
+    iteration over :meth:`patch_jobs` or :meth:`patch_deployments` reads
+    a consistent snapshot through its own connection, without blocking
+    writers. In-memory stores have a single connection, so their
+    iterations read every matching row at once.
+
+    .. code-block:: python
+
+        with SnapshotStore("osconfig.db") as store:
+            store.refresh_patch_deployments(client, "projects/p")
+            running = list(store.patch_jobs(state=PatchJob.State.PATCHING))
+    """
+
+    def __init__(self, path: str, *, mmap_size: int = 256 * 1024 * 1024):
+        """Open or create a store.
+
+        Args:
+            path (str): The database file, or ``":memory:"``.
+            mmap_size (int): The number of bytes of the database file to
+                memory-map for reads.
+        """
+        self._path = path
+        self._mmap_size = mmap_size
+        self._connection = self._connect()
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            if path != ":memory:":
+                # Write-ahead logging lets iterations read while others write.
+                self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> "SnapshotStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._connection.close()
+
+    def put_patch_jobs(self, jobs: Iterable[patch_jobs.PatchJob]) -> int:
+        """Insert or replace patch jobs.
+
+        Args:
+            jobs (Iterable[~.patch_jobs.PatchJob]): The jobs.
+
+        Returns:
+            int: The number of jobs written.
+        """
+        rows = []
+        for patch_job in jobs:
+            pb = patch_jobs.PatchJob.pb(patch_job)
+            rows.append(
+                (
+                    pb.name,
+                    _parent(pb.name),
+                    pb.state,
+                    pb.patch_deployment,
+                    timestamp_key(pb.create_time),
+                    timestamp_key(pb.update_time),
+                    pb.SerializeToString(),
+                )
+            )
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO patch_jobs VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def put_patch_deployments(
+        self, deployments: Iterable[patch_deployments.PatchDeployment]
+    ) -> int:
+        """Insert or replace patch deployments.
+
+        Args:
+            deployments (Iterable[~.patch_deployments.PatchDeployment]): The
+                patch deployments.
+
+        Returns:
+            int: The number of patch deployments written.
+        """
+        rows = []
+        for deployment in deployments:
+            pb = patch_deployments.PatchDeployment.pb(deployment)
+            rows.append(
+                (
+                    pb.name,
+                    _parent(pb.name),
+                    timestamp_key(pb.update_time),
+                    pb.SerializeToString(),
+                )
+            )
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO patch_deployments VALUES (?, ?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def get_patch_job(self, name: str) -> Optional[patch_jobs.PatchJob]:
+        """Look up a patch job by name.
+
+        Args:
+            name (str): The name, in the form ``projects/*/patchJobs/*``.
+
+        Returns:
+            Optional[~.patch_jobs.PatchJob]: The job, if it is stored.
+        """
+        rows = self._fetch("SELECT data FROM patch_jobs WHERE name = ?", (name,))
+        return next(_deserialize(patch_jobs.PatchJob, rows), None)
+
+    def get_patch_deployment(
+        self, name: str
+    ) -> Optional[patch_deployments.PatchDeployment]:
+        """Look up a patch deployment by name.
+
+        Args:
+            name (str): The name, in the form
+                ``projects/*/patchDeployments/*``.
+
+        Returns:
+            Optional[~.patch_deployments.PatchDeployment]: The patch
+                deployment, if it is stored.
+        """
+        rows = self._fetch("SELECT data FROM patch_deployments WHERE name = ?", (name,))
+        return next(_deserialize(patch_deployments.PatchDeployment, rows), None)
+
+    def patch_jobs(
+        self,
+        *,
+        parent: str = None,
+        state: patch_jobs.PatchJob.State = None,
+        patch_deployment: str = None
+    ) -> Iterator[patch_jobs.PatchJob]:
+        """Iterate over stored patch jobs, newest first.
+
+        Args:
+            parent (str): Only jobs of this project, in the form
+                ``projects/*``.
+            state (~.patch_jobs.PatchJob.State): Only jobs in this state.
+            patch_deployment (str): Only jobs created by this patch
+                deployment.
+
+        Yields:
+            ~.patch_jobs.PatchJob: The matching jobs, deserialized as they
+                are iterated.
+        """
+        where, parameters = _where(
+            parent=parent,
+            state=None if state is None else int(state),
+            patch_deployment=patch_deployment,
+        )
+        rows = self._scan(
+            "SELECT data FROM patch_jobs{0} ORDER BY create_time DESC".format(where),
+            parameters,
+        )
+        return _deserialize(patch_jobs.PatchJob, rows)
+
+    def patch_deployments(
+        self, *, parent: str = None
+    ) -> Iterator[patch_deployments.PatchDeployment]:
+        """Iterate over stored patch deployments, by name.
+
+        Args:
+            parent (str): Only patch deployments of this project, in the
+                form ``projects/*``.
+
+        Yields:
+            ~.patch_deployments.PatchDeployment: The patch deployments,
+                deserialized as they are iterated.
+        """
+        where, parameters = _where(parent=parent)
+        rows = self._scan(
+            "SELECT data FROM patch_deployments{0} ORDER BY name".format(where),
+            parameters,
+        )
+        return _deserialize(patch_deployments.PatchDeployment, rows)
+
+    def count_patch_jobs_by_state(self, *, parent: str = None) -> Dict[int, int]:
+        """Count the stored patch jobs in each state, without loading them.
+
+        Args:
+            parent (str): Only count jobs of this project.
+
+        Returns:
+            Dict[int, int]: The number of jobs keyed by ``PatchJob.State``.
+        """
+        where, parameters = _where(parent=parent)
+        rows = self._fetch(
+            "SELECT state, COUNT(*) FROM patch_jobs{0} GROUP BY state".format(where),
+            parameters,
+        )
+        return {patch_jobs.PatchJob.State(state): count for state, count in rows}
+
+    def refresh_patch_jobs(
+        self,
+        client,
+        parent: str,
+        *,
+        criteria: PatchJobFilter = None,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = gapic_v1.method.DEFAULT,
+        metadata: Sequence[Tuple[str, str]] = ()
+    ) -> int:
+        """Store the patch jobs of a project listed by the service.
+
+        Each page is written as soon as it arrives. Patch jobs cannot be
+        deleted, so stored jobs missing from the listing are kept. For
+        frequent refreshes of long histories, see
+        :class:`~.sync.PatchJobSync`.
+
+        Args:
+            client (~.OsConfigServiceClient): The client used to list the
+                jobs.
+            parent (str): The project, in the form ``projects/*``.
+            criteria (~.PatchJobFilter): Restricts the jobs listed.
+            retry (google.api_core.retry.Retry): Designation of what errors,
+                if any, should be retried.
+            timeout (float): The timeout for each request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with each request as metadata.
+
+        Returns:
+            int: The number of jobs stored.
+        """
+        criteria = criteria or PatchJobFilter()
+        pager = client.list_patch_jobs(
+            criteria.request(parent), retry=retry, timeout=timeout, metadata=metadata
+        )
+        count = 0
+        for page in pager.pages:
+            count += self.put_patch_jobs(criteria.filter(page.patch_jobs))
+        return count
+
+    def refresh_patch_deployments(
+        self,
+        client,
+        parent: str,
+        *,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = gapic_v1.method.DEFAULT,
+        metadata: Sequence[Tuple[str, str]] = ()
+    ) -> int:
+        """Replace the stored patch deployments of a project.
+
+        Stored patch deployments of the project that the service no longer
+        lists are removed once the listing completes.
+
+        Args:
+            client (~.OsConfigServiceClient): The client used to list the
+                patch deployments.
+            parent (str): The project, in the form ``projects/*``.
+            retry (google.api_core.retry.Retry): Designation of what errors,
+                if any, should be retried.
+            timeout (float): The timeout for each request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with each request as metadata.
+
+        Returns:
+            int: The number of patch deployments stored.
+        """
+        pager = client.list_patch_deployments(
+            parent=parent, retry=retry, timeout=timeout, metadata=metadata
+        )
+        names = set()
+        for page in pager.pages:
+            self.put_patch_deployments(page.patch_deployments)
+            names.update(deployment.name for deployment in page.patch_deployments)
+
+        stored = self._fetch(
+            "SELECT name FROM patch_deployments WHERE parent = ?", (parent,)
+        )
+        deleted = [(name,) for name, in stored if name not in names]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM patch_deployments WHERE name = ?", deleted
+            )
+        return len(names)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._path, check_same_thread=False)
+        connection.execute("PRAGMA mmap_size = {0:d}".format(self._mmap_size))
+        return connection
+
+    def _fetch(self, sql: str, parameters: Tuple = ()) -> List[Tuple]:
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def _scan(self, sql: str, parameters: Tuple = ()) -> Iterator[Tuple]:
+        if self._path == ":memory:":
+            yield from self._fetch(sql, parameters)
+            return
+
+        # Rows are fetched in batches, so that large results are never
+        # materialized at once. The statement stays open between batches,
+        # so it runs on a connection of its own rather than the shared one.
+        connection = self._connect()
+        try:
+            cursor = connection.execute(sql, parameters)
+            rows = cursor.fetchmany(256)
+            while rows:
+                yield from rows
+                rows = cursor.fetchmany(256)
+        finally:
+            connection.close()
+
+
+def _where(**criteria) -> Tuple[str, Tuple]:
+    # Build a WHERE clause matching every criterion that is not None.
+    terms = [(column, value) for column, value in criteria.items() if value is not None]
+    if not terms:
+        return "", ()
+    clause = " WHERE " + " AND ".join("{0} = ?".format(column) for column, _ in terms)
+    return clause, tuple(value for _, value in terms)
+
+
+def _deserialize(message_type, rows: Iterator[Tuple]) -> Iterator:
+    for (data,) in rows:
+        yield message_type.deserialize(data)
+
+
+__all__ = ("SnapshotStore",)
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import itertools
+import operator
+from typing import Dict, Iterable, Sequence
+
+from google.cloud.osconfig_v1.types import patch_jobs
+
+try:
+    import numpy  # type: ignore
+except ImportError:  # pragma: NO COVER
+    numpy = None
+
+
+# The counters of ``PatchJob.InstanceDetailsSummary``, in field number order.
+SUMMARY_FIELDS = tuple(
+    field.name
+    for field in sorted(
+        patch_jobs.PatchJob.InstanceDetailsSummary.pb().DESCRIPTOR.fields,
+        key=operator.attrgetter("number"),
+    )
+)
+
+# Counters of instances that were patched successfully.
+SUCCEEDED_FIELDS = (
+    "succeeded_instance_count",
+    "succeeded_reboot_required_instance_count",
+)
+
+_get_counters = operator.attrgetter(*SUMMARY_FIELDS)
+
+
+class SummaryTable:
+    """The instance details summaries of many patch jobs, as arrays.
+
+    ``counts`` is a dense ``(jobs, 15)`` int64 matrix with one column per
+    name in :data:`SUMMARY_FIELDS`, so fleet-wide reports are computed
+    with vectorized NumPy operations rather than attribute access on
+    every job. This requires the ``numpy`` package, which is installed
+    with the ``numpy`` extra.
+
+    Attributes:
+        names (numpy.ndarray): The name of each patch job.
+        states (numpy.ndarray): The ``PatchJob.State`` of each patch job,
+            as int32.
+        counts (numpy.ndarray): The summary counters of each patch job.
+    """
+
+    def __init__(self, names, states, counts):
+        self.names = names
+        self.states = states
+        self.counts = counts
+
+    @classmethod
+    def from_patch_jobs(cls, jobs: Iterable[patch_jobs.PatchJob]) -> "SummaryTable":
+        """Build a table from patch jobs.
+
+        Args:
+            jobs (Iterable[~.patch_jobs.PatchJob]): The patch jobs, for
+                example a :class:`~.pagers.ListPatchJobsPager`.
+
+        Returns:
+            ~.SummaryTable: The table, with one row per job in order.
+        """
+        if numpy is None:
+            raise ImportError(
+                "Summary tables require numpy; install it with "
+                "`pip install google-cloud-os-config[numpy]`."
+            )
+
+        # Read from the underlying protobuf messages, which is much faster
+        # than going through the proto-plus wrappers for every field.
+        pbs = [patch_jobs.PatchJob.pb(job) for job in jobs]
+        counts = numpy.fromiter(
+            itertools.chain.from_iterable(
+                _get_counters(pb.instance_details_summary) for pb in pbs
+            ),
+            dtype=numpy.int64,
+            count=len(pbs) * len(SUMMARY_FIELDS),
+        ).reshape(len(pbs), len(SUMMARY_FIELDS))
+        names = numpy.array([pb.name for pb in pbs], dtype=object)
+        states = numpy.fromiter(
+            (pb.state for pb in pbs), dtype=numpy.int32, count=len(pbs)
+        )
+        return cls(names, states, counts)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def column(self, field: str):
+        """Return one counter for every job.
+
+        Args:
+            field (str): A name in :data:`SUMMARY_FIELDS`.
+
+        Returns:
+            numpy.ndarray: A view of the counter's column.
+        """
+        return self.counts[:, SUMMARY_FIELDS.index(field)]
+
+    def select(self, mask) -> "SummaryTable":
+        """Return the rows selected by a boolean mask or index array.
+
+        For example, ``table.select(table.states == PatchJob.State.SUCCEEDED)``.
+        """
+        return type(self)(self.names[mask], self.states[mask], self.counts[mask])
+
+    def totals(self) -> Dict[str, int]:
+        """Sum every counter over all jobs."""
+        return dict(zip(SUMMARY_FIELDS, self.counts.sum(axis=0).tolist()))
+
+    def instance_counts(self):
+        """Return the total number of instances of each job.
+
+        Returns:
+            numpy.ndarray: The row sums of :attr:`counts`.
+        """
+        return self.counts.sum(axis=1)
+
+    def success_ratios(self):
+        """Return the fraction of instances each job patched successfully.
+
+        Returns:
+            numpy.ndarray: The ratio for each job, or NaN for jobs without
+                instances.
+        """
+        succeeded = sum(self.column(field) for field in SUCCEEDED_FIELDS)
+        total = self.instance_counts()
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            return succeeded / total
+
+    def success_ratio(self) -> float:
+        """Return the fraction of all instances patched successfully."""
+        total = int(self.counts.sum())
+        if not total:
+            return float("nan")
+        succeeded = sum(int(self.column(field).sum()) for field in SUCCEEDED_FIELDS)
+        return succeeded / total
+
+    def percentiles(
+        self, values, q: Sequence[float] = (50, 90, 99)
+    ) -> Dict[float, float]:
+        """Compute percentiles over all jobs, ignoring NaN values.
+
+        Args:
+            values (Union[str, numpy.ndarray]): A name in
+                :data:`SUMMARY_FIELDS`, or one value per job such as the
+                result of :meth:`success_ratios`.
+            q (Sequence[float]): The percentiles to compute, between 0 and
+                100.
+
+        Returns:
+            Dict[float, float]: Each percentile mapped to its value.
+        """
+        if isinstance(values, str):
+            values = self.column(values)
+        return dict(zip(q, numpy.nanpercentile(values, q).tolist()))
+
+    def to_records(self):
+        """Return the table as a NumPy structured array.
+
+        The array has a ``name`` field, a ``state`` field and one int64
+        field per name in :data:`SUMMARY_FIELDS`.
+        """
+        dtype = [("name", object), ("state", numpy.int32)] + [
+            (field, numpy.int64) for field in SUMMARY_FIELDS
+        ]
+        records = numpy.empty(len(self), dtype=dtype)
+        records["name"] = self.names
+        records["state"] = self.states
+        for index, field in enumerate(SUMMARY_FIELDS):
+            records[field] = self.counts[:, index]
+        return records
+
+
+__all__ = ("SUCCEEDED_FIELDS", "SUMMARY_FIELDS", "SummaryTable")
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import datetime
+import math
+import os
+import tempfile
+import threading
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from google.api_core import gapic_v1  # type: ignore
+from google.api_core import retry as retries  # type: ignore
+
+from google.cloud.osconfig_v1.services.os_config_service import watchers
+from google.cloud.osconfig_v1.services.os_config_service.filters import (
+    PatchJobFilter,
+    timestamp_key,
+)
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+class SyncResult(NamedTuple):
+    """The outcome of one :meth:`PatchJobSync.sync`.
+
+    Attributes:
+        full (bool): Whether the whole listing was fetched, because there
+            was no snapshot to start from.
+        added (int): The number of jobs new to the snapshot.
+        updated (int): The number of jobs whose ``update_time`` changed.
+        refreshed (int): The number of running jobs fetched individually
+            because they were not in the pages listed.
+        pages_fetched (int): The number of listing pages fetched.
+        bytes_fetched (int): The serialized size of the pages and jobs
+            fetched.
+        pages_avoided (int): An estimate of the listing pages a full
+            listing would have fetched in addition.
+        bytes_avoided (int): The serialized size of the snapshot jobs
+            that were not fetched again.
+    """
+
+    full: bool
+    added: int
+    updated: int
+    refreshed: int
+    pages_fetched: int
+    bytes_fetched: int
+    pages_avoided: int
+    bytes_avoided: int
+
+
+class PatchJobSync:
+    """Keep a local snapshot of a project's patch jobs up to date.
+
+    The first :meth:`sync` lists every patch job. Later syncs only list
+    until they reach a page in which every job was created before the
+    high-water mark, the latest ``create_time`` in the snapshot, less
+    ``overlap``. Jobs still running in the snapshot that were not in
+    those pages are refreshed with ``get_patch_job``; jobs in a terminal
+    state never change and are not fetched again.
+
+    Listing only stops early once the jobs listed so far show that
+    ``list_patch_jobs`` returns the newest jobs first; otherwise every
+    page is listed.
+    The service can only filter on the patch deployment, which is pushed
+    down when ``criteria`` names one; other criteria are applied locally
+    by :meth:`jobs`.
+
+    When ``path`` is given, the snapshot is loaded from that file and
+    saved back after every sync as a serialized
+    :class:`~.patch_jobs.ListPatchJobsResponse`.
+
+    The snapshot may be read from other threads; reads wait for a sync in
+    progress to finish.
+    """
+
+    def __init__(
+        self,
+        client,
+        parent: str,
+        path: str = None,
+        *,
+        criteria: PatchJobFilter = None,
+        page_size: int = 100,
+        overlap: datetime.timedelta = datetime.timedelta(minutes=5)
+    ):
+        """Instantiate the sync engine.
+
+        Args:
+            client (~.OsConfigServiceClient): The client used to list and
+                get patch jobs.
+            parent (str): The project, in the form ``projects/*``.
+            path (str): The file the snapshot is persisted to.
+            criteria (~.PatchJobFilter): Restricts the jobs synced.
+            page_size (int): The number of jobs requested per page.
+            overlap (datetime.timedelta): How far before the high-water
+                mark listing continues, to allow for clock skew and jobs
+                committed out of order.
+        """
+        self._client = client
+        self._parent = parent
+        self._path = path
+        self._criteria = criteria or PatchJobFilter()
+        self._page_size = page_size
+        self._overlap = int(overlap.total_seconds() * 1e9)
+        self._jobs = {}  # type: Dict[str, patch_jobs.PatchJob]
+        self._lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            with open(path, "rb") as snapshot:
+                response = patch_jobs.ListPatchJobsResponse.deserialize(snapshot.read())
+            for patch_job in response.patch_jobs:
+                self._jobs[patch_job.name] = patch_job
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    @property
+    def watermark(self) -> Optional[datetime.datetime]:
+        """The latest ``create_time`` in the snapshot, if it has any jobs."""
+        with self._lock:
+            if not self._jobs:
+                return None
+            latest = max(
+                (
+                    patch_jobs.PatchJob.pb(job).create_time
+                    for job in self._jobs.values()
+                ),
+                key=timestamp_key,
+            )
+        return latest.ToDatetime().replace(tzinfo=datetime.timezone.utc)
+
+    def get(self, name: str) -> Optional[patch_jobs.PatchJob]:
+        """Return the snapshot of a patch job, if it has been synced."""
+        return self._jobs.get(name)
+
+    def jobs(self) -> List[patch_jobs.PatchJob]:
+        """Return the synced patch jobs that meet the criteria, newest first."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        jobs.sort(
+            key=lambda job: timestamp_key(patch_jobs.PatchJob.pb(job).create_time),
+            reverse=True,
+        )
+        return list(self._criteria.filter(jobs))
+
+    def sync(
+        self,
+        *,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = gapic_v1.method.DEFAULT,
+        metadata: Sequence[Tuple[str, str]] = ()
+    ) -> SyncResult:
+        """Bring the snapshot up to date with the service.
+
+        Args:
+            retry (google.api_core.retry.Retry): Designation of what errors,
+                if any, should be retried.
+            timeout (float): The timeout for each request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with each request as metadata.
+
+        Returns:
+            ~.SyncResult: What was fetched and avoided.
+        """
+        with self._lock:
+            result = self._sync(retry=retry, timeout=timeout, metadata=metadata)
+            if self._path is not None:
+                self._save()
+            return result
+
+    def _sync(self, **kwargs) -> SyncResult:
+        # The listing is ordered by creation, so the cutoff is taken from
+        # create_time too. Jobs created before it that may still change are
+        # running, and refreshed below.
+        cutoff = None
+        if self._jobs:
+            cutoff = (
+                max(
+                    timestamp_key(patch_jobs.PatchJob.pb(job).create_time)
+                    for job in self._jobs.values()
+                )
+                - self._overlap
+            )
+
+        pager = self._client.list_patch_jobs(
+            self._criteria.request(self._parent, self._page_size), **kwargs
+        )
+        seen = set()
+        added = updated = pages_fetched = bytes_fetched = 0
+        # The creation time of the last job listed, and whether the listing
+        # has been newest first so far; None until two jobs were compared.
+        last_created = None
+        newest_first = None
+        for page in pager.pages:
+            pb = patch_jobs.ListPatchJobsResponse.pb(page)
+            pages_fetched += 1
+            bytes_fetched += pb.ByteSize()
+
+            older = True
+            for job_pb in pb.patch_jobs:
+                seen.add(job_pb.name)
+                created = timestamp_key(job_pb.create_time)
+                if last_created is not None and newest_first is not False:
+                    newest_first = created <= last_created
+                last_created = created
+                if cutoff is None or created >= cutoff:
+                    older = False
+                previous = self._jobs.get(job_pb.name)
+                if previous is None:
+                    added += 1
+                elif patch_jobs.PatchJob.pb(previous).update_time != job_pb.update_time:
+                    updated += 1
+                self._jobs[job_pb.name] = patch_jobs.PatchJob.wrap(job_pb)
+
+            # When the listing is newest first, the remaining pages only
+            # hold jobs created before the last sync; they are either
+            # terminal or refreshed below.
+            if cutoff is not None and older and newest_first:
+                break
+
+        unseen = [job for name, job in self._jobs.items() if name not in seen]
+        refreshed = 0
+        bytes_avoided = 0
+        for patch_job in unseen:
+            if watchers.is_terminal(patch_job):
+                bytes_avoided += patch_jobs.PatchJob.pb(patch_job).ByteSize()
+                continue
+            fresh = self._client.get_patch_job(name=patch_job.name, **kwargs)
+            refreshed += 1
+            bytes_fetched += patch_jobs.PatchJob.pb(fresh).ByteSize()
+            if (
+                patch_jobs.PatchJob.pb(fresh).update_time
+                != patch_jobs.PatchJob.pb(patch_job).update_time
+            ):
+                updated += 1
+            self._jobs[fresh.name] = fresh
+
+        return SyncResult(
+            full=cutoff is None,
+            added=added,
+            updated=updated,
+            refreshed=refreshed,
+            pages_fetched=pages_fetched,
+            bytes_fetched=bytes_fetched,
+            pages_avoided=math.ceil(len(unseen) / self._page_size)
+            if self._page_size
+            else 0,
+            bytes_avoided=bytes_avoided,
+        )
+
+    def _save(self) -> None:
+        # Write to a temporary file first, so that a crash never leaves a
+        # truncated snapshot behind.
+        data = patch_jobs.ListPatchJobsResponse.serialize(
+            patch_jobs.ListPatchJobsResponse(patch_jobs=list(self._jobs.values()))
+        )
+        directory = os.path.dirname(os.path.abspath(self._path))
+        fd, temporary = tempfile.mkstemp(dir=directory, prefix=".patch-jobs-")
+        try:
+            with os.fdopen(fd, "wb") as snapshot:
+                snapshot.write(data)
+            os.replace(temporary, self._path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+
+__all__ = ("PatchJobSync", "SyncResult")
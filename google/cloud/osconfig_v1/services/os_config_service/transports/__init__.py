@@ -16,21 +16,65 @@
 #
 
 from collections import OrderedDict
+import importlib
+import sys
 from typing import Dict, Type
 
 from .base import OsConfigServiceTransport
 from .grpc import OsConfigServiceGrpcTransport
-from .grpc_asyncio import OsConfigServiceGrpcAsyncIOTransport
 
 
-# Compile a registry of transports.
+# Compile a registry of transports. The asyncio transport imports grpc.aio,
+# and the other names are only needed by some clients, so they are imported
+# on first access (PEP 562), and the transports registered then.
 _transport_registry = OrderedDict()  # type: Dict[str, Type[OsConfigServiceTransport]]
 _transport_registry["grpc"] = OsConfigServiceGrpcTransport
-_transport_registry["grpc_asyncio"] = OsConfigServiceGrpcAsyncIOTransport
+
+_EXPORTS = {
+    "ChannelPool": ".channel_pool",
+    "CircuitBreakers": ".circuit_breaker",
+    "CircuitOpenError": ".circuit_breaker",
+    "DEFAULT_CHANNEL_POOL": ".channel_pool",
+    "OsConfigServiceGrpcAsyncIOTransport": ".grpc_asyncio",
+    "OsConfigServiceGrpcMultiChannelTransport": ".grpc_multichannel",
+}
+
+_TRANSPORT_LABELS = {
+    "OsConfigServiceGrpcAsyncIOTransport": "grpc_asyncio",
+    "OsConfigServiceGrpcMultiChannelTransport": "grpc_multichannel",
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(
+            "module {0!r} has no attribute {1!r}".format(__name__, name)
+        )
+    value = getattr(importlib.import_module(module, __name__), name)
+    if name in _TRANSPORT_LABELS:
+        _transport_registry[_TRANSPORT_LABELS[name]] = value
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if sys.version_info < (3, 7):  # pragma: NO COVER
+    # Module __getattr__ is not supported; import every name now.
+    for _name in _EXPORTS:
+        __getattr__(_name)
 
 
 __all__ = (
+    "ChannelPool",
+    "CircuitBreakers",
+    "CircuitOpenError",
+    "DEFAULT_CHANNEL_POOL",
     "OsConfigServiceTransport",
     "OsConfigServiceGrpcTransport",
     "OsConfigServiceGrpcAsyncIOTransport",
+    "OsConfigServiceGrpcMultiChannelTransport",
 )
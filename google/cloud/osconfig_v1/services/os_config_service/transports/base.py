@@ -17,14 +17,53 @@
 
 import abc
 import typing
+import weakref
 
 from google import auth
+from google.api_core import gapic_v1  # type: ignore
+from google.api_core import retry as retries  # type: ignore
 from google.auth import credentials  # type: ignore
 
+from google.cloud.osconfig_v1.services.os_config_service import policies
 from google.cloud.osconfig_v1.types import patch_deployments
 from google.cloud.osconfig_v1.types import patch_jobs
 from google.protobuf import empty_pb2 as empty  # type: ignore
 
+# The modules of the optional features of the transports are imported when
+# the features are used.
+if typing.TYPE_CHECKING:  # pragma: NO COVER
+    from google.cloud.osconfig_v1.services.os_config_service import instrumentation
+    from google.cloud.osconfig_v1.services.os_config_service import ratelimit
+    from google.cloud.osconfig_v1.services.os_config_service.raw import (
+        RawListPatchJobInstanceDetailsResponse,
+    )
+
+    from .channel_pool import ChannelPool
+    from . import circuit_breaker
+
+
+try:
+    from importlib import metadata  # type: ignore
+except ImportError:  # pragma: NO COVER
+    # Python < 3.8 has no importlib.metadata; pkg_resources is much slower
+    # to import.
+    import pkg_resources
+
+    def _distribution_version(name: str) -> str:
+        return pkg_resources.get_distribution(name).version
+
+    _DistributionNotFound = pkg_resources.DistributionNotFound
+else:
+    _distribution_version = metadata.version
+    _DistributionNotFound = metadata.PackageNotFoundError
+
+try:
+    DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo(
+        gapic_version=_distribution_version("google-cloud-os-config")
+    )
+except _DistributionNotFound:
+    DEFAULT_CLIENT_INFO = gapic_v1.client_info.ClientInfo()
+
 
 class OsConfigServiceTransport(abc.ABC):
     """Abstract transport class for OsConfigService."""
@@ -36,6 +75,7 @@ class OsConfigServiceTransport(abc.ABC):
         *,
         host: str = "osconfig.googleapis.com",
         credentials: credentials.Credentials = None,
+        client_info: gapic_v1.client_info.ClientInfo = DEFAULT_CLIENT_INFO,
         **kwargs,
     ) -> None:
         """Instantiate the transport.
@@ -47,6 +87,9 @@ class OsConfigServiceTransport(abc.ABC):
                 credentials identify the application to the service; if none
                 are specified, the client will attempt to ascertain the
                 credentials from the environment.
+            client_info (google.api_core.gapic_v1.client_info.ClientInfo):
+                The client info used to send a user-agent string along with
+                API requests.
         """
         # Save the hostname. Default to port 443 (HTTPS) if none is specified.
         if ":" not in host:
@@ -61,6 +104,200 @@ class OsConfigServiceTransport(abc.ABC):
         # Save the credentials.
         self._credentials = credentials
 
+        # Wrapped RPC methods are built on first use and cached here, keyed
+        # by method name.
+        self._client_info = client_info
+        self._wrapped_methods = {}  # type: typing.Dict[str, typing.Callable]
+
+        # The default retry and timeout of each method, and the budget their
+        # retries draw from.
+        self._method_policies = policies.DEFAULT_METHOD_POLICIES
+        self._retry_budget = policies.RetryBudget()
+
+    # The function used to wrap the raw RPC callables; asynchronous
+    # transports override this with the coroutine-aware variant.
+    _wrap_method = staticmethod(gapic_v1.method.wrap_method)
+
+    # Likewise, the functions used to instrument the wrapped methods, to
+    # guard them with circuit breakers and to rate limit them, and the class
+    # of their retries. Their modules are only imported once a transport
+    # uses them.
+    _retry_class = retries.Retry
+
+    @staticmethod
+    def _instrument_method(rpc, name, metrics):
+        from google.cloud.osconfig_v1.services.os_config_service import instrumentation
+
+        return instrumentation.instrument(rpc, name, metrics)
+
+    @staticmethod
+    def _guard_method(rpc, endpoint, name, breakers, metrics=None):
+        from . import circuit_breaker
+
+        return circuit_breaker.guard(rpc, endpoint, name, breakers, metrics)
+
+    @staticmethod
+    def _limit_method(stub, name, limiter, metrics=None):
+        from google.cloud.osconfig_v1.services.os_config_service import ratelimit
+
+        return ratelimit.limit(stub, name, limiter, metrics)
+
+    # The registry wrapped methods record metrics to, if any.
+    _metrics = None  # type: typing.Optional[instrumentation.MetricsRegistry]
+
+    # The circuit breakers guarding the wrapped methods, if any.
+    _circuit_breakers = None  # type: typing.Optional[circuit_breaker.CircuitBreakers]
+
+    # The rate limiter spacing out the wrapped methods' calls, if any.
+    _rate_limiter = None  # type: typing.Optional[ratelimit.RateLimiter]
+
+    # The methods whose calls may be hedged.
+    _hedged_methods = frozenset()  # type: typing.FrozenSet[str]
+
+    def instrument(self, metrics: "instrumentation.MetricsRegistry") -> None:
+        """Record metrics for every RPC made through this transport.
+
+        Args:
+            metrics (~.MetricsRegistry): The registry to record to, or
+                None to stop recording.
+        """
+        self._metrics = metrics
+        self._wrapped_methods.clear()
+
+    def set_circuit_breakers(
+        self, circuit_breakers: "circuit_breaker.CircuitBreakers"
+    ) -> None:
+        """Guard every RPC made through this transport with a circuit breaker.
+
+        Each method has its own breaker for this transport's host, which
+        refuses calls with :class:`~.CircuitOpenError` while it is open.
+
+        Args:
+            circuit_breakers (~.CircuitBreakers): The breakers, or None to
+                stop guarding calls.
+        """
+        self._circuit_breakers = circuit_breakers
+        self._wrapped_methods.clear()
+
+    def set_rate_limiter(self, rate_limiter: "ratelimit.RateLimiter") -> None:
+        """Space out every RPC made through this transport under a rate limit.
+
+        Args:
+            rate_limiter (~.RateLimiter): The limiter, or None to stop
+                limiting calls.
+        """
+        self._rate_limiter = rate_limiter
+        self._wrapped_methods.clear()
+
+    def set_hedged_methods(self, names: typing.Iterable[str]) -> None:
+        """Send the requests of some RPCs so that hedged calls can cancel them.
+
+        See :class:`~.HedgingPolicy`.
+
+        Args:
+            names (Iterable[str]): The names of the methods.
+        """
+        self._hedged_methods = frozenset(names)
+        self._wrapped_methods.clear()
+
+    def configure_policies(
+        self,
+        method_policies: typing.Mapping[str, policies.MethodPolicy] = None,
+        retry_budget: policies.RetryBudget = None,
+    ) -> None:
+        """Set the default retry and timeout of the RPC methods.
+
+        Args:
+            method_policies (Mapping[str, ~.MethodPolicy]): Policies by
+                method name, replacing the defaults of those methods.
+            retry_budget (~.RetryBudget): The budget the default retries of
+                every method draw from, replacing the transport's own.
+        """
+        self._method_policies = policies.merge_policies(method_policies)
+        if retry_budget is not None:
+            self._retry_budget = retry_budget
+        self._wrapped_methods.clear()
+
+    def _wrapped_method(self, name: str) -> typing.Callable:
+        """Return the wrapped callable for the named RPC.
+
+        The wrapped method adds retry and timeout information, and friendly
+        error handling. Its default retry and timeout come from the method's
+        policy, with retries drawn from the transport's retry budget. It is
+        guarded by the method's circuit breaker if the transport has them,
+        and every attempt waits for the rate limiter if there is one. It is
+        built once per transport and reused by every subsequent call.
+
+        Args:
+            name (str): The name of the RPC, e.g. ``"get_patch_job"``.
+
+        Returns:
+            Callable: The wrapped RPC method.
+        """
+        rpc = self._wrapped_methods.get(name)
+        if rpc is None:
+            stub = getattr(self, name)
+            if name in self._hedged_methods:
+                from google.cloud.osconfig_v1.services.os_config_service import hedging
+
+                stub = hedging.cancellable(stub)
+            if self._metrics is not None:
+                from google.cloud.osconfig_v1.services.os_config_service import (
+                    instrumentation,
+                )
+
+                stub = instrumentation.count_attempts(stub)
+            if self._rate_limiter is not None:
+                stub = self._limit_method(stub, name, self._rate_limiter, self._metrics)
+            policy = self._method_policies.get(name, policies.MethodPolicy(None))
+            rpc = self._retry_budget.track(
+                self._wrap_method(
+                    stub,
+                    default_retry=policy.make_retry(
+                        self._retry_class, self._retry_budget
+                    ),
+                    default_timeout=policy.timeout,
+                    client_info=self._client_info,
+                )
+            )
+            if self._circuit_breakers is not None:
+                rpc = self._guard_method(
+                    rpc, self._host, name, self._circuit_breakers, self._metrics
+                )
+            if self._metrics is not None:
+                rpc = self._instrument_method(rpc, name, self._metrics)
+            self._wrapped_methods[name] = rpc
+        return rpc
+
+    def _acquire_pooled_channel(
+        self,
+        channel_pool: "ChannelPool",
+        key: typing.Hashable,
+        factory: typing.Callable,
+    ):
+        """Draw a channel from ``channel_pool`` for the life of this transport.
+
+        The reference is released by :meth:`_release_pooled_channel`, or
+        when the transport is garbage collected.
+        """
+        channel = channel_pool.acquire(key, factory)
+        self._pooled_channel_finalizer = weakref.finalize(
+            self, channel_pool.release, key
+        )
+        return channel
+
+    def _release_pooled_channel(self) -> bool:
+        """Release a channel drawn from a pool, if there is one.
+
+        Returns:
+            bool: Whether the transport's channel came from a pool.
+        """
+        finalizer = getattr(self, "_pooled_channel_finalizer", None)
+        if finalizer is None:
+            return False
+        finalizer()
+        return True
+
     @property
     def execute_patch_job(
         self
@@ -112,6 +349,18 @@ class OsConfigServiceTransport(abc.ABC):
     ]:
         raise NotImplementedError()
 
+    @property
+    def list_patch_job_instance_details_raw(
+        self
+    ) -> typing.Callable[
+        [patch_jobs.ListPatchJobInstanceDetailsRequest],
+        typing.Union[
+            "RawListPatchJobInstanceDetailsResponse",
+            typing.Awaitable["RawListPatchJobInstanceDetailsResponse"],
+        ],
+    ]:
+        raise NotImplementedError()
+
     @property
     def create_patch_deployment(
         self
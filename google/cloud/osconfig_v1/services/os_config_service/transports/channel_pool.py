@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable
+
+
+class _PooledChannel:
+    __slots__ = ("channel", "references", "idle_since")
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.references = 0
+        self.idle_since = None
+
+
+def _close_channel(channel) -> None:
+    result = channel.close()
+
+    # AsyncIO channels close with a coroutine, which can only be scheduled
+    # from a running event loop; otherwise the channel is closed once it is
+    # garbage collected.
+    if asyncio.iscoroutine(result):
+        # asyncio.get_running_loop is only available from Python 3.7.
+        try:
+            loop = asyncio.get_event_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None and loop.is_running():
+            loop.create_task(result)
+        else:
+            result.close()
+
+
+class ChannelPool:
+    """A reference-counted pool of gRPC channels.
+
+    Transports sharing a pool reuse one channel for each distinct key
+    (typically the host, credentials and SSL configuration) instead of
+    opening a connection each. A channel is closed once it has had no
+    references for ``idle_timeout`` seconds; idle channels are evicted
+    whenever the pool is used, or explicitly with :meth:`evict_idle`.
+
+    AsyncIO channels are bound to the event loop they were created on, so
+    they should only be shared between transports used on the same loop.
+    """
+
+    def __init__(self, idle_timeout: float = 300.0):
+        """Instantiate the pool.
+
+        Args:
+            idle_timeout (float): How long in seconds an unreferenced
+                channel is kept open for reuse.
+        """
+        self._idle_timeout = idle_timeout
+        self._channels = {}  # type: Dict[Hashable, _PooledChannel]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    def acquire(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the pooled channel for ``key``, creating it if needed.
+
+        Every call must be balanced by a call to :meth:`release` with the
+        same key.
+
+        Args:
+            key (Hashable): Identifies the channel configuration.
+            factory (Callable[[], Any]): Creates the channel when the pool
+                has none for ``key``.
+
+        Returns:
+            The channel.
+        """
+        with self._lock:
+            pooled = self._channels.get(key)
+            if pooled is None:
+                pooled = self._channels[key] = _PooledChannel(factory())
+            pooled.references += 1
+            pooled.idle_since = None
+            channel = pooled.channel
+        self.evict_idle()
+        return channel
+
+    def release(self, key: Hashable) -> None:
+        """Drop a reference taken by :meth:`acquire`.
+
+        Args:
+            key (Hashable): The key passed to :meth:`acquire`.
+        """
+        with self._lock:
+            pooled = self._channels.get(key)
+            if pooled is not None and pooled.references > 0:
+                pooled.references -= 1
+                if not pooled.references:
+                    pooled.idle_since = time.monotonic()
+        self.evict_idle()
+
+    def evict_idle(self, idle_timeout: float = None) -> int:
+        """Close the channels that have been unreferenced for too long.
+
+        Args:
+            idle_timeout (float): Overrides the pool's idle timeout; ``0``
+                closes every unreferenced channel.
+
+        Returns:
+            int: The number of channels closed.
+        """
+        if idle_timeout is None:
+            idle_timeout = self._idle_timeout
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                key
+                for key, pooled in self._channels.items()
+                if pooled.idle_since is not None
+                and now - pooled.idle_since >= idle_timeout
+            ]
+            channels = [self._channels.pop(key).channel for key in expired]
+
+        for channel in channels:
+            _close_channel(channel)
+        return len(channels)
+
+
+# A process-wide pool that transports can share.
+DEFAULT_CHANNEL_POOL = ChannelPool()
+
+
+__all__ = ("ChannelPool", "DEFAULT_CHANNEL_POOL")
@@ -0,0 +1,375 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import collections
+import threading
+import time
+from typing import Callable, Deque, Dict, Optional, Tuple, Type
+
+from google.api_core import exceptions  # type: ignore
+
+from google.cloud.osconfig_v1.services.os_config_service import instrumentation
+
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+# The values of the circuit state gauge.
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Errors that suggest the service is unhealthy, rather than that the
+# request was wrong.
+DEFAULT_FAILURE_TYPES = (
+    exceptions.DeadlineExceeded,
+    exceptions.InternalServerError,
+    exceptions.RetryError,
+    exceptions.ServiceUnavailable,
+    exceptions.TooManyRequests,
+    exceptions.Unknown,
+)  # type: Tuple[Type[Exception], ...]
+
+
+class CircuitOpenError(exceptions.GoogleAPIError):
+    """Raised instead of calling a method whose circuit is open.
+
+    Attributes:
+        method (str): The name of the method.
+        retry_after (float): The seconds until the circuit lets a probe
+            request through.
+    """
+
+    def __init__(self, method: str, retry_after: float):
+        super().__init__(
+            "The circuit breaker of {0} is open; calls are refused for "
+            "{1:.1f} more seconds.".format(method, retry_after)
+        )
+        self.method = method
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Tracks the failures of one method and refuses calls while they last.
+
+    The breaker is closed while fewer than ``failure_threshold`` of the
+    last ``window`` calls failed. Once more did, and at least
+    ``minimum_calls`` were made, it opens and refuses every call for
+    ``open_duration`` seconds. It then half-opens, letting up to
+    ``probes`` calls through: if they all succeed it closes again, and
+    if any fails it opens for another ``open_duration``.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: float = 0.5,
+        minimum_calls: int = 20,
+        window: int = 100,
+        open_duration: float = 30.0,
+        probes: int = 3,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Instantiate the breaker.
+
+        Args:
+            failure_threshold (float): The fraction of failed calls that
+                opens the breaker.
+            minimum_calls (int): The calls needed before the breaker can
+                open.
+            window (int): The number of recent calls considered.
+            open_duration (float): How long in seconds the breaker stays
+                open.
+            probes (int): The calls let through while half-open.
+            clock (Callable[[], float]): Returns the current time in
+                seconds; used for testing.
+        """
+        self._failure_threshold = failure_threshold
+        self._minimum_calls = minimum_calls
+        self._open_duration = open_duration
+        self._probes = probes
+        self._clock = clock
+        self._outcomes = collections.deque(maxlen=window)  # type: Deque[bool]
+        self._failures = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_admitted = 0
+        self._probes_succeeded = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """The state: ``"closed"``, ``"open"`` or ``"half_open"``."""
+        with self._lock:
+            if self._state == OPEN and self._retry_after() <= 0:
+                return HALF_OPEN
+            return self._state
+
+    def _retry_after(self) -> float:
+        return self._opened_at + self._open_duration - self._clock()
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+        self._failures = 0
+
+    def acquire(self, method: str = "") -> Optional[str]:
+        """Ask to make a call.
+
+        Args:
+            method (str): The name of the method, for the error message.
+
+        Returns:
+            Optional[str]: The new state, if asking changed it.
+
+        Raises:
+            ~.CircuitOpenError: If the call is refused.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return None
+            transition = None
+            if self._state == OPEN:
+                retry_after = self._retry_after()
+                if retry_after > 0:
+                    raise CircuitOpenError(method, retry_after)
+                self._state = transition = HALF_OPEN
+                self._probes_admitted = self._probes_succeeded = 0
+            if self._probes_admitted >= self._probes:
+                raise CircuitOpenError(method, 0.0)
+            self._probes_admitted += 1
+            return transition
+
+    def release(self) -> None:
+        """Return a probe that was abandoned without an outcome."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes_admitted:
+                self._probes_admitted -= 1
+
+    def record(self, success: bool) -> Optional[str]:
+        """Record the outcome of a call.
+
+        Args:
+            success (bool): Whether the call succeeded.
+
+        Returns:
+            Optional[str]: The new state, if the outcome changed it.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN:
+                if not success:
+                    self._open()
+                    return OPEN
+                self._probes_succeeded += 1
+                if self._probes_succeeded >= self._probes:
+                    self._state = CLOSED
+                    return CLOSED
+                return None
+
+            if self._state == OPEN:
+                # A call admitted before the breaker opened.
+                return None
+
+            if len(self._outcomes) == self._outcomes.maxlen:
+                self._failures -= not self._outcomes[0]
+            self._outcomes.append(success)
+            self._failures += not success
+            if len(
+                self._outcomes
+            ) >= self._minimum_calls and self._failures >= self._failure_threshold * len(
+                self._outcomes
+            ):
+                self._open()
+                return OPEN
+            return None
+
+
+class CircuitBreakers:
+    """Circuit breakers for the methods of a service, per endpoint.
+
+    Pass an instance as the ``circuit_breakers`` argument of a client to
+    refuse calls to a method, with :class:`CircuitOpenError`, while the
+    endpoint keeps failing them. Only errors of ``failure_types`` count
+    as failures; other errors, such as ``NotFound``, mean the service is
+    answering.
+
+    When the client records metrics, the state of each breaker is the
+    ``circuit_state`` gauge (0 closed, 1 half-open, 2 open), and the
+    ``circuit_opened`` and ``circuit_rejected_calls`` counters count how
+    often it opened and how many calls it refused.
+
+    The breakers are thread-safe, and may be shared between clients.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_types: Tuple[Type[Exception], ...] = DEFAULT_FAILURE_TYPES,
+        **settings
+    ):
+        """Instantiate the breakers.
+
+        Args:
+            failure_types (Tuple[Type[Exception], ...]): The errors counted
+                as failures.
+            settings (dict): Passed to every :class:`CircuitBreaker`.
+        """
+        self._failure_types = failure_types
+        self._settings = settings
+        self._breakers = {}  # type: Dict[Tuple[str, str], CircuitBreaker]
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str, method: str) -> CircuitBreaker:
+        """Return the breaker of a method on an endpoint.
+
+        Args:
+            endpoint (str): The host of the service.
+            method (str): The name of the method.
+
+        Returns:
+            ~.CircuitBreaker: The breaker.
+        """
+        key = (endpoint, method)
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = self._breakers[key] = CircuitBreaker(**self._settings)
+            return breaker
+
+    def states(self) -> Dict[Tuple[str, str], str]:
+        """Return the state of every breaker, by endpoint and method."""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {key: breaker.state for key, breaker in breakers.items()}
+
+    def is_failure(self, exc: Exception) -> bool:
+        """Return whether an error counts as a failure."""
+        return isinstance(exc, self._failure_types)
+
+
+class _GuardedMethod:
+    # Calls a wrapped method through a circuit breaker.
+
+    def __init__(
+        self,
+        rpc: Callable,
+        name: str,
+        breakers: CircuitBreakers,
+        breaker: CircuitBreaker,
+        metrics: Optional[instrumentation.MetricsRegistry],
+    ):
+        self._rpc = rpc
+        self._name = name
+        self._breakers = breakers
+        self._breaker = breaker
+        self._metrics = metrics
+
+    def _transition(self, state: Optional[str]) -> None:
+        if state is None or self._metrics is None:
+            return
+        self._metrics.set_gauge(
+            instrumentation.CIRCUIT_STATE, self._name, _STATE_VALUES[state]
+        )
+        if state == OPEN:
+            self._metrics.increment(instrumentation.CIRCUIT_OPENED, self._name)
+
+    def _acquire(self) -> None:
+        try:
+            self._transition(self._breaker.acquire(self._name))
+        except CircuitOpenError:
+            if self._metrics is not None:
+                self._metrics.increment(instrumentation.CIRCUIT_REJECTED, self._name)
+            raise
+
+    def _record(self, exc: Optional[BaseException]) -> None:
+        if exc is not None and not isinstance(exc, Exception):
+            # Cancelled, so there is no outcome.
+            self._breaker.release()
+            return
+        success = exc is None or not self._breakers.is_failure(exc)
+        self._transition(self._breaker.record(success))
+
+    def __call__(self, *args, **kwargs):
+        self._acquire()
+        try:
+            response = self._rpc(*args, **kwargs)
+        except BaseException as exc:
+            self._record(exc)
+            raise
+        self._record(None)
+        return response
+
+
+class _GuardedAsyncMethod(_GuardedMethod):
+    async def __call__(self, *args, **kwargs):
+        self._acquire()
+        try:
+            response = await self._rpc(*args, **kwargs)
+        except BaseException as exc:
+            self._record(exc)
+            raise
+        self._record(None)
+        return response
+
+
+def guard(
+    rpc: Callable,
+    endpoint: str,
+    name: str,
+    breakers: CircuitBreakers,
+    metrics: instrumentation.MetricsRegistry = None,
+) -> Callable:
+    """Call a wrapped method through its circuit breaker.
+
+    Args:
+        rpc (Callable): The wrapped method.
+        endpoint (str): The host of the service.
+        name (str): The name of the method.
+        breakers (~.CircuitBreakers): The breakers.
+        metrics (~.MetricsRegistry): A registry to record the state of
+            the breaker to.
+
+    Returns:
+        Callable: The guarded method.
+    """
+    return _GuardedMethod(rpc, name, breakers, breakers.get(endpoint, name), metrics)
+
+
+def guard_async(
+    rpc: Callable,
+    endpoint: str,
+    name: str,
+    breakers: CircuitBreakers,
+    metrics: instrumentation.MetricsRegistry = None,
+) -> Callable:
+    """Call an asynchronous wrapped method through its circuit breaker.
+
+    See :func:`guard`.
+    """
+    return _GuardedAsyncMethod(
+        rpc, name, breakers, breakers.get(endpoint, name), metrics
+    )
+
+
+__all__ = (
+    "CircuitBreaker",
+    "CircuitBreakers",
+    "CircuitOpenError",
+    "DEFAULT_FAILURE_TYPES",
+    "guard",
+    "guard_async",
+)
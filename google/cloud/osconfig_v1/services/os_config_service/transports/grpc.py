@@ -15,8 +15,9 @@
 # limitations under the License.
 #
 
-from typing import Callable, Dict, Optional, Sequence, Tuple
+from typing import Callable, Dict, Optional, Sequence, Tuple, TYPE_CHECKING
 
+from google.api_core import gapic_v1  # type: ignore
 from google.api_core import grpc_helpers  # type: ignore
 from google import auth  # type: ignore
 from google.auth import credentials  # type: ignore
@@ -29,7 +30,14 @@ from google.cloud.osconfig_v1.types import patch_deployments
 from google.cloud.osconfig_v1.types import patch_jobs
 from google.protobuf import empty_pb2 as empty  # type: ignore
 
-from .base import OsConfigServiceTransport
+from .base import OsConfigServiceTransport, DEFAULT_CLIENT_INFO
+
+if TYPE_CHECKING:  # pragma: NO COVER
+    from google.cloud.osconfig_v1.services.os_config_service.raw import (
+        RawListPatchJobInstanceDetailsResponse,
+    )
+
+    from .channel_pool import ChannelPool
 
 
 class OsConfigServiceGrpcTransport(OsConfigServiceTransport):
@@ -57,7 +65,9 @@ class OsConfigServiceGrpcTransport(OsConfigServiceTransport):
         credentials: credentials.Credentials = None,
         channel: grpc.Channel = None,
         api_mtls_endpoint: str = None,
-        client_cert_source: Callable[[], Tuple[bytes, bytes]] = None
+        client_cert_source: Callable[[], Tuple[bytes, bytes]] = None,
+        client_info: gapic_v1.client_info.ClientInfo = DEFAULT_CLIENT_INFO,
+        channel_pool: "ChannelPool" = None
     ) -> None:
         """Instantiate the transport.
 
@@ -79,6 +89,13 @@ class OsConfigServiceGrpcTransport(OsConfigServiceTransport):
                 callback to provide client SSL certificate bytes and private key
                 bytes, both in PEM format. It is ignored if ``api_mtls_endpoint``
                 is None.
+            client_info (google.api_core.gapic_v1.client_info.ClientInfo):
+                The client info used to send a user-agent string along with
+                API requests.
+            channel_pool (Optional[~.ChannelPool]): A pool to draw the
+                channel from. Transports using the same pool, host,
+                credentials and SSL configuration share one channel. It is
+                ignored if ``channel`` is provided.
 
         Raises:
             google.auth.exceptions.MutualTlsChannelError: If mutual TLS transport
@@ -98,6 +115,9 @@ class OsConfigServiceGrpcTransport(OsConfigServiceTransport):
                 else api_mtls_endpoint + ":443"
             )
 
+            # Pooled channels are keyed by the credentials as given, so that
+            # transports relying on application default credentials share.
+            pool_credentials = credentials
             if credentials is None:
                 credentials, _ = auth.default(scopes=self.AUTH_SCOPES)
 
@@ -108,20 +128,34 @@ class OsConfigServiceGrpcTransport(OsConfigServiceTransport):
                 ssl_credentials = grpc.ssl_channel_credentials(
                     certificate_chain=cert, private_key=key
                 )
+                ssl_key = (cert, key)
             else:
                 ssl_credentials = SslCredentials().ssl_credentials
+                ssl_key = "default"
 
             # create a new channel. The provided one is ignored.
-            self._grpc_channel = type(self).create_channel(
-                host,
-                credentials=credentials,
-                ssl_credentials=ssl_credentials,
-                scopes=self.AUTH_SCOPES,
-            )
+            def create_channel():
+                return self._create_grpc_channel(
+                    host,
+                    credentials=credentials,
+                    ssl_credentials=ssl_credentials,
+                    scopes=self.AUTH_SCOPES,
+                )
+
+            if channel_pool is not None:
+                self._grpc_channel = self._acquire_pooled_channel(
+                    channel_pool,
+                    (self._channel_pool_label(), host, pool_credentials, ssl_key),
+                    create_channel,
+                )
+            else:
+                self._grpc_channel = create_channel()
 
         # Run the base constructor.
-        super().__init__(host=host, credentials=credentials)
+        super().__init__(host=host, credentials=credentials, client_info=client_info)
         self._stubs = {}  # type: Dict[str, Callable]
+        self._channel_pool = channel_pool
+        self._pool_credentials = None if channel else credentials
 
     @classmethod
     def create_channel(
@@ -152,6 +186,16 @@ class OsConfigServiceGrpcTransport(OsConfigServiceTransport):
             host, credentials=credentials, scopes=scopes, **kwargs
         )
 
+    def _create_grpc_channel(self, host: str, **kwargs) -> grpc.Channel:
+        # Build the channel this transport sends requests through; subclasses
+        # may override this to spread requests over several channels.
+        return type(self).create_channel(host, **kwargs)
+
+    def _channel_pool_label(self) -> str:
+        # Distinguishes this transport's channels from those of other
+        # transports sharing a channel pool.
+        return "grpc"
+
     @property
     def grpc_channel(self) -> grpc.Channel:
         """Create the channel designed to connect to this service.
@@ -162,13 +206,31 @@ class OsConfigServiceGrpcTransport(OsConfigServiceTransport):
         # Sanity check: Only create a new channel if we do not already
         # have one.
         if not hasattr(self, "_grpc_channel"):
-            self._grpc_channel = self.create_channel(
-                self._host, credentials=self._credentials
-            )
+            if self._channel_pool is not None:
+                self._grpc_channel = self._acquire_pooled_channel(
+                    self._channel_pool,
+                    (self._channel_pool_label(), self._host, self._pool_credentials),
+                    lambda: self._create_grpc_channel(
+                        self._host, credentials=self._credentials
+                    ),
+                )
+            else:
+                self._grpc_channel = self._create_grpc_channel(
+                    self._host, credentials=self._credentials
+                )
 
         # Return the channel from cache.
         return self._grpc_channel
 
+    def close(self) -> None:
+        """Close the channel used by this transport.
+
+        A channel drawn from a pool is released back to the pool instead,
+        which closes it once no transport has used it for a while.
+        """
+        if not self._release_pooled_channel() and hasattr(self, "_grpc_channel"):
+            self._grpc_channel.close()
+
     @property
     def execute_patch_job(
         self
@@ -309,6 +371,39 @@ class OsConfigServiceGrpcTransport(OsConfigServiceTransport):
             )
         return self._stubs["list_patch_job_instance_details"]
 
+    @property
+    def list_patch_job_instance_details_raw(
+        self
+    ) -> Callable[
+        [patch_jobs.ListPatchJobInstanceDetailsRequest],
+        "RawListPatchJobInstanceDetailsResponse",
+    ]:
+        r"""Return a callable for the list patch job instance
+        details method over gRPC, returning raw responses.
+
+        Responses are kept in their wire format rather than deserialized
+        into proto-plus messages.
+
+        Returns:
+            Callable[[~.ListPatchJobInstanceDetailsRequest],
+                    ~.RawListPatchJobInstanceDetailsResponse]:
+                A function that, when called, will call the underlying RPC
+                on the server.
+        """
+        if "list_patch_job_instance_details_raw" not in self._stubs:
+            from google.cloud.osconfig_v1.services.os_config_service.raw import (
+                RawListPatchJobInstanceDetailsResponse,
+            )
+
+            self._stubs[
+                "list_patch_job_instance_details_raw"
+            ] = self.grpc_channel.unary_unary(
+                "/google.cloud.osconfig.v1.OsConfigService/ListPatchJobInstanceDetails",
+                request_serializer=patch_jobs.ListPatchJobInstanceDetailsRequest.serialize,
+                response_deserializer=RawListPatchJobInstanceDetailsResponse.deserialize,
+            )
+        return self._stubs["list_patch_job_instance_details_raw"]
+
     @property
     def create_patch_deployment(
         self
@@ -17,18 +17,27 @@
 
 from typing import Awaitable, Callable, Dict, Optional, Sequence, Tuple
 
+from google.api_core import gapic_v1  # type: ignore
 from google.api_core import grpc_helpers_async  # type: ignore
+from google.api_core import retry_async as retries_async  # type: ignore
 from google.auth import credentials  # type: ignore
 from google.auth.transport.grpc import SslCredentials  # type: ignore
 
 import grpc  # type: ignore
 from grpc.experimental import aio  # type: ignore
 
+from google.cloud.osconfig_v1.services.os_config_service import instrumentation
+from google.cloud.osconfig_v1.services.os_config_service import ratelimit
+from google.cloud.osconfig_v1.services.os_config_service.raw import (
+    RawListPatchJobInstanceDetailsResponse,
+)
 from google.cloud.osconfig_v1.types import patch_deployments
 from google.cloud.osconfig_v1.types import patch_jobs
 from google.protobuf import empty_pb2 as empty  # type: ignore
 
-from .base import OsConfigServiceTransport
+from .base import OsConfigServiceTransport, DEFAULT_CLIENT_INFO
+from .channel_pool import ChannelPool
+from . import circuit_breaker
 from .grpc import OsConfigServiceGrpcTransport
 
 
@@ -51,6 +60,12 @@ class OsConfigServiceGrpcAsyncIOTransport(OsConfigServiceTransport):
     _grpc_channel: aio.Channel
     _stubs: Dict[str, Callable] = {}
 
+    _wrap_method = staticmethod(gapic_v1.method_async.wrap_method)
+    _instrument_method = staticmethod(instrumentation.instrument_async)
+    _guard_method = staticmethod(circuit_breaker.guard_async)
+    _limit_method = staticmethod(ratelimit.limit_async)
+    _retry_class = retries_async.AsyncRetry
+
     @classmethod
     def create_channel(
         cls,
@@ -87,7 +102,9 @@ class OsConfigServiceGrpcAsyncIOTransport(OsConfigServiceTransport):
         credentials: credentials.Credentials = None,
         channel: aio.Channel = None,
         api_mtls_endpoint: str = None,
-        client_cert_source: Callable[[], Tuple[bytes, bytes]] = None
+        client_cert_source: Callable[[], Tuple[bytes, bytes]] = None,
+        client_info: gapic_v1.client_info.ClientInfo = DEFAULT_CLIENT_INFO,
+        channel_pool: ChannelPool = None
     ) -> None:
         """Instantiate the transport.
 
@@ -109,6 +126,13 @@ class OsConfigServiceGrpcAsyncIOTransport(OsConfigServiceTransport):
                 callback to provide client SSL certificate bytes and private key
                 bytes, both in PEM format. It is ignored if ``api_mtls_endpoint``
                 is None.
+            client_info (google.api_core.gapic_v1.client_info.ClientInfo):
+                The client info used to send a user-agent string along with
+                API requests.
+            channel_pool (Optional[~.ChannelPool]): A pool to draw the
+                channel from. Transports using the same pool, host,
+                credentials and SSL configuration share one channel. It is
+                ignored if ``channel`` is provided.
 
         Raises:
           google.auth.exceptions.MutualTlsChannelError: If mutual TLS transport
@@ -128,6 +152,8 @@ class OsConfigServiceGrpcAsyncIOTransport(OsConfigServiceTransport):
                 else api_mtls_endpoint + ":443"
             )
 
+            pool_credentials = credentials
+
             # Create SSL credentials with client_cert_source or application
             # default SSL credentials.
             if client_cert_source:
@@ -135,20 +161,34 @@ class OsConfigServiceGrpcAsyncIOTransport(OsConfigServiceTransport):
                 ssl_credentials = grpc.ssl_channel_credentials(
                     certificate_chain=cert, private_key=key
                 )
+                ssl_key = (cert, key)
             else:
                 ssl_credentials = SslCredentials().ssl_credentials
+                ssl_key = "default"
 
             # create a new channel. The provided one is ignored.
-            self._grpc_channel = type(self).create_channel(
-                host,
-                credentials=credentials,
-                ssl_credentials=ssl_credentials,
-                scopes=self.AUTH_SCOPES,
-            )
+            def create_channel():
+                return type(self).create_channel(
+                    host,
+                    credentials=credentials,
+                    ssl_credentials=ssl_credentials,
+                    scopes=self.AUTH_SCOPES,
+                )
+
+            if channel_pool is not None:
+                self._grpc_channel = self._acquire_pooled_channel(
+                    channel_pool,
+                    ("grpc_asyncio", host, pool_credentials, ssl_key),
+                    create_channel,
+                )
+            else:
+                self._grpc_channel = create_channel()
 
         # Run the base constructor.
-        super().__init__(host=host, credentials=credentials)
+        super().__init__(host=host, credentials=credentials, client_info=client_info)
         self._stubs = {}
+        self._channel_pool = channel_pool
+        self._pool_credentials = None if channel else credentials
 
     @property
     def grpc_channel(self) -> aio.Channel:
@@ -160,13 +200,31 @@ class OsConfigServiceGrpcAsyncIOTransport(OsConfigServiceTransport):
         # Sanity check: Only create a new channel if we do not already
         # have one.
         if not hasattr(self, "_grpc_channel"):
-            self._grpc_channel = self.create_channel(
-                self._host, credentials=self._credentials
-            )
+            if self._channel_pool is not None:
+                self._grpc_channel = self._acquire_pooled_channel(
+                    self._channel_pool,
+                    ("grpc_asyncio", self._host, self._pool_credentials),
+                    lambda: self.create_channel(
+                        self._host, credentials=self._credentials
+                    ),
+                )
+            else:
+                self._grpc_channel = self.create_channel(
+                    self._host, credentials=self._credentials
+                )
 
         # Return the channel from cache.
         return self._grpc_channel
 
+    async def close(self) -> None:
+        """Close the channel used by this transport.
+
+        A channel drawn from a pool is released back to the pool instead,
+        which closes it once no transport has used it for a while.
+        """
+        if not self._release_pooled_channel() and hasattr(self, "_grpc_channel"):
+            await self._grpc_channel.close()
+
     @property
     def execute_patch_job(
         self
@@ -309,6 +367,35 @@ class OsConfigServiceGrpcAsyncIOTransport(OsConfigServiceTransport):
             )
         return self._stubs["list_patch_job_instance_details"]
 
+    @property
+    def list_patch_job_instance_details_raw(
+        self
+    ) -> Callable[
+        [patch_jobs.ListPatchJobInstanceDetailsRequest],
+        Awaitable[RawListPatchJobInstanceDetailsResponse],
+    ]:
+        r"""Return a callable for the list patch job instance
+        details method over gRPC, returning raw responses.
+
+        Responses are kept in their wire format rather than deserialized
+        into proto-plus messages.
+
+        Returns:
+            Callable[[~.ListPatchJobInstanceDetailsRequest],
+                    ~.RawListPatchJobInstanceDetailsResponse]:
+                A function that, when called, will call the underlying RPC
+                on the server.
+        """
+        if "list_patch_job_instance_details_raw" not in self._stubs:
+            self._stubs[
+                "list_patch_job_instance_details_raw"
+            ] = self.grpc_channel.unary_unary(
+                "/google.cloud.osconfig.v1.OsConfigService/ListPatchJobInstanceDetails",
+                request_serializer=patch_jobs.ListPatchJobInstanceDetailsRequest.serialize,
+                response_deserializer=RawListPatchJobInstanceDetailsResponse.deserialize,
+            )
+        return self._stubs["list_patch_job_instance_details_raw"]
+
     @property
     def create_patch_deployment(
         self
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+from typing import Callable, List, Sequence, Tuple
+
+from google.api_core import gapic_v1  # type: ignore
+from google.auth import credentials  # type: ignore
+
+import grpc  # type: ignore
+
+from .base import DEFAULT_CLIENT_INFO
+from .channel_pool import ChannelPool
+from .grpc import OsConfigServiceGrpcTransport
+
+
+class ChannelGroup:
+    """A set of gRPC channels used as one.
+
+    Multi-callables created with :meth:`unary_unary` send each call over
+    the channel with the fewest calls in flight, rotating between channels
+    that are equally loaded.
+    """
+
+    def __init__(self, channels: Sequence[grpc.Channel]):
+        """Instantiate the group.
+
+        Args:
+            channels (Sequence[grpc.Channel]): The channels to spread calls
+                over; there must be at least one.
+        """
+        if not channels:
+            raise ValueError("A channel group needs at least one channel.")
+        self._channels = tuple(channels)
+        self._in_flight = [0] * len(self._channels)
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @property
+    def channels(self) -> Tuple[grpc.Channel, ...]:
+        """The channels in the group."""
+        return self._channels
+
+    @property
+    def in_flight(self) -> Tuple[int, ...]:
+        """The number of calls in flight on each channel."""
+        return tuple(self._in_flight)
+
+    def unary_unary(self, method: str, **kwargs) -> "_LeastLoadedMultiCallable":
+        """Create a multi-callable for a unary-unary method.
+
+        Args:
+            method (str): The name of the RPC method.
+            kwargs (dict): Passed to ``unary_unary`` on every channel.
+
+        Returns:
+            A callable with the same signature as
+            :class:`grpc.UnaryUnaryMultiCallable`.
+        """
+        return _LeastLoadedMultiCallable(
+            self, [channel.unary_unary(method, **kwargs) for channel in self._channels]
+        )
+
+    def close(self) -> None:
+        """Close every channel in the group."""
+        for channel in self._channels:
+            channel.close()
+
+    def _acquire(self) -> int:
+        with self._lock:
+            count = len(self._channels)
+            index = min(
+                ((self._next + offset) % count for offset in range(count)),
+                key=self._in_flight.__getitem__,
+            )
+            self._next = (index + 1) % count
+            self._in_flight[index] += 1
+            return index
+
+    def _release(self, index: int) -> None:
+        with self._lock:
+            self._in_flight[index] -= 1
+
+
+class _LeastLoadedMultiCallable:
+    def __init__(self, group: ChannelGroup, callables: List[Callable]):
+        self._group = group
+        self._callables = callables
+
+    def __call__(self, request, *args, **kwargs):
+        index = self._group._acquire()
+        try:
+            return self._callables[index](request, *args, **kwargs)
+        finally:
+            self._group._release(index)
+
+    def future(self, request, *args, **kwargs):
+        index = self._group._acquire()
+        try:
+            future = self._callables[index].future(request, *args, **kwargs)
+        except BaseException:
+            self._group._release(index)
+            raise
+        future.add_done_callback(lambda _: self._group._release(index))
+        return future
+
+
+class OsConfigServiceGrpcMultiChannelTransport(OsConfigServiceGrpcTransport):
+    """gRPC backend transport for OsConfigService over several channels.
+
+    This behaves like :class:`~.OsConfigServiceGrpcTransport`, but opens
+    ``channel_count`` channels (and so HTTP/2 connections) to the service
+    and sends each call, including the page requests made by pagers, over
+    the channel with the fewest calls in flight. This lifts the limit on
+    concurrent streams of a single connection for high-QPS workloads.
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str = "osconfig.googleapis.com",
+        credentials: credentials.Credentials = None,
+        channels: Sequence[grpc.Channel] = None,
+        channel_count: int = 4,
+        api_mtls_endpoint: str = None,
+        client_cert_source: Callable[[], Tuple[bytes, bytes]] = None,
+        client_info: gapic_v1.client_info.ClientInfo = DEFAULT_CLIENT_INFO,
+        channel_pool: ChannelPool = None
+    ) -> None:
+        """Instantiate the transport.
+
+        Args:
+            host (Optional[str]): The hostname to connect to.
+            credentials (Optional[google.auth.credentials.Credentials]): The
+                authorization credentials to attach to requests. These
+                credentials identify the application to the service; if none
+                are specified, the client will attempt to ascertain the
+                credentials from the environment.
+                This argument is ignored if ``channels`` is provided.
+            channels (Optional[Sequence[grpc.Channel]]): ``Channel``
+                instances through which to make calls.
+            channel_count (int): The number of channels to open. It is
+                ignored if ``channels`` is provided.
+            api_mtls_endpoint (Optional[str]): The mutual TLS endpoint. If
+                provided, it overrides the ``host`` argument and tries to create
+                mutual TLS channels with client SSL credentials from
+                ``client_cert_source`` or applicatin default SSL credentials.
+            client_cert_source (Optional[Callable[[], Tuple[bytes, bytes]]]): A
+                callback to provide client SSL certificate bytes and private key
+                bytes, both in PEM format. It is ignored if ``api_mtls_endpoint``
+                is None.
+            client_info (google.api_core.gapic_v1.client_info.ClientInfo):
+                The client info used to send a user-agent string along with
+                API requests.
+            channel_pool (Optional[~.ChannelPool]): A pool to draw the
+                channels from, shared with other multi-channel transports
+                using the same channel count, host, credentials and SSL
+                configuration. It is ignored if ``channels`` is provided.
+
+        Raises:
+            google.auth.exceptions.MutualTlsChannelError: If mutual TLS transport
+                creation failed for any reason.
+        """
+        self._channel_count = len(channels) if channels else channel_count
+        super().__init__(
+            host=host,
+            credentials=credentials,
+            channel=ChannelGroup(channels) if channels else None,
+            api_mtls_endpoint=api_mtls_endpoint,
+            client_cert_source=client_cert_source,
+            client_info=client_info,
+            channel_pool=channel_pool,
+        )
+
+    def _create_grpc_channel(self, host: str, **kwargs) -> ChannelGroup:
+        # Channels with identical arguments share subchannels, and so a
+        # single connection, through gRPC's global subchannel pool. Give each
+        # channel its own pool and index so that each opens its own
+        # connection.
+        options = list(kwargs.pop("options", ()))
+        return ChannelGroup(
+            [
+                type(self).create_channel(
+                    host,
+                    options=options
+                    + [
+                        ("grpc.use_local_subchannel_pool", 1),
+                        ("grpc.channel_index", index),
+                    ],
+                    **kwargs
+                )
+                for index in range(self._channel_count)
+            ]
+        )
+
+    def _channel_pool_label(self) -> str:
+        return "grpc_multichannel:{0}".format(self._channel_count)
+
+    @property
+    def grpc_channel(self) -> ChannelGroup:
+        """Create the channels designed to connect to this service.
+
+        This property caches on the instance; repeated calls return
+        the same :class:`ChannelGroup`.
+        """
+        return super().grpc_channel
+
+
+__all__ = ("ChannelGroup", "OsConfigServiceGrpcMultiChannelTransport")
@@ -0,0 +1,502 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import concurrent.futures
+import time
+from typing import (
+    AsyncIterable,
+    Callable,
+    Dict,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from google.api_core import gapic_v1  # type: ignore
+from google.api_core import retry as retries  # type: ignore
+
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+# Patch job states after which the job never changes again.
+TERMINAL_STATES = frozenset(
+    (
+        patch_jobs.PatchJob.State.SUCCEEDED,
+        patch_jobs.PatchJob.State.COMPLETED_WITH_ERRORS,
+        patch_jobs.PatchJob.State.CANCELED,
+        patch_jobs.PatchJob.State.TIMED_OUT,
+    )
+)
+
+
+def is_terminal(patch_job: patch_jobs.PatchJob) -> bool:
+    """Return whether the patch job has reached a terminal state."""
+    return patch_job.state in TERMINAL_STATES
+
+
+class AdaptivePolling:
+    """Compute the delay between polls of a running patch job.
+
+    The delay grows by ``multiplier`` (up to ``maximum``) while the job
+    reports no progress, and shrinks back towards ``minimum`` whenever
+    ``percent_complete`` or the ``instance_details_summary`` counters
+    change. Once the job is at least ``near_completion`` percent complete
+    it is polled every ``minimum`` seconds.
+
+    An instance keeps state for a single job; use a new instance for
+    each job being watched.
+    """
+
+    def __init__(
+        self,
+        initial: float = 5.0,
+        minimum: float = 1.0,
+        maximum: float = 60.0,
+        multiplier: float = 2.0,
+        near_completion: float = 90.0,
+    ):
+        """Instantiate the polling policy.
+
+        Args:
+            initial (float): The delay in seconds after the first poll.
+            minimum (float): The shortest delay in seconds between polls.
+            maximum (float): The longest delay in seconds between polls.
+            multiplier (float): The factor by which the delay grows while
+                the job is stalled, and shrinks while it progresses.
+            near_completion (float): The ``percent_complete`` from which
+                the job is polled every ``minimum`` seconds.
+        """
+        self._delay = initial
+        self._minimum = minimum
+        self._maximum = maximum
+        self._multiplier = multiplier
+        self._near_completion = near_completion
+        self._last_progress = None
+
+    def next_delay(self, patch_job: patch_jobs.PatchJob) -> float:
+        """Return the delay before polling again after seeing ``patch_job``.
+
+        Args:
+            patch_job (:class:`~.patch_jobs.PatchJob`): The most recently
+                polled state of the job.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        progress = (patch_job.percent_complete, patch_job.instance_details_summary)
+        if self._last_progress is not None:
+            if progress == self._last_progress:
+                self._delay = min(self._delay * self._multiplier, self._maximum)
+            else:
+                self._delay = max(self._delay / self._multiplier, self._minimum)
+        self._last_progress = progress
+
+        if patch_job.percent_complete >= self._near_completion:
+            self._delay = self._minimum
+        return self._delay
+
+
+def _deadline_remaining(deadline_at: Optional[float], delay: float) -> float:
+    if deadline_at is None:
+        return delay
+    remaining = deadline_at - time.monotonic()
+    if remaining <= 0:
+        raise concurrent.futures.TimeoutError(
+            "Patch job did not reach a terminal state before the deadline."
+        )
+    return min(delay, remaining)
+
+
+def wait_for_patch_job(
+    client,
+    name: str,
+    *,
+    polling: AdaptivePolling = None,
+    deadline: float = None,
+    retry: retries.Retry = gapic_v1.method.DEFAULT,
+    timeout: float = gapic_v1.method.DEFAULT,
+    metadata: Sequence[Tuple[str, str]] = (),
+) -> Iterable[patch_jobs.PatchJob]:
+    """Poll a patch job until it reaches a terminal state.
+
+    Args:
+        client (~.OsConfigServiceClient): The client used to poll the job.
+        name (str): The name of the patch job, in the form
+            ``projects/*/patchJobs/*``.
+        polling (~.AdaptivePolling): The policy deciding the delay between
+            polls. Defaults to :class:`AdaptivePolling` with its defaults.
+        deadline (float): The overall time in seconds to wait for the job.
+            If not set, waits indefinitely.
+        retry (google.api_core.retry.Retry): Designation of what errors, if
+            any, should be retried on each poll.
+        timeout (float): The timeout for each ``get_patch_job`` request.
+        metadata (Sequence[Tuple[str, str]]): Strings which should be
+            sent along with each request as metadata.
+
+    Yields:
+        ~.patch_jobs.PatchJob: A snapshot of the job after every poll; the
+            last snapshot is in a terminal state.
+
+    Raises:
+        concurrent.futures.TimeoutError: If the deadline passes before the
+            job reaches a terminal state.
+    """
+    polling = polling or AdaptivePolling()
+    deadline_at = None if deadline is None else time.monotonic() + deadline
+    while True:
+        patch_job = client.get_patch_job(
+            name=name, retry=retry, timeout=timeout, metadata=metadata
+        )
+        yield patch_job
+        if is_terminal(patch_job):
+            return
+        time.sleep(_deadline_remaining(deadline_at, polling.next_delay(patch_job)))
+
+
+async def wait_for_patch_job_async(
+    client,
+    name: str,
+    *,
+    polling: AdaptivePolling = None,
+    deadline: float = None,
+    retry: retries.Retry = gapic_v1.method.DEFAULT,
+    timeout: float = gapic_v1.method.DEFAULT,
+    metadata: Sequence[Tuple[str, str]] = (),
+) -> AsyncIterable[patch_jobs.PatchJob]:
+    """Poll a patch job until it reaches a terminal state.
+
+    This is the asynchronous counterpart of :func:`wait_for_patch_job`;
+    ``client`` is an :class:`~.OsConfigServiceAsyncClient`.
+
+    Yields:
+        ~.patch_jobs.PatchJob: A snapshot of the job after every poll; the
+            last snapshot is in a terminal state.
+
+    Raises:
+        concurrent.futures.TimeoutError: If the deadline passes before the
+            job reaches a terminal state.
+    """
+    polling = polling or AdaptivePolling()
+    deadline_at = None if deadline is None else time.monotonic() + deadline
+    while True:
+        patch_job = await client.get_patch_job(
+            name=name, retry=retry, timeout=timeout, metadata=metadata
+        )
+        yield patch_job
+        if is_terminal(patch_job):
+            return
+        await asyncio.sleep(
+            _deadline_remaining(deadline_at, polling.next_delay(patch_job))
+        )
+
+
+class StateTransition(NamedTuple):
+    """A change in the state of a watched patch job.
+
+    Attributes:
+        name (str): The name of the patch job.
+        previous_state (~.patch_jobs.PatchJob.State): The state seen on the
+            previous poll; ``STATE_UNSPECIFIED`` on the first poll.
+        patch_job (~.patch_jobs.PatchJob): The snapshot carrying the new
+            state.
+    """
+
+    name: str
+    previous_state: patch_jobs.PatchJob.State
+    patch_job: patch_jobs.PatchJob
+
+
+class _WatchedJob:
+    __slots__ = ("name", "polling", "future", "patch_job", "due", "in_flight")
+
+    def __init__(self, name, polling, future, due):
+        self.name = name
+        self.polling = polling
+        self.future = future
+        self.patch_job = None
+        self.due = due
+        self.in_flight = False
+
+    def priority(self, now: float) -> float:
+        # Jobs closer to completion are polled first. Overdue jobs gain one
+        # point per second waited so that slow jobs are not starved.
+        percent_complete = self.patch_job.percent_complete if self.patch_job else 0.0
+        return percent_complete + (now - self.due)
+
+
+class PatchJobWatcher:
+    """Watch many patch jobs through one shared polling schedule.
+
+    Polls are issued through an :class:`~.OsConfigServiceAsyncClient` at no
+    more than ``polls_per_second``, with at most ``max_concurrent_polls``
+    requests in flight, regardless of how many jobs are watched. Each job
+    is polled again after the delay chosen by its own
+    :class:`AdaptivePolling`; when several jobs are due, those closest to
+    completion go first. Watching a job that is already watched shares the
+    existing polls rather than adding new ones.
+
+    State changes are delivered to the ``on_transition`` callback and to
+    the :attr:`transitions` queue, as :class:`StateTransition` tuples.
+
+    The watcher must be started from a running event loop, either with
+    :meth:`start` and :meth:`close` or as an async context manager::
+
+        async with PatchJobWatcher(client) as watcher:
+            patch_job = await watcher.watch(name)
+    """
+
+    def __init__(
+        self,
+        client,
+        *,
+        polls_per_second: float = 10.0,
+        max_concurrent_polls: int = 10,
+        polling_factory: Callable[[], AdaptivePolling] = AdaptivePolling,
+        on_transition: Callable[[StateTransition], None] = None,
+        retry: retries.Retry = gapic_v1.method.DEFAULT,
+        timeout: float = gapic_v1.method.DEFAULT,
+        metadata: Sequence[Tuple[str, str]] = (),
+    ):
+        """Instantiate the watcher.
+
+        Args:
+            client (~.OsConfigServiceAsyncClient): The client used to poll
+                the jobs.
+            polls_per_second (float): The maximum rate of ``get_patch_job``
+                requests across all watched jobs.
+            max_concurrent_polls (int): The maximum number of
+                ``get_patch_job`` requests in flight at once.
+            polling_factory (Callable[[], ~.AdaptivePolling]): Builds the
+                polling policy for each newly watched job.
+            on_transition (Callable[[~.StateTransition], None]): Called
+                whenever a watched job changes state. An exception it
+                raises stops watching the job and is set on the job's
+                future.
+            retry (google.api_core.retry.Retry): Designation of what errors,
+                if any, should be retried on each poll.
+            timeout (float): The timeout for each ``get_patch_job`` request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with each request as metadata.
+        """
+        self._client = client
+        self._interval = 1.0 / polls_per_second
+        self._max_concurrent_polls = max_concurrent_polls
+        self._polling_factory = polling_factory
+        self._on_transition = on_transition
+        self._retry = retry
+        self._timeout = timeout
+        self._metadata = metadata
+
+        self._jobs = {}  # type: Dict[str, _WatchedJob]
+        self._polls = set()  # type: Set[asyncio.Future]
+        self._transitions = None  # type: Optional[asyncio.Queue]
+        self._loop = None  # type: Optional[asyncio.AbstractEventLoop]
+        self._semaphore = None  # type: Optional[asyncio.Semaphore]
+        self._wakeup = None  # type: Optional[asyncio.Event]
+        self._scheduler = None  # type: Optional[asyncio.Future]
+
+    @property
+    def transitions(self) -> asyncio.Queue:
+        """An :class:`asyncio.Queue` of :class:`StateTransition` tuples.
+
+        The queue is created on first access; transitions are only queued
+        from then on.
+        """
+        if self._transitions is None:
+            self._transitions = asyncio.Queue()
+        return self._transitions
+
+    def start(self) -> None:
+        """Start polling in a background task on the running event loop."""
+        if self._scheduler is not None:
+            return
+        self._loop = asyncio.get_event_loop()
+        self._semaphore = asyncio.Semaphore(self._max_concurrent_polls)
+        self._wakeup = asyncio.Event()
+        self._scheduler = asyncio.ensure_future(self._schedule())
+
+    async def close(self) -> None:
+        """Stop polling and cancel every pending :meth:`watch` future."""
+        if self._scheduler is None:
+            return
+        tasks = [self._scheduler] + list(self._polls)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self._jobs.values():
+            job.future.cancel()
+        self._jobs.clear()
+        self._scheduler = None
+
+    async def __aenter__(self) -> "PatchJobWatcher":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    def watch(self, name: str) -> asyncio.Future:
+        """Start watching a patch job.
+
+        Args:
+            name (str): The name of the patch job, in the form
+                ``projects/*/patchJobs/*``.
+
+        Returns:
+            asyncio.Future: Resolves to the terminal
+                :class:`~.patch_jobs.PatchJob`, or to the error raised
+                while polling it. Watching the same job again returns the
+                same future.
+        """
+        if self._scheduler is None:
+            raise RuntimeError("The watcher must be started before watching jobs.")
+
+        job = self._jobs.get(name)
+        if job is None:
+            job = _WatchedJob(
+                name,
+                self._polling_factory(),
+                self._loop.create_future(),
+                self._loop.time(),
+            )
+            self._jobs[name] = job
+            self._wakeup.set()
+        return job.future
+
+    def unwatch(self, name: str) -> None:
+        """Stop watching a patch job, cancelling its :meth:`watch` future."""
+        job = self._jobs.pop(name, None)
+        if job is not None:
+            job.future.cancel()
+
+    @property
+    def watched(self) -> Sequence[str]:
+        """The names of the jobs currently being watched."""
+        return tuple(self._jobs)
+
+    def _next_job(self) -> Tuple[Optional[_WatchedJob], Optional[float]]:
+        # Return the due job with the highest priority or, if none is due,
+        # how long to wait until the next one is.
+        now = self._loop.time()
+        ready = None
+        ready_priority = None
+        earliest = None
+        for job in self._jobs.values():
+            if job.in_flight:
+                continue
+            if job.due <= now:
+                priority = job.priority(now)
+                if ready is None or priority > ready_priority:
+                    ready, ready_priority = job, priority
+            elif earliest is None or job.due < earliest:
+                earliest = job.due
+
+        if ready is not None:
+            return ready, None
+        return None, None if earliest is None else earliest - now
+
+    async def _schedule(self) -> None:
+        while True:
+            job, wait = self._next_job()
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._semaphore.acquire()
+            if self._jobs.get(job.name) is not job:
+                # The job was unwatched while waiting for a free slot.
+                self._semaphore.release()
+                continue
+            job.in_flight = True
+            poll = asyncio.ensure_future(self._poll(job))
+            self._polls.add(poll)
+            poll.add_done_callback(self._polls.discard)
+            await asyncio.sleep(self._interval)
+
+    async def _poll(self, job: _WatchedJob) -> None:
+        try:
+            patch_job = await self._client.get_patch_job(
+                name=job.name,
+                retry=self._retry,
+                timeout=self._timeout,
+                metadata=self._metadata,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            if self._jobs.get(job.name) is job:
+                del self._jobs[job.name]
+                job.future.set_exception(exc)
+            return
+        finally:
+            self._semaphore.release()
+            self._wakeup.set()
+
+        if self._jobs.get(job.name) is not job:
+            return
+
+        try:
+            self._update(job, patch_job)
+        except Exception as exc:
+            # An error raised by on_transition fails the watch, like an
+            # error polling the job.
+            self._jobs.pop(job.name, None)
+            if not job.future.done():
+                job.future.set_exception(exc)
+        finally:
+            job.in_flight = False
+
+    def _update(self, job: _WatchedJob, patch_job: patch_jobs.PatchJob) -> None:
+        previous, job.patch_job = job.patch_job, patch_job
+        if previous is None or previous.state != patch_job.state:
+            transition = StateTransition(
+                job.name,
+                previous.state
+                if previous is not None
+                else patch_jobs.PatchJob.State.STATE_UNSPECIFIED,
+                patch_job,
+            )
+            if self._transitions is not None:
+                self._transitions.put_nowait(transition)
+            if self._on_transition is not None:
+                self._on_transition(transition)
+
+        if is_terminal(patch_job):
+            del self._jobs[job.name]
+            if not job.future.done():
+                job.future.set_result(patch_job)
+        else:
+            job.due = self._loop.time() + job.polling.next_delay(patch_job)
+
+
+__all__ = (
+    "AdaptivePolling",
+    "PatchJobWatcher",
+    "StateTransition",
+    "TERMINAL_STATES",
+    "is_terminal",
+    "wait_for_patch_job",
+    "wait_for_patch_job_async",
+)
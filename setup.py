@@ -34,8 +34,14 @@ dependencies = [
     "google-api-core[grpc] >= 1.17.2, < 2.0.0dev",
     "proto-plus >= 0.4.0",
     "libcst >= 0.2.5",
+    "contextvars >= 2.4; python_version < '3.7'",
 ]
-extras = {}
+extras = {
+    "numpy": ["numpy >= 1.13.0"],
+    "parquet": ["pyarrow >= 1.0.0"],
+    "prometheus": ["prometheus-client >= 0.8.0"],
+    "opentelemetry": ["opentelemetry-api >= 1.0.0"],
+}
 
 
 # Setup boilerplate below this line.
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import mock
+
+import pytest
+
+from google.api_core import exceptions
+from google.api_core import grpc_helpers_async
+from google.auth import credentials
+from google.cloud.osconfig_v1.services.os_config_service import (
+    OsConfigServiceAsyncClient,
+)
+from google.cloud.osconfig_v1.services.os_config_service import OsConfigServiceClient
+from google.cloud.osconfig_v1.services.os_config_service import bulk
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+def _execute(request, **kwargs):
+    if request.parent == "projects/bad":
+        raise exceptions.PermissionDenied("denied")
+    return patch_jobs.PatchJob(name=request.parent + "/patchJobs/j")
+
+
+def test_requests_for_parents():
+    template = patch_jobs.ExecutePatchJobRequest(
+        parent="projects/ignored", display_name="weekly"
+    )
+    requests = bulk.requests_for_parents(template, ["projects/a", "projects/b"])
+
+    assert [r.parent for r in requests] == ["projects/a", "projects/b"]
+    assert all(r.display_name == "weekly" for r in requests)
+    assert template.parent == "projects/ignored"
+
+
+def test_execute_patch_jobs():
+    client = OsConfigServiceClient(credentials=credentials.AnonymousCredentials())
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._transport.execute_patch_job), "__call__"
+    ) as call:
+        call.side_effect = _execute
+        results = client.execute_patch_jobs(
+            template={"display_name": "weekly"},
+            parents=["projects/a", "projects/bad", "projects/c"],
+            max_workers=2,
+        )
+
+        assert len(call.mock_calls) == 3
+
+    assert [r.request.parent for r in results] == [
+        "projects/a",
+        "projects/bad",
+        "projects/c",
+    ]
+    assert [r.ok for r in results] == [True, False, True]
+    assert results[0].patch_job.name == "projects/a/patchJobs/j"
+    assert isinstance(results[1].error, exceptions.PermissionDenied)
+
+
+def test_execute_patch_jobs_flattened_error():
+    client = OsConfigServiceClient(credentials=credentials.AnonymousCredentials())
+
+    # Attempting to call a method with both requests and a template
+    # is an error.
+    with pytest.raises(ValueError):
+        client.execute_patch_jobs(
+            [patch_jobs.ExecutePatchJobRequest()], parents=["projects/a"]
+        )
+
+
+@pytest.mark.asyncio
+async def test_execute_patch_jobs_async():
+    client = OsConfigServiceAsyncClient(credentials=credentials.AnonymousCredentials())
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._client._transport.execute_patch_job), "__call__"
+    ) as call:
+        call.side_effect = lambda request, **kwargs: (
+            grpc_helpers_async.FakeUnaryUnaryCall(_execute(request))
+        )
+        results = await client.execute_patch_jobs(
+            [
+                patch_jobs.ExecutePatchJobRequest(parent="projects/a"),
+                patch_jobs.ExecutePatchJobRequest(parent="projects/b"),
+            ],
+            max_concurrency=1,
+        )
+
+        assert len(call.mock_calls) == 2
+
+    assert all(r.ok for r in results)
+    assert [r.patch_job.name for r in results] == [
+        "projects/a/patchJobs/j",
+        "projects/b/patchJobs/j",
+    ]
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import mock
+
+import pytest
+
+from google.api_core import exceptions
+from google.api_core import grpc_helpers_async
+from google.auth import credentials
+from google.cloud.osconfig_v1.services.os_config_service import (
+    OsConfigServiceAsyncClient,
+)
+from google.cloud.osconfig_v1.services.os_config_service import OsConfigServiceClient
+from google.cloud.osconfig_v1.services.os_config_service.cache import ResourceCache
+from google.cloud.osconfig_v1.types import patch_deployments
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _deployment(name):
+    return patch_deployments.PatchDeployment(name=name, description="d")
+
+
+def test_cache_ttl():
+    clock = _Clock()
+    cache = ResourceCache(ttl=10, clock=clock)
+    cache.put(_deployment("projects/p/patchDeployments/a"))
+
+    clock.now = 9
+    assert cache.get("projects/p/patchDeployments/a").description == "d"
+    clock.now = 10
+    assert cache.get("projects/p/patchDeployments/a") is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_ratio == 0.5
+
+
+def test_cache_lru_eviction():
+    cache = ResourceCache(maxsize=2)
+    cache.put(_deployment("a"))
+    cache.put(_deployment("b"))
+    cache.get("a")
+    cache.put(_deployment("c"))
+
+    # "b" was the least recently used entry.
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_cache_patch_jobs():
+    clock = _Clock()
+    cache = ResourceCache(ttl=10, clock=clock)
+    cache.put(
+        patch_jobs.PatchJob(name="running", state=patch_jobs.PatchJob.State.PATCHING)
+    )
+    cache.put(
+        patch_jobs.PatchJob(name="done", state=patch_jobs.PatchJob.State.SUCCEEDED)
+    )
+
+    # Running jobs are not cached; terminal jobs never expire.
+    clock.now = 1e9
+    assert cache.get("running") is None
+    assert cache.get("done").state == patch_jobs.PatchJob.State.SUCCEEDED
+
+    # Lookups of running jobs are not misses; nor do they lower the ratio.
+    assert (cache.hits, cache.misses, cache.uncacheable) == (1, 0, 1)
+    assert cache.hit_ratio == 1.0
+
+    # Once the job finishes, it is cached like any other.
+    cache.put(
+        patch_jobs.PatchJob(name="running", state=patch_jobs.PatchJob.State.SUCCEEDED)
+    )
+    assert cache.get("running").state == patch_jobs.PatchJob.State.SUCCEEDED
+    cache.invalidate("running")
+    assert cache.get("running") is None
+    assert (cache.hits, cache.misses, cache.uncacheable) == (2, 1, 1)
+
+
+def test_cache_returns_copies():
+    cache = ResourceCache()
+    cache.put(_deployment("a"))
+    cache.get("a").description = "changed"
+
+    assert cache.get("a").description == "d"
+
+
+def test_cache_invalidate_and_clear():
+    cache = ResourceCache()
+    cache.put(_deployment("a"))
+    cache.get("a")
+
+    assert cache.invalidate("a")
+    assert not cache.invalidate("a")
+    cache.clear()
+    assert (len(cache), cache.hits, cache.misses) == (0, 0, 0)
+
+
+def test_get_patch_deployment_cached():
+    cache = ResourceCache()
+    client = OsConfigServiceClient(
+        credentials=credentials.AnonymousCredentials(), cache=cache
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._transport.get_patch_deployment), "__call__"
+    ) as call:
+        call.return_value = _deployment("projects/p/patchDeployments/a")
+        for _ in range(3):
+            response = client.get_patch_deployment(name="projects/p/patchDeployments/a")
+            assert response.description == "d"
+
+        assert len(call.mock_calls) == 1
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_get_patch_job_cached_when_terminal():
+    cache = ResourceCache()
+    client = OsConfigServiceClient(
+        credentials=credentials.AnonymousCredentials(), cache=cache
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(type(client._transport.get_patch_job), "__call__") as call:
+        call.side_effect = [
+            patch_jobs.PatchJob(name="j", state=patch_jobs.PatchJob.State.PATCHING),
+            patch_jobs.PatchJob(name="j", state=patch_jobs.PatchJob.State.SUCCEEDED),
+        ]
+        states = [client.get_patch_job(name="j").state for _ in range(3)]
+
+        assert len(call.mock_calls) == 2
+    assert states == [
+        patch_jobs.PatchJob.State.PATCHING,
+        patch_jobs.PatchJob.State.SUCCEEDED,
+        patch_jobs.PatchJob.State.SUCCEEDED,
+    ]
+
+
+def test_create_and_delete_patch_deployment_invalidate():
+    cache = ResourceCache()
+    client = OsConfigServiceClient(
+        credentials=credentials.AnonymousCredentials(), cache=cache
+    )
+    cache.put(_deployment("projects/p/patchDeployments/a"))
+    cache.put(_deployment("projects/p/patchDeployments/b"))
+
+    with mock.patch.object(
+        type(client._transport.create_patch_deployment), "__call__"
+    ) as call:
+        call.return_value = _deployment("projects/p/patchDeployments/a")
+        client.create_patch_deployment(
+            parent="projects/p",
+            patch_deployment=patch_deployments.PatchDeployment(),
+            patch_deployment_id="a",
+        )
+
+    # Deleting invalidates the entry even if the request fails.
+    with mock.patch.object(
+        type(client._transport.delete_patch_deployment), "__call__"
+    ) as call:
+        call.side_effect = exceptions.NotFound("gone")
+        with pytest.raises(exceptions.NotFound):
+            client.delete_patch_deployment(name="projects/p/patchDeployments/b")
+
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_patch_deployment_cached_async():
+    cache = ResourceCache()
+    client = OsConfigServiceAsyncClient(
+        credentials=credentials.AnonymousCredentials(), cache=cache
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._client._transport.get_patch_deployment), "__call__"
+    ) as call:
+        call.return_value = grpc_helpers_async.FakeUnaryUnaryCall(
+            _deployment("projects/p/patchDeployments/a")
+        )
+        for _ in range(2):
+            response = await client.get_patch_deployment(
+                name="projects/p/patchDeployments/a"
+            )
+            assert response.description == "d"
+
+        assert len(call.mock_calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
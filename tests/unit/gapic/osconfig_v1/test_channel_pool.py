@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import gc
+import mock
+
+from google.auth import credentials
+from google.cloud.osconfig_v1.services.os_config_service import (
+    OsConfigServiceAsyncClient,
+)
+from google.cloud.osconfig_v1.services.os_config_service import OsConfigServiceClient
+from google.cloud.osconfig_v1.services.os_config_service import transports
+
+
+def test_channel_pool_reference_counting():
+    pool = transports.ChannelPool(idle_timeout=60)
+    factory = mock.Mock(side_effect=lambda: mock.Mock())
+
+    first = pool.acquire("key", factory)
+    second = pool.acquire("key", factory)
+    assert first is second
+    assert factory.call_count == 1
+
+    pool.release("key")
+    pool.release("key")
+
+    # The idle channel is kept for reuse until the idle timeout passes.
+    assert len(pool) == 1
+    assert pool.acquire("key", factory) is first
+    pool.release("key")
+
+    assert pool.evict_idle(idle_timeout=0) == 1
+    assert len(pool) == 0
+    first.close.assert_called_once_with()
+
+
+def test_channel_pool_does_not_evict_referenced_channels():
+    pool = transports.ChannelPool(idle_timeout=0)
+    channel = pool.acquire("key", mock.Mock)
+
+    assert pool.evict_idle() == 0
+    assert not channel.close.called
+
+
+def test_channel_pool_closes_asyncio_channels():
+    closed = []
+
+    async def close():
+        closed.append(True)
+
+    pool = transports.ChannelPool(idle_timeout=0)
+
+    # Without a running event loop the close coroutine is discarded.
+    pool.acquire("idle", lambda: mock.Mock(close=close))
+    pool.release("idle")
+    assert not closed
+
+    async def run():
+        pool.acquire("running", lambda: mock.Mock(close=close))
+        pool.release("running")
+        await asyncio.sleep(0)
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(run())
+    finally:
+        loop.close()
+    assert closed == [True]
+
+
+def test_grpc_transport_channel_pool():
+    pool = transports.ChannelPool(idle_timeout=60)
+    creds = credentials.AnonymousCredentials()
+
+    with mock.patch.object(
+        transports.OsConfigServiceGrpcTransport, "create_channel"
+    ) as create_channel:
+        create_channel.side_effect = lambda *args, **kwargs: mock.Mock()
+        first = transports.OsConfigServiceGrpcTransport(
+            credentials=creds, channel_pool=pool
+        )
+        second = transports.OsConfigServiceGrpcTransport(
+            credentials=creds, channel_pool=pool
+        )
+        other = transports.OsConfigServiceGrpcTransport(
+            credentials=credentials.AnonymousCredentials(), channel_pool=pool
+        )
+
+        # Transports with the same host and credentials share a channel.
+        assert first.grpc_channel is second.grpc_channel
+        assert other.grpc_channel is not first.grpc_channel
+        assert create_channel.call_count == 2
+
+    channel = first.grpc_channel
+    first.close()
+    del second
+    gc.collect()
+
+    # Both references were released; the channel is idle but still pooled.
+    assert not channel.close.called
+    assert pool.evict_idle(idle_timeout=0) == 1
+    channel.close.assert_called_once_with()
+
+
+def test_client_channel_pool():
+    pool = transports.ChannelPool(idle_timeout=60)
+    creds = credentials.AnonymousCredentials()
+
+    with mock.patch.object(
+        transports.OsConfigServiceGrpcTransport, "create_channel"
+    ) as create_channel:
+        create_channel.side_effect = lambda *args, **kwargs: mock.Mock()
+        first = OsConfigServiceClient(credentials=creds, channel_pool=pool)
+        second = OsConfigServiceClient(credentials=creds, channel_pool=pool)
+        unpooled = OsConfigServiceClient(credentials=creds)
+
+        assert first._transport.grpc_channel is second._transport.grpc_channel
+        assert unpooled._transport.grpc_channel is not first._transport.grpc_channel
+        assert create_channel.call_count == 2
+        assert len(pool) == 1
+
+
+def test_async_client_channel_pool():
+    pool = transports.ChannelPool(idle_timeout=60)
+    creds = credentials.AnonymousCredentials()
+
+    with mock.patch.object(
+        transports.OsConfigServiceGrpcAsyncIOTransport, "create_channel"
+    ) as create_channel:
+        create_channel.side_effect = lambda *args, **kwargs: mock.Mock()
+        first = OsConfigServiceAsyncClient(credentials=creds, channel_pool=pool)
+        second = OsConfigServiceAsyncClient(credentials=creds, channel_pool=pool)
+
+        assert (
+            first._client._transport.grpc_channel
+            is second._client._transport.grpc_channel
+        )
+        assert create_channel.call_count == 1
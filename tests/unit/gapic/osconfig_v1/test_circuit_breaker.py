@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import mock
+
+import pytest
+
+from google.api_core import exceptions
+from google.api_core import grpc_helpers_async
+from google.auth import credentials
+from google.cloud.osconfig_v1.services.os_config_service import (
+    OsConfigServiceAsyncClient,
+)
+from google.cloud.osconfig_v1.services.os_config_service import OsConfigServiceClient
+from google.cloud.osconfig_v1.services.os_config_service import instrumentation
+from google.cloud.osconfig_v1.services.os_config_service.transports import (
+    CircuitBreakers,
+    CircuitOpenError,
+)
+from google.cloud.osconfig_v1.services.os_config_service.transports.circuit_breaker import (
+    CircuitBreaker,
+)
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _breaker(clock, **kwargs):
+    settings = dict(
+        failure_threshold=0.5,
+        minimum_calls=4,
+        window=10,
+        open_duration=30.0,
+        probes=2,
+        clock=clock,
+    )
+    settings.update(kwargs)
+    return CircuitBreaker(**settings)
+
+
+def test_breaker_opens_on_failure_rate():
+    breaker = _breaker(_Clock())
+
+    for success in (True, False, True):
+        breaker.acquire()
+        assert breaker.record(success) is None
+    assert breaker.state == "closed"
+
+    breaker.acquire()
+    assert breaker.record(False) == "open"
+    assert breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.acquire("get_patch_job")
+    assert exc_info.value.method == "get_patch_job"
+    assert exc_info.value.retry_after == 30.0
+
+
+def test_breaker_ignores_old_outcomes():
+    breaker = _breaker(_Clock(), failure_threshold=0.6, minimum_calls=3, window=3)
+
+    for success in (False, True, True, False, True, True, False):
+        breaker.acquire()
+        breaker.record(success)
+
+    assert breaker.state == "closed"
+
+
+def test_breaker_half_opens_and_closes():
+    clock = _Clock()
+    breaker = _breaker(clock, minimum_calls=1)
+    breaker.acquire()
+    breaker.record(False)
+
+    clock.now += 30.0
+    assert breaker.state == "half_open"
+    assert breaker.acquire() == "half_open"
+    assert breaker.acquire() is None
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+
+    assert breaker.record(True) is None
+    assert breaker.record(True) == "closed"
+    assert breaker.acquire() is None
+
+
+def test_breaker_reopens_on_failed_probe():
+    clock = _Clock()
+    breaker = _breaker(clock, minimum_calls=1)
+    breaker.acquire()
+    breaker.record(False)
+
+    clock.now += 30.0
+    breaker.acquire()
+    assert breaker.record(False) == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+
+
+def test_breaker_release_returns_probe():
+    clock = _Clock()
+    breaker = _breaker(clock, minimum_calls=1, probes=1)
+    breaker.acquire()
+    breaker.record(False)
+
+    clock.now += 30.0
+    breaker.acquire()
+    breaker.release()
+    breaker.acquire()
+
+
+def test_breakers_per_endpoint_and_method():
+    breakers = CircuitBreakers(minimum_calls=1)
+
+    breaker = breakers.get("a:443", "get_patch_job")
+    assert breakers.get("a:443", "get_patch_job") is breaker
+    assert breakers.get("b:443", "get_patch_job") is not breaker
+    assert breakers.is_failure(exceptions.ServiceUnavailable("down"))
+    assert not breakers.is_failure(exceptions.NotFound("gone"))
+
+    breaker.record(False)
+    assert breakers.states() == {
+        ("a:443", "get_patch_job"): "open",
+        ("b:443", "get_patch_job"): "closed",
+    }
+
+
+def test_client_fails_fast_while_open():
+    registry = instrumentation.MetricsRegistry()
+    client = OsConfigServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+        circuit_breakers=CircuitBreakers(minimum_calls=2),
+        metrics=registry,
+    )
+    request = patch_jobs.ExecutePatchJobRequest(parent="projects/p")
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._transport.execute_patch_job), "__call__"
+    ) as call:
+        call.side_effect = [
+            exceptions.NotFound("no such project"),
+            exceptions.ServiceUnavailable("down"),
+        ]
+        with pytest.raises(exceptions.NotFound):
+            client.execute_patch_job(request)
+        with pytest.raises(exceptions.ServiceUnavailable):
+            client.execute_patch_job(request)
+        with pytest.raises(CircuitOpenError):
+            client.execute_patch_job(request)
+
+        assert len(call.mock_calls) == 2
+
+    method = "execute_patch_job"
+    assert registry.gauge(instrumentation.CIRCUIT_STATE, method) == 2
+    assert registry.counter(instrumentation.CIRCUIT_OPENED, method) == 1
+    assert registry.counter(instrumentation.CIRCUIT_REJECTED, method) == 1
+    assert registry.counter(instrumentation.ERRORS, method) == 3
+
+
+@pytest.mark.asyncio
+async def test_async_client_fails_fast_while_open():
+    client = OsConfigServiceAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+        circuit_breakers=CircuitBreakers(minimum_calls=1),
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._client._transport.cancel_patch_job), "__call__"
+    ) as call:
+        call.side_effect = exceptions.InternalServerError("oops")
+        with pytest.raises(exceptions.InternalServerError):
+            await client.cancel_patch_job(
+                patch_jobs.CancelPatchJobRequest(name="projects/p/patchJobs/j")
+            )
+        with pytest.raises(CircuitOpenError):
+            await client.cancel_patch_job(
+                patch_jobs.CancelPatchJobRequest(name="projects/p/patchJobs/j")
+            )
+
+        assert len(call.mock_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_client_closes_after_probes():
+    clock = _Clock()
+    client = OsConfigServiceAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+        circuit_breakers=CircuitBreakers(minimum_calls=1, probes=1, clock=clock),
+    )
+    request = patch_jobs.CancelPatchJobRequest(name="projects/p/patchJobs/j")
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._client._transport.cancel_patch_job), "__call__"
+    ) as call:
+        call.side_effect = [
+            exceptions.InternalServerError("oops"),
+            grpc_helpers_async.FakeUnaryUnaryCall(patch_jobs.PatchJob()),
+        ]
+        with pytest.raises(exceptions.InternalServerError):
+            await client.cancel_patch_job(request)
+
+        clock.now += 30.0
+        await client.cancel_patch_job(request)
+
+    host = client._client._transport._host
+    assert client._client._transport._circuit_breakers.states() == {
+        (host, "cancel_patch_job"): "closed"
+    }
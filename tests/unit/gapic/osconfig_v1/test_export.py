@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import io
+import json
+
+import mock
+
+import pytest
+
+from google.cloud.osconfig_v1.services.os_config_service import export
+from google.cloud.osconfig_v1.services.os_config_service import pagers
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+def _details(i):
+    return patch_jobs.PatchJobInstanceDetails(
+        name="projects/p/zones/z/instances/i{0}".format(i),
+        instance_system_id=str(i),
+        state=patch_jobs.Instance.PatchState.SUCCEEDED if i % 2 else 0,
+        failure_reason='boom, "quoted"' if i == 2 else "",
+        attempt_count=i,
+    )
+
+
+def _pager():
+    responses = [
+        patch_jobs.ListPatchJobInstanceDetailsResponse(
+            patch_job_instance_details=[_details(0), _details(1), _details(2)],
+            next_page_token="abc",
+        ),
+        patch_jobs.ListPatchJobInstanceDetailsResponse(
+            patch_job_instance_details=[], next_page_token="def"
+        ),
+        patch_jobs.ListPatchJobInstanceDetailsResponse(
+            patch_job_instance_details=[_details(3)]
+        ),
+    ]
+    method = mock.Mock(side_effect=responses[1:])
+    return pagers.ListPatchJobInstanceDetailsPager(
+        method=method,
+        request=patch_jobs.ListPatchJobInstanceDetailsRequest(),
+        response=responses[0],
+    )
+
+
+def test_iter_rows():
+    rows = list(export.iter_rows(_pager()))
+
+    assert len(rows) == 4
+    assert rows[1] == (
+        "projects/p/zones/z/instances/i1",
+        "1",
+        int(patch_jobs.Instance.PatchState.SUCCEEDED),
+        "",
+        1,
+    )
+    assert all(type(row[2]) is int for row in rows)
+
+
+def test_iter_column_chunks():
+    chunks = list(export.iter_column_chunks(_pager(), chunk_size=3))
+
+    assert [len(chunk["name"]) for chunk in chunks] == [3, 1]
+    assert set(chunks[0]) == set(export.COLUMNS)
+    assert chunks[0]["attempt_count"] == [0, 1, 2]
+    assert chunks[1]["instance_system_id"] == ["3"]
+
+
+def test_export_csv():
+    out = io.StringIO(newline="")
+    assert export.export_csv(_pager(), out) == 4
+
+    lines = out.getvalue().splitlines()
+    assert lines[0] == ",".join(export.COLUMNS)
+    assert lines[3] == 'projects/p/zones/z/instances/i2,2,0,"boom, ""quoted""",2'
+    assert len(lines) == 5
+
+
+def test_export_jsonl():
+    out = io.StringIO()
+    assert export.export_jsonl(_pager(), out) == 4
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert records[3] == {
+        "name": "projects/p/zones/z/instances/i3",
+        "instance_system_id": "3",
+        "state": int(patch_jobs.Instance.PatchState.SUCCEEDED),
+        "failure_reason": "",
+        "attempt_count": 3,
+    }
+
+
+def test_export_parquet(tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "details.parquet")
+
+    assert export.export_parquet(_pager(), path, chunk_size=2) == 4
+
+    table = parquet.read_table(path)
+    assert table.num_rows == 4
+    assert table.column("attempt_count").to_pylist() == [0, 1, 2, 3]
+
+
+def test_export_parquet_requires_pyarrow():
+    with mock.patch.object(export, "pyarrow", None):
+        with pytest.raises(ImportError):
+            export.export_parquet(_pager(), io.BytesIO())
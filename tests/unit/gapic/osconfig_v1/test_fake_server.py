@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import datetime
+
+import grpc
+import pytest
+
+from google.api_core import exceptions
+from google.cloud.osconfig_v1.services.os_config_service.fake_server import (
+    FakeOsConfigServer,
+    FakeOsConfigService,
+)
+from google.cloud.osconfig_v1.types import patch_deployments
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _execute(client, **fields):
+    return client.execute_patch_job(patch_jobs.ExecutePatchJobRequest(**fields))
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture
+def server(clock):
+    service = FakeOsConfigService(
+        instances_per_project=30, failure_rate=0.2, seed=1, clock=clock
+    )
+    with FakeOsConfigServer(service, max_workers=4) as server:
+        yield server
+
+
+def test_execute_and_list_instance_details(server):
+    client = server.client()
+
+    job = _execute(
+        client,
+        parent="projects/p",
+        instance_filter={"all": True},
+        display_name="nightly",
+    )
+    assert job.name.startswith("projects/p/patchJobs/")
+    assert job.display_name == "nightly"
+    assert job.state in (
+        patch_jobs.PatchJob.State.SUCCEEDED,
+        patch_jobs.PatchJob.State.COMPLETED_WITH_ERRORS,
+    )
+    assert client.get_patch_job(name=job.name) == job
+
+    pager = client.list_patch_job_instance_details(
+        patch_jobs.ListPatchJobInstanceDetailsRequest(parent=job.name, page_size=7)
+    )
+    details = list(pager)
+    assert len(details) == 30
+    assert len({d.instance_system_id for d in details}) == 30
+    assert server.service.calls["list_patch_job_instance_details"] == 5
+
+    failed = [d for d in details if d.state == patch_jobs.Instance.PatchState.FAILED]
+    summary = job.instance_details_summary
+    assert summary.failed_instance_count == len(failed)
+    assert summary.succeeded_instance_count == 30 - len(failed)
+    assert all(d.failure_reason for d in failed)
+
+    filtered = client.list_patch_job_instance_details(
+        patch_jobs.ListPatchJobInstanceDetailsRequest(
+            parent=job.name, filter='state="FAILED"'
+        )
+    )
+    assert [d.name for d in filtered] == [d.name for d in failed]
+
+
+def test_instance_filter(server):
+    client = server.client()
+    fleet = server.service.fleet("projects/p")
+
+    def targets(**instance_filter):
+        job = _execute(
+            client, parent="projects/p", instance_filter=instance_filter, dry_run=True
+        )
+        details = client.list_patch_job_instance_details(parent=job.name)
+        return sorted(d.name for d in details)
+
+    assert targets(zones=["us-central1-b"]) == sorted(
+        i.name for i in fleet if i.zone == "us-central1-b"
+    )
+    assert targets(instance_name_prefixes=["instance-2"]) == sorted(
+        i.name for i in fleet if i.name.split("/")[-1].startswith("instance-2")
+    )
+    assert targets(group_labels=[{"labels": {"env": "dev"}}]) == sorted(
+        i.name for i in fleet if i.labels["env"] == "dev"
+    )
+    assert targets(instances=["zones/us-central1-a/instances/instance-3"]) == [
+        "projects/p/zones/us-central1-a/instances/instance-3"
+    ]
+
+    with pytest.raises(exceptions.InvalidArgument):
+        _execute(client, parent="projects/p")
+
+
+def test_patch_job_progress_and_cancel(server, clock):
+    server.service.patch_duration = 10.0
+    client = server.client()
+
+    job = _execute(client, parent="projects/p", instance_filter={"all": True})
+    assert job.state == patch_jobs.PatchJob.State.PATCHING
+    assert job.percent_complete == 0.0
+    assert job.instance_details_summary.notified_instance_count == 30
+    assert job.update_time == job.create_time
+
+    clock.now = 5.0
+    job = client.get_patch_job(name=job.name)
+    assert job.state == patch_jobs.PatchJob.State.PATCHING
+    assert job.percent_complete == 50.0
+    assert job.update_time - job.create_time == datetime.timedelta(seconds=5)
+
+    clock.now = 5.2
+    assert client.get_patch_job(name=job.name).update_time == job.update_time
+
+    job = client.cancel_patch_job(patch_jobs.CancelPatchJobRequest(name=job.name))
+    assert job.state == patch_jobs.PatchJob.State.CANCELED
+
+    clock.now = 20.0
+    job = client.get_patch_job(name=job.name)
+    assert job.state == patch_jobs.PatchJob.State.CANCELED
+    assert job.instance_details_summary.notified_instance_count == 15
+
+
+def test_list_patch_jobs(server):
+    client = server.client()
+    for i in range(5):
+        _execute(
+            client,
+            parent="projects/p",
+            instance_filter={"all": True},
+            display_name="even" if i % 2 == 0 else "odd",
+        )
+    _execute(client, parent="projects/q", instance_filter={"all": True})
+
+    pager = client.list_patch_jobs(
+        patch_jobs.ListPatchJobsRequest(parent="projects/p", page_size=2)
+    )
+    jobs = list(pager)
+    assert len(jobs) == 5
+    # Newest first.
+    assert [job.name for job in jobs] == [
+        "projects/p/patchJobs/{0}".format(i) for i in range(5, 0, -1)
+    ]
+    pager = client.list_patch_jobs(parent="projects/p")
+    assert len(list(pager)) == 5
+
+    request = patch_jobs.ListPatchJobsRequest(
+        parent="projects/p", filter='display_name="even"'
+    )
+    assert len(list(client.list_patch_jobs(request))) == 3
+
+    with pytest.raises(exceptions.InvalidArgument):
+        list(
+            client.list_patch_jobs(
+                patch_jobs.ListPatchJobsRequest(parent="projects/p", filter="nope")
+            )
+        )
+    with pytest.raises(exceptions.InvalidArgument):
+        list(
+            client.list_patch_jobs(
+                patch_jobs.ListPatchJobsRequest(parent="projects/p", page_token="x")
+            )
+        )
+
+
+def test_patch_deployments(server):
+    client = server.client()
+    deployment = patch_deployments.PatchDeployment(
+        description="weekly", instance_filter={"all": True}
+    )
+
+    created = client.create_patch_deployment(
+        parent="projects/p", patch_deployment=deployment, patch_deployment_id="weekly"
+    )
+    assert created.name == "projects/p/patchDeployments/weekly"
+    assert created.description == "weekly"
+    assert client.get_patch_deployment(name=created.name) == created
+    assert list(client.list_patch_deployments(parent="projects/p")) == [created]
+
+    with pytest.raises(exceptions.AlreadyExists):
+        client.create_patch_deployment(
+            parent="projects/p",
+            patch_deployment=deployment,
+            patch_deployment_id="weekly",
+        )
+
+    client.delete_patch_deployment(name=created.name)
+    with pytest.raises(exceptions.NotFound):
+        client.get_patch_deployment(name=created.name)
+    with pytest.raises(exceptions.NotFound):
+        client.delete_patch_deployment(name=created.name)
+
+
+def test_inject_error(server):
+    client = server.client()
+    job = _execute(client, parent="projects/p", instance_filter={"all": True})
+
+    server.service.inject_error(
+        grpc.StatusCode.UNAVAILABLE, methods=["get_patch_job"], count=2
+    )
+    # The default policy of get_patch_job retries unavailable errors.
+    assert client.get_patch_job(name=job.name).name == job.name
+    assert server.service.calls["get_patch_job"] == 3
+
+    server.service.inject_error(grpc.StatusCode.PERMISSION_DENIED, message="no")
+    with pytest.raises(exceptions.PermissionDenied):
+        client.get_patch_job(name=job.name)
+    with pytest.raises(exceptions.PermissionDenied):
+        client.list_patch_jobs(parent="projects/p")
+
+    server.service.clear_errors()
+    client.get_patch_job(name=job.name)
+
+
+@pytest.mark.asyncio
+async def test_async_client(server):
+    client = server.async_client()
+
+    job = await _execute(client, parent="projects/p", instance_filter={"all": True})
+    pager = await client.list_patch_job_instance_details(
+        patch_jobs.ListPatchJobInstanceDetailsRequest(parent=job.name, page_size=8)
+    )
+    details = [d async for d in pager]
+    assert len(details) == 30
+
+    with pytest.raises(exceptions.NotFound):
+        await client.get_patch_job(name="projects/p/patchJobs/missing")
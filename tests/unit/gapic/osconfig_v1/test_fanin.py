@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import asyncio
+
+import mock
+
+import pytest
+
+from google.api_core import exceptions
+from google.api_core import grpc_helpers_async
+from google.auth import credentials
+from google.cloud.osconfig_v1.services.os_config_service import (
+    OsConfigServiceAsyncClient,
+)
+from google.cloud.osconfig_v1.services.os_config_service import fanin
+from google.cloud.osconfig_v1.services.os_config_service import pagers
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+def _page(parent, page, pages=3, per_page=2):
+    return patch_jobs.ListPatchJobInstanceDetailsResponse(
+        patch_job_instance_details=[
+            patch_jobs.PatchJobInstanceDetails(
+                name="{0}/instances/{1}".format(parent, page * per_page + i)
+            )
+            for i in range(per_page)
+        ],
+        next_page_token=str(page + 1) if page + 1 < pages else "",
+    )
+
+
+class _FakeClient:
+    # Serves three pages per patch job after a short delay, recording the
+    # largest number of page requests in flight at once.
+
+    def __init__(self, fail=None):
+        self.fail = fail
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+
+    async def _fetch(self, request):
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+        finally:
+            self.in_flight -= 1
+        if request.parent == self.fail:
+            raise exceptions.NotFound("no such job")
+        return _page(request.parent, int(request.page_token or 0))
+
+    async def list_patch_job_instance_details(self, parent, **kwargs):
+        request = patch_jobs.ListPatchJobInstanceDetailsRequest(parent=parent)
+        return pagers.ListPatchJobInstanceDetailsAsyncPager(
+            method=self._fetch, request=request, response=await self._fetch(request)
+        )
+
+
+def _parents(count):
+    return ["projects/p/patchJobs/j{0}".format(i) for i in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_merge_instance_details_keeps_order_per_job():
+    client = _FakeClient()
+    parents = _parents(5)
+
+    results = [
+        item
+        async for item in fanin.merge_instance_details(
+            client, parents, max_concurrency=2
+        )
+    ]
+
+    assert len(results) == 5 * 3 * 2
+    assert client.max_in_flight == 2
+    for parent in parents:
+        assert [r.details.name for r in results if r.patch_job == parent] == [
+            "{0}/instances/{1}".format(parent, i) for i in range(6)
+        ]
+
+
+@pytest.mark.asyncio
+async def test_merge_instance_details_applies_back_pressure():
+    client = _FakeClient()
+    merged = fanin.merge_instance_details(
+        client, _parents(5), max_concurrency=5, max_buffered_pages=1
+    )
+
+    await merged.__anext__()
+    await asyncio.sleep(0.05)
+
+    # One page consumed, one buffered, and at most one page waiting for
+    # room in the buffer per job.
+    assert client.requests <= 2 + 5
+    await merged.aclose()
+
+
+@pytest.mark.asyncio
+async def test_merge_instance_details_raises_and_cancels():
+    client = _FakeClient(fail="projects/p/patchJobs/j1")
+
+    with pytest.raises(exceptions.NotFound):
+        async for _ in fanin.merge_instance_details(
+            client, _parents(3), max_concurrency=1
+        ):
+            pass
+
+    await asyncio.sleep(0.01)
+    assert client.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_merge_instance_details_no_parents():
+    client = _FakeClient()
+
+    assert [i async for i in fanin.merge_instance_details(client, [])] == []
+    assert client.requests == 0
+
+
+@pytest.mark.asyncio
+async def test_merge_patch_job_instance_details_async():
+    client = OsConfigServiceAsyncClient(credentials=credentials.AnonymousCredentials())
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._client._transport.list_patch_job_instance_details), "__call__"
+    ) as call:
+        call.side_effect = lambda request, **kwargs: (
+            grpc_helpers_async.FakeUnaryUnaryCall(
+                _page(request.parent, int(request.page_token or 0))
+            )
+        )
+        results = [
+            item
+            async for item in client.merge_patch_job_instance_details(
+                _parents(2), max_concurrency=1
+            )
+        ]
+
+        assert len(call.mock_calls) == 6
+
+    assert [r.patch_job for r in results].count("projects/p/patchJobs/j0") == 6
+    assert [r.patch_job for r in results].count("projects/p/patchJobs/j1") == 6
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import datetime
+
+import mock
+
+from google.cloud.osconfig_v1.services.os_config_service import pagers
+from google.cloud.osconfig_v1.services.os_config_service.filters import PatchJobFilter
+from google.cloud.osconfig_v1.services.os_config_service.indexes import PatchJobIndex
+from google.cloud.osconfig_v1.types import patch_jobs
+
+State = patch_jobs.PatchJob.State
+
+
+def _job(name, state, deployment="", day=1, display_name=""):
+    return patch_jobs.PatchJob(
+        name=name,
+        state=state,
+        patch_deployment=deployment,
+        display_name=display_name,
+        create_time=datetime.datetime(2020, 1, day, tzinfo=datetime.timezone.utc),
+    )
+
+
+def _jobs():
+    return [
+        _job("a", State.SUCCEEDED, "d1", day=1, display_name="weekly"),
+        _job("b", State.TIMED_OUT, "d1", day=2),
+        _job("c", State.TIMED_OUT, "d2", day=3),
+        _job("d", State.SUCCEEDED, "", day=4, display_name="weekly"),
+    ]
+
+
+def _day(day):
+    return datetime.datetime(2020, 1, day, tzinfo=datetime.timezone.utc)
+
+
+def test_server_filter():
+    assert PatchJobFilter().server_filter() == ""
+    assert (
+        PatchJobFilter(
+            patch_deployment='projects/p/patchDeployments/"x"'
+        ).server_filter()
+        == 'patch_deployment="projects/p/patchDeployments/\\"x\\""'
+    )
+
+
+def test_request():
+    criteria = PatchJobFilter(patch_deployment="d1", states=[State.TIMED_OUT])
+    request = criteria.request("projects/p", page_size=50)
+
+    assert request.parent == "projects/p"
+    assert request.page_size == 50
+    assert request.filter == 'patch_deployment="d1"'
+    assert criteria.needs_local_filtering
+    assert not PatchJobFilter(patch_deployment="d1").needs_local_filtering
+
+
+def test_matches():
+    jobs = _jobs()
+
+    def names(criteria):
+        return [job.name for job in criteria.filter(jobs)]
+
+    assert names(PatchJobFilter()) == ["a", "b", "c", "d"]
+    assert names(PatchJobFilter(states=[State.TIMED_OUT])) == ["b", "c"]
+    assert names(PatchJobFilter(patch_deployment="d1")) == ["a", "b"]
+    assert names(PatchJobFilter(display_name="weekly")) == ["a", "d"]
+    assert names(PatchJobFilter(created_after=_day(2), created_before=_day(4))) == [
+        "b",
+        "c",
+    ]
+
+
+def test_repr():
+    assert repr(PatchJobFilter(display_name="weekly")) == (
+        "PatchJobFilter(display_name='weekly')"
+    )
+
+
+def test_index_queries():
+    index = PatchJobIndex()
+    assert index.update(reversed(_jobs())) == 4
+
+    def names(jobs):
+        return [job.name for job in jobs]
+
+    assert len(index) == 4
+    assert "a" in index
+    assert names(index.by_state(State.TIMED_OUT)) == ["b", "c"]
+    assert names(index.by_patch_deployment("d1")) == ["a", "b"]
+    assert names(index.created_between(_day(2), _day(4))) == ["b", "c"]
+    assert names(index.created_between(start=_day(3))) == ["c", "d"]
+    assert names(
+        index.query(
+            PatchJobFilter(
+                states=[State.SUCCEEDED], display_name="weekly", created_after=_day(2)
+            )
+        )
+    ) == ["d"]
+    assert names(
+        index.query(PatchJobFilter(states=[State.TIMED_OUT], patch_deployment="d2"))
+    ) == ["c"]
+
+
+def test_index_replaces_jobs():
+    index = PatchJobIndex()
+    index.update(_jobs())
+    index.add(_job("b", State.SUCCEEDED, "d2", day=5))
+
+    assert len(index) == 4
+    assert [job.name for job in index.by_state(State.TIMED_OUT)] == ["c"]
+    assert [job.name for job in index.by_patch_deployment("d2")] == ["c", "b"]
+    assert index.get("b").state == State.SUCCEEDED
+
+    assert index.remove("b")
+    assert not index.remove("b")
+    assert [job.name for job in index.created_between()] == ["a", "c", "d"]
+
+
+def test_index_track():
+    jobs = _jobs()
+    pager = pagers.ListPatchJobsPager(
+        method=mock.Mock(
+            side_effect=[patch_jobs.ListPatchJobsResponse(patch_jobs=jobs[2:])]
+        ),
+        request=patch_jobs.ListPatchJobsRequest(),
+        response=patch_jobs.ListPatchJobsResponse(
+            patch_jobs=jobs[:2], next_page_token="abc"
+        ),
+    )
+    index = PatchJobIndex()
+    tracked = index.track(pager)
+
+    # The whole first page is indexed as soon as it is iterated.
+    assert next(tracked).name == "a"
+    assert len(index) == 2
+    assert [job.name for job in tracked] == ["b", "c", "d"]
+    assert len(index) == 4
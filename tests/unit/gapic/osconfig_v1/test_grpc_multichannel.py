@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import mock
+
+import pytest
+
+from google.auth import credentials
+from google.cloud.osconfig_v1.services.os_config_service import OsConfigServiceClient
+from google.cloud.osconfig_v1.services.os_config_service import transports
+from google.cloud.osconfig_v1.services.os_config_service.transports.grpc_multichannel import (
+    ChannelGroup,
+)
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+def test_get_transport_class_multichannel():
+    transport = OsConfigServiceClient.get_transport_class("grpc_multichannel")
+    assert transport == transports.OsConfigServiceGrpcMultiChannelTransport
+
+
+def test_channel_group_requires_channels():
+    with pytest.raises(ValueError):
+        ChannelGroup([])
+
+
+def test_channel_group_round_robin():
+    channels = [mock.Mock() for _ in range(3)]
+    group = ChannelGroup(channels)
+    callable_ = group.unary_unary("/Service/Method")
+
+    for _ in range(6):
+        callable_("request")
+
+    # With no calls outstanding every channel is equally loaded, so calls
+    # rotate between them.
+    for channel in channels:
+        assert channel.unary_unary.return_value.call_count == 2
+    assert group.in_flight == (0, 0, 0)
+
+
+def test_channel_group_least_loaded():
+    channels = [mock.Mock() for _ in range(3)]
+    group = ChannelGroup(channels)
+    callable_ = group.unary_unary("/Service/Method")
+
+    # Hold two calls open on the first two channels.
+    busy = [group._acquire(), group._acquire()]
+    assert busy == [0, 1]
+    assert group.in_flight == (1, 1, 0)
+
+    callable_("request")
+    callable_("request")
+    assert channels[2].unary_unary.return_value.call_count == 2
+    assert not channels[0].unary_unary.return_value.called
+    assert not channels[1].unary_unary.return_value.called
+
+    for index in busy:
+        group._release(index)
+    assert group.in_flight == (0, 0, 0)
+
+
+def test_channel_group_releases_on_error():
+    channel = mock.Mock()
+    channel.unary_unary.return_value.side_effect = RuntimeError
+    group = ChannelGroup([channel])
+
+    with pytest.raises(RuntimeError):
+        group.unary_unary("/Service/Method")("request")
+    assert group.in_flight == (0,)
+
+
+def test_multichannel_transport_creates_channels():
+    with mock.patch.object(
+        transports.OsConfigServiceGrpcMultiChannelTransport, "create_channel"
+    ) as create_channel:
+        create_channel.side_effect = lambda *args, **kwargs: mock.Mock()
+        transport = transports.OsConfigServiceGrpcMultiChannelTransport(
+            credentials=credentials.AnonymousCredentials(), channel_count=3
+        )
+
+        assert len(transport.grpc_channel.channels) == 3
+        assert create_channel.call_count == 3
+
+    channels = transport.grpc_channel.channels
+    transport.close()
+    for channel in channels:
+        channel.close.assert_called_once_with()
+
+
+def test_multichannel_transport_distinct_channel_options():
+    with mock.patch.object(
+        transports.OsConfigServiceGrpcMultiChannelTransport, "create_channel"
+    ) as create_channel:
+        create_channel.side_effect = lambda *args, **kwargs: mock.Mock()
+        transport = transports.OsConfigServiceGrpcMultiChannelTransport(
+            credentials=credentials.AnonymousCredentials(), channel_count=3
+        )
+        transport.grpc_channel
+
+    options = [
+        tuple(call_args[1]["options"]) for call_args in create_channel.call_args_list
+    ]
+    assert len(set(options)) == 3
+    for channel_options in options:
+        assert ("grpc.use_local_subchannel_pool", 1) in channel_options
+
+
+def test_multichannel_transport_real_channels():
+    transport = transports.OsConfigServiceGrpcMultiChannelTransport(
+        credentials=credentials.AnonymousCredentials(), channel_count=2
+    )
+    first, second = transport.grpc_channel.channels
+    assert first is not second
+    transport.close()
+
+
+def test_multichannel_transport_channel_pool():
+    pool = transports.ChannelPool(idle_timeout=60)
+    creds = credentials.AnonymousCredentials()
+
+    with mock.patch.object(
+        transports.OsConfigServiceGrpcTransport, "create_channel"
+    ) as create_channel:
+        create_channel.side_effect = lambda *args, **kwargs: mock.Mock()
+        single = transports.OsConfigServiceGrpcTransport(
+            credentials=creds, channel_pool=pool
+        )
+        first = transports.OsConfigServiceGrpcMultiChannelTransport(
+            credentials=creds, channel_pool=pool, channel_count=2
+        )
+        second = transports.OsConfigServiceGrpcMultiChannelTransport(
+            credentials=creds, channel_pool=pool, channel_count=2
+        )
+
+        # Multi-channel transports share their channel group, but never
+        # the channel of a single-channel transport.
+        assert first.grpc_channel is second.grpc_channel
+        assert single.grpc_channel not in first.grpc_channel.channels
+        assert len(pool) == 2
+
+
+def test_multichannel_transport_client_call():
+    channels = [mock.Mock() for _ in range(2)]
+    for channel in channels:
+        channel.unary_unary.return_value.return_value = patch_jobs.PatchJob(
+            name="name_value"
+        )
+    client = OsConfigServiceClient(
+        transport=transports.OsConfigServiceGrpcMultiChannelTransport(
+            credentials=credentials.AnonymousCredentials(), channels=channels
+        )
+    )
+
+    for _ in range(4):
+        response = client.get_patch_job(name="name_value")
+        assert response.name == "name_value"
+
+    for channel in channels:
+        assert channel.unary_unary.return_value.call_count == 2
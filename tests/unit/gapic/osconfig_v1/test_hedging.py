@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import asyncio
+from concurrent import futures
+import threading
+import time
+
+import mock
+
+import pytest
+
+from google.api_core import exceptions
+from google.api_core import grpc_helpers_async
+from google.auth import credentials
+from google.cloud.osconfig_v1.services.os_config_service import (
+    OsConfigServiceAsyncClient,
+)
+from google.cloud.osconfig_v1.services.os_config_service import OsConfigServiceClient
+from google.cloud.osconfig_v1.services.os_config_service import instrumentation
+from google.cloud.osconfig_v1.services.os_config_service import hedging
+from google.cloud.osconfig_v1.services.os_config_service.hedging import HedgingPolicy
+from google.cloud.osconfig_v1.types import patch_deployments
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+class _SlowFirstStub:
+    # A stub answering the first request after `delay` seconds and the
+    # others after `hedge_delay`, or failing with the given errors in turn.
+    # Requests are sent as futures, which can be cancelled until answered.
+
+    def __init__(self, delay=5.0, errors=(), hedge_delay=0.0):
+        self.delay = delay
+        self.hedge_delay = hedge_delay
+        self.errors = list(errors)
+        self.futures = []
+        self._lock = threading.Lock()
+
+    @property
+    def calls(self):
+        return len(self.futures)
+
+    def future(self, request, **kwargs):
+        future = futures.Future()
+        with self._lock:
+            self.futures.append(future)
+            first = len(self.futures) == 1
+            error = self.errors.pop(0) if self.errors else None
+
+        def finish():
+            if not future.set_running_or_notify_cancel():
+                return
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(
+                    patch_jobs.PatchJob(name=request.name, display_name=str(first))
+                )
+
+        delay = self.delay if first else self.hedge_delay
+        if delay:
+            timer = threading.Timer(delay, finish)
+            timer.daemon = True
+            timer.start()
+        else:
+            finish()
+        return future
+
+    def __call__(self, request, **kwargs):
+        return self.future(request, **kwargs).result()
+
+
+class _SlowCall(grpc_helpers_async.FakeUnaryUnaryCall):
+    def __init__(self, response, delay):
+        super().__init__(response)
+        self.delay = delay
+
+    def __await__(self):
+        yield from asyncio.ensure_future(asyncio.sleep(self.delay)).__await__()
+        return self.response
+
+
+def _request():
+    return patch_jobs.GetPatchJobRequest(name="projects/p/patchJobs/j")
+
+
+def test_delay_follows_percentile():
+    policy = HedgingPolicy(90.0, initial_delay=0.2, min_delay=0.01, min_samples=10)
+
+    assert policy.delay("get_patch_job") == 0.2
+
+    for i in range(1, 11):
+        policy.observe("get_patch_job", i / 100)
+
+    assert policy.delay("get_patch_job") == 0.1
+    assert policy.delay("get_patch_deployment") == 0.2
+
+
+def test_fast_call_is_not_hedged():
+    policy = HedgingPolicy(initial_delay=1.0)
+    stub = _SlowFirstStub(delay=0.0)
+
+    response = policy.call("get_patch_job", hedging.cancellable(stub), _request())
+
+    assert response.name == "projects/p/patchJobs/j"
+    assert (policy.calls, policy.hedges, policy.hedge_rate) == (1, 0, 0.0)
+    assert policy.delay("get_patch_job") == 1.0
+    policy.close()
+
+
+def test_slow_call_is_hedged():
+    policy = HedgingPolicy(initial_delay=0.01, min_samples=1)
+    stub = _SlowFirstStub()
+    metrics = instrumentation.MetricsRegistry()
+
+    start = time.monotonic()
+    response = policy.call(
+        "get_patch_job", hedging.cancellable(stub), _request(), metrics=metrics
+    )
+
+    assert time.monotonic() - start < 1.0
+    assert response.display_name == "False"
+    assert (policy.hedges, policy.hedge_wins, policy.hedge_rate) == (1, 1, 1.0)
+    assert metrics.counter(instrumentation.HEDGES, "get_patch_job") == 1
+    assert metrics.counter(instrumentation.HEDGE_WINS, "get_patch_job") == 1
+
+    # The slow request was cancelled, and its latency not observed.
+    assert stub.calls == 2
+    assert stub.futures[0].cancelled()
+    assert policy.delay("get_patch_job") == 0.01
+    policy.close()
+
+
+def test_hedge_is_cancelled_when_the_first_request_wins():
+    policy = HedgingPolicy(initial_delay=0.01)
+    stub = _SlowFirstStub(delay=0.1, hedge_delay=5.0)
+
+    response = policy.call("get_patch_job", hedging.cancellable(stub), _request())
+
+    assert response.display_name == "True"
+    assert (policy.hedges, policy.hedge_wins) == (1, 0)
+    assert stub.futures[1].cancelled()
+    policy.close()
+
+
+def test_hedge_errors_wait_for_the_other_request():
+    policy = HedgingPolicy(initial_delay=0.01)
+    stub = _SlowFirstStub(delay=0.1, errors=[None, exceptions.NotFound("gone")])
+
+    response = policy.call("get_patch_job", hedging.cancellable(stub), _request())
+
+    assert response.display_name == "True"
+    assert policy.hedge_wins == 0
+    policy.close()
+
+
+def test_both_requests_fail():
+    policy = HedgingPolicy(initial_delay=0.01)
+    stub = _SlowFirstStub(
+        delay=0.1,
+        errors=[exceptions.InternalServerError("oops"), exceptions.NotFound("gone")],
+    )
+
+    with pytest.raises(exceptions.GoogleAPICallError):
+        policy.call("get_patch_job", hedging.cancellable(stub), _request())
+    policy.close()
+
+
+def test_hedges_are_capped():
+    policy = HedgingPolicy(initial_delay=0.01, max_hedge_ratio=0.0)
+
+    policy.call("get_patch_job", hedging.cancellable(_SlowFirstStub()), _request())
+
+    stub = _SlowFirstStub(delay=0.05)
+    response = policy.call("get_patch_job", hedging.cancellable(stub), _request())
+
+    assert response.display_name == "True"
+    assert stub.calls == 1
+    assert (policy.calls, policy.hedges) == (2, 1)
+    policy.close()
+
+
+def test_uncancellable_calls_are_not_hedged():
+    policy = HedgingPolicy(initial_delay=0.01)
+
+    response = policy.call("get_patch_job", _SlowFirstStub(delay=0.05), _request())
+
+    assert response.display_name == "True"
+    assert policy.hedges == 0
+    policy.close()
+
+
+def test_get_patch_job_hedged():
+    policy = HedgingPolicy(initial_delay=0.01)
+    client = OsConfigServiceClient(
+        credentials=credentials.AnonymousCredentials(), hedging=policy
+    )
+    stub = _SlowFirstStub()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(type(client._transport.get_patch_job), "future") as call:
+        call.side_effect = stub.future
+        start = time.monotonic()
+        response = client.get_patch_job(name="projects/p/patchJobs/j")
+
+    assert time.monotonic() - start < 1.0
+    assert response.display_name == "False"
+    assert stub.calls == 2
+    assert stub.futures[0].cancelled()
+    policy.close()
+
+
+@pytest.mark.asyncio
+async def test_get_patch_deployment_hedged_async():
+    policy = HedgingPolicy(initial_delay=0.01)
+    client = OsConfigServiceAsyncClient(
+        credentials=credentials.AnonymousCredentials(), hedging=policy
+    )
+    calls = []
+
+    def serve(request, **kwargs):
+        calls.append(request)
+        return _SlowCall(
+            patch_deployments.PatchDeployment(
+                name=request.name, description=str(len(calls))
+            ),
+            5.0 if len(calls) == 1 else 0.0,
+        )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._client._transport.get_patch_deployment), "__call__"
+    ) as call:
+        call.side_effect = serve
+        start = time.monotonic()
+        response = await client.get_patch_deployment(
+            name="projects/p/patchDeployments/d"
+        )
+
+    assert time.monotonic() - start < 1.0
+    assert response.description == "2"
+    assert (policy.hedges, policy.hedge_wins) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_fast_call_is_not_hedged_async():
+    policy = HedgingPolicy(initial_delay=1.0)
+
+    async def rpc(request, **kwargs):
+        return patch_jobs.PatchJob(name=request.name)
+
+    response = await policy.call_async("get_patch_job", rpc, _request())
+
+    assert response.name == "projects/p/patchJobs/j"
+    assert policy.hedges == 0
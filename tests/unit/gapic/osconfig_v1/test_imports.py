@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import importlib
+import pkgutil
+
+import pytest
+
+from google.cloud.osconfig_v1 import services
+
+
+def _modules():
+    return sorted(
+        name
+        for _, name, _ in pkgutil.walk_packages(
+            services.__path__, services.__name__ + "."
+        )
+    )
+
+
+@pytest.mark.parametrize("name", _modules())
+def test_module_imports(name):
+    # Run by every unit test session, this checks each module imports on
+    # the oldest supported Python too.
+    importlib.import_module(name)
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import sys
+
+import mock
+
+import pytest
+
+from google.api_core import exceptions
+from google.api_core import grpc_helpers_async
+from google.api_core import retry as retries
+from google.auth import credentials
+from google.cloud.osconfig_v1.services.os_config_service import (
+    OsConfigServiceAsyncClient,
+)
+from google.cloud.osconfig_v1.services.os_config_service import OsConfigServiceClient
+from google.cloud.osconfig_v1.services.os_config_service import instrumentation
+from google.cloud.osconfig_v1.services.os_config_service.instrumentation import (
+    Histogram,
+    MetricsRegistry,
+)
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+def _pages(count):
+    return [
+        patch_jobs.ListPatchJobsResponse(
+            patch_jobs=[patch_jobs.PatchJob(name="projects/p/patchJobs/{0}".format(i))],
+            next_page_token=str(i + 1) if i + 1 < count else "",
+        )
+        for i in range(count)
+    ]
+
+
+def test_histogram():
+    histogram = Histogram((1, 2, 4, 8))
+
+    assert histogram.percentile(50) is None
+    assert histogram.mean is None
+
+    for value in (0.5, 1.5, 1.5, 3, 7, 20):
+        histogram.observe(value)
+
+    assert histogram.bucket_counts == [1, 2, 1, 1, 1]
+    assert histogram.count == 6
+    assert histogram.sum == pytest.approx(33.5)
+    assert (histogram.min, histogram.max) == (0.5, 20)
+    assert histogram.percentile(0) == 0.5
+    assert histogram.percentile(50) == 2
+    assert histogram.percentile(100) == 20
+    assert 1 <= histogram.percentile(25) <= 2
+
+
+def test_registry_records_and_exports():
+    exporter = mock.Mock()
+    registry = MetricsRegistry([exporter])
+
+    registry.record(instrumentation.LATENCY, "get_patch_job", 0.25)
+    registry.record(instrumentation.LATENCY, "get_patch_job", 0.75)
+    registry.increment(instrumentation.ERRORS, "get_patch_job")
+
+    histogram = registry.histogram(instrumentation.LATENCY, "get_patch_job")
+    assert histogram.count == 2
+    assert histogram.mean == 0.5
+    assert registry.histogram(instrumentation.LATENCY, "list_patch_jobs") is None
+    assert registry.counter(instrumentation.ERRORS, "get_patch_job") == 1
+    assert registry.counter(instrumentation.ERRORS, "list_patch_jobs") == 0
+    assert exporter.record.mock_calls == [
+        mock.call(instrumentation.LATENCY, "get_patch_job", 0.25),
+        mock.call(instrumentation.LATENCY, "get_patch_job", 0.75),
+    ]
+    exporter.increment.assert_called_once_with(
+        instrumentation.ERRORS, "get_patch_job", 1
+    )
+
+    snapshot = registry.snapshot()
+    assert snapshot[instrumentation.LATENCY]["get_patch_job"].count == 2
+    assert snapshot[instrumentation.ERRORS] == {"get_patch_job": 1}
+
+    registry.reset()
+    assert registry.snapshot() == {}
+
+
+def test_client_without_metrics_is_not_instrumented():
+    client = OsConfigServiceClient(credentials=credentials.AnonymousCredentials())
+
+    rpc = client._transport._wrapped_method("get_patch_job")
+
+    assert not isinstance(rpc, instrumentation._InstrumentedMethod)
+
+
+def test_get_patch_job_metrics():
+    registry = MetricsRegistry()
+    client = OsConfigServiceClient(
+        credentials=credentials.AnonymousCredentials(), metrics=registry
+    )
+    response = patch_jobs.PatchJob(name="projects/p/patchJobs/j")
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(type(client._transport.get_patch_job), "__call__") as call:
+        call.side_effect = [exceptions.ServiceUnavailable("try again"), response]
+        client.get_patch_job(
+            name="projects/p/patchJobs/j",
+            retry=retries.Retry(
+                predicate=retries.if_exception_type(exceptions.ServiceUnavailable),
+                initial=0.0,
+            ),
+        )
+
+    method = "get_patch_job"
+    assert registry.histogram(instrumentation.LATENCY, method).count == 1
+    assert registry.histogram(instrumentation.RETRIES, method).max == 1
+    assert registry.histogram(
+        instrumentation.REQUEST_BYTES, method
+    ).max == instrumentation.message_bytes(
+        patch_jobs.GetPatchJobRequest(name="projects/p/patchJobs/j")
+    )
+    assert registry.histogram(
+        instrumentation.RESPONSE_BYTES, method
+    ).max == instrumentation.message_bytes(response)
+    assert registry.counter(instrumentation.ERRORS, method) == 0
+
+
+def test_error_metrics():
+    registry = MetricsRegistry()
+    client = OsConfigServiceClient(
+        credentials=credentials.AnonymousCredentials(), metrics=registry
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(type(client._transport.get_patch_job), "__call__") as call:
+        call.side_effect = exceptions.NotFound("no such job")
+        with pytest.raises(exceptions.NotFound):
+            client.get_patch_job(name="projects/p/patchJobs/j")
+
+    assert registry.counter(instrumentation.ERRORS, "get_patch_job") == 1
+    assert registry.histogram(instrumentation.RESPONSE_BYTES, "get_patch_job") is None
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_pager_metrics(prefetch):
+    registry = MetricsRegistry()
+    client = OsConfigServiceClient(
+        credentials=credentials.AnonymousCredentials(), metrics=registry
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(type(client._transport.list_patch_jobs), "__call__") as call:
+        call.side_effect = _pages(3)
+        pager = client.list_patch_jobs(parent="projects/p", prefetch=prefetch)
+        assert len(list(pager)) == 3
+
+    assert registry.histogram(instrumentation.LATENCY, "list_patch_jobs").count == 3
+    pages = registry.histogram(instrumentation.PAGES, "list_patch_jobs")
+    assert (pages.count, pages.max) == (1, 3)
+
+
+@pytest.mark.asyncio
+async def test_async_client_metrics():
+    registry = MetricsRegistry()
+    client = OsConfigServiceAsyncClient(
+        credentials=credentials.AnonymousCredentials(), metrics=registry
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._client._transport.list_patch_jobs), "__call__"
+    ) as call:
+        call.side_effect = [
+            grpc_helpers_async.FakeUnaryUnaryCall(page) for page in _pages(2)
+        ]
+        pager = await client.list_patch_jobs(parent="projects/p")
+        assert len([job async for job in pager]) == 2
+
+    assert registry.histogram(instrumentation.LATENCY, "list_patch_jobs").count == 2
+    assert registry.histogram(instrumentation.RETRIES, "list_patch_jobs").max == 0
+    assert registry.histogram(instrumentation.PAGES, "list_patch_jobs").max == 2
+
+
+def _opentelemetry():
+    # Stand-ins for the modules of the opentelemetry-api package.
+    opentelemetry = mock.Mock()
+    return {
+        "opentelemetry": opentelemetry,
+        "opentelemetry.metrics": opentelemetry.metrics,
+    }
+
+
+def test_prometheus_exporter():
+    prometheus_client = mock.Mock()
+    with mock.patch.dict(sys.modules, {"prometheus_client": prometheus_client}):
+        exporter = instrumentation.PrometheusExporter(registry=mock.sentinel.registry)
+        exporter.record(instrumentation.LATENCY, "get_patch_job", 0.5)
+        exporter.record(instrumentation.LATENCY, "list_patch_jobs", 0.5)
+        exporter.increment(instrumentation.ERRORS, "get_patch_job")
+
+    assert prometheus_client.Histogram.call_count == 1
+    histogram = prometheus_client.Histogram.return_value
+    histogram.labels.assert_any_call("get_patch_job")
+    histogram.labels.return_value.observe.assert_called_with(0.5)
+    prometheus_client.Counter.return_value.labels.return_value.inc.assert_called_once_with(
+        1
+    )
+
+
+def test_opentelemetry_exporter():
+    meter = mock.Mock()
+    with mock.patch.dict(sys.modules, _opentelemetry()):
+        exporter = instrumentation.OpenTelemetryExporter(meter)
+    exporter.record(instrumentation.LATENCY, "get_patch_job", 0.5)
+    exporter.increment(instrumentation.ERRORS, "get_patch_job", 2)
+
+    meter.create_histogram.assert_called_once_with("osconfig.rpc_latency_seconds")
+    meter.create_histogram.return_value.record.assert_called_once_with(
+        0.5, {"method": "get_patch_job"}
+    )
+    meter.create_counter.return_value.add.assert_called_once_with(
+        2, {"method": "get_patch_job"}
+    )
+
+
+def test_exporters_require_their_packages():
+    with mock.patch.dict(sys.modules, {"prometheus_client": None}):
+        with pytest.raises(ImportError):
+            instrumentation.PrometheusExporter()
+    with mock.patch.dict(sys.modules, {"opentelemetry": None}):
+        with pytest.raises(ImportError):
+            instrumentation.OpenTelemetryExporter()
+
+
+def test_gauges():
+    exporter = mock.Mock()
+    registry = MetricsRegistry([exporter])
+
+    assert registry.gauge(instrumentation.CIRCUIT_STATE, "get_patch_job") is None
+    registry.set_gauge(instrumentation.CIRCUIT_STATE, "get_patch_job", 2)
+
+    assert registry.gauge(instrumentation.CIRCUIT_STATE, "get_patch_job") == 2
+    assert registry.snapshot()[instrumentation.CIRCUIT_STATE] == {"get_patch_job": 2}
+    exporter.set_gauge.assert_called_once_with(
+        instrumentation.CIRCUIT_STATE, "get_patch_job", 2
+    )
+
+    meter = mock.Mock()
+    with mock.patch.dict(sys.modules, _opentelemetry()):
+        exporter = instrumentation.OpenTelemetryExporter(meter)
+    exporter.set_gauge(instrumentation.CIRCUIT_STATE, "get_patch_job", 2)
+    exporter.set_gauge(instrumentation.CIRCUIT_STATE, "get_patch_job", 1)
+
+    assert meter.create_up_down_counter.return_value.add.mock_calls == [
+        mock.call(2, {"method": "get_patch_job"}),
+        mock.call(-1, {"method": "get_patch_job"}),
+    ]
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import subprocess
+import sys
+
+import pytest
+
+from google.cloud import osconfig
+from google.cloud import osconfig_v1
+from google.cloud.osconfig_v1.services import os_config_service
+from google.cloud.osconfig_v1.services.os_config_service import transports
+from google.cloud.osconfig_v1.services.os_config_service.async_client import (
+    OsConfigServiceAsyncClient,
+)
+from google.cloud.osconfig_v1.services.os_config_service.client import (
+    OsConfigServiceClient,
+)
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+def _loaded_modules(statement):
+    # Run a statement in a fresh interpreter and return the library modules
+    # it loaded.
+    code = (
+        "import sys\n"
+        "{0}\n"
+        "print('\\n'.join(m for m in sys.modules if m.startswith('google.cloud.os')))"
+    ).format(statement)
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    ).stdout
+    return set(output.split())
+
+
+# Module __getattr__ (PEP 562) needs Python 3.7; older interpreters import
+# the packages eagerly.
+requires_lazy_imports = pytest.mark.skipif(
+    sys.version_info < (3, 7), reason="requires module __getattr__"
+)
+
+
+def test_exports():
+    for package in (osconfig, osconfig_v1, os_config_service):
+        for name in package.__all__:
+            assert getattr(package, name) is not None
+        assert set(package.__all__) <= set(dir(package))
+
+    assert osconfig.OsConfigServiceClient is OsConfigServiceClient
+    assert osconfig.OsConfigServiceAsyncClient is OsConfigServiceAsyncClient
+    assert osconfig_v1.OsConfigServiceClient is OsConfigServiceClient
+    assert osconfig_v1.PatchJob is patch_jobs.PatchJob
+    assert osconfig_v1.types.patch_jobs is patch_jobs
+    assert os_config_service.OsConfigServiceAsyncClient is OsConfigServiceAsyncClient
+
+
+def test_unknown_attribute():
+    for package in (osconfig, osconfig_v1, os_config_service, transports):
+        with pytest.raises(AttributeError):
+            package.NoSuchClient
+
+
+def test_asyncio_transport_registered():
+    transport_class = transports.OsConfigServiceGrpcAsyncIOTransport
+    assert transports._transport_registry["grpc_asyncio"] is transport_class
+    assert OsConfigServiceClient.get_transport_class("grpc_asyncio") is transport_class
+
+
+@requires_lazy_imports
+def test_import_package_loads_nothing():
+    assert _loaded_modules("import google.cloud.osconfig") == {"google.cloud.osconfig"}
+
+
+@requires_lazy_imports
+def test_sync_client_does_not_load_asyncio_modules():
+    modules = _loaded_modules("from google.cloud.osconfig import OsConfigServiceClient")
+
+    service = "google.cloud.osconfig_v1.services.os_config_service."
+    assert service + "client" in modules
+    assert service + "async_client" not in modules
+    assert service + "transports.grpc_asyncio" not in modules
+
+
+@requires_lazy_imports
+def test_sync_client_does_not_load_optional_features():
+    modules = _loaded_modules("from google.cloud.osconfig import OsConfigServiceClient")
+
+    service = "google.cloud.osconfig_v1.services.os_config_service."
+    for name in (
+        "bulk",
+        "cache",
+        "hedging",
+        "instrumentation",
+        "paging",
+        "ratelimit",
+        "raw",
+        "records",
+        "watchers",
+        "transports.channel_pool",
+        "transports.circuit_breaker",
+        "transports.grpc_multichannel",
+    ):
+        assert service + name not in modules
+
+
+def test_multichannel_transport_registered():
+    transport_class = transports.OsConfigServiceGrpcMultiChannelTransport
+    assert transports._transport_registry["grpc_multichannel"] is transport_class
+    assert (
+        OsConfigServiceClient.get_transport_class("grpc_multichannel")
+        is transport_class
+    )
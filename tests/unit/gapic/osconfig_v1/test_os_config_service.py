@@ -1408,6 +1408,116 @@ async def test_list_patch_job_instance_details_async_pages():
             assert page.raw_page.next_page_token == token
 
 
+def test_list_patch_job_instance_details_pages_prefetch():
+    client = OsConfigServiceClient(credentials=credentials.AnonymousCredentials)
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._transport.list_patch_job_instance_details), "__call__"
+    ) as call:
+        # Set the response to a series of pages.
+        call.side_effect = (
+            patch_jobs.ListPatchJobInstanceDetailsResponse(
+                patch_job_instance_details=[
+                    patch_jobs.PatchJobInstanceDetails(),
+                    patch_jobs.PatchJobInstanceDetails(),
+                    patch_jobs.PatchJobInstanceDetails(),
+                ],
+                next_page_token="abc",
+            ),
+            patch_jobs.ListPatchJobInstanceDetailsResponse(
+                patch_job_instance_details=[], next_page_token="def"
+            ),
+            patch_jobs.ListPatchJobInstanceDetailsResponse(
+                patch_job_instance_details=[patch_jobs.PatchJobInstanceDetails()],
+                next_page_token="ghi",
+            ),
+            patch_jobs.ListPatchJobInstanceDetailsResponse(
+                patch_job_instance_details=[
+                    patch_jobs.PatchJobInstanceDetails(),
+                    patch_jobs.PatchJobInstanceDetails(),
+                ]
+            ),
+            RuntimeError,
+        )
+        pager = client.list_patch_job_instance_details(request={}, prefetch=2)
+        pages = list(pager.pages)
+        assert len(pages) == 4
+        for page, token in zip(pages, ["abc", "def", "ghi", ""]):
+            assert page.raw_page.next_page_token == token
+        assert pager.next_page_token == ""
+
+
+def test_list_patch_job_instance_details_pages_prefetch_error():
+    client = OsConfigServiceClient(credentials=credentials.AnonymousCredentials)
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._transport.list_patch_job_instance_details), "__call__"
+    ) as call:
+        # Fail on the second page; the error surfaces in the caller.
+        call.side_effect = (
+            patch_jobs.ListPatchJobInstanceDetailsResponse(
+                patch_job_instance_details=[patch_jobs.PatchJobInstanceDetails()],
+                next_page_token="abc",
+            ),
+            RuntimeError,
+        )
+        pager = client.list_patch_job_instance_details(request={}, prefetch=1)
+        results = []
+        with pytest.raises(RuntimeError):
+            for i in pager:
+                results.append(i)
+        assert len(results) == 1
+
+
+@pytest.mark.asyncio
+async def test_list_patch_job_instance_details_async_pages_prefetch():
+    client = OsConfigServiceAsyncClient(credentials=credentials.AnonymousCredentials)
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._client._transport.list_patch_job_instance_details),
+        "__call__",
+        new_callable=mock.AsyncMock,
+    ) as call:
+        # Set the response to a series of pages.
+        call.side_effect = (
+            patch_jobs.ListPatchJobInstanceDetailsResponse(
+                patch_job_instance_details=[
+                    patch_jobs.PatchJobInstanceDetails(),
+                    patch_jobs.PatchJobInstanceDetails(),
+                    patch_jobs.PatchJobInstanceDetails(),
+                ],
+                next_page_token="abc",
+            ),
+            patch_jobs.ListPatchJobInstanceDetailsResponse(
+                patch_job_instance_details=[], next_page_token="def"
+            ),
+            patch_jobs.ListPatchJobInstanceDetailsResponse(
+                patch_job_instance_details=[patch_jobs.PatchJobInstanceDetails()],
+                next_page_token="ghi",
+            ),
+            patch_jobs.ListPatchJobInstanceDetailsResponse(
+                patch_job_instance_details=[
+                    patch_jobs.PatchJobInstanceDetails(),
+                    patch_jobs.PatchJobInstanceDetails(),
+                ]
+            ),
+            RuntimeError,
+        )
+        async_pager = await client.list_patch_job_instance_details(
+            request={}, prefetch=2
+        )
+        responses = []
+        async for response in async_pager:
+            responses.append(response)
+
+        assert len(responses) == 6
+        assert all(isinstance(i, patch_jobs.PatchJobInstanceDetails) for i in responses)
+        assert async_pager.next_page_token == ""
+
+
 def test_create_patch_deployment(transport: str = "grpc"):
     client = OsConfigServiceClient(
         credentials=credentials.AnonymousCredentials(), transport=transport
@@ -2380,6 +2490,24 @@ def test_transport_grpc_default():
     assert isinstance(client._transport, transports.OsConfigServiceGrpcTransport)
 
 
+def test_transport_wrapped_methods_cached():
+    client = OsConfigServiceClient(credentials=credentials.AnonymousCredentials())
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(type(client._transport.get_patch_job), "__call__") as call:
+        call.return_value = patch_jobs.PatchJob()
+        client.get_patch_job(name="name_value")
+        rpc = client._transport._wrapped_methods["get_patch_job"]
+        client.get_patch_job(name="name_value")
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 2
+
+    # The wrapped method is built once and reused on subsequent calls.
+    assert client._transport._wrapped_method("get_patch_job") is rpc
+    assert list(client._transport._wrapped_methods) == ["get_patch_job"]
+
+
 def test_os_config_service_base_transport():
     # Instantiate the base transport.
     transport = transports.OsConfigServiceTransport(
@@ -2394,6 +2522,7 @@ def test_os_config_service_base_transport():
         "cancel_patch_job",
         "list_patch_jobs",
         "list_patch_job_instance_details",
+        "list_patch_job_instance_details_raw",
         "create_patch_deployment",
         "get_patch_deployment",
         "list_patch_deployments",
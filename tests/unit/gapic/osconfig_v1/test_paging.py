@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import mock
+
+import pytest
+
+from google.api_core import exceptions
+from google.api_core import grpc_helpers_async
+from google.auth import credentials
+from google.cloud.osconfig_v1.services.os_config_service import (
+    OsConfigServiceAsyncClient,
+)
+from google.cloud.osconfig_v1.services.os_config_service import OsConfigServiceClient
+from google.cloud.osconfig_v1.services.os_config_service import pagers
+from google.cloud.osconfig_v1.services.os_config_service.paging import AdaptivePageSize
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Service:
+    # Serves `total` patch jobs, taking `per_item` seconds of fake time
+    # per job, and failing pages larger than `deadline_items`.
+
+    def __init__(self, clock, total=1000, per_item=0.001, deadline_items=None):
+        self.clock = clock
+        self.total = total
+        self.per_item = per_item
+        self.deadline_items = deadline_items
+        self.page_sizes = []
+
+    def __call__(self, request, **kwargs):
+        self.page_sizes.append(request.page_size)
+        if self.deadline_items and request.page_size > self.deadline_items:
+            raise exceptions.DeadlineExceeded("too slow")
+        start = int(request.page_token or 0)
+        end = min(self.total, start + request.page_size)
+        self.clock.now += 0.01 + self.per_item * (end - start)
+        return patch_jobs.ListPatchJobsResponse(
+            patch_jobs=[
+                patch_jobs.PatchJob(name="projects/p/patchJobs/{0}".format(i))
+                for i in range(start, end)
+            ],
+            next_page_token=str(end) if end < self.total else "",
+        )
+
+
+def test_observe_grows_and_shrinks():
+    policy = AdaptivePageSize(1.0, initial_page_size=100, max_page_size=1000)
+
+    assert policy.observe(100, 100, 0.1) == 200
+    assert policy.observe(200, 200, 0.4) == 400
+    assert policy.observe(400, 400, 0.6) == 666
+    assert policy.observe(666, 666, 0.2) == 1000
+    assert policy.observe(1000, 1000, 4.0) == 250
+    assert policy.observe(250, 250, 1000.0) == 10
+
+
+def test_observe_ignores_short_pages_within_budget():
+    policy = AdaptivePageSize(1.0, initial_page_size=100)
+
+    assert policy.observe(100, 7, 0.01) == 100
+    assert policy.observe(100, 7, 2.0) == 10
+
+
+def test_observe_limits_page_bytes():
+    policy = AdaptivePageSize(1.0, initial_page_size=100, max_page_bytes=5000)
+
+    assert policy.observe(100, 100, 0.1, page_bytes=10000) == 50
+
+
+def test_invalid_bounds():
+    with pytest.raises(ValueError):
+        AdaptivePageSize(min_page_size=10, max_page_size=5)
+
+
+def test_pager_adapts_page_size():
+    clock = _Clock()
+    service = _Service(clock)
+    policy = AdaptivePageSize(0.5, initial_page_size=10, clock=clock)
+    request = patch_jobs.ListPatchJobsRequest(parent="projects/p")
+    pager = pagers.ListPatchJobsPager(
+        method=service,
+        request=request,
+        response=policy.fetch(service, request, "patch_jobs"),
+        adaptive_page_size=policy,
+    )
+
+    assert len(list(pager)) == 1000
+    assert service.page_sizes == [10, 20, 40, 80, 160, 320, 484]
+
+
+def test_pager_adapts_page_size_with_prefetch():
+    clock = _Clock()
+    service = _Service(clock, total=300)
+    policy = AdaptivePageSize(0.5, initial_page_size=10, clock=clock)
+    request = patch_jobs.ListPatchJobsRequest(parent="projects/p")
+    pager = pagers.ListPatchJobsPager(
+        method=service,
+        request=request,
+        response=policy.fetch(service, request, "patch_jobs"),
+        prefetch=2,
+        adaptive_page_size=policy,
+    )
+
+    assert len(list(pager)) == 300
+    assert service.page_sizes == [10, 20, 40, 80, 160]
+
+
+def test_deadline_exceeded_shrinks_page():
+    clock = _Clock()
+    service = _Service(clock, total=100, deadline_items=30)
+    policy = AdaptivePageSize(10.0, initial_page_size=100, clock=clock)
+
+    response = policy.fetch(
+        service, patch_jobs.ListPatchJobsRequest(parent="projects/p"), "patch_jobs"
+    )
+
+    assert len(response.patch_jobs) == 25
+    assert service.page_sizes == [100, 50, 25]
+
+
+def test_deadline_exceeded_at_min_page_size():
+    clock = _Clock()
+    service = _Service(clock, deadline_items=5)
+    policy = AdaptivePageSize(initial_page_size=20, min_page_size=10, clock=clock)
+
+    with pytest.raises(exceptions.DeadlineExceeded):
+        policy.fetch(service, patch_jobs.ListPatchJobsRequest(), "patch_jobs")
+
+    assert service.page_sizes == [20, 10]
+
+
+def test_list_patch_jobs_adaptive_page_size():
+    client = OsConfigServiceClient(credentials=credentials.AnonymousCredentials())
+    clock = _Clock()
+    service = _Service(clock, total=70)
+    policy = AdaptivePageSize(0.5, initial_page_size=10, clock=clock)
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(type(client._transport.list_patch_jobs), "__call__") as call:
+        call.side_effect = service
+        pager = client.list_patch_jobs(parent="projects/p", adaptive_page_size=policy)
+
+        assert len(list(pager)) == 70
+
+    assert service.page_sizes == [10, 20, 40]
+
+
+@pytest.mark.asyncio
+async def test_list_patch_jobs_adaptive_page_size_async():
+    client = OsConfigServiceAsyncClient(credentials=credentials.AnonymousCredentials())
+    clock = _Clock()
+    service = _Service(clock, total=70)
+    policy = AdaptivePageSize(0.5, initial_page_size=10, clock=clock)
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._client._transport.list_patch_jobs), "__call__"
+    ) as call:
+        call.side_effect = lambda request, **kwargs: (
+            grpc_helpers_async.FakeUnaryUnaryCall(service(request))
+        )
+        pager = await client.list_patch_jobs(
+            parent="projects/p", adaptive_page_size=policy
+        )
+
+        assert len([job async for job in pager]) == 70
+
+    assert service.page_sizes == [10, 20, 40]
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import mock
+
+import pytest
+
+from google.api_core import client_options
+from google.api_core import exceptions
+from google.api_core import grpc_helpers_async
+from google.api_core import retry as retries
+from google.auth import credentials
+from google.cloud.osconfig_v1.services.os_config_service import (
+    OsConfigServiceAsyncClient,
+)
+from google.cloud.osconfig_v1.services.os_config_service import OsConfigServiceClient
+from google.cloud.osconfig_v1.services.os_config_service import policies
+from google.cloud.osconfig_v1.services.os_config_service.policies import (
+    MethodPolicy,
+    RetryBudget,
+)
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _job():
+    return patch_jobs.PatchJob(name="projects/p/patchJobs/j")
+
+
+def test_retry_budget():
+    clock = _Clock()
+    budget = RetryBudget(0.5, 1.0, capacity=2.0, clock=clock)
+
+    assert budget.withdraw()
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    assert budget.rejected == 1
+
+    budget.deposit()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert budget.withdraw()
+
+    clock.now += 1.5
+    assert budget.balance == 1.5
+    clock.now += 10
+    assert budget.balance == 2.0
+
+
+def test_retry_budget_track():
+    budget = RetryBudget(0.25, 0.0, capacity=1.0)
+    assert budget.withdraw()
+    rpc = budget.track(lambda request: request * 2)
+
+    assert [rpc(i) for i in range(4)] == [0, 2, 4, 6]
+    assert budget.balance == 1.0
+
+
+def test_make_retry():
+    assert MethodPolicy().make_retry() is None
+
+    budget = RetryBudget(capacity=1.0, min_retries_per_second=0.0)
+    retry = MethodPolicy(retry_on=(exceptions.ServiceUnavailable,)).make_retry(
+        budget=budget
+    )
+
+    assert isinstance(retry, retries.Retry)
+    assert not retry._predicate(exceptions.NotFound("gone"))
+    assert retry._predicate(exceptions.ServiceUnavailable("down"))
+    assert not retry._predicate(exceptions.ServiceUnavailable("down"))
+
+
+def test_merge_policies():
+    policy = MethodPolicy(timeout=5.0)
+    merged = policies.merge_policies({"list_patch_job_instance_details": policy})
+
+    assert merged["list_patch_job_instance_details"] is policy
+    assert merged["list_patch_job_instance_details_raw"] is policy
+    assert merged["get_patch_job"] == policies.DEFAULT_METHOD_POLICIES["get_patch_job"]
+
+    with pytest.raises(ValueError):
+        policies.merge_policies({"get_patch_jobs": policy})
+
+
+def test_reads_are_retried_by_default():
+    client = OsConfigServiceClient(credentials=credentials.AnonymousCredentials())
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._transport.get_patch_job), "__call__"
+    ) as call, mock.patch("time.sleep"):
+        call.side_effect = [exceptions.ServiceUnavailable("down"), _job()]
+        response = client.get_patch_job(name="projects/p/patchJobs/j")
+
+        assert len(call.mock_calls) == 2
+        _, _, kwargs = call.mock_calls[0]
+        assert 0 < kwargs["timeout"] <= 60.0
+
+    assert response.name == "projects/p/patchJobs/j"
+
+
+def test_execute_patch_job_is_not_retried():
+    client = OsConfigServiceClient(credentials=credentials.AnonymousCredentials())
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._transport.execute_patch_job), "__call__"
+    ) as call:
+        call.side_effect = [exceptions.ServiceUnavailable("down"), _job()]
+        with pytest.raises(exceptions.ServiceUnavailable):
+            client.execute_patch_job(patch_jobs.ExecutePatchJobRequest(parent="p"))
+
+        assert len(call.mock_calls) == 1
+        _, _, kwargs = call.mock_calls[0]
+        assert 0 < kwargs["timeout"] <= 60.0
+
+
+def test_policies_from_client_options():
+    client = OsConfigServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+        client_options={
+            "api_endpoint": "osconfig.example.com",
+            "method_policies": {"get_patch_job": MethodPolicy(timeout=5.0)},
+        },
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(type(client._transport.get_patch_job), "__call__") as call:
+        call.side_effect = [exceptions.ServiceUnavailable("down"), _job()]
+        with pytest.raises(exceptions.ServiceUnavailable):
+            client.get_patch_job(name="projects/p/patchJobs/j")
+
+        _, _, kwargs = call.mock_calls[0]
+        assert 0 < kwargs["timeout"] <= 5.0
+
+
+def test_spent_retry_budget_stops_retries():
+    options = client_options.ClientOptions()
+    options.retry_budget = RetryBudget(min_retries_per_second=0.0, capacity=1.0)
+    client = OsConfigServiceClient(
+        credentials=credentials.AnonymousCredentials(), client_options=options
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._transport.get_patch_job), "__call__"
+    ) as call, mock.patch("time.sleep"):
+        call.side_effect = exceptions.ServiceUnavailable("down")
+        with pytest.raises(exceptions.ServiceUnavailable):
+            client.get_patch_job(name="projects/p/patchJobs/j")
+
+        assert len(call.mock_calls) == 2
+
+    assert options.retry_budget.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_reads_are_retried_by_default_async():
+    client = OsConfigServiceAsyncClient(credentials=credentials.AnonymousCredentials())
+
+    async def sleep(delay):
+        pass
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._client._transport.get_patch_job), "__call__"
+    ) as call, mock.patch("asyncio.sleep", sleep):
+        call.side_effect = [
+            exceptions.ServiceUnavailable("down"),
+            grpc_helpers_async.FakeUnaryUnaryCall(_job()),
+        ]
+        response = await client.get_patch_job(name="projects/p/patchJobs/j")
+
+        assert len(call.mock_calls) == 2
+
+    assert response.name == "projects/p/patchJobs/j"
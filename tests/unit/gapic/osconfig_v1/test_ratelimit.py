@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import mock
+
+import pytest
+
+from google.api_core import exceptions
+from google.api_core import gapic_v1
+from google.api_core import grpc_helpers_async
+from google.api_core import retry as retries
+from google.api_core import retry_async as retries_async
+from google.auth import credentials
+from google.cloud.osconfig_v1.services.os_config_service import (
+    OsConfigServiceAsyncClient,
+)
+from google.cloud.osconfig_v1.services.os_config_service import OsConfigServiceClient
+from google.cloud.osconfig_v1.services.os_config_service import instrumentation
+from google.cloud.osconfig_v1.services.os_config_service import ratelimit
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_limiter_bursts_then_spaces_calls():
+    clock = _Clock()
+    limiter = ratelimit.RateLimiter(
+        {"get_patch_job": ratelimit.RateLimit(rate=10.0, burst=2)}, clock=clock
+    )
+
+    delays = [limiter.reserve("get_patch_job", "projects/p") for _ in range(4)]
+    assert delays == pytest.approx([0.0, 0.0, 0.1, 0.2])
+
+    # The waiting calls have used the tokens refilled in the meantime.
+    clock.now = 0.3
+    assert limiter.reserve("get_patch_job", "projects/p") == pytest.approx(0.0)
+    assert limiter.reserve("get_patch_job", "projects/p") == pytest.approx(0.1)
+
+
+def test_limiter_buckets_per_project_and_method():
+    clock = _Clock()
+    limiter = ratelimit.RateLimiter(
+        {"get_patch_job": ratelimit.RateLimit(rate=1.0)},
+        default=ratelimit.RateLimit(rate=2.0),
+        clock=clock,
+    )
+
+    assert limiter.reserve("get_patch_job", "projects/p") == 0.0
+    assert limiter.reserve("get_patch_job", "projects/q") == 0.0
+    assert limiter.reserve("list_patch_jobs", "projects/p") == 0.0
+    assert limiter.reserve("get_patch_job", "projects/p") == pytest.approx(1.0)
+    assert limiter.reserve("list_patch_jobs", "projects/p") == pytest.approx(0.5)
+
+
+def test_limiter_without_default_leaves_methods_unlimited():
+    limiter = ratelimit.RateLimiter(
+        {"list_patch_job_instance_details": ratelimit.RateLimit(rate=1.0)},
+        clock=_Clock(),
+    )
+
+    assert limiter.limit("get_patch_job") is None
+    for _ in range(3):
+        assert limiter.reserve("get_patch_job", "projects/p") == 0.0
+
+    # The raw variant shares the budget of the method it reads.
+    assert limiter.limit("list_patch_job_instance_details_raw") == (1.0, 1.0)
+
+
+def test_limiter_refuses_long_waits():
+    limiter = ratelimit.RateLimiter(
+        {"get_patch_job": ratelimit.RateLimit(rate=1.0, burst=1)},
+        max_wait=1.5,
+        clock=_Clock(),
+    )
+
+    limiter.reserve("get_patch_job", "projects/p")
+    assert limiter.reserve("get_patch_job", "projects/p") == pytest.approx(1.0)
+    with pytest.raises(ratelimit.RateLimitExceeded) as exc_info:
+        limiter.reserve("get_patch_job", "projects/p")
+    assert exc_info.value.key == "projects/p"
+    assert exc_info.value.method == "get_patch_job"
+    assert exc_info.value.delay == pytest.approx(2.0)
+
+    # The refused call did not take a token.
+    with pytest.raises(ratelimit.RateLimitExceeded) as exc_info:
+        limiter.reserve("get_patch_job", "projects/p")
+    assert exc_info.value.delay == pytest.approx(2.0)
+
+
+def test_file_store_shares_buckets(tmp_path):
+    clock = _Clock()
+    path = str(tmp_path / "buckets.db")
+    limits = {"get_patch_job": ratelimit.RateLimit(rate=1.0, burst=2)}
+    first = ratelimit.RateLimiter(
+        limits, store=ratelimit.FileTokenStore(path), clock=clock
+    )
+    second = ratelimit.RateLimiter(
+        limits, store=ratelimit.FileTokenStore(path), clock=clock
+    )
+
+    assert first.reserve("get_patch_job", "projects/p") == 0.0
+    assert second.reserve("get_patch_job", "projects/p") == 0.0
+    assert first.reserve("get_patch_job", "projects/p") == pytest.approx(1.0)
+    assert second.reserve("get_patch_job", "projects/p") == pytest.approx(2.0)
+    assert second.reserve("get_patch_job", "projects/q") == 0.0
+
+
+def test_routing_key():
+    request = patch_jobs.GetPatchJobRequest(name="projects/p/patchJobs/j")
+    metadata = (
+        gapic_v1.routing_header.to_grpc_metadata((("name", "projects/q/patchJobs/j"),)),
+    )
+
+    assert ratelimit.routing_key(request, metadata) == "projects/q"
+    assert ratelimit.routing_key(request) == "projects/p"
+    assert (
+        ratelimit.routing_key(patch_jobs.ListPatchJobsRequest(parent="projects/r"))
+        == "projects/r"
+    )
+    assert ratelimit.routing_key(patch_jobs.ListPatchJobsRequest()) == ""
+
+
+def test_client_waits_for_its_turn():
+    clock = _Clock()
+    registry = instrumentation.MetricsRegistry()
+    client = OsConfigServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+        rate_limiter=ratelimit.RateLimiter(
+            {"list_patch_job_instance_details": ratelimit.RateLimit(rate=4.0)},
+            clock=clock,
+        ),
+        metrics=registry,
+    )
+    request = patch_jobs.ListPatchJobInstanceDetailsRequest(
+        parent="projects/p/patchJobs/j"
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._transport.list_patch_job_instance_details), "__call__"
+    ) as call, mock.patch.object(ratelimit.time, "sleep") as sleep:
+        call.return_value = patch_jobs.ListPatchJobInstanceDetailsResponse()
+        client.list_patch_job_instance_details(request)
+        client.list_patch_job_instance_details(request)
+        client.list_patch_job_instance_details(
+            patch_jobs.ListPatchJobInstanceDetailsRequest(
+                parent="projects/q/patchJobs/j"
+            )
+        )
+
+        assert len(call.mock_calls) == 3
+
+    sleep.assert_called_once_with(pytest.approx(0.25))
+    histogram = registry.histogram(
+        instrumentation.RATE_LIMIT_WAIT, "list_patch_job_instance_details"
+    )
+    assert histogram.count == 3
+    assert histogram.sum == pytest.approx(0.25)
+
+
+@pytest.mark.asyncio
+async def test_async_client_waits_for_its_turn():
+    clock = _Clock()
+    client = OsConfigServiceAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+        rate_limiter=ratelimit.RateLimiter(
+            {}, default=ratelimit.RateLimit(rate=2.0), clock=clock
+        ),
+    )
+    request = patch_jobs.GetPatchJobRequest(name="projects/p/patchJobs/j")
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._client._transport.get_patch_job), "__call__"
+    ) as call, mock.patch.object(
+        ratelimit.asyncio, "sleep", new_callable=mock.AsyncMock
+    ) as sleep:
+        call.side_effect = lambda *args, **kwargs: (
+            grpc_helpers_async.FakeUnaryUnaryCall(patch_jobs.PatchJob())
+        )
+        await client.get_patch_job(request)
+        await client.get_patch_job(request)
+
+        assert len(call.mock_calls) == 2
+
+    sleep.assert_awaited_once_with(pytest.approx(0.5))
+
+
+def test_every_attempt_waits_for_its_turn():
+    registry = instrumentation.MetricsRegistry()
+    client = OsConfigServiceClient(
+        credentials=credentials.AnonymousCredentials(),
+        rate_limiter=ratelimit.RateLimiter(
+            {}, default=ratelimit.RateLimit(rate=1.0), clock=_Clock()
+        ),
+        metrics=registry,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._transport.get_patch_job), "__call__"
+    ) as call, mock.patch.object(ratelimit.time, "sleep") as sleep:
+        call.side_effect = [
+            exceptions.ServiceUnavailable("retry"),
+            patch_jobs.PatchJob(),
+        ]
+        client.get_patch_job(
+            name="projects/p/patchJobs/j",
+            retry=retries.Retry(
+                predicate=retries.if_exception_type(exceptions.ServiceUnavailable),
+                initial=0.01,
+            ),
+        )
+
+        assert len(call.mock_calls) == 2
+
+    # The retry waited for a second token; its own backoff sleeps too.
+    assert mock.call(pytest.approx(1.0)) in sleep.call_args_list
+    histogram = registry.histogram(instrumentation.RATE_LIMIT_WAIT, "get_patch_job")
+    assert histogram.count == 2
+
+
+@pytest.mark.asyncio
+async def test_async_every_attempt_waits_for_its_turn():
+    client = OsConfigServiceAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+        rate_limiter=ratelimit.RateLimiter(
+            {}, default=ratelimit.RateLimit(rate=1.0), clock=_Clock()
+        ),
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._client._transport.get_patch_job), "__call__"
+    ) as call, mock.patch.object(
+        ratelimit.asyncio, "sleep", new_callable=mock.AsyncMock
+    ) as sleep:
+        call.side_effect = [
+            exceptions.ServiceUnavailable("retry"),
+            grpc_helpers_async.FakeUnaryUnaryCall(patch_jobs.PatchJob()),
+        ]
+        await client.get_patch_job(
+            name="projects/p/patchJobs/j",
+            retry=retries_async.AsyncRetry(
+                predicate=retries.if_exception_type(exceptions.ServiceUnavailable),
+                initial=0.01,
+            ),
+        )
+
+        assert len(call.mock_calls) == 2
+
+    # The retry waited for a second token; its own backoff sleeps too.
+    assert mock.call(pytest.approx(1.0)) in sleep.await_args_list
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import mock
+
+import pytest
+
+from google.api_core import grpc_helpers_async
+from google.auth import credentials
+from google.cloud.osconfig_v1.services.os_config_service import (
+    OsConfigServiceAsyncClient,
+)
+from google.cloud.osconfig_v1.services.os_config_service import OsConfigServiceClient
+from google.cloud.osconfig_v1.services.os_config_service import raw
+from google.cloud.osconfig_v1.types import patch_jobs
+
+RawResponse = raw.RawListPatchJobInstanceDetailsResponse
+
+
+def _response(next_page_token=""):
+    return patch_jobs.ListPatchJobInstanceDetailsResponse(
+        patch_job_instance_details=[
+            patch_jobs.PatchJobInstanceDetails(
+                name="instances/a",
+                state=patch_jobs.Instance.PatchState.SUCCEEDED,
+                attempt_count=2,
+            ),
+            patch_jobs.PatchJobInstanceDetails(
+                name="instances/b",
+                instance_system_id="123",
+                failure_reason="timed out",
+                attempt_count=-1,
+            ),
+        ],
+        next_page_token=next_page_token,
+    )
+
+
+def _raw(next_page_token=""):
+    return RawResponse.deserialize(
+        patch_jobs.ListPatchJobInstanceDetailsResponse.serialize(
+            _response(next_page_token)
+        )
+    )
+
+
+def test_raw_response():
+    response = _raw("abc")
+
+    assert len(response) == 2
+    assert response.next_page_token == "abc"
+    assert response.raw_page is response
+    assert response.to_response() == _response("abc")
+    assert response.serialize() == (
+        patch_jobs.ListPatchJobInstanceDetailsResponse.serialize(_response("abc"))
+    )
+
+    details = response.patch_job_instance_details
+    assert len(details) == 2
+    assert details[1] == _response().patch_job_instance_details[1]
+    assert [d.name for d in details[:1]] == ["instances/a"]
+    assert [d.name for d in details] == ["instances/a", "instances/b"]
+
+
+def test_raw_project():
+    assert list(_raw().project(["attempt_count", "state", "failure_reason"])) == [
+        (2, int(patch_jobs.Instance.PatchState.SUCCEEDED), ""),
+        (-1, 0, "timed out"),
+    ]
+
+
+def test_project_matches_messages():
+    fields = raw.PROJECTABLE_FIELDS
+    assert list(raw.project(_raw(), fields)) == list(raw.project(_response(), fields))
+    with pytest.raises(KeyError):
+        list(raw.project(_response(), ["nope"]))
+    with pytest.raises(KeyError):
+        list(raw.project(_raw(), ["nope"]))
+
+
+def test_raw_response_skips_unknown_fields():
+    pb = patch_jobs.ListPatchJobInstanceDetailsResponse.pb(_response())
+    # Field 99, fixed32 and fixed64 wire types, on the response and an item.
+    data = pb.SerializeToString() + b"\x9d\x06\x01\x02\x03\x04"
+    data += b"\x99\x06" + bytes(8)
+    response = RawResponse(data)
+
+    assert len(response) == 2
+    assert [name for name, in response.project(["name"])] == [
+        "instances/a",
+        "instances/b",
+    ]
+
+
+def test_list_patch_job_instance_details_raw():
+    client = OsConfigServiceClient(credentials=credentials.AnonymousCredentials())
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._transport.list_patch_job_instance_details_raw), "__call__"
+    ) as call:
+        call.side_effect = [_raw("abc"), _raw()]
+        pager = client.list_patch_job_instance_details(parent="p", raw=True)
+        states = list(pager.project(["state"]))
+
+        assert len(call.mock_calls) == 2
+    assert states == [(int(patch_jobs.Instance.PatchState.SUCCEEDED),), (0,)] * 2
+
+
+def test_list_patch_job_instance_details_raw_iter():
+    client = OsConfigServiceClient(credentials=credentials.AnonymousCredentials())
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._transport.list_patch_job_instance_details_raw), "__call__"
+    ) as call:
+        call.return_value = _raw()
+        results = list(client.list_patch_job_instance_details(parent="p", raw=True))
+
+    assert all(isinstance(r, patch_jobs.PatchJobInstanceDetails) for r in results)
+    assert [r.name for r in results] == ["instances/a", "instances/b"]
+
+
+@pytest.mark.asyncio
+async def test_list_patch_job_instance_details_raw_async():
+    client = OsConfigServiceAsyncClient(credentials=credentials.AnonymousCredentials())
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._client._transport.list_patch_job_instance_details_raw), "__call__"
+    ) as call:
+        call.side_effect = [
+            grpc_helpers_async.FakeUnaryUnaryCall(_raw("abc")),
+            grpc_helpers_async.FakeUnaryUnaryCall(_raw()),
+        ]
+        pager = await client.list_patch_job_instance_details(parent="p", raw=True)
+        names = [values async for values in pager.project(["name"])]
+
+    assert names == [("instances/a",), ("instances/b",)] * 2
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import pickle
+import sys
+
+import mock
+
+import pytest
+
+from google.api_core import grpc_helpers_async
+from google.auth import credentials
+from google.cloud.osconfig_v1.services.os_config_service import (
+    OsConfigServiceAsyncClient,
+)
+from google.cloud.osconfig_v1.services.os_config_service import OsConfigServiceClient
+from google.cloud.osconfig_v1.services.os_config_service.records import (
+    InstanceDetailsRecord,
+)
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+def _details():
+    return patch_jobs.PatchJobInstanceDetails(
+        name="instances/a",
+        instance_system_id="123",
+        state=patch_jobs.Instance.PatchState.FAILED,
+        failure_reason="".join(["timed", " out"]),
+        attempt_count=3,
+    )
+
+
+def test_record_round_trip():
+    record = InstanceDetailsRecord.from_proto(_details())
+
+    assert record.name == "instances/a"
+    assert record.state == int(patch_jobs.Instance.PatchState.FAILED)
+    assert type(record.state) is int
+    assert record.patch_state == patch_jobs.Instance.PatchState.FAILED
+    assert record.to_proto() == _details()
+
+
+def test_record_is_compact_and_immutable():
+    record = InstanceDetailsRecord.from_proto(_details())
+
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.state = 0
+    with pytest.raises(AttributeError):
+        del record.name
+
+
+def test_record_interns_failure_reason():
+    first = InstanceDetailsRecord.from_proto(_details())
+    second = InstanceDetailsRecord.from_proto(_details())
+
+    assert first.failure_reason is second.failure_reason
+
+
+def test_record_value_semantics():
+    record = InstanceDetailsRecord.from_proto(_details())
+
+    assert record == InstanceDetailsRecord(
+        "instances/a", "123", patch_jobs.Instance.PatchState.FAILED, "timed out", 3
+    )
+    assert record != InstanceDetailsRecord("instances/a")
+    assert len({record, InstanceDetailsRecord.from_proto(_details())}) == 1
+    assert pickle.loads(pickle.dumps(record)) == record
+    assert repr(InstanceDetailsRecord("a")) == (
+        "InstanceDetailsRecord(name='a', instance_system_id='', state=0, "
+        "failure_reason='', attempt_count=0)"
+    )
+
+
+def test_pager_records():
+    client = OsConfigServiceClient(credentials=credentials.AnonymousCredentials())
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._transport.list_patch_job_instance_details), "__call__"
+    ) as call:
+        call.return_value = patch_jobs.ListPatchJobInstanceDetailsResponse(
+            patch_job_instance_details=[
+                _details(),
+                patch_jobs.PatchJobInstanceDetails(),
+            ]
+        )
+        records = list(client.list_patch_job_instance_details(parent="p").records())
+
+    assert records == [
+        InstanceDetailsRecord.from_proto(_details()),
+        InstanceDetailsRecord(),
+    ]
+    assert type(records[0].state) is int
+    assert records[0].failure_reason is sys.intern("timed out")
+
+
+@pytest.mark.asyncio
+async def test_async_pager_records():
+    client = OsConfigServiceAsyncClient(credentials=credentials.AnonymousCredentials())
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._client._transport.list_patch_job_instance_details), "__call__"
+    ) as call:
+        call.return_value = grpc_helpers_async.FakeUnaryUnaryCall(
+            patch_jobs.ListPatchJobInstanceDetailsResponse(
+                patch_job_instance_details=[_details()]
+            )
+        )
+        pager = await client.list_patch_job_instance_details(parent="p")
+        records = [record async for record in pager.records()]
+
+    assert [record.to_proto() for record in records] == [_details()]
+    assert type(records[0].state) is int
+    assert records[0].failure_reason is sys.intern("timed out")
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import datetime
+
+import mock
+
+from google.auth import credentials
+from google.cloud.osconfig_v1.services.os_config_service import OsConfigServiceClient
+from google.cloud.osconfig_v1.services.os_config_service.filters import PatchJobFilter
+from google.cloud.osconfig_v1.services.os_config_service.store import SnapshotStore
+from google.cloud.osconfig_v1.types import patch_deployments
+from google.cloud.osconfig_v1.types import patch_jobs
+
+State = patch_jobs.PatchJob.State
+
+
+def _job(project, i, state=State.SUCCEEDED, deployment=""):
+    return patch_jobs.PatchJob(
+        name="projects/{0}/patchJobs/{1}".format(project, i),
+        state=state,
+        patch_deployment=deployment,
+        create_time=datetime.datetime(2020, 1, 1, i, tzinfo=datetime.timezone.utc),
+    )
+
+
+def _deployment(project, name):
+    return patch_deployments.PatchDeployment(
+        name="projects/{0}/patchDeployments/{1}".format(project, name)
+    )
+
+
+def _names(resources):
+    return [resource.name.rsplit("/", 1)[-1] for resource in resources]
+
+
+def test_store_lookups(tmp_path):
+    path = str(tmp_path / "store.db")
+    with SnapshotStore(path) as store:
+        store.put_patch_jobs(
+            [
+                _job("p", 1, deployment="projects/p/patchDeployments/d"),
+                _job("p", 2, state=State.TIMED_OUT),
+                _job("p", 3, deployment="projects/p/patchDeployments/d"),
+                _job("q", 4),
+            ]
+        )
+        store.put_patch_deployments([_deployment("p", "d"), _deployment("q", "e")])
+
+    # The store is durable.
+    with SnapshotStore(path) as store:
+        assert store.get_patch_job("projects/p/patchJobs/2").state == State.TIMED_OUT
+        assert store.get_patch_job("projects/p/patchJobs/9") is None
+        assert store.get_patch_deployment("projects/q/patchDeployments/e")
+        assert store.get_patch_deployment("projects/q/patchDeployments/x") is None
+
+        assert _names(store.patch_jobs()) == ["4", "3", "2", "1"]
+        assert _names(store.patch_jobs(parent="p")) == []
+        assert _names(store.patch_jobs(parent="projects/p")) == ["3", "2", "1"]
+        assert _names(store.patch_jobs(state=State.SUCCEEDED)) == ["4", "3", "1"]
+        assert _names(
+            store.patch_jobs(
+                state=State.SUCCEEDED, patch_deployment="projects/p/patchDeployments/d"
+            )
+        ) == ["3", "1"]
+        assert _names(store.patch_deployments(parent="projects/p")) == ["d"]
+        assert store.count_patch_jobs_by_state(parent="projects/p") == {
+            State.SUCCEEDED: 2,
+            State.TIMED_OUT: 1,
+        }
+
+
+def test_store_iteration_reads_snapshot(tmp_path):
+    with SnapshotStore(str(tmp_path / "store.db")) as store:
+        store.put_patch_jobs(
+            [_job("p{0}".format(n), i) for n in range(15) for i in range(1, 21)]
+        )
+
+        # Writes made while iterating neither block nor show up in the
+        # iteration, which spans several batches.
+        seen = 0
+        for i, _ in enumerate(store.patch_jobs(), 1):
+            if i == 1:
+                store.put_patch_jobs([_job("q", 1)])
+            seen += 1
+
+        assert seen == 300
+        assert store.get_patch_job("projects/q/patchJobs/1")
+
+
+def test_store_replaces():
+    with SnapshotStore(":memory:") as store:
+        store.put_patch_jobs([_job("p", 1, state=State.PATCHING)])
+        store.put_patch_jobs([_job("p", 1, state=State.SUCCEEDED)])
+
+        assert _names(store.patch_jobs(state=State.PATCHING)) == []
+        assert _names(store.patch_jobs(state=State.SUCCEEDED)) == ["1"]
+
+
+def test_refresh():
+    client = OsConfigServiceClient(credentials=credentials.AnonymousCredentials())
+    store = SnapshotStore(":memory:")
+    store.put_patch_deployments([_deployment("p", "old"), _deployment("q", "other")])
+
+    with mock.patch.object(
+        type(client._transport.list_patch_deployments), "__call__"
+    ) as call:
+        call.side_effect = [
+            patch_deployments.ListPatchDeploymentsResponse(
+                patch_deployments=[_deployment("p", "a")], next_page_token="abc"
+            ),
+            patch_deployments.ListPatchDeploymentsResponse(
+                patch_deployments=[_deployment("p", "b")]
+            ),
+        ]
+        assert store.refresh_patch_deployments(client, "projects/p") == 2
+
+    # Deployments deleted from the project are dropped; others are kept.
+    assert _names(store.patch_deployments()) == ["a", "b", "other"]
+
+    with mock.patch.object(type(client._transport.list_patch_jobs), "__call__") as call:
+        call.return_value = patch_jobs.ListPatchJobsResponse(
+            patch_jobs=[_job("p", 1), _job("p", 2, state=State.CANCELED)]
+        )
+        count = store.refresh_patch_jobs(
+            client, "projects/p", criteria=PatchJobFilter(states=[State.SUCCEEDED])
+        )
+
+    assert count == 1
+    assert _names(store.patch_jobs()) == ["1"]
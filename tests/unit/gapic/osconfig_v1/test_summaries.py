@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import math
+
+import mock
+
+import pytest
+
+from google.cloud.osconfig_v1.services.os_config_service import summaries
+from google.cloud.osconfig_v1.types import patch_jobs
+
+numpy = pytest.importorskip("numpy")
+
+
+def _job(name, state=patch_jobs.PatchJob.State.SUCCEEDED, **counts):
+    return patch_jobs.PatchJob(
+        name=name,
+        state=state,
+        instance_details_summary=patch_jobs.PatchJob.InstanceDetailsSummary(**counts),
+    )
+
+
+def _table():
+    return summaries.SummaryTable.from_patch_jobs(
+        [
+            _job("a", succeeded_instance_count=8, failed_instance_count=2),
+            _job(
+                "b",
+                state=patch_jobs.PatchJob.State.COMPLETED_WITH_ERRORS,
+                succeeded_reboot_required_instance_count=1,
+                failed_instance_count=3,
+            ),
+            _job("c"),
+        ]
+    )
+
+
+def test_summary_fields():
+    assert len(summaries.SUMMARY_FIELDS) == 15
+    assert summaries.SUMMARY_FIELDS[0] == "pending_instance_count"
+    assert summaries.SUMMARY_FIELDS[-1] == "no_agent_detected_instance_count"
+
+
+def test_from_patch_jobs():
+    table = _table()
+
+    assert len(table) == 3
+    assert table.counts.shape == (3, 15)
+    assert table.counts.dtype == numpy.int64
+    assert table.names.tolist() == ["a", "b", "c"]
+    assert table.states.tolist() == [
+        patch_jobs.PatchJob.State.SUCCEEDED,
+        patch_jobs.PatchJob.State.COMPLETED_WITH_ERRORS,
+        patch_jobs.PatchJob.State.SUCCEEDED,
+    ]
+    assert table.column("failed_instance_count").tolist() == [2, 3, 0]
+
+
+def test_totals_and_ratios():
+    table = _table()
+
+    totals = table.totals()
+    assert totals["succeeded_instance_count"] == 8
+    assert totals["failed_instance_count"] == 5
+    assert table.instance_counts().tolist() == [10, 4, 0]
+
+    ratios = table.success_ratios()
+    assert ratios[:2].tolist() == [0.8, 0.25]
+    assert math.isnan(ratios[2])
+    assert table.success_ratio() == pytest.approx(9 / 14)
+
+
+def test_percentiles():
+    table = _table()
+
+    assert table.percentiles("failed_instance_count", q=(0, 100)) == {0: 0.0, 100: 3.0}
+    # Jobs without instances are ignored.
+    assert table.percentiles(table.success_ratios(), q=(50,)) == {
+        50: pytest.approx(0.525)
+    }
+
+
+def test_select_and_records():
+    table = _table()
+    succeeded = table.select(table.states == patch_jobs.PatchJob.State.SUCCEEDED)
+    assert succeeded.names.tolist() == ["a", "c"]
+
+    records = table.to_records()
+    assert records["name"].tolist() == ["a", "b", "c"]
+    assert records["failed_instance_count"].tolist() == [2, 3, 0]
+
+
+def test_empty_table():
+    table = summaries.SummaryTable.from_patch_jobs([])
+
+    assert table.counts.shape == (0, 15)
+    assert math.isnan(table.success_ratio())
+
+
+def test_requires_numpy():
+    with mock.patch.object(summaries, "numpy", None):
+        with pytest.raises(ImportError):
+            summaries.SummaryTable.from_patch_jobs([])
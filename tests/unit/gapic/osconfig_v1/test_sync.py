@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import datetime
+
+import mock
+
+from google.auth import credentials
+from google.cloud.osconfig_v1.services.os_config_service import OsConfigServiceClient
+from google.cloud.osconfig_v1.services.os_config_service.fake_server import (
+    FakeOsConfigServer,
+    FakeOsConfigService,
+)
+from google.cloud.osconfig_v1.services.os_config_service.filters import PatchJobFilter
+from google.cloud.osconfig_v1.services.os_config_service.sync import PatchJobSync
+from google.cloud.osconfig_v1.types import patch_jobs
+
+State = patch_jobs.PatchJob.State
+
+
+def _time(hour):
+    return datetime.datetime(2020, 1, 1, hour, tzinfo=datetime.timezone.utc)
+
+
+def _job(i, state=State.SUCCEEDED, updated=None):
+    return patch_jobs.PatchJob(
+        name="projects/p/patchJobs/{0}".format(i),
+        state=state,
+        create_time=_time(i),
+        update_time=_time(updated if updated is not None else i),
+    )
+
+
+def _pages(jobs, page_size, newest_first=True):
+    # Newest first by default, as the service lists them.
+    jobs = sorted(jobs, key=lambda job: job.create_time, reverse=newest_first)
+    pages = []
+    for start in range(0, len(jobs), page_size):
+        pages.append(
+            patch_jobs.ListPatchJobsResponse(
+                patch_jobs=jobs[start : start + page_size],
+                next_page_token=str(start) if start + page_size < len(jobs) else "",
+            )
+        )
+    return pages
+
+
+def _client():
+    return OsConfigServiceClient(credentials=credentials.AnonymousCredentials())
+
+
+def _serve(pages, jobs=()):
+    # The stubs of every RPC share one class, so a single mock of its
+    # __call__ answers both list_patch_jobs and get_patch_job.
+    pages = iter(pages)
+    jobs = {job.name: job for job in jobs}
+
+    def call(request, **kwargs):
+        if isinstance(request, patch_jobs.GetPatchJobRequest):
+            return jobs[request.name]
+        return next(pages)
+
+    return call
+
+
+def _calls(call, request_type):
+    return [c for c in call.mock_calls if isinstance(c[1][0], request_type)]
+
+
+def test_sync_full_then_incremental(tmp_path):
+    path = str(tmp_path / "jobs.bin")
+    client = _client()
+    history = [_job(i) for i in range(1, 9)] + [_job(9, state=State.PATCHING)]
+
+    with mock.patch.object(type(client._transport.list_patch_jobs), "__call__") as call:
+        call.side_effect = _pages(history, 2)
+        result = PatchJobSync(client, "projects/p", path, page_size=2).sync()
+
+        assert len(call.mock_calls) == 5
+    assert result.full
+    assert (result.added, result.pages_fetched, result.pages_avoided) == (9, 5, 0)
+
+    # Two new jobs arrive and the running job finishes.
+    current = history[:8] + [_job(9, updated=12), _job(10), _job(11)]
+    sync = PatchJobSync(client, "projects/p", path, page_size=2)
+    assert len(sync) == 9
+    assert sync.watermark == _time(9)
+
+    with mock.patch.object(type(client._transport.list_patch_jobs), "__call__") as call:
+        call.side_effect = _serve(_pages(current, 2))
+        result = sync.sync()
+
+        # The first page is new; the second one holds job 9, created within
+        # the overlap of the watermark; the third is entirely older.
+        assert len(call.mock_calls) == 3
+        assert not _calls(call, patch_jobs.GetPatchJobRequest)
+
+    assert not result.full
+    assert (result.added, result.updated, result.refreshed) == (2, 1, 0)
+    assert result.pages_fetched == 3
+    assert result.pages_avoided == 3
+    assert result.bytes_avoided > 0
+    assert len(sync) == 11
+    assert sync.get("projects/p/patchJobs/9").state == State.SUCCEEDED
+    assert sync.watermark == _time(11)
+
+
+def test_sync_cutoff_uses_create_time():
+    client = _client()
+    sync = PatchJobSync(client, "projects/p", page_size=2)
+
+    # Job 2 was updated long after it was created.
+    with mock.patch.object(type(client._transport.list_patch_jobs), "__call__") as call:
+        call.side_effect = _pages([_job(1), _job(2, updated=10)], 2)
+        sync.sync()
+    assert sync.watermark == _time(2)
+
+    # Jobs created since, though before job 2 was last updated, are listed.
+    current = [_job(1), _job(2, updated=10), _job(3), _job(4), _job(5)]
+    with mock.patch.object(type(client._transport.list_patch_jobs), "__call__") as call:
+        call.side_effect = _pages(current, 2)
+        result = sync.sync()
+
+        assert len(call.mock_calls) == 3
+    assert result.added == 3
+    assert len(sync) == 5
+
+
+def test_sync_listing_oldest_first():
+    client = _client()
+    sync = PatchJobSync(
+        client, "projects/p", page_size=1, overlap=datetime.timedelta(0)
+    )
+
+    with mock.patch.object(type(client._transport.list_patch_jobs), "__call__") as call:
+        call.side_effect = _pages([_job(i) for i in range(1, 4)], 1, False)
+        sync.sync()
+
+    # Every page is listed, since the first ones hold the oldest jobs.
+    with mock.patch.object(type(client._transport.list_patch_jobs), "__call__") as call:
+        call.side_effect = _pages([_job(i) for i in range(1, 6)], 1, False)
+        result = sync.sync()
+
+        assert len(call.mock_calls) == 5
+    assert result.added == 2
+    assert len(sync) == 5
+
+
+def test_sync_fake_server():
+    service = FakeOsConfigService(instances_per_project=2)
+    # The fake lists jobs newest first, like the service.
+    with FakeOsConfigServer(service, max_workers=4) as server:
+        client = server.client()
+        sync = PatchJobSync(
+            client, "projects/p", page_size=2, overlap=datetime.timedelta(0)
+        )
+
+        def execute(count):
+            for _ in range(count):
+                client.execute_patch_job(
+                    patch_jobs.ExecutePatchJobRequest(
+                        parent="projects/p", instance_filter={"all": True}
+                    )
+                )
+
+        execute(5)
+        assert sync.sync().added == 5
+
+        execute(3)
+        result = sync.sync()
+
+    # Listing stops at the first page reaching past the jobs synced before.
+    assert result.added == 3
+    assert (result.pages_fetched, result.pages_avoided) == (3, 1)
+    assert len(sync) == 8
+
+
+def test_sync_refreshes_running_jobs():
+    client = _client()
+    sync = PatchJobSync(
+        client, "projects/p", page_size=2, overlap=datetime.timedelta(0)
+    )
+    history = [_job(1, state=State.PATCHING)] + [_job(i) for i in range(2, 7)]
+
+    with mock.patch.object(type(client._transport.list_patch_jobs), "__call__") as call:
+        call.side_effect = _pages(history, 2)
+        sync.sync()
+
+    with mock.patch.object(type(client._transport.list_patch_jobs), "__call__") as call:
+        call.side_effect = _serve(
+            _pages(history, 2), [_job(1, state=State.SUCCEEDED, updated=6)]
+        )
+        result = sync.sync()
+
+        # Listing stops at the first page created before the watermark; the
+        # running job on a later page is fetched on its own.
+        assert len(_calls(call, patch_jobs.ListPatchJobsRequest)) == 2
+        assert len(_calls(call, patch_jobs.GetPatchJobRequest)) == 1
+
+    assert (result.refreshed, result.updated) == (1, 1)
+    assert sync.get("projects/p/patchJobs/1").state == State.SUCCEEDED
+
+
+def test_sync_criteria():
+    client = _client()
+    criteria = PatchJobFilter(
+        patch_deployment="projects/p/patchDeployments/d", states=[State.SUCCEEDED]
+    )
+    sync = PatchJobSync(client, "projects/p", criteria=criteria)
+
+    with mock.patch.object(type(client._transport.list_patch_jobs), "__call__") as call:
+        call.side_effect = _pages([_job(1), _job(2, state=State.CANCELED)], 10)
+        sync.sync()
+
+        _, args, _ = call.mock_calls[0]
+        assert args[0].filter == 'patch_deployment="projects/p/patchDeployments/d"'
+
+    # The state criterion is applied locally.
+    assert [job.name for job in sync.jobs()] == []
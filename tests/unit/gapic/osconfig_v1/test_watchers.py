@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import concurrent.futures
+import mock
+
+import pytest
+
+from google.api_core import grpc_helpers_async
+from google.auth import credentials
+from google.cloud.osconfig_v1.services.os_config_service import (
+    OsConfigServiceAsyncClient,
+)
+from google.cloud.osconfig_v1.services.os_config_service import OsConfigServiceClient
+from google.cloud.osconfig_v1.services.os_config_service import watchers
+from google.cloud.osconfig_v1.types import patch_jobs
+
+
+def _patch_job(state, percent_complete=0.0, succeeded=0):
+    return patch_jobs.PatchJob(
+        name="projects/p/patchJobs/j",
+        state=state,
+        percent_complete=percent_complete,
+        instance_details_summary=patch_jobs.PatchJob.InstanceDetailsSummary(
+            succeeded_instance_count=succeeded
+        ),
+    )
+
+
+def _no_delay():
+    return watchers.AdaptivePolling(initial=0, minimum=0, maximum=0)
+
+
+def test_adaptive_polling_backs_off_while_stalled():
+    polling = watchers.AdaptivePolling(initial=2, minimum=1, maximum=10)
+    job = _patch_job(patch_jobs.PatchJob.State.PATCHING, 10.0, 1)
+
+    assert polling.next_delay(job) == 2
+    assert polling.next_delay(job) == 4
+    assert polling.next_delay(job) == 8
+    assert polling.next_delay(job) == 10
+
+    # Progress in the summary counters shrinks the delay again.
+    job = _patch_job(patch_jobs.PatchJob.State.PATCHING, 10.0, 2)
+    assert polling.next_delay(job) == 5
+
+
+def test_adaptive_polling_near_completion():
+    polling = watchers.AdaptivePolling(initial=30, minimum=1, maximum=60)
+    job = _patch_job(patch_jobs.PatchJob.State.PATCHING, 95.0)
+
+    assert polling.next_delay(job) == 1
+
+
+def test_wait_for_patch_job():
+    client = OsConfigServiceClient(credentials=credentials.AnonymousCredentials())
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(type(client._transport.get_patch_job), "__call__") as call:
+        call.side_effect = (
+            _patch_job(patch_jobs.PatchJob.State.STARTED),
+            _patch_job(patch_jobs.PatchJob.State.PATCHING, 50.0),
+            _patch_job(patch_jobs.PatchJob.State.SUCCEEDED, 100.0),
+            RuntimeError,
+        )
+        snapshots = list(
+            client.wait_for_patch_job("projects/p/patchJobs/j", polling=_no_delay())
+        )
+
+        assert len(call.mock_calls) == 3
+        _, args, _ = call.mock_calls[0]
+        assert args[0].name == "projects/p/patchJobs/j"
+
+    assert [s.percent_complete for s in snapshots] == [0.0, 50.0, 100.0]
+    assert watchers.is_terminal(snapshots[-1])
+
+
+def test_wait_for_patch_job_deadline():
+    client = OsConfigServiceClient(credentials=credentials.AnonymousCredentials())
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(type(client._transport.get_patch_job), "__call__") as call:
+        call.return_value = _patch_job(patch_jobs.PatchJob.State.PATCHING)
+        with pytest.raises(concurrent.futures.TimeoutError):
+            for _ in client.wait_for_patch_job(
+                "projects/p/patchJobs/j", polling=_no_delay(), deadline=0
+            ):
+                pass
+
+
+@pytest.mark.asyncio
+async def test_wait_for_patch_job_async():
+    client = OsConfigServiceAsyncClient(credentials=credentials.AnonymousCredentials())
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._client._transport.get_patch_job), "__call__"
+    ) as call:
+        call.side_effect = (
+            grpc_helpers_async.FakeUnaryUnaryCall(
+                _patch_job(patch_jobs.PatchJob.State.PATCHING, 50.0)
+            ),
+            grpc_helpers_async.FakeUnaryUnaryCall(
+                _patch_job(patch_jobs.PatchJob.State.CANCELED, 60.0)
+            ),
+        )
+        snapshots = []
+        async for snapshot in client.wait_for_patch_job(
+            "projects/p/patchJobs/j", polling=_no_delay()
+        ):
+            snapshots.append(snapshot)
+
+    assert [s.state for s in snapshots] == [
+        patch_jobs.PatchJob.State.PATCHING,
+        patch_jobs.PatchJob.State.CANCELED,
+    ]
+
+
+def _fake_call(patch_job):
+    return grpc_helpers_async.FakeUnaryUnaryCall(patch_job)
+
+
+@pytest.mark.asyncio
+async def test_patch_job_watcher():
+    client = OsConfigServiceAsyncClient(credentials=credentials.AnonymousCredentials())
+    transitions = []
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._client._transport.get_patch_job), "__call__"
+    ) as call:
+        call.side_effect = (
+            _fake_call(_patch_job(patch_jobs.PatchJob.State.PATCHING, 10.0)),
+            _fake_call(_patch_job(patch_jobs.PatchJob.State.PATCHING, 50.0)),
+            _fake_call(_patch_job(patch_jobs.PatchJob.State.SUCCEEDED, 100.0)),
+        )
+        async with watchers.PatchJobWatcher(
+            client,
+            polls_per_second=1000,
+            polling_factory=_no_delay,
+            on_transition=transitions.append,
+        ) as watcher:
+            queue = watcher.transitions
+            future = watcher.watch("projects/p/patchJobs/j")
+
+            # Watching the same job again shares its polls.
+            assert watcher.watch("projects/p/patchJobs/j") is future
+            patch_job = await future
+
+        assert len(call.mock_calls) == 3
+
+    assert patch_job.state == patch_jobs.PatchJob.State.SUCCEEDED
+    assert watcher.watched == ()
+    assert [(t.previous_state, t.patch_job.state) for t in transitions] == [
+        (
+            patch_jobs.PatchJob.State.STATE_UNSPECIFIED,
+            patch_jobs.PatchJob.State.PATCHING,
+        ),
+        (patch_jobs.PatchJob.State.PATCHING, patch_jobs.PatchJob.State.SUCCEEDED),
+    ]
+    assert queue.qsize() == 2
+
+
+@pytest.mark.asyncio
+async def test_patch_job_watcher_error():
+    client = OsConfigServiceAsyncClient(credentials=credentials.AnonymousCredentials())
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._client._transport.get_patch_job), "__call__"
+    ) as call:
+        call.side_effect = RuntimeError
+        async with watchers.PatchJobWatcher(client, polls_per_second=1000) as watcher:
+            with pytest.raises(RuntimeError):
+                await watcher.watch("projects/p/patchJobs/j")
+
+
+@pytest.mark.asyncio
+async def test_patch_job_watcher_callback_error():
+    client = OsConfigServiceAsyncClient(credentials=credentials.AnonymousCredentials())
+    on_transition = mock.Mock(side_effect=ValueError)
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+        type(client._client._transport.get_patch_job), "__call__"
+    ) as call:
+        call.return_value = _fake_call(
+            _patch_job(patch_jobs.PatchJob.State.PATCHING, 10.0)
+        )
+        async with watchers.PatchJobWatcher(
+            client,
+            polls_per_second=1000,
+            polling_factory=_no_delay,
+            on_transition=on_transition,
+        ) as watcher:
+            with pytest.raises(ValueError):
+                await watcher.watch("projects/p/patchJobs/j")
+
+            # The job is no longer watched, so it can be watched afresh.
+            assert watcher.watched == ()
+            on_transition.side_effect = None
+            call.return_value = _fake_call(
+                _patch_job(patch_jobs.PatchJob.State.SUCCEEDED, 100.0)
+            )
+            patch_job = await watcher.watch("projects/p/patchJobs/j")
+
+    assert patch_job.state == patch_jobs.PatchJob.State.SUCCEEDED
+
+
+@pytest.mark.asyncio
+async def test_patch_job_watcher_prefers_jobs_near_completion():
+    client = mock.Mock()
+    watcher = watchers.PatchJobWatcher(client)
+    watcher.start()
+    try:
+        watcher.watch("projects/p/patchJobs/slow")
+        watcher.watch("projects/p/patchJobs/fast")
+        watcher._jobs["projects/p/patchJobs/slow"].patch_job = _patch_job(
+            patch_jobs.PatchJob.State.PATCHING, 10.0
+        )
+        watcher._jobs["projects/p/patchJobs/fast"].patch_job = _patch_job(
+            patch_jobs.PatchJob.State.PATCHING, 90.0
+        )
+
+        job, _ = watcher._next_job()
+        assert job.name == "projects/p/patchJobs/fast"
+    finally:
+        watcher._jobs.clear()
+        await watcher.close()